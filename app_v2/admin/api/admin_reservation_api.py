@@ -5,6 +5,7 @@ from datetime import date, datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 from app_v2.admin.usecases.by_farm import (
@@ -20,6 +21,7 @@ from app_v2.admin.usecases.resolve_event_by_reservation import (
 from app_v2.admin.dto.admin_reservation_dtos import (
     AdminReservationListItemDTO,
 )
+from app_v2.common.json_response import trusted_json_response
 
 router = APIRouter(
     prefix="/api/admin/reservations",
@@ -102,12 +104,13 @@ def list_admin_reservations(
         default=0,
         ge=0,
     ),
-) -> AdminReservationListResponse:
+) -> Response:
     """
     管理者用：予約一覧取得 API
 
     - 一覧表示が目的
     - 画面遷移用 resolve 系 usecase は使用しない
+    - 最大 limit 件の DTO を response_model で再検証せずに JSON 化する
     """
 
     # ─────────────────────────────
@@ -118,14 +121,18 @@ def list_admin_reservations(
             reservation_id=reservation_id
         )
         if item is None:
-            return AdminReservationListResponse(
-                items=[],
-                total_count=0,
+            return trusted_json_response(
+                AdminReservationListResponse(
+                    items=[],
+                    total_count=0,
+                )
             )
 
-        return AdminReservationListResponse(
-            items=[item],
-            total_count=1,
+        return trusted_json_response(
+            AdminReservationListResponse(
+                items=[item],
+                total_count=1,
+            )
         )
 
     # ─────────────────────────────
@@ -138,9 +145,11 @@ def list_admin_reservations(
         event_start=event_start,
     )
 
-    return AdminReservationListResponse(
-        items=items,
-        total_count=total_count,
+    return trusted_json_response(
+        AdminReservationListResponse(
+            items=items,
+            total_count=total_count,
+        )
     )
 
 
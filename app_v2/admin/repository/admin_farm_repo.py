@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Any, Dict, List
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class AdminFarmRepository:
@@ -16,7 +16,7 @@ class AdminFarmRepository:
     """
 
     def __init__(self) -> None:
-        self.conn = sqlite3.connect(resolve_db_path())
+        self.conn = connect(resolve_db_path())
         self.conn.row_factory = sqlite3.Row
 
     def find_farms_by_owner_kana(
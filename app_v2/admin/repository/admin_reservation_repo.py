@@ -4,7 +4,7 @@ import sqlite3
 from datetime import date
 from typing import Any, Dict, List, Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class AdminReservationRepository:
@@ -18,7 +18,7 @@ class AdminReservationRepository:
     """
 
     def __init__(self) -> None:
-        self.conn = sqlite3.connect(resolve_db_path())
+        self.conn = connect(resolve_db_path())
         self.conn.row_factory = sqlite3.Row
 
     # ------------------------------------------------------------------
@@ -67,6 +67,7 @@ class AdminReservationRepository:
                 r.farm_id AS farm_id,
                 r.consumer_id AS customer_user_id,
                 r.pickup_slot_code AS pickup_slot_code,
+                r.pickup_display AS pickup_display,
                 r.items_json AS items_json,
                 r.rice_subtotal AS rice_subtotal,
                 r.service_fee AS service_fee,
@@ -153,6 +154,7 @@ class AdminReservationRepository:
                 r.farm_id AS farm_id,
                 r.consumer_id AS customer_user_id,
                 r.pickup_slot_code AS pickup_slot_code,
+                r.pickup_display AS pickup_display,
                 r.items_json AS items_json,
                 r.rice_subtotal AS rice_subtotal,
                 r.service_fee AS service_fee,
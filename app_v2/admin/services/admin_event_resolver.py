@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence, Tuple
 
 # ============================================================
 # 既存ロジック（表示禁止・ロジック専用）
@@ -9,8 +9,14 @@ from typing import Tuple
 
 from app_v2.customer_booking.services.reservation_expanded_service import (
     _parse_db_datetime,
-    _calc_event_for_booking,
 )
+from app_v2.domain.pickup_event_batch import (
+    datetime_to_epoch_us,
+    epoch_us_to_datetime,
+    event_windows_for_booking,
+    parse_db_datetimes_us,
+)
+from app_v2.domain.pickup_slot import UTC, PickupSlot
 
 # ============================================================
 # 管理画面用：受け渡しイベント解決ロジック
@@ -47,4 +53,32 @@ def resolve_event(
     ※ 業務ロジック専用
     ※ 表示用文字列は生成しない
     """
-    return _calc_event_for_booking(created_at, pickup_slot_code)
+    return PickupSlot.from_code(pickup_slot_code).event_for_booking(created_at, UTC)
+
+
+def resolve_events(
+    rows: Sequence[Dict[str, Any]],
+) -> List[Tuple[datetime, datetime]]:
+    """
+    reservations の行（created_at / pickup_slot_code）の列から
+    (event_start, event_end) の列を一括で返す。resolve_event の一括版。
+
+    ※ 業務ロジック専用
+    ※ created_at が無い・壊れている行は parse_created_at と同じく「現在時刻」扱い
+    """
+    if not rows:
+        return []
+
+    now_us = datetime_to_epoch_us(datetime.now(timezone.utc))
+    created_us = [
+        now_us if v is None else v
+        for v in parse_db_datetimes_us([row.get("created_at") for row in rows])
+    ]
+    starts, ends = event_windows_for_booking(
+        created_us,
+        [str(row.get("pickup_slot_code") or "") for row in rows],
+    )
+    return [
+        (epoch_us_to_datetime(s), epoch_us_to_datetime(e))
+        for s, e in zip(starts, ends)
+    ]
@@ -10,6 +10,7 @@ from app_v2.admin.repository.admin_reservation_repo import (
 from app_v2.admin.dto.admin_reservation_dtos import (
     AdminReservationListItemDTO,
 )
+from app_v2.common.trusted_dto import build_trusted
 
 from app_v2.admin.services.admin_items_formatter import (
     build_items_display,
@@ -20,6 +21,7 @@ from app_v2.admin.services.admin_items_formatter import (
 from app_v2.admin.services.admin_event_resolver import (
     parse_created_at,
     resolve_event,
+    resolve_events,
 )
 
 
@@ -66,24 +68,16 @@ class AdminReservationService:
                 date_to=None,
             )
 
-            dtos: List[AdminReservationListItemDTO] = []
-
-            for row in raw_rows:
-                pickup_slot_code = str(row.get("pickup_slot_code") or "")
-                if not pickup_slot_code:
-                    continue
+            rows = [row for row in raw_rows if row.get("pickup_slot_code")]
+            events = resolve_events(rows)
 
-                created_at = parse_created_at(row.get("created_at"))
-
-                row_event_start, _ = resolve_event(
-                    created_at=created_at,
-                    pickup_slot_code=pickup_slot_code,
-                )
+            dtos: List[AdminReservationListItemDTO] = []
 
-                if row_event_start != event_start:
+            for row, event in zip(rows, events):
+                if event[0] != event_start:
                     continue
 
-                dto = self._build_admin_dto(row)
+                dto = self._build_admin_dto(row, event=event)
                 dtos.append(dto)
 
             return dtos, len(dtos)
@@ -141,17 +135,10 @@ class AdminReservationService:
 
         grouped: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
 
-        for row in raw_rows:
-            pickup_slot_code = str(row.get("pickup_slot_code") or "")
-            if not pickup_slot_code:
-                continue
+        rows = [row for row in raw_rows if row.get("pickup_slot_code")]
 
-            created_at = parse_created_at(row.get("created_at"))
-
-            event_start, event_end = resolve_event(
-                created_at=created_at,
-                pickup_slot_code=pickup_slot_code,
-            )
+        for row, (event_start, event_end) in zip(rows, resolve_events(rows)):
+            pickup_slot_code = str(row["pickup_slot_code"])
 
             key = (pickup_slot_code, event_start)
 
@@ -194,18 +181,23 @@ class AdminReservationService:
     def _build_admin_dto(
         self,
         row: Dict[str, Any],
+        event: Optional[Tuple[datetime, datetime]] = None,
     ) -> AdminReservationListItemDTO:
         """
         reservations の生データから DTO を組み立てる。
+        event（event_start, event_end）が計算済みなら再計算しない。
         """
 
         pickup_slot_code = str(row.get("pickup_slot_code") or "")
         created_at = parse_created_at(row.get("created_at"))
 
-        event_start, event_end = resolve_event(
-            created_at=created_at,
-            pickup_slot_code=pickup_slot_code,
-        )
+        if event is not None:
+            event_start, event_end = event
+        else:
+            event_start, event_end = resolve_event(
+                created_at=created_at,
+                pickup_slot_code=pickup_slot_code,
+            )
 
         # ★ 表示は DB.reservations.pickup_display のみ
         pickup_display = row.get("pickup_display")
@@ -246,7 +238,8 @@ class AdminReservationService:
         except (TypeError, ValueError):
             pickup_map_url = ""
 
-        return AdminReservationListItemDTO(
+        return build_trusted(
+            AdminReservationListItemDTO,
             reservation_id=int(row["id"]),
             farm_id=int(row["farm_id"]),
             customer_user_id=customer_user_id,
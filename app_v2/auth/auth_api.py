@@ -82,10 +82,9 @@ def verify_otp(payload: VerifyOtpRequest, request: Request):
     # セッション確立
     # ==================================================
     # farm_id の解決はここで行う（認証後）
-    from app_v2.db.core import resolve_db_path
-    import sqlite3
+    from app_v2.db.core import connect, resolve_db_path
 
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     try:
         row = conn.execute(
             "SELECT farm_id FROM farms WHERE email = ?",
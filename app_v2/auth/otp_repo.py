@@ -2,7 +2,7 @@ import sqlite3
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 # ======================================================
@@ -10,7 +10,7 @@ from app_v2.db.core import resolve_db_path
 # ======================================================
 
 def _get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -1,11 +1,13 @@
-import os
+import logging
 import random
-import sqlite3
 from datetime import datetime, timedelta
 
-from app_v2.db.core import resolve_db_path
+from app_v2.config.settings import get_settings
+from app_v2.db.core import connect, resolve_db_path
 from app_v2.auth import otp_repo
 
+logger = logging.getLogger(__name__)
+
 
 # ======================================================
 # 定数（ここで一元管理）
@@ -36,7 +38,7 @@ def _generate_otp_code() -> str:
     6桁の数値 OTP を生成
     OTP_FIXED=1 の場合は固定値を返す（テスト用）
     """
-    if os.getenv("OTP_FIXED") == "1":
+    if get_settings().otp_fixed:
         return "123456"
 
     return str(
@@ -52,7 +54,7 @@ def _get_farm_registration_status(email: str) -> str | None:
     email に紐づく farm の registration_status を取得
     存在しない場合は None
     """
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     try:
         row = conn.execute(
             """
@@ -142,4 +144,9 @@ def _send_otp_email(email: str, code: str) -> None:
     OTP メール送信
     本番では SendGrid / SES 等に差し替える
     """
-    print(f"[OTP] send to {email}: {code}")
+    logger.info(
+        "OTP mail (stub) to %s: %s",
+        email,
+        code,
+        extra={"event": "mail.otp_stub", "to": email},
+    )
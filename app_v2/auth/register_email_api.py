@@ -3,9 +3,8 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-import sqlite3
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 from app_v2.auth import otp_repo, otp_service
 
 
@@ -37,7 +36,7 @@ class OkResponse(BaseModel):
 # =========================
 
 def _farm_exists(email: str) -> bool:
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     try:
         row = conn.execute(
             "SELECT 1 FROM farms WHERE email = ? LIMIT 1",
@@ -53,7 +52,7 @@ def _create_empty_farm(email: str) -> int:
     email 登録完了時点で farm を永続化する。
     registration_status は必須。
     """
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     try:
         cur = conn.execute(
             """
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException, Request, status
@@ -12,6 +11,7 @@ from app_v2.auth_consumer.magic.schemas import (
     MagicLinkLoginSendRequest,   # ★ 追加
 )
 from app_v2.auth_consumer.magic.service import MagicLinkService
+from app_v2.config.settings import get_settings
 
 from app_v2.customer_booking.services.confirm_service import ConfirmService
 from app_v2.customer_booking.dtos import ReservationFormDTO
@@ -215,7 +215,7 @@ def consume_magic_link(request: Request, token: str):
 
     request.session["consumer_id"] = consumer_id_int
 
-    frontend_origin = os.getenv("FRONTEND_BASE_URL")
+    frontend_origin = get_settings().frontend_base_url
     if not frontend_origin:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -265,7 +265,7 @@ def consume_login_only(request: Request, token: str):
 
     request.session["consumer_id"] = consumer_id
 
-    frontend_origin = os.getenv("FRONTEND_BASE_URL")
+    frontend_origin = get_settings().frontend_base_url
     if not frontend_origin:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -288,7 +288,7 @@ def magic_test_entry():
     【DEV ONLY】
     """
 
-    env = os.getenv("ENV", "development")
+    env = get_settings().env
     if env not in ("development", "dev", "local"):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,7 +2,7 @@ import sqlite3
 from datetime import datetime
 from typing import Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class MagicLinkRepository:
@@ -26,7 +26,7 @@ class MagicLinkRepository:
             return self._external_conn
 
         db_path = resolve_db_path()
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1,8 +1,8 @@
-import os
 import secrets
 from datetime import datetime, timedelta, timezone
 
 from app_v2.auth_consumer.magic.repository import MagicLinkRepository
+from app_v2.config.settings import get_settings
 from app_v2.auth_consumer.mailer import MagicLinkMailer
 
 
@@ -46,7 +46,7 @@ class MagicLinkService:
         if not agreed:
             raise ValueError("Agreement is required")
 
-        api_base_url = os.getenv("API_BASE_URL")
+        api_base_url = get_settings().api_base_url
         if not api_base_url:
             raise RuntimeError("API_BASE_URL is not set")
 
@@ -99,7 +99,7 @@ class MagicLinkService:
         if not consumer_id:
             raise ValueError("consumer_id is required")
 
-        api_base_url = os.getenv("API_BASE_URL")
+        api_base_url = get_settings().api_base_url
         if not api_base_url:
             raise RuntimeError("API_BASE_URL is not set")
 
@@ -28,12 +28,9 @@ class MagicLinkMailer:
         - ログに出すのみ
         """
 
-        print("=== MAGIC LINK (DEBUG) ===")
-        print(magic_link_url)
-        print("==========================")
-
-        logger.info("=== Magic Link Mail (Phase B-1b mock) ===")
-        logger.info("To: %s", to)
-        logger.info("Magic Link URL:")
-        logger.info(magic_link_url)
-        logger.info("======================================")
+        logger.info(
+            "Magic Link Mail (Phase B-1b mock) to %s: %s",
+            to,
+            magic_link_url,
+            extra={"event": "mail.magic_link_stub", "to": to},
+        )
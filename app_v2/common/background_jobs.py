@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ============================================================
+# プロセス内バックグラウンドジョブ
+#
+# - ワーカースレッド 1 本 + 実行予定時刻のヒープ
+# - ジョブが例外を投げたら指数バックオフ（+ jitter）で再実行
+# - max_attempts を使い切ったら on_give_up を呼んで終わり
+# - 永続化はしない（再起動時の拾い直しは各ジョブ側で行う）
+# ============================================================
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 6
+DEFAULT_BACKOFF_BASE_SEC = 5.0
+DEFAULT_BACKOFF_MAX_SEC = 600.0
+
+
+@dataclass
+class Job:
+    name: str
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    backoff_base_sec: float = DEFAULT_BACKOFF_BASE_SEC
+    on_give_up: Optional[Callable[[BaseException], Any]] = None
+    attempts: int = field(default=0)
+
+
+class BackgroundJobRunner:
+    def __init__(self, *, name: str = "background-jobs") -> None:
+        self.name = name
+        self._heap: List[Tuple[float, int, Job]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._stats: Dict[str, int] = {
+            "submitted": 0,
+            "succeeded": 0,
+            "retried": 0,
+            "gave_up": 0,
+        }
+
+    # --------------------------------------------------------
+    # lifecycle
+    # --------------------------------------------------------
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name=self.name,
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        ワーカーを止める（実行中のジョブは最後まで走らせる）。
+        未実行のジョブは破棄する。
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+
+        with self._cond:
+            self._heap.clear()
+            self._thread = None
+
+    # --------------------------------------------------------
+    # submit
+    # --------------------------------------------------------
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        delay_sec: float = 0.0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_base_sec: float = DEFAULT_BACKOFF_BASE_SEC,
+        on_give_up: Optional[Callable[[BaseException], Any]] = None,
+    ) -> None:
+        job = Job(
+            name=name,
+            fn=fn,
+            args=args,
+            max_attempts=max_attempts,
+            backoff_base_sec=backoff_base_sec,
+            on_give_up=on_give_up,
+        )
+        with self._cond:
+            self._stats["submitted"] += 1
+            self._push(job, time.monotonic() + delay_sec)
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._heap)
+        return stats
+
+    # --------------------------------------------------------
+    # internal
+    # --------------------------------------------------------
+
+    def _push(self, job: Job, run_at: float) -> None:
+        heapq.heappush(self._heap, (run_at, next(self._seq), job))
+        self._cond.notify()
+
+    def _next_job(self) -> Optional[Job]:
+        with self._cond:
+            while not self._stopping:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                run_at = self._heap[0][0]
+                wait = run_at - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+
+                return heapq.heappop(self._heap)[2]
+        return None
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+
+            job.attempts += 1
+            try:
+                job.fn(*job.args)
+            except Exception as e:
+                self._on_failure(job, e)
+            else:
+                with self._cond:
+                    self._stats["succeeded"] += 1
+
+    def _on_failure(self, job: Job, error: BaseException) -> None:
+        if job.attempts < job.max_attempts:
+            delay = min(
+                job.backoff_base_sec * (2 ** (job.attempts - 1)),
+                DEFAULT_BACKOFF_MAX_SEC,
+            ) * random.uniform(0.8, 1.2)
+            logger.warning(
+                "job %s failed (attempt %d/%d), retry in %.1fs: %s",
+                job.name,
+                job.attempts,
+                job.max_attempts,
+                delay,
+                error,
+                extra={
+                    "event": "jobs.retry",
+                    "job": job.name,
+                    "attempt": job.attempts,
+                    "retry_in_sec": round(delay, 1),
+                },
+            )
+            with self._cond:
+                self._stats["retried"] += 1
+                if not self._stopping:
+                    self._push(job, time.monotonic() + delay)
+            return
+
+        logger.error(
+            "job %s gave up after %d attempts: %s",
+            job.name,
+            job.attempts,
+            error,
+            extra={"event": "jobs.gave_up", "job": job.name, "attempt": job.attempts},
+        )
+        with self._cond:
+            self._stats["gave_up"] += 1
+
+        if job.on_give_up is not None:
+            try:
+                job.on_give_up(error)
+            except Exception:
+                logger.exception(
+                    "on_give_up failed for job %s",
+                    job.name,
+                    extra={"event": "jobs.on_give_up_failed", "job": job.name},
+                )
+
+
+# ============================================================
+# プロセス共有インスタンス
+# ============================================================
+
+_runner: Optional[BackgroundJobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> BackgroundJobRunner:
+    global _runner
+    if _runner is not None:
+        return _runner
+
+    with _runner_lock:
+        if _runner is None:
+            _runner = BackgroundJobRunner()
+        return _runner
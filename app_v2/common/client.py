@@ -1,25 +1,48 @@
-import os
-import cloudinary
-import cloudinary.uploader
+import threading
 
-# 必要な環境変数：
+from app_v2.config.settings import get_settings
+
+# 必要な環境変数（app_v2.config.settings 経由）：
 # CLOUDINARY_CLOUD_NAME
 # CLOUDINARY_API_KEY
 # CLOUDINARY_API_SECRET
 # 任意：CLOUDINARY_UPLOAD_FOLDER （例: "rice-app/farms"）
+#
+# cloudinary パッケージは初回アップロード / 削除時に import する（起動を遅くしない）
+
+_configured = False
+_config_lock = threading.Lock()
+
 
 def init():
-    cloudinary.config(
-        cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-        api_key=os.getenv("CLOUDINARY_API_KEY"),
-        api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-        secure=True,
-    )
+    """
+    cloudinary.config はプロセスで 1 回だけ実行する。
+    （並列アップロード時に毎回グローバル設定を書き換えないため）
+    """
+    global _configured
+    if _configured:
+        return
+
+    with _config_lock:
+        if _configured:
+            return
+        import cloudinary
+
+        settings = get_settings()
+        cloudinary.config(
+            cloud_name=settings.cloudinary_cloud_name,
+            api_key=settings.cloudinary_api_key,
+            api_secret=settings.cloudinary_api_secret,
+            secure=True,
+        )
+        _configured = True
 
 def upload_bytes(content: bytes, filename: str, folder: str | None = None):
     init()
+    import cloudinary.uploader
+
     options = {
-        "folder": folder or os.getenv("CLOUDINARY_UPLOAD_FOLDER", "rice-app/farms"),
+        "folder": folder or get_settings().cloudinary_upload_folder,
         "resource_type": "image",
         "use_filename": True,
         "unique_filename": True,
@@ -39,6 +62,8 @@ def delete_public_id(public_id: str) -> bool:
     - 既に存在しない場合はエラーにしない
     """
     init()
+    import cloudinary.uploader
+
     try:
         resp = cloudinary.uploader.destroy(public_id, invalidate=True)
         return resp.get("result") in {"ok", "not found"}
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app_v2.config.settings import get_settings
+from app_v2.customer_booking.repository.table_versions_repo import (
+    fetch_table_version,
+)
+from app_v2.db.datetimes import parse_db_datetime_or_none
+
+# ============================================================
+# 公開 API の条件付きリクエスト（ETag / Last-Modified → 304）
+#
+# - レスポンスの中身は「テーブルの version（table_versions）」と「現在時刻」だけで決まる
+#   - DB 由来の部分は farms / farm_pickup_slots への書き込みごとに version が上がる（トリガ）
+#   - 時刻由来の部分（次回受け渡し・締切・収穫年度）は JST の正時でしか切り替わらない
+#     （受け渡し枠の開始・締切（開始の 3 時間前）はどちらも正時）
+#   → ETag = hash(salt | version | JST の時間帯 | path?query) の strong ETag
+# - If-None-Match が一致すれば、farms を読む前に 304 を返す（table_versions 1 行の SELECT のみ）
+# - max-age は次の正時を越えない（越えると「次回受け渡し」が古いまま使われる）
+# - table_versions が無い DB ではヘッダを付けずに通常どおり返す
+# - service の single flight の key には cache.content_key（ETag を決めた version と時間帯）を
+#   含める。書き込み前に始まった計算の結果を、書き込み後の ETag で返さないため
+#
+# 使い方（API 層）:
+#   cache = check_public_cache(request, "farms")
+#   if cache.not_modified:
+#       return cache.not_modified_response()
+#   result = service.get_xxx(..., content_key=cache.content_key)
+#   return trusted_json_response(result, headers=cache.headers)
+# ============================================================
+
+_HOUR_SEC = 3600
+# JST は UTC+9（正時のずれが無い）ので、UNIX 時刻の 1 時間区切りがそのまま JST の正時区切り
+_JST_OFFSET_SEC = 9 * _HOUR_SEC
+
+
+@dataclass(frozen=True)
+class PublicCacheCheck:
+    headers: Dict[str, str] = field(default_factory=dict)
+    not_modified: bool = False
+    # ETag を決めた (version, JST の時間帯)。table_versions が無い DB では None
+    content_key: Optional[Tuple[int, int]] = None
+
+    def not_modified_response(self) -> Response:
+        # 304 にも ETag / Cache-Control / Last-Modified を付ける（RFC 9110 15.4.5）
+        return Response(status_code=304, headers=self.headers)
+
+
+_NO_CACHE = PublicCacheCheck()
+
+
+def check_public_cache(
+    request: Request,
+    table_name: str,
+    *,
+    now: Optional[float] = None,
+) -> PublicCacheCheck:
+    """
+    table_name の version と現在の JST 時間帯から ETag 等を作り、
+    リクエストの If-None-Match / If-Modified-Since と比べる。
+    """
+    version = fetch_table_version(table_name)
+    if version is None:
+        return _NO_CACHE
+
+    now_ts = time.time() if now is None else now
+    hour_bucket = int(now_ts + _JST_OFFSET_SEC) // _HOUR_SEC
+    bucket_start = hour_bucket * _HOUR_SEC - _JST_OFFSET_SEC
+    seconds_to_next_hour = bucket_start + _HOUR_SEC - int(now_ts)
+
+    etag = _make_etag(
+        version=version.version,
+        hour_bucket=hour_bucket,
+        target=_request_target(request),
+    )
+
+    # 内容が最後に変わり得た時刻：最後の書き込みと、今の時間帯の開始の新しい方
+    last_modified = datetime.fromtimestamp(bucket_start, timezone.utc)
+    updated_at = parse_db_datetime_or_none(version.updated_at)
+    if updated_at is not None and updated_at > last_modified:
+        last_modified = updated_at.replace(microsecond=0)
+
+    max_age = max(0, min(get_settings().public_cache_max_age_sec, seconds_to_next_hour))
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    return PublicCacheCheck(
+        headers=headers,
+        not_modified=_is_not_modified(request, etag, last_modified),
+        content_key=(version.version, hour_bucket),
+    )
+
+
+# ============================================================
+# helpers
+# ============================================================
+
+def _request_target(request: Request) -> str:
+    query = request.url.query
+    return f"{request.url.path}?{query}" if query else request.url.path
+
+
+def _make_etag(*, version: int, hour_bucket: int, target: str) -> str:
+    key = f"{get_settings().etag_salt}|{version}|{hour_bucket}|{target}".encode("utf-8")
+    return '"' + hashlib.blake2b(key, digest_size=8).hexdigest() + '"'
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    # If-None-Match があるときは If-Modified-Since を見ない（RFC 9110 13.1.3）
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match は弱い比較（W/ を外して比べる）。"*" は常に一致。
+    """
+    value = if_none_match.strip()
+    if value == "*":
+        return True
+    for candidate in value.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
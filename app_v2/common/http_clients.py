@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional
+
+import httpx
+
+# ============================================================
+# 外部 API 用の共有 HTTP クライアント
+#
+# - 接続プール（keep-alive）を使い回し、毎回の TCP / TLS ハンドシェイクを省く
+# - async 版は event loop ごとに 1 つ（テストなどで loop が替わっても安全）
+# - アプリ終了時に close_http_clients() で閉じる
+# ============================================================
+
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=3.0)
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=60.0,
+)
+
+_sync_client: Optional[httpx.Client] = None
+_sync_lock = threading.Lock()
+
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_sync_client() -> httpx.Client:
+    global _sync_client
+    if _sync_client is not None:
+        return _sync_client
+
+    with _sync_lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(
+                timeout=DEFAULT_TIMEOUT,
+                limits=DEFAULT_LIMITS,
+            )
+        return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    実行中の event loop に紐づく AsyncClient を返す（loop 内からのみ呼ぶ）。
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+
+    if _async_client is None or _async_client_loop is not loop or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=DEFAULT_LIMITS,
+        )
+        _async_client_loop = loop
+
+    return _async_client
+
+
+async def close_http_clients() -> None:
+    global _sync_client, _async_client, _async_client_loop
+
+    with _sync_lock:
+        client, _sync_client = _sync_client, None
+    if client is not None:
+        client.close()
+
+    if _async_client is not None and _async_client_loop is asyncio.get_running_loop():
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import PurePath
+from typing import BinaryIO, Optional, Union
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app_v2.config.upload_limits import (
+    IMAGE_MAX_PIXELS,
+    IMAGE_OUTPUT_FORMAT,
+    IMAGE_OUTPUT_QUALITY,
+)
+
+# ============================================================
+# アップロード前の画像加工
+#
+# - デコードは 1 回だけ（JPEG は draft で縮小デコード）
+# - EXIF の向きを反映したうえで、メタデータ（EXIF / GPS / ICC）は捨てる
+# - 表示サイズ・サムネイルサイズに縮小して WebP で再エンコード
+# ============================================================
+
+Image.MAX_IMAGE_PIXELS = IMAGE_MAX_PIXELS
+
+_OUTPUT_EXT = "." + IMAGE_OUTPUT_FORMAT.lower()
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    content: bytes
+    filename: str
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    display: ImageVariant
+    thumbnail: Optional[ImageVariant]
+    original_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        size = len(self.display.content)
+        if self.thumbnail is not None:
+            size += len(self.thumbnail.content)
+        return size
+
+
+def process_image(
+    content: Union[bytes, BinaryIO],
+    filename: str,
+    *,
+    max_edge: int,
+    thumb_edge: Optional[int] = None,
+) -> ProcessedImage:
+    """
+    アップロードされた画像を表示用に加工する。
+
+    - content は bytes / ファイルオブジェクトのどちらでもよい
+      （ファイルは先頭から読む。全体をメモリに載せない）
+    - 壊れた画像・画像でないファイルは ValueError
+    - thumb_edge を指定した場合はサムネイルも同時に作る（再デコードしない）
+    """
+    if isinstance(content, (bytes, bytearray)):
+        original_bytes = len(content)
+        stream: BinaryIO = BytesIO(content)
+    else:
+        stream = content
+        stream.seek(0, 2)
+        original_bytes = stream.tell()
+        stream.seek(0)
+
+    try:
+        with Image.open(stream) as src:
+            # JPEG は縮小デコードでメモリと CPU を節約する
+            src.draft("RGB", (max_edge, max_edge))
+            image = ImageOps.exif_transpose(src)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValueError("invalid image file")
+
+    image = _normalize_mode(image)
+
+    stem = PurePath(filename or "image").stem or "image"
+
+    display_image = _fit_within(image, max_edge)
+    display = _encode(display_image, f"{stem}{_OUTPUT_EXT}")
+
+    thumbnail: Optional[ImageVariant] = None
+    if thumb_edge is not None:
+        thumb_image = _fit_within(display_image, thumb_edge)
+        thumbnail = _encode(thumb_image, f"{stem}_thumb{_OUTPUT_EXT}")
+
+    return ProcessedImage(
+        display=display,
+        thumbnail=thumbnail,
+        original_bytes=original_bytes,
+    )
+
+
+# ============================================================
+# 内部ヘルパ
+# ============================================================
+
+def _normalize_mode(image: Image.Image) -> Image.Image:
+    # 透過は保持し、それ以外（CMYK / P / L など）は RGB に揃える
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    if image.mode in ("LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def _fit_within(image: Image.Image, max_edge: int) -> Image.Image:
+    if max(image.size) <= max_edge:
+        return image
+    resized = image.copy()
+    resized.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    return resized
+
+
+def _encode(image: Image.Image, filename: str) -> ImageVariant:
+    buf = BytesIO()
+    # exif / icc_profile を渡さないので、メタデータは一切書き出されない
+    image.save(
+        buf,
+        format=IMAGE_OUTPUT_FORMAT,
+        quality=IMAGE_OUTPUT_QUALITY,
+        method=4,
+    )
+    return ImageVariant(
+        content=buf.getvalue(),
+        filename=filename,
+        width=image.width,
+        height=image.height,
+    )
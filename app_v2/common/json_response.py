@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app_v2.common.trusted_dto import strict_dto_validation
+
+# ============================================================
+# 信頼済み DTO の高速 JSON レスポンス
+#
+# - endpoint が DTO を返すと FastAPI は response_model で
+#     model_dump → 再検証 → dict へ serialize → json.dumps
+#   を毎回行う（500 件の地図カードで数十 ms）
+# - service が組み立てた DTO は検証済み（または build_trusted で信頼済み）なので、
+#   pydantic-core の dump_json で直接 bytes にして Response で返す
+#   （FastAPI は Response をそのまま返し、response_model の処理を飛ばす）
+# - response_model は decorator に残す（OpenAPI のスキーマ用）
+# - 出力は FastAPI の既定（by_alias=True・区切りの空白なし・UTF-8）と同じ bytes
+# - build_trusted で組み立てた DTO は HttpUrl 項目が str のままなので、
+#   型の不一致の警告は出さない。STRICT_DTO_VALIDATION=1 のときは逆にエラーにする
+# ============================================================
+
+
+@lru_cache(maxsize=64)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def trusted_json_response(
+    content: Any,
+    response_type: Optional[Any] = None,
+    *,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    検証済みの DTO（またはその list）を JSON の Response にする。
+
+    - response_type: list[DTO] など。省略時は type(content)（BaseModel 単体向け）
+    - 中身の再検証はしない。dict など DTO 以外を渡さないこと
+    """
+    body = _adapter(response_type or type(content)).dump_json(
+        content,
+        by_alias=True,
+        warnings="error" if strict_dto_validation() else False,
+    )
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=dict(headers) if headers else None,
+        media_type="application/json",
+    )
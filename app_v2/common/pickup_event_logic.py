@@ -6,11 +6,9 @@ from typing import Tuple
 
 # 既存の reservation_expanded_service にある実装をそのままラップする
 from app_v2.customer_booking.services.reservation_expanded_service import (
-    JST as _JST,
     _parse_db_datetime as _parse_db_datetime_impl,
-    _calc_event_for_export as _calc_event_for_export_impl,
-    _calc_event_for_booking as _calc_event_for_booking_impl,
 )
+from app_v2.domain.pickup_slot import JST as _JST, UTC, PickupSlot
 
 # 外からは pickup_event_logic.JST として使えるように re-export
 JST = _JST
@@ -29,18 +27,18 @@ def calc_event_for_export(now: datetime, pickup_slot_code: str) -> Tuple[datetim
     """
     「今の時刻 now から見て、どのイベント(週)を表示対象にするか」を決める。
 
-    実装は reservation_expanded_service の _calc_event_for_export に委譲。
+    週の判定は reservation_expanded_service と同じく UTC 基準。
     """
-    return _calc_event_for_export_impl(now, pickup_slot_code)
+    return PickupSlot.from_code(pickup_slot_code).event_for_export(now, UTC)
 
 
 def calc_event_for_booking(created_at: datetime, pickup_slot_code: str) -> Tuple[datetime, datetime]:
     """
     「予約 created_at がどのイベント(週)に属する扱いにするか」を決める。
 
-    実装は reservation_expanded_service の _calc_event_for_booking に委譲。
+    週の判定は reservation_expanded_service と同じく UTC 基準。
     """
-    return _calc_event_for_booking_impl(created_at, pickup_slot_code)
+    return PickupSlot.from_code(pickup_slot_code).event_for_booking(created_at, UTC)
 
 
 def is_same_event_for_display(
@@ -56,6 +54,7 @@ def is_same_event_for_display(
 
     を判定するユーティリティ。
     """
-    export_start, _ = calc_event_for_export(now, pickup_slot_code)
-    booking_start, _ = calc_event_for_booking(created_at, pickup_slot_code)
+    slot = PickupSlot.from_code(pickup_slot_code)
+    export_start, _ = slot.event_for_export(now, UTC)
+    booking_start, _ = slot.event_for_booking(created_at, UTC)
     return export_start == booking_start
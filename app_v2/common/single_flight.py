@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+# ============================================================
+# 同時に来た同じ計算をまとめる（single flight）
+#
+# - 同じ key の計算が実行中なら、後から来た呼び出しは新たに計算せず、その結果を待って受け取る
+#   （キャンペーン時に同じ一覧・詳細が一斉に来ても、SQLite への問い合わせと
+#     DTO の組み立ては 1 回で済む）
+# - まとめるのは「実行中の間」だけ。終わった結果は保持しない（キャッシュではない）
+#   → 待っていた呼び出しが受け取るのは、自分より少し前に始まった計算の結果
+#     （古さは計算 1 回分の時間まで）
+# - 例外も同じものを全員に投げる
+# - 結果のオブジェクトは待っていた全員で共有される。呼び出し側で書き換えないこと
+# - sync endpoint（threadpool のスレッド）から呼ぶ前提の threading 実装
+#
+# 使い方（service）:
+#   _list_flight: SingleFlight[PublicFarmListResponse] = SingleFlight("public_farms.list")
+#   return _list_flight.do((content_key, page, lat, lng), lambda: self._compute(page, lat, lng))
+#   （content_key: 結果を決めるデータの version など。ETag を付ける API では
+#     app_v2.common.http_cache の PublicCacheCheck.content_key を渡す）
+# ============================================================
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self._stats: Dict[str, int] = {"leaders": 0, "shared": 0}
+        _register(self)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["shared"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # 先に key を外してから起こす（起きた後に来た呼び出しは新しく計算する）
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+# ============================================================
+# /metrics 用（生成された SingleFlight を名前付きで覚えておく）
+# ============================================================
+
+_registry_lock = threading.Lock()
+_registry: List[SingleFlight[Any]] = []
+
+
+def _register(flight: SingleFlight[Any]) -> None:
+    with _registry_lock:
+        _registry.append(flight)
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    with _registry_lock:
+        flights = list(_registry)
+    return {flight.name: flight.stats() for flight in flights}
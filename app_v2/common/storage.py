@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import posixpath
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path, PurePath
+from typing import Any, Dict, Optional
+
+from app_v2.config.settings import get_settings
+from app_v2.db.core import connect
+
+# ============================================================
+# 画像ストレージ（差し替え可能）
+#
+# 必要な環境変数（すべて任意。app_v2.config.settings で読む）：
+# STORAGE_BACKEND         "cloudinary"（既定） / "local"
+# LOCAL_STORAGE_DIR       local 保存先（既定: <repo>/media_store）
+# LOCAL_STORAGE_BASE_URL  local 保存時の公開 URL（既定: http://localhost:8000/media）
+# STORAGE_DEDUPE          "0" で同一内容の再アップロード検出を無効化
+#
+# dedupe の索引は DB の storage_dedupe テーブル（インスタンス・デプロイをまたいで共有）
+#
+# put / find / delete の戻り値は common/client.upload_bytes と同じ形
+#   {"url", "public_id", "bytes"}
+# ============================================================
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+DEFAULT_LOCAL_STORAGE_DIR = BASE_DIR / "media_store"
+DEFAULT_LOCAL_STORAGE_BASE_URL = "http://localhost:8000/media"
+
+# main.py が StaticFiles をマウントするパス
+LOCAL_MEDIA_MOUNT_PATH = "/media"
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class StorageBackend(ABC):
+    """
+    ストレージ実装の共通インターフェース。
+
+    - put: 保存して {"url", "public_id", "bytes"} を返す
+    - find: 同じ内容が既に保存済みならその結果を返す（なければ None。任意実装）
+    - delete: public_id の実ファイルを削除（存在しなくてもエラーにしない）
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+        ...
+
+    def find(self, content: bytes, *, folder: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    @abstractmethod
+    def delete(self, public_id: str) -> bool:
+        ...
+
+
+# ============================================================
+# Cloudinary
+# ============================================================
+
+class CloudinaryStorage(StorageBackend):
+    name = "cloudinary"
+
+    def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+        # cloudinary SDK は実際に使うときだけ読み込む
+        from app_v2.common import client
+
+        return client.upload_bytes(content, filename=filename, folder=folder)
+
+    def delete(self, public_id: str) -> bool:
+        from app_v2.common import client
+
+        return client.delete_public_id(public_id)
+
+
+# ============================================================
+# Local（内容アドレス方式）
+# ============================================================
+
+class LocalContentStore(StorageBackend):
+    """
+    SHA-256 をキーにしたファイルシステム保存（開発・テスト用）。
+
+    - 保存先: <root>/<folder>/<sha[:2]>/<sha><ext>（root = LOCAL_STORAGE_DIR/objects）
+    - 同じ folder に同じ内容を置いても実体は 1 つ
+    - public_id は root からの相対パス（URL もこれから組み立てる）
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path, base_url: str) -> None:
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _public_id(self, sha: str, *, filename: str, folder: str) -> str:
+        ext = PurePath(filename or "").suffix.lower()
+        return posixpath.join(folder.strip("/"), sha[:2], f"{sha}{ext}")
+
+    def _result(self, public_id: str, size: int) -> Dict[str, Any]:
+        return {
+            "url": f"{self.base_url}/{public_id}",
+            "public_id": public_id,
+            "bytes": size,
+        }
+
+    def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+        public_id = self._public_id(content_hash(content), filename=filename, folder=folder)
+        path = self.root / public_id
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 書きかけのファイルを公開しないよう、一時ファイル → rename
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp, path)
+            except Exception:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+
+        return self._result(public_id, len(content))
+
+    def delete(self, public_id: str) -> bool:
+        path = self.root / public_id
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        return True
+
+
+# ============================================================
+# Dedupe（どのバックエンドの前にも置ける）
+# ============================================================
+
+class DedupeIndex:
+    """
+    「(folder, 内容ハッシュ) → 保存結果」の索引（DB の storage_dedupe テーブル）。
+
+    - 索引は DB に置く（ローカルディスクはインスタンスごと・デプロイで消えるため）
+    - db_path 省略時は呼び出しごとに resolve_db_path()
+    - テーブルが無い DB（マイグレーション前）では索引なし扱い
+      （find は常に None、put / forget は何もしない）
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path = db_path
+
+    def get(self, folder: str, sha: str) -> Optional[Dict[str, Any]]:
+        conn = connect(self.db_path)
+        try:
+            row = conn.execute(
+                """
+                SELECT url, public_id, bytes
+                  FROM storage_dedupe
+                 WHERE folder = ?
+                   AND sha256 = ?
+                """,
+                (folder, sha),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # no such table: storage_dedupe
+            return None
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        return {"url": row[0], "public_id": row[1], "bytes": int(row[2] or 0)}
+
+    def put(self, folder: str, sha: str, record: Dict[str, Any]) -> None:
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO storage_dedupe (
+                        folder, sha256, url, public_id, bytes, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (folder, sha256) DO UPDATE SET
+                        url = excluded.url,
+                        public_id = excluded.public_id,
+                        bytes = excluded.bytes,
+                        created_at = excluded.created_at
+                    """,
+                    (
+                        folder,
+                        sha,
+                        record.get("url"),
+                        record.get("public_id"),
+                        int(record.get("bytes") or 0),
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+        except sqlite3.OperationalError:
+            return
+        finally:
+            conn.close()
+
+    def forget(self, public_id: str) -> None:
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "DELETE FROM storage_dedupe WHERE public_id = ?",
+                    (public_id,),
+                )
+        except sqlite3.OperationalError:
+            return
+        finally:
+            conn.close()
+
+
+class DedupingStorage(StorageBackend):
+    """
+    同じ folder に同じ内容を再アップロードした場合、
+    既存の URL を返して inner への保存（ネットワーク通信）を省く。
+    """
+
+    def __init__(self, inner: StorageBackend, index: DedupeIndex) -> None:
+        self.inner = inner
+        self.index = index
+        self.name = inner.name
+
+    def find(self, content: bytes, *, folder: str) -> Optional[Dict[str, Any]]:
+        return self.index.get(folder, content_hash(content))
+
+    def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+        sha = content_hash(content)
+        existing = self.index.get(folder, sha)
+        if existing:
+            return existing
+
+        result = self.inner.put(content, filename=filename, folder=folder)
+        self.index.put(folder, sha, result)
+        return result
+
+    def delete(self, public_id: str) -> bool:
+        ok = self.inner.delete(public_id)
+        if ok:
+            self.index.forget(public_id)
+        return ok
+
+
+# ============================================================
+# 設定から組み立て（プロセスで 1 つ）
+# ============================================================
+
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+
+def get_local_storage_dir() -> Path:
+    return Path(get_settings().local_storage_dir or DEFAULT_LOCAL_STORAGE_DIR)
+
+
+def get_local_media_dir() -> Path:
+    # 公開するのはこの配下だけ
+    return get_local_storage_dir() / "objects"
+
+
+def is_local_backend() -> bool:
+    return get_settings().storage_backend == "local"
+
+
+def _build_storage() -> StorageBackend:
+    if is_local_backend():
+        inner: StorageBackend = LocalContentStore(
+            root=get_local_media_dir(),
+            base_url=get_settings().local_storage_base_url or DEFAULT_LOCAL_STORAGE_BASE_URL,
+        )
+    else:
+        inner = CloudinaryStorage()
+
+    if not get_settings().storage_dedupe:
+        return inner
+
+    return DedupingStorage(inner, DedupeIndex())
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is not None:
+        return _storage
+
+    with _storage_lock:
+        if _storage is None:
+            _storage = _build_storage()
+        return _storage
+
+
+def set_storage(storage: Optional[StorageBackend]) -> None:
+    """
+    テスト・スクリプト用の差し替え（None で環境変数から作り直し）。
+    """
+    global _storage
+    with _storage_lock:
+        _storage = storage
+
+
+# ============================================================
+# 関数 API（common/client と同じ呼び方）
+# ============================================================
+
+def upload_bytes(content: bytes, filename: str, folder: str) -> Dict[str, Any]:
+    return get_storage().put(content, filename=filename, folder=folder)
+
+
+def find_existing(content: bytes, folder: str) -> Optional[Dict[str, Any]]:
+    return get_storage().find(content, folder=folder)
+
+
+def delete_public_id(public_id: str) -> bool:
+    return get_storage().delete(public_id)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from app_v2.config.settings import get_settings
+
+# ============================================================
+# 信頼済みデータからの DTO 組み立て
+#
+# - service が自前の DB 行・計算結果から作る DTO は、型も値もこちらで決めている。
+#   一覧では 1 件ごとの Pydantic 検証がそのまま CPU 時間になるので、検証を飛ばして組み立てる
+# - 呼び出し側は「DTO の型どおりの値」を DTO のフィールド名で渡すこと（変換は行われない）
+#     int は int、datetime は datetime、ネストした DTO は DTO インスタンス
+#   例外: HttpUrl の項目は str のまま入る（URL は保存時に検証済み。DTO 側は
+#   SerializedHttpUrl にして、str でも速い経路で出力されるようにする）
+# - STRICT_DTO_VALIDATION=1 のときは通常のコンストラクタ（全項目検証）になる。
+#   テストではこれを有効にして、渡している値の型崩れを検出する
+# - 外部入力（リクエスト body・Stripe など）から作る DTO には使わない
+#
+# model_construct は使わない：フィールドごとに alias・default を Python で見るため、
+# HttpUrl の無い DTO では Rust 側の検証より遅い（AdminReservationListItemDTO で約 2 倍）。
+# ここではフィールドの並びと default を事前に調べておき、__dict__ を直接入れる
+# （JSON のキー順は __dict__ の順になるので、渡された順ではなく DTO の定義順に並べ直す）
+# ============================================================
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_constructors: Dict[type, Callable[..., Any]] = {}
+_constructors_lock = threading.Lock()
+
+
+def build_trusted(model: Type[ModelT], **fields: Any) -> ModelT:
+    if strict_dto_validation():
+        return model(**fields)
+    constructor = _constructors.get(model)
+    if constructor is None:
+        with _constructors_lock:
+            constructor = _constructors[model] = _make_constructor(model)
+    return constructor(fields)
+
+
+def strict_dto_validation() -> bool:
+    return get_settings().strict_dto_validation
+
+
+def _make_constructor(model: Type[ModelT]) -> Callable[[Dict[str, Any]], ModelT]:
+    # private 属性・post_init・extra を持つ DTO は pydantic 標準の model_construct に任せる
+    if (
+        model.__pydantic_post_init__ is not None
+        or model.__private_attributes__
+        or model.model_config.get("extra") == "allow"
+    ):
+        return lambda fields: model.model_construct(**fields)
+
+    layout = [
+        (
+            name,
+            info
+            if info.default is not PydanticUndefined or info.default_factory is not None
+            else None,
+        )
+        for name, info in model.model_fields.items()
+    ]
+    names = tuple(name for name, _ in layout)
+    new = model.__new__
+    set_attr = object.__setattr__
+
+    def construct(fields: Dict[str, Any]) -> ModelT:
+        fields_set = set(fields)
+        if tuple(fields) == names:
+            # 全フィールドを定義順に渡している（一覧の組み立てはこの形にしておく）
+            values = fields
+        else:
+            values = {}
+            for name, default in layout:
+                if name in fields:
+                    values[name] = fields[name]
+                elif default is not None:
+                    # 可変の default（[] など）は get_default がコピーを返す
+                    values[name] = default.get_default(
+                        call_default_factory=True, validated_data=values
+                    )
+        obj = new(model)
+        set_attr(obj, "__dict__", values)
+        set_attr(obj, "__pydantic_fields_set__", fields_set)
+        set_attr(obj, "__pydantic_extra__", None)
+        set_attr(obj, "__pydantic_private__", None)
+        return obj
+
+    return construct
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os
+from typing import BinaryIO, Iterable, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+
+# ============================================================
+# アップロード受信時の上限チェック
+#
+# - リクエスト全体: ASGI の receive を包み、届いたバイト数で判定する
+#   （Content-Length が上限超えなら本文を読む前に 413）。上限はパスごとに変えられる
+# - 1 ファイル: multipart の本文を届いた順に区切り（boundary）で分け、
+#   パートごとの本文のバイト数が上限を超えた時点で 413（残りは受信しない）
+# - multipart 展開後（Starlette が一時ファイルへ spool 済み）にもサイズを確認し、
+#   中身はメモリに読み込まずに渡す
+# ============================================================
+
+UPLOAD_TOO_LARGE_DETAIL = "upload too large"
+
+# パートのヘッダ（Content-Disposition など）として受け付ける長さ
+MULTIPART_PART_HEADER_MAX_BYTES = 16 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+def open_bounded_upload(file: UploadFile, *, max_bytes: int) -> BinaryIO:
+    """
+    UploadFile の中身をファイルオブジェクトのまま返す。
+    max_bytes を超える場合は UploadTooLargeError。
+    """
+    f = file.file
+    size = file.size
+    if size is None:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+
+    if size > max_bytes:
+        raise UploadTooLargeError(UPLOAD_TOO_LARGE_DETAIL)
+
+    f.seek(0)
+    return f
+
+
+def multipart_boundary(content_type: bytes) -> Optional[bytes]:
+    """
+    Content-Type（multipart/form-data; boundary=...）の boundary。multipart でなければ None。
+    """
+    media_type, _, params = content_type.partition(b";")
+    if media_type.strip().lower() != b"multipart/form-data":
+        return None
+
+    for param in params.split(b";"):
+        key, _, value = param.strip().partition(b"=")
+        if key.strip().lower() == b"boundary":
+            value = value.strip().strip(b'"')
+            return value or None
+    return None
+
+
+class MultipartPartMeter:
+    """
+    multipart の本文を届いた順に受け取り、パートごとの本文のバイト数を数える。
+
+    - feed は上限を超えたパートがあれば False（以降の呼び出しも False）
+    - 区切りがチャンクをまたいでも数え漏れないよう、区切り長 - 1 バイトだけ持ち越す
+    - パートのヘッダが MULTIPART_PART_HEADER_MAX_BYTES を超える場合も False
+    """
+
+    def __init__(self, boundary: bytes, *, max_part_bytes: int) -> None:
+        self._delimiter = b"\r\n--" + boundary
+        self._max_part_bytes = max_part_bytes
+        # 先頭の区切りの前には CRLF が無いので補う
+        self._buf = b"\r\n"
+        self._state = "preamble"  # preamble / headers / body
+        self._part_bytes = 0
+        self.exceeded = False
+
+    def feed(self, data: bytes) -> bool:
+        if self.exceeded:
+            return False
+
+        buf = self._buf + data
+        delimiter = self._delimiter
+        carry = len(delimiter) - 1
+
+        while True:
+            if self._state == "headers":
+                end = buf.find(b"\r\n\r\n")
+                if end == -1:
+                    if len(buf) > MULTIPART_PART_HEADER_MAX_BYTES:
+                        self.exceeded = True
+                    break
+                buf = buf[end + 4:]
+                self._state = "body"
+                self._part_bytes = 0
+                continue
+
+            idx = buf.find(delimiter)
+            if idx == -1:
+                consumed = max(0, len(buf) - carry)
+                if self._state == "body":
+                    self._part_bytes += consumed
+                    if self._part_bytes > self._max_part_bytes:
+                        self.exceeded = True
+                buf = buf[consumed:]
+                break
+
+            if self._state == "body":
+                self._part_bytes += idx
+                if self._part_bytes > self._max_part_bytes:
+                    self.exceeded = True
+                    break
+            buf = buf[idx + len(delimiter):]
+            self._state = "headers"
+
+        self._buf = buf
+        return not self.exceeded
+
+
+class UploadBodyLimitMiddleware:
+    """
+    path_prefixes 配下への POST / PUT 本文を max_body_bytes で打ち切る。
+
+    - path_max_body_bytes: パス（完全一致）ごとの全体の上限（1 ファイルだけ受ける route など）
+    - max_part_bytes: multipart の 1 パートの本文の上限（None なら見ない）
+    - 上限を超えた時点で 413 を返し、残りは受信しない
+    - 対象外のリクエストには何もしない
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        path_prefixes: Iterable[str],
+        max_body_bytes: int,
+        path_max_body_bytes: Optional[Mapping[str, int]] = None,
+        max_part_bytes: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.path_prefixes: Tuple[str, ...] = tuple(path_prefixes)
+        self.max_body_bytes = max_body_bytes
+        self.path_max_body_bytes = dict(path_max_body_bytes or {})
+        self.max_part_bytes = max_part_bytes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_bytes = self.path_max_body_bytes.get(scope["path"], self.max_body_bytes)
+        meter: Optional[MultipartPartMeter] = None
+
+        for key, value in scope["headers"]:
+            if key == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    continue
+                if declared > max_body_bytes:
+                    await _send_too_large(send)
+                    return
+            elif key == b"content-type" and self.max_part_bytes is not None:
+                boundary = multipart_boundary(value)
+                if boundary is not None:
+                    meter = MultipartPartMeter(boundary, max_part_bytes=self.max_part_bytes)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received += len(body)
+                if received > max_body_bytes or (meter is not None and not meter.feed(body)):
+                    # FastAPI は本文解析中の HTTPException をそのまま返す
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=UPLOAD_TOO_LARGE_DETAIL,
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def _send_too_large(send) -> None:
+    body = b'{"detail":"' + UPLOAD_TOO_LARGE_DETAIL.encode() + b'"}'
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status.HTTP_413_CONTENT_TOO_LARGE,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,6 @@
+# 地図モーダルのクラスタ表示の設定（数値の源泉）
+# 格子の大きさ・カードに切り替える条件など、環境で変える値は app_v2.config.settings
+# （MAP_CLUSTER_CELL_PX / MAP_CLUSTER_CARD_MIN_ZOOM / MAP_CLUSTER_MAX_CARDS / MAP_CLUSTER_MAX_GRID_CELLS）
+
+# 受け付けるズームの上限（Google Maps / Leaflet の最大ズーム程度）
+MAP_MAX_ZOOM = 22
@@ -0,0 +1,185 @@
+# 環境変数から読む設定（秘密鍵・外部サービス・URL）
+#
+# - 初回の get_settings() で 1 度だけ読み、以後は同じ Settings を返す
+# - import 時には何も読まない（.env の読み込みは main.py の先頭で行う）
+# - 値が無くても起動は止めない。必要な機能を最初に使ったときにエラーにする
+#   （例: STRIPE_SECRET_KEY が無ければ Checkout 作成時に RuntimeError）
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Settings:
+    # 実行環境
+    is_render: bool
+    env: str
+
+    # Session / CORS / リンク生成
+    session_secret: str
+    cors_extra_origins: Tuple[str, ...]
+    frontend_base_url: Optional[str]
+    api_base_url: Optional[str]
+    cancel_token_secret: Optional[str]
+
+    # Stripe
+    stripe_secret_key: str
+    stripe_webhook_secret: str
+
+    # Cloudinary
+    cloudinary_cloud_name: Optional[str]
+    cloudinary_api_key: Optional[str]
+    cloudinary_api_secret: Optional[str]
+    cloudinary_upload_folder: str
+
+    # Geocoding（"google" / "stub"）
+    geocoding_api_key: Optional[str]
+    geocoder_backend: str
+
+    # 画像ストレージ（app_v2.common.storage）
+    # "cloudinary"（既定） / "local"
+    storage_backend: str
+    # local 保存先（None なら <repo>/media_store）と、local 保存時の公開 URL
+    local_storage_dir: Optional[str]
+    local_storage_base_url: Optional[str]
+    # False で同一内容の再アップロード検出を無効化（STORAGE_DEDUPE=0）
+    storage_dedupe: bool
+
+    # /metrics の Bearer トークン（未設定なら /metrics は 404）
+    metrics_token: Optional[str]
+
+    # リクエスト単位のプロファイリング（オンデマンド）
+    # 管理者用トークン。リクエストに X-Profile-Request: <token> を付けるとそのリクエストを計測する。
+    # /api/admin/profiles も Authorization: Bearer <token> が必要（未設定なら 404）
+    profile_token: Optional[str]
+    # ランダムに計測する割合（0.0〜1.0。0 なら header 指定のときだけ）
+    profile_sample_rate: float
+    # スタックを取る間隔（ミリ秒）
+    profile_interval_ms: float
+    # 保存先と保持件数（古いものから消す）
+    profile_dir: str
+    profile_max_entries: int
+
+    # ログ出力（構造化ログ）
+    # "json"（1 行 1 JSON。本番）/ "text"（ローカルで読みやすい形式）
+    log_format: str
+    log_level: str
+    # 書き出し待ちキューの上限。溢れた分は捨てる（リクエスト側を待たせない）
+    log_queue_max: int
+    # 量の多いイベントの間引き率。"<event or logger 名>=<0.0〜1.0>" をカンマ区切り
+    #   例: LOG_SAMPLE_RATES="uvicorn.access=0.1,sql.n_plus_one=0.2"
+    # 指定の無いものは全件出す。WARNING 以上は間引かない
+    log_sample_rates: str
+    # 受け取る / 返す相関 ID のヘッダ
+    request_id_header: str
+
+    # SQL トレース（slow query / N+1 検出）。SQL_TRACE=1 のときだけ有効
+    sql_trace_enabled: bool
+    # これを超えた文は EXPLAIN QUERY PLAN 付きでログに出す（ミリ秒）
+    sql_slow_ms: float
+    # 1 リクエストあたりの文の数の上限（超えたら内訳をログに出す）
+    sql_query_budget: int
+    # 同じ fingerprint の文が 1 リクエストでこの回数以上 → N+1 の疑い
+    sql_repeat_threshold: int
+
+    # 公開 API の HTTP キャッシュ（ETag / Cache-Control）
+    # ブラウザ・CDN が再検証なしで使ってよい秒数の上限。
+    # 実際の max-age は「次の JST 正時まで」と小さい方（受け渡し枠・締切は正時で切り替わる）
+    public_cache_max_age_sec: int
+    # ETag に混ぜる値。デプロイごとに変えると、DTO の形が変わったときに古い ETag が当たらない
+    # （Render はデプロイのコミットを RENDER_GIT_COMMIT に入れる）
+    etag_salt: str
+
+    # 公開一覧の「距離順の並び」キャッシュ
+    # ユーザー位置を丸める格子の一辺（km）。同じ格子のユーザーは同じ並び順を共有する。
+    # 0 以下でキャッシュしない（毎回全件を距離順に並べる）
+    location_cache_grid_km: float
+    # 保持する格子の数（LRU）。1 格子 = 公開農家数ぶんの farm_id と距離
+    location_cache_max_cells: int
+
+    # 地図モーダルのクラスタ表示
+    # クラスタの格子の一辺（画面上のピクセル。ズームに関係なく画面上で同じ大きさ）
+    map_cluster_cell_px: int
+    # このズーム以上で、表示範囲内の農家が map_cluster_max_cards 件以下ならカードを返す
+    map_cluster_card_min_zoom: int
+    map_cluster_max_cards: int
+    # 1 回に返すクラスタの格子数の上限。表示範囲がズームに対して広すぎる
+    # （画面より大きい範囲を高ズームで送ってきた）ときは、収まるまでズームを下げて集計する
+    # （2560x1440 の画面で 64px 格子なら約 900）
+    map_cluster_max_grid_cells: int
+
+    # テスト・デバッグ用
+    # OTP を固定値（123456）にする（OTP_FIXED=1）
+    otp_fixed: bool
+    # service が組み立てる DTO もすべて Pydantic で検証する（STRICT_DTO_VALIDATION=1）。
+    # 既定では自前の DB・計算から作る DTO は検証を飛ばす（app_v2.common.trusted_dto）
+    strict_dto_validation: bool
+
+    @property
+    def profiling_enabled(self) -> bool:
+        # どちらも無効ならミドルウェア自体を登録しない（オーバーヘッド 0）
+        return bool(self.profile_token) or self.profile_sample_rate > 0
+
+
+def _env(name: str) -> Optional[str]:
+    value = os.getenv(name)
+    return value if value else None
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings(
+        is_render=os.getenv("RENDER", "") == "true",
+        env=os.getenv("ENV", "development"),
+        session_secret=os.getenv("SESSION_SECRET", "dev-secret-key"),
+        cors_extra_origins=tuple(
+            url
+            for url in (
+                _env("FRONTEND_URL"),
+                _env("VERCEL_FRONTEND_URL"),
+                _env("VERCEL_FRONTEND_URL_PREVIEW"),
+            )
+            if url
+        ),
+        frontend_base_url=_env("FRONTEND_BASE_URL"),
+        api_base_url=_env("API_BASE_URL"),
+        cancel_token_secret=_env("CANCEL_TOKEN_SECRET"),
+        stripe_secret_key=os.getenv("STRIPE_SECRET_KEY", ""),
+        stripe_webhook_secret=os.getenv("STRIPE_WEBHOOK_SECRET", ""),
+        cloudinary_cloud_name=_env("CLOUDINARY_CLOUD_NAME"),
+        cloudinary_api_key=_env("CLOUDINARY_API_KEY"),
+        cloudinary_api_secret=_env("CLOUDINARY_API_SECRET"),
+        cloudinary_upload_folder=os.getenv("CLOUDINARY_UPLOAD_FOLDER", "rice-app/farms"),
+        geocoding_api_key=_env("GOOGLE_GEOCODING_API_KEY") or _env("GOOGLE_MAPS_API_KEY"),
+        geocoder_backend=os.getenv("GEOCODER_BACKEND", "google").strip().lower(),
+        storage_backend=os.getenv("STORAGE_BACKEND", "cloudinary").strip().lower(),
+        local_storage_dir=_env("LOCAL_STORAGE_DIR"),
+        local_storage_base_url=_env("LOCAL_STORAGE_BASE_URL"),
+        storage_dedupe=os.getenv("STORAGE_DEDUPE", "1") != "0",
+        metrics_token=_env("METRICS_TOKEN"),
+        profile_token=_env("PROFILE_TOKEN"),
+        profile_sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        profile_interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "2")),
+        profile_dir=os.getenv("PROFILE_DIR", "profiles"),
+        profile_max_entries=int(os.getenv("PROFILE_MAX_ENTRIES", "50")),
+        log_format=os.getenv("LOG_FORMAT", "json").strip().lower(),
+        log_level=os.getenv("LOG_LEVEL", "INFO").strip().upper(),
+        log_queue_max=int(os.getenv("LOG_QUEUE_MAX", "10000")),
+        log_sample_rates=os.getenv("LOG_SAMPLE_RATES", ""),
+        request_id_header=os.getenv("REQUEST_ID_HEADER", "X-Request-ID"),
+        sql_trace_enabled=os.getenv("SQL_TRACE", "0") == "1",
+        sql_slow_ms=float(os.getenv("SQL_SLOW_MS", "100")),
+        sql_query_budget=int(os.getenv("SQL_QUERY_BUDGET", "25")),
+        sql_repeat_threshold=int(os.getenv("SQL_REPEAT_THRESHOLD", "5")),
+        public_cache_max_age_sec=int(os.getenv("PUBLIC_CACHE_MAX_AGE_SEC", "60")),
+        etag_salt=os.getenv("ETAG_SALT") or os.getenv("RENDER_GIT_COMMIT", ""),
+        location_cache_grid_km=float(os.getenv("LOCATION_CACHE_GRID_KM", "1.0")),
+        location_cache_max_cells=int(os.getenv("LOCATION_CACHE_MAX_CELLS", "256")),
+        map_cluster_cell_px=int(os.getenv("MAP_CLUSTER_CELL_PX", "64")),
+        map_cluster_card_min_zoom=int(os.getenv("MAP_CLUSTER_CARD_MIN_ZOOM", "14")),
+        map_cluster_max_cards=int(os.getenv("MAP_CLUSTER_MAX_CARDS", "100")),
+        map_cluster_max_grid_cells=int(os.getenv("MAP_CLUSTER_MAX_GRID_CELLS", "1500")),
+        otp_fixed=os.getenv("OTP_FIXED") == "1",
+        strict_dto_validation=os.getenv("STRICT_DTO_VALIDATION", "0") == "1",
+    )
@@ -0,0 +1,32 @@
+# 画像アップロードの上限ルール（数値の源泉）
+
+# PR 画像アップロードの同時実行数（プロセス全体で共有する worker 数）
+PR_IMAGE_UPLOAD_MAX_WORKERS = 4
+
+# アップロード前の画像加工（表示サイズ = 長辺の上限 px）
+PR_IMAGE_MAX_EDGE = 1600
+PR_IMAGE_THUMB_EDGE = 480
+FACE_IMAGE_MAX_EDGE = 512
+
+# 再エンコード形式（WebP・メタデータは付けない）
+IMAGE_OUTPUT_FORMAT = "WEBP"
+IMAGE_OUTPUT_QUALITY = 80
+
+# デコードを許可する最大ピクセル数（decompression bomb 対策）
+IMAGE_MAX_PIXELS = 60_000_000
+
+# 受信時の上限（ボディを読みながら判定し、超えた時点で打ち切る）
+# 1 ファイル = multipart の 1 パートの本文
+IMAGE_MAX_FILE_BYTES = 20_000_000
+PR_IMAGE_MAX_FILES_PER_REQUEST = 10
+# multipart の境界・パートのヘッダ分の余裕
+UPLOAD_MULTIPART_OVERHEAD_BYTES = 1_000_000
+# 1 リクエストの上限（PR 画像: 最大枚数分）
+UPLOAD_MAX_REQUEST_BYTES = (
+    IMAGE_MAX_FILE_BYTES * PR_IMAGE_MAX_FILES_PER_REQUEST
+    + UPLOAD_MULTIPART_OVERHEAD_BYTES
+)
+# 1 リクエストの上限（顔写真・カバー画像: 1 枚分）
+UPLOAD_SINGLE_FILE_MAX_REQUEST_BYTES = (
+    IMAGE_MAX_FILE_BYTES + UPLOAD_MULTIPART_OVERHEAD_BYTES
+)
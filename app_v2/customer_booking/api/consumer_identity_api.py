@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Request
-import sqlite3
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 router = APIRouter(
     prefix="/consumers",
@@ -39,7 +38,7 @@ def get_consumer_identity(request: Request):
         }
 
     db_path = resolve_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
 
     try:
         cur = conn.cursor()
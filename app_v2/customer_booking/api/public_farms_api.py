@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 
+from app_v2.common.http_cache import check_public_cache
+from app_v2.common.json_response import trusted_json_response
+from app_v2.config.map_clusters import MAP_MAX_ZOOM
+
 from app_v2.customer_booking.dtos import (
     PublicFarmListResponse,
     PublicFarmDetailDTO,
     PublicFarmCardDTO,
+    PublicFarmMapClustersResponse,
 )
 from app_v2.customer_booking.services.public_farms_service import (
     PublicFarmsService,
@@ -26,6 +32,10 @@ router = APIRouter(
     tags=["public_farms"],
 )
 
+# 公開 API の中身は farms / farm_pickup_slots と現在時刻だけで決まる
+# （ETag は table_versions の 'farms' から作る。app_v2.common.http_cache 参照）
+FARMS_VERSION_KEY = "farms"
+
 # ============================================================
 # 地図表示用（最優先定義：ルーティング衝突防止）
 # ============================================================
@@ -34,26 +44,72 @@ router = APIRouter(
     response_model=list[PublicFarmCardDTO],
 )
 def list_public_farms_for_map(
+    request: Request,
     min_lat: float = Query(...),
     max_lat: float = Query(...),
     min_lng: float = Query(...),
     max_lng: float = Query(...),
     limit: int = Query(200, ge=1, le=500),
-) -> list[PublicFarmCardDTO]:
+) -> Response:
     """
     地図モーダル用の公開農家一覧。
     バウンディングボックス内の農家を最大 limit 件返す。
+    （件数が多いので response_model の再検証を通さずに JSON 化する）
     """
+    cache = check_public_cache(request, FARMS_VERSION_KEY)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
     repo = PublicFarmsRepository()
     service = PublicFarmsService(repo=repo)
 
-    return service.get_public_farms_for_map(
+    farms = service.get_public_farms_for_map(
         min_lat=min_lat,
         max_lat=max_lat,
         min_lng=min_lng,
         max_lng=max_lng,
         limit=limit,
     )
+    return trusted_json_response(
+        farms, list[PublicFarmCardDTO], headers=cache.headers
+    )
+
+
+# ============================================================
+# 地図表示用（クラスタ：低ズームはまとめて返す）
+# ============================================================
+@router.get(
+    "/farms/map/clusters",
+    response_model=PublicFarmMapClustersResponse,
+)
+def list_public_farm_clusters_for_map(
+    request: Request,
+    min_lat: float = Query(...),
+    max_lat: float = Query(...),
+    min_lng: float = Query(...),
+    max_lng: float = Query(...),
+    zoom: int = Query(..., ge=0, le=MAP_MAX_ZOOM),
+) -> Response:
+    """
+    地図モーダル用。表示範囲の農家をズームに応じた格子でまとめて返す。
+    - mode=clusters: clusters（件数・重心・範囲・代表の農家）のみ
+    - mode=farms: 十分ズームしたとき。/farms/map と同じカード
+    """
+    cache = check_public_cache(request, FARMS_VERSION_KEY)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
+    repo = PublicFarmsRepository()
+    service = PublicFarmsService(repo=repo)
+
+    result = service.get_public_farm_clusters_for_map(
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+        zoom=zoom,
+    )
+    return trusted_json_response(result, headers=cache.headers)
 
 
 # ============================================================
@@ -64,23 +120,30 @@ def list_public_farms_for_map(
     response_model=PublicFarmListResponse,
 )
 def list_public_farms(
+    request: Request,
     page: int = Query(1, ge=1),
     lat: float | None = Query(None),
     lng: float | None = Query(None),
-) -> PublicFarmListResponse:
+) -> Response:
     """
     Public Page 用の農家一覧。
     - page: 1始まり
     - lat/lng: ユーザー位置（任意）
     """
+    cache = check_public_cache(request, FARMS_VERSION_KEY)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
     repo = PublicFarmsRepository()
     service = PublicFarmsService(repo=repo)
 
-    return service.get_public_farms(
+    result = service.get_public_farms(
         page=page,
         lat=lat,
         lng=lng,
+        content_key=cache.content_key,
     )
+    return trusted_json_response(result, headers=cache.headers)
 
 
 # ============================================================
@@ -98,25 +161,33 @@ class PublicFarmDetailResponse(BaseModel):
     response_model=PublicFarmDetailResponse,
 )
 def get_public_farm_detail(
+    request: Request,
     farm_id: int,
-) -> PublicFarmDetailResponse:
+) -> Response:
     """
     Public Detail Page 用の農家詳細。
+    （非公開・不存在の応答も farms の状態で決まるので、同じ ETag で扱う）
     """
+    cache = check_public_cache(request, FARMS_VERSION_KEY)
+    if cache.not_modified:
+        return cache.not_modified_response()
+
     repo = PublicFarmDetailRepository()
     service = PublicFarmDetailService(repo=repo)
 
-    dto = service.get_public_farm_detail(farm_id=farm_id)
+    dto = service.get_public_farm_detail(farm_id=farm_id, content_key=cache.content_key)
 
     if dto is None:
-        return PublicFarmDetailResponse(
+        body = PublicFarmDetailResponse(
             ok=False,
             farm=None,
             error_code="FARM_NOT_FOUND",
             message="指定された農家は存在しないか、現在は公開されていません。",
         )
+    else:
+        body = PublicFarmDetailResponse(
+            ok=True,
+            farm=dto,
+        )
 
-    return PublicFarmDetailResponse(
-        ok=True,
-        farm=dto,
-    )
+    return trusted_json_response(body, headers=cache.headers)
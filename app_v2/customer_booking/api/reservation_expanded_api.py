@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Request, HTTPException, status
+from fastapi.responses import Response
 
+from app_v2.common.json_response import trusted_json_response
 from app_v2.customer_booking.dtos import ExportReservationsResponseDTO
 from app_v2.customer_booking.services.reservation_expanded_service import (
     ReservationExpandedService,
@@ -24,7 +26,7 @@ _service = ReservationExpandedService()
 )
 def get_reservations_expanded(
     request: Request,
-) -> ExportReservationsResponseDTO:
+) -> Response:
     """
     Export ページ V2 用の ViewModel API（ME 前提）。
 
@@ -46,4 +48,5 @@ def get_reservations_expanded(
             detail="Not authenticated",
         )
 
-    return _service.build_export_view(farm_id=farm_id)
+    # 行は build_trusted で組み立て済み（response_model の再検証は通さない）
+    return trusted_json_response(_service.build_export_view(farm_id=farm_id))
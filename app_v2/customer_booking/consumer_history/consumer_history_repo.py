@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class ConsumerHistoryRepository:
@@ -21,7 +21,7 @@ class ConsumerHistoryRepository:
 
     def __init__(self) -> None:
         db_path = resolve_db_path()
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
 
     def get_last_confirmed_farm_id(
@@ -1,5 +1,9 @@
-from typing import List, Literal, Optional
-from pydantic import BaseModel, HttpUrl, conint
+from typing import Annotated, List, Literal, Optional
+from pydantic import BaseModel, HttpUrl, PlainSerializer, conint
+
+# 入力は HttpUrl として検証し、出力は str(value) で文字列にする（スキーマは HttpUrl のまま）。
+# build_trusted で str のまま入った値も、型の不一致の遅い経路を通らずに出力できる
+SerializedHttpUrl = Annotated[HttpUrl, PlainSerializer(str, return_type=str)]
 
 # ============================================================
 # Public Farm List / Detail DTO
@@ -21,12 +25,16 @@ class PublicFarmCardDTO(BaseModel):
     price_10kg: int
 
     # 画像・PR
-    face_image_url: HttpUrl
-    pr_images: List[HttpUrl]
+    face_image_url: SerializedHttpUrl
+    pr_images: List[SerializedHttpUrl]
+    # 一覧カード用の縮小画像（pr_images と同じ並び・同じ長さ）
+    pr_thumbnail_urls: List[SerializedHttpUrl] = []
     pr_title: str
 
-    # 受け渡しスロット
+    # 受け渡しスロット（次回受け渡しのスロット）
     pickup_slot_code: str
+    # farm の全スロット（週内の時刻順）
+    pickup_slot_codes: List[str] = []
 
     # 次回受け渡し日時
     next_pickup_display: str
@@ -48,6 +56,51 @@ class PublicFarmListResponse(BaseModel):
     farms: List[PublicFarmCardDTO]
 
 
+class PublicFarmMapClusterDTO(BaseModel):
+    """
+    地図モーダル：表示範囲内の農家をズームに応じた格子でまとめたクラスタ
+    （件数が 1 のクラスタは農家 1 件のマーカー）
+    """
+    cluster_id: str
+
+    # 重心
+    lat: float
+    lng: float
+    count: int
+
+    # クラスタを含む範囲（クリックでここまでズームする用）
+    min_lat: float
+    max_lat: float
+    min_lng: float
+    max_lng: float
+
+    # 代表の農家（重心に最も近い農家）
+    representative_farm_id: int
+    representative_face_image_url: SerializedHttpUrl
+
+
+class PublicFarmMapClustersResponse(BaseModel):
+    ok: bool = True
+    zoom: int
+    # clusters: 低ズーム（clusters のみ） / farms: 高ズーム（カードのみ）
+    mode: Literal["clusters", "farms"]
+    # 表示範囲内の農家数（farms モードで limit を超えた分も含む。
+    # clusters モードでは clusters の count の合計と同じ）
+    total_count: int
+    clusters: List[PublicFarmMapClusterDTO] = []
+    farms: List[PublicFarmCardDTO] = []
+
+
+class PickupSlotOptionDTO(BaseModel):
+    """
+    農家詳細：スロットごとの次回受け渡し（複数スロット farm 用）
+    """
+    pickup_slot_code: str
+    next_pickup_display: str
+    next_pickup_start: str
+    next_pickup_deadline: str
+
+
 class PublicFarmDetailDTO(BaseModel):
     farm_id: int
 
@@ -59,6 +112,7 @@ class PublicFarmDetailDTO(BaseModel):
     face_image_url: HttpUrl
     cover_image_url: HttpUrl
     pr_images: List[HttpUrl]
+    pr_thumbnail_urls: List[HttpUrl] = []
 
     rice_variety_label: str
     harvest_year: int
@@ -74,6 +128,8 @@ class PublicFarmDetailDTO(BaseModel):
     next_pickup_display: str
     next_pickup_start: str
     next_pickup_deadline: str
+    # 全スロットの次回受け渡し（近い順。先頭は上の next_pickup_* と同じ）
+    pickup_slots: List[PickupSlotOptionDTO] = []
 
     pickup_place_name: str
     pickup_notes: str
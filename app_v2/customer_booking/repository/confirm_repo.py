@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from typing import List, TypedDict
+from typing import List, Tuple, TypedDict
 
 from fastapi import HTTPException
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    fetch_farm_pickup_slot_codes,
+)
 from app_v2.customer_booking.dtos import (
     ReservationItemInput,
     ReservationResultDTO,
@@ -24,7 +27,7 @@ def _get_conn() -> sqlite3.Connection:
     - DB パス解決は resolve_db_path() に一本化
     - repo 以外からは呼ばれない
     """
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -41,9 +44,20 @@ class _ItemCalcResult(TypedDict):
 
 
 # ============================================================
-# Public API（confirm_service から呼ばれる唯一の関数）
+# Public API（confirm_service から呼ばれる関数）
 # ============================================================
 
+def fetch_pickup_slot_codes(*, farm_id: int) -> Tuple[str, ...]:
+    """
+    farm の受け渡しスロットコード（farm が無ければ空タプル）。
+    """
+    conn = _get_conn()
+    try:
+        return fetch_farm_pickup_slot_codes(conn, farm_id)
+    finally:
+        conn.close()
+
+
 def create_pending_reservation(
     *,
     farm_id: int,
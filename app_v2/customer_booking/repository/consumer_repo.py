@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import sqlite3
 from typing import Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class ConsumerRepository:
@@ -36,7 +35,7 @@ class ConsumerRepository:
         """
         consumers テーブルから email に対応する consumer_id を取得する
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -65,7 +64,7 @@ class ConsumerRepository:
         """
         email を人格IDとして新規 consumer を作成する
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -84,7 +83,7 @@ class ConsumerRepository:
         """
         email を持たない consumer（例: LINE 由来）を作成する
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
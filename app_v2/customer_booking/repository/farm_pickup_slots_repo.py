@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+from app_v2.domain.pickup_schedule import split_slot_codes
+
+# ============================================================
+# farm_pickup_slots（farm ごとの受け渡しスロット）
+#
+# - 呼び出し側の接続・トランザクションの中で使う（commit しない）
+# - 一覧系は farms の SELECT に PICKUP_SLOT_CODES_SQL を足して 1 本で取る
+# - 行が無い farm（移行前・未設定）は farms.pickup_time を 1 件として扱う
+# ============================================================
+
+# farms を f として参照する SELECT 用（"SAT_10_11,WED_19_20"）
+PICKUP_SLOT_CODES_SQL = """
+    (SELECT GROUP_CONCAT(s.pickup_slot_code, ',')
+       FROM farm_pickup_slots AS s
+      WHERE s.farm_id = f.farm_id)
+"""
+
+
+def fetch_farm_pickup_slot_codes(
+    conn: sqlite3.Connection,
+    farm_id: int,
+) -> Tuple[str, ...]:
+    """
+    farm の全スロットコード。farm が無ければ空タプル。
+    """
+    row = conn.execute(
+        f"""
+        SELECT f.pickup_time AS pickup_time,
+               {PICKUP_SLOT_CODES_SQL} AS pickup_slot_codes
+          FROM farms AS f
+         WHERE f.farm_id = ?
+        """,
+        (farm_id,),
+    ).fetchone()
+    if row is None:
+        return ()
+    return split_slot_codes(row[1], row[0])
+
+
+def fetch_all_farm_pickup_slot_codes(
+    conn: sqlite3.Connection,
+    *,
+    active_only: bool = True,
+) -> List[Tuple[int, Tuple[str, ...]]]:
+    """
+    (farm_id, スロットコード) の一覧（スロット未設定の farm は除く）。
+    """
+    where = "WHERE f.active_flag = 1" if active_only else ""
+    rows = conn.execute(
+        f"""
+        SELECT f.farm_id AS farm_id,
+               f.pickup_time AS pickup_time,
+               {PICKUP_SLOT_CODES_SQL} AS pickup_slot_codes
+          FROM farms AS f
+         {where}
+         ORDER BY f.farm_id
+        """
+    ).fetchall()
+
+    result: List[Tuple[int, Tuple[str, ...]]] = []
+    for farm_id, pickup_time, raw in rows:
+        codes = split_slot_codes(raw, pickup_time)
+        if codes:
+            result.append((int(farm_id), codes))
+    return result
+
+
+def replace_farm_pickup_slots(
+    conn: sqlite3.Connection,
+    farm_id: int,
+    codes: Sequence[str],
+) -> None:
+    """
+    farm のスロットを codes で置き換える（farms.pickup_time は呼び出し側で更新する）。
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    conn.execute("DELETE FROM farm_pickup_slots WHERE farm_id = ?", (farm_id,))
+    conn.executemany(
+        """
+        INSERT INTO farm_pickup_slots (farm_id, pickup_slot_code, created_at)
+        VALUES (?, ?, ?)
+        """,
+        [(farm_id, code, now) for code in codes],
+    )
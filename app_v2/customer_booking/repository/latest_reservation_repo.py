@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import sqlite3
 from typing import Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class LatestReservationRepository:
@@ -19,7 +18,7 @@ class LatestReservationRepository:
         *,
         consumer_id: int,
     ) -> Optional[int]:
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
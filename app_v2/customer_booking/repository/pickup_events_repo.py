@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    fetch_all_farm_pickup_slot_codes,
+)
+
+
+@dataclass(frozen=True)
+class PickupEventRow:
+    event_id: int
+    farm_id: int
+    pickup_slot_code: str
+    event_start_at: str
+    event_end_at: str
+    deadline_at: str
+    display_label: str
+
+
+@dataclass(frozen=True)
+class PickupEventSpec:
+    """生成前のイベント（event_id なし）"""
+
+    farm_id: int
+    pickup_slot_code: str
+    event_start_at: datetime
+    event_end_at: datetime
+    deadline_at: datetime
+    display_label: str
+
+
+class PickupEventsRepository:
+    """
+    pickup_events 用 Repository。
+
+    - sqlite3 直叩き
+    - 日時は reservations.event_start_at と同じ UTC isoformat 文字列で保存・照合する
+    - (farm_id, event_start_at) が一意
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path = db_path or str(resolve_db_path())
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # -----------------------------
+    # READ
+    # -----------------------------
+    def find_event(
+        self,
+        *,
+        farm_id: int,
+        event_start_at: datetime,
+    ) -> Optional[PickupEventRow]:
+        with self._get_conn() as conn:
+            row = conn.execute(
+                """
+                SELECT event_id, farm_id, pickup_slot_code,
+                       event_start_at, event_end_at, deadline_at, display_label
+                  FROM pickup_events
+                 WHERE farm_id = ?
+                   AND event_start_at = ?
+                """,
+                (farm_id, event_start_at.isoformat()),
+            ).fetchone()
+            return PickupEventRow(**dict(row)) if row else None
+
+    def list_events_for_farm(
+        self,
+        *,
+        farm_id: int,
+        start_from: datetime,
+        limit: int = 52,
+    ) -> List[PickupEventRow]:
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT event_id, farm_id, pickup_slot_code,
+                       event_start_at, event_end_at, deadline_at, display_label
+                  FROM pickup_events
+                 WHERE farm_id = ?
+                   AND event_start_at >= ?
+                 ORDER BY event_start_at
+                 LIMIT ?
+                """,
+                (farm_id, start_from.isoformat(), limit),
+            ).fetchall()
+            return [PickupEventRow(**dict(r)) for r in rows]
+
+    def list_active_farm_slots(self) -> List[Tuple[int, Tuple[str, ...]]]:
+        """
+        イベントを先行生成すべき farm（有効・スロット設定済み）の (farm_id, スロットコード)。
+        """
+        with self._get_conn() as conn:
+            return fetch_all_farm_pickup_slot_codes(conn, active_only=True)
+
+    # -----------------------------
+    # WRITE
+    # -----------------------------
+    def upsert_events(self, specs: Iterable[PickupEventSpec], *, now: datetime) -> None:
+        """
+        イベントをまとめて登録する。既にある週は slot / 終了 / 締切 / 表示を更新する。
+        """
+        params = [
+            (
+                s.farm_id,
+                s.pickup_slot_code,
+                s.event_start_at.isoformat(),
+                s.event_end_at.isoformat(),
+                s.deadline_at.isoformat(),
+                s.display_label,
+                now.isoformat(),
+            )
+            for s in specs
+        ]
+        if not params:
+            return
+
+        with self._get_conn() as conn:
+            conn.executemany(
+                """
+                INSERT INTO pickup_events (
+                    farm_id, pickup_slot_code,
+                    event_start_at, event_end_at, deadline_at, display_label,
+                    created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (farm_id, event_start_at) DO UPDATE SET
+                    pickup_slot_code = excluded.pickup_slot_code,
+                    event_end_at = excluded.event_end_at,
+                    deadline_at = excluded.deadline_at,
+                    display_label = excluded.display_label
+                """,
+                params,
+            )
+
+    def get_or_create_event_id(self, spec: PickupEventSpec, *, now: datetime) -> int:
+        """
+        (farm_id, event_start_at) のイベント ID を返す。無ければ作る。
+        既存行は書き換えない（予約確定時に過去週を参照することがあるため）。
+        """
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO pickup_events (
+                    farm_id, pickup_slot_code,
+                    event_start_at, event_end_at, deadline_at, display_label,
+                    created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (farm_id, event_start_at) DO NOTHING
+                """,
+                (
+                    spec.farm_id,
+                    spec.pickup_slot_code,
+                    spec.event_start_at.isoformat(),
+                    spec.event_end_at.isoformat(),
+                    spec.deadline_at.isoformat(),
+                    spec.display_label,
+                    now.isoformat(),
+                ),
+            )
+            row = conn.execute(
+                """
+                SELECT event_id
+                  FROM pickup_events
+                 WHERE farm_id = ?
+                   AND event_start_at = ?
+                """,
+                (spec.farm_id, spec.event_start_at.isoformat()),
+            ).fetchone()
+            return int(row["event_id"])
+
+    def delete_unused_future_events(
+        self,
+        *,
+        farm_id: int,
+        after: datetime,
+        keep_slot_codes: Sequence[str],
+    ) -> int:
+        """
+        スロット変更時の掃除：今後の週で、残すスロット以外のもの・予約が紐づいていないものを消す。
+        """
+        codes = list(keep_slot_codes)
+        placeholders = ",".join("?" for _ in codes) or "NULL"
+        with self._get_conn() as conn:
+            cur = conn.execute(
+                f"""
+                DELETE FROM pickup_events
+                 WHERE farm_id = ?
+                   AND event_start_at > ?
+                   AND pickup_slot_code NOT IN ({placeholders})
+                   AND NOT EXISTS (
+                       SELECT 1 FROM reservations AS r
+                        WHERE r.event_id = pickup_events.event_id
+                   )
+                """,
+                (farm_id, after.isoformat(), *codes),
+            )
+            return cur.rowcount
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 import sqlite3
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    PICKUP_SLOT_CODES_SQL,
+)
+from app_v2.domain.pickup_schedule import split_slot_codes
 
 
 # ============================================================
@@ -37,6 +41,9 @@ class PublicFarmDetailRow:
     pickup_lat: float
     pickup_lng: float
 
+    # farm_pickup_slots の全スロット（未設定なら pickup_slot_code の 1 件）
+    pickup_slot_codes: Tuple[str, ...] = ()
+
 
 # ============================================================
 # Repository
@@ -47,7 +54,7 @@ class PublicFarmDetailRepository:
     FarmDetailPage 用 Repository（read-only）
 
     方針:
-    - farms テーブルのみ参照
+    - farms（+ farm_pickup_slots のスロット一覧）のみ参照
     - public_farms 一覧とは完全に独立
     - 公開中 & 予約受付中 farm のみ取得
     - 値は加工しない（決定責務は service にない）
@@ -55,7 +62,7 @@ class PublicFarmDetailRepository:
 
     def __init__(self) -> None:
         db_path = resolve_db_path()
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
 
     def fetch_publishable_farm_detail(
@@ -63,7 +70,7 @@ class PublicFarmDetailRepository:
         farm_id: int,
     ) -> Optional[PublicFarmDetailRow]:
 
-        sql = """
+        sql = f"""
             SELECT
                 f.farm_id               AS farm_id,
 
@@ -84,6 +91,7 @@ class PublicFarmDetailRepository:
                 f.pr_text               AS pr_text,
 
                 f.pickup_time           AS pickup_slot_code,
+                {PICKUP_SLOT_CODES_SQL} AS pickup_slot_codes,
                 f.pickup_place_name     AS pickup_place_name,
                 f.pickup_notes          AS pickup_notes,
                 f.pickup_lat            AS pickup_lat,
@@ -129,6 +137,9 @@ class PublicFarmDetailRepository:
             pr_text=str(row["pr_text"] or ""),
 
             pickup_slot_code=str(row["pickup_slot_code"] or ""),
+            pickup_slot_codes=split_slot_codes(
+                row["pickup_slot_codes"], row["pickup_slot_code"]
+            ),
             pickup_place_name=str(row["pickup_place_name"] or ""),
             pickup_notes=str(row["pickup_notes"] or ""),
             pickup_lat=float(row["pickup_lat"]),
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 import sqlite3
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    PICKUP_SLOT_CODES_SQL,
+)
+from app_v2.domain.pickup_schedule import split_slot_codes
 
 
 # ============================================================
@@ -29,6 +33,9 @@ class PublicFarmRow:
     pickup_lat: float
     pickup_lng: float
 
+    # farm_pickup_slots の全スロット（未設定なら pickup_slot_code の 1 件）
+    pickup_slot_codes: Tuple[str, ...] = ()
+
 
 # ============================================================
 # Repository
@@ -44,14 +51,14 @@ class PublicFarmsRepository:
 
     def __init__(self) -> None:
         db_path = resolve_db_path()
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
 
     # --------------------------------------------------------
     # 公開 & 予約受付中の農家一覧（ページング前）
     # --------------------------------------------------------
     def fetch_publishable_farms(self) -> List[PublicFarmRow]:
-        sql = """
+        sql = f"""
             SELECT
                 f.farm_id            AS farm_id,
 
@@ -61,6 +68,7 @@ class PublicFarmsRepository:
 
                 f.price_10kg         AS price_10kg,
                 f.pickup_time        AS pickup_slot_code,
+                {PICKUP_SLOT_CODES_SQL}         AS pickup_slot_codes,
                 f.pickup_lat         AS pickup_lat,
                 f.pickup_lng         AS pickup_lng,
 
@@ -76,6 +84,113 @@ class PublicFarmsRepository:
         rows = self.conn.execute(sql).fetchall()
         return [_row_to_entity(r) for r in rows]
 
+    # --------------------------------------------------------
+    # 公開 & 予約受付中の農家の位置だけ（距離順の並びを作る用）
+    # --------------------------------------------------------
+    def fetch_publishable_farm_locations(self) -> List[Tuple[int, float, float]]:
+        rows = self.conn.execute(
+            """
+            SELECT
+                f.farm_id            AS farm_id,
+                f.pickup_lat         AS pickup_lat,
+                f.pickup_lng         AS pickup_lng
+            FROM farms AS f
+            WHERE
+                f.active_flag = 1
+                AND f.is_accepting_reservations = 1
+            """
+        ).fetchall()
+        return [
+            (int(r["farm_id"]), float(r["pickup_lat"]), float(r["pickup_lng"]))
+            for r in rows
+        ]
+
+    # --------------------------------------------------------
+    # 地図用：公開農家のマーカー（位置・顔写真）全件
+    # --------------------------------------------------------
+    def fetch_publishable_farm_markers(self) -> List[Tuple[int, float, float, str]]:
+        rows = self.conn.execute(
+            """
+            SELECT
+                f.farm_id            AS farm_id,
+                f.pickup_lat         AS pickup_lat,
+                f.pickup_lng         AS pickup_lng,
+                f.face_image_url     AS face_image_url
+            FROM farms AS f
+            WHERE
+                f.active_flag = 1
+                AND f.is_accepting_reservations = 1
+                AND f.pickup_lat IS NOT NULL
+                AND f.pickup_lng IS NOT NULL
+            """
+        ).fetchall()
+        return [
+            (
+                int(r["farm_id"]),
+                float(r["pickup_lat"]),
+                float(r["pickup_lng"]),
+                str(r["face_image_url"] or ""),
+            )
+            for r in rows
+        ]
+
+    # --------------------------------------------------------
+    # 公開 & 予約受付中の農家（farm_id 指定・1 ページ分）
+    # --------------------------------------------------------
+    def fetch_publishable_farms_by_ids(
+        self,
+        farm_ids: Sequence[int],
+    ) -> List[PublicFarmRow]:
+        """
+        並び順は保証しない。公開でなくなった farm は返らない。
+        """
+        if not farm_ids:
+            return []
+
+        placeholders = ",".join("?" for _ in farm_ids)
+        sql = f"""
+            SELECT
+                f.farm_id            AS farm_id,
+
+                f.last_name          AS owner_last_name,
+                f.first_name         AS owner_first_name,
+                f.address            AS owner_address,
+
+                f.price_10kg         AS price_10kg,
+                f.pickup_time        AS pickup_slot_code,
+                {PICKUP_SLOT_CODES_SQL}         AS pickup_slot_codes,
+                f.pickup_lat         AS pickup_lat,
+                f.pickup_lng         AS pickup_lng,
+
+                f.face_image_url     AS face_image_url,
+                f.pr_title           AS pr_title,
+                f.pr_images_json     AS pr_images_raw
+            FROM farms AS f
+            WHERE
+                f.farm_id IN ({placeholders})
+                AND f.active_flag = 1
+                AND f.is_accepting_reservations = 1
+        """
+
+        rows = self.conn.execute(sql, tuple(farm_ids)).fetchall()
+        return [_row_to_entity(r) for r in rows]
+
+    # --------------------------------------------------------
+    # 公開農家集合の version（table_versions・距離順キャッシュのキー）
+    # --------------------------------------------------------
+    def fetch_publish_set_version(self) -> Optional[int]:
+        """
+        farms / farm_pickup_slots への書き込みごとに上がる値。
+        table_versions が無い DB（マイグレーション前）では None。
+        """
+        try:
+            row = self.conn.execute(
+                "SELECT version FROM table_versions WHERE table_name = 'farms'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return int(row[0]) if row is not None else None
+
     # --------------------------------------------------------
     # 地図用：バウンディングボックス検索
     # --------------------------------------------------------
@@ -88,7 +203,7 @@ class PublicFarmsRepository:
         limit: int,
     ) -> List[PublicFarmRow]:
 
-        sql = """
+        sql = f"""
             SELECT
                 f.farm_id            AS farm_id,
 
@@ -98,6 +213,7 @@ class PublicFarmsRepository:
 
                 f.price_10kg         AS price_10kg,
                 f.pickup_time        AS pickup_slot_code,
+                {PICKUP_SLOT_CODES_SQL}         AS pickup_slot_codes,
                 f.pickup_lat         AS pickup_lat,
                 f.pickup_lng         AS pickup_lng,
 
@@ -136,6 +252,9 @@ def _row_to_entity(r: sqlite3.Row) -> PublicFarmRow:
         owner_address=str(r["owner_address"] or ""),
         price_10kg=int(r["price_10kg"]),
         pickup_slot_code=str(r["pickup_slot_code"]),
+        pickup_slot_codes=split_slot_codes(
+            r["pickup_slot_codes"], r["pickup_slot_code"]
+        ),
         pickup_lat=float(r["pickup_lat"]),
         pickup_lng=float(r["pickup_lng"]),
         face_image_url=str(r["face_image_url"] or ""),
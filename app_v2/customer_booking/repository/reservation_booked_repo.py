@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Optional, Tuple
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class ReservationBookedRepository:
@@ -17,7 +17,7 @@ class ReservationBookedRepository:
     """
 
     def open_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(resolve_db_path())
+        conn = connect(resolve_db_path())
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1,10 +1,12 @@
 import sqlite3
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from app_v2.db.core import resolve_db_path
-
-DB_PATH = str(resolve_db_path())
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    PICKUP_SLOT_CODES_SQL,
+)
+from app_v2.domain.pickup_schedule import split_slot_codes
 
 
 @dataclass
@@ -12,6 +14,8 @@ class FarmRecord:
     farm_id: int
     pickup_time: Optional[str]
     active_flag: int
+    # farm_pickup_slots の全スロット（未設定なら pickup_time の 1 件）
+    pickup_slot_codes: Tuple[str, ...] = ()
 
 
 @dataclass
@@ -34,11 +38,11 @@ class ReservationExpandedRepository:
     表示文字列は DB.reservations.pickup_display を唯一の正として返す。
     """
 
-    def __init__(self, db_path: str = DB_PATH) -> None:
-        self.db_path = db_path
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path = db_path or str(resolve_db_path())
 
     def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -46,13 +50,14 @@ class ReservationExpandedRepository:
         with self._get_connection() as conn:
             cur = conn.cursor()
             cur.execute(
-                """
+                f"""
                 SELECT
-                    farm_id,
-                    pickup_time,
-                    active_flag
-                FROM farms
-                WHERE farm_id = ?
+                    f.farm_id AS farm_id,
+                    f.pickup_time AS pickup_time,
+                    f.active_flag AS active_flag,
+                    {PICKUP_SLOT_CODES_SQL} AS pickup_slot_codes
+                FROM farms AS f
+                WHERE f.farm_id = ?
                 """,
                 (farm_id,),
             )
@@ -66,6 +71,9 @@ class ReservationExpandedRepository:
                 active_flag=int(row["active_flag"])
                 if row["active_flag"] is not None
                 else 1,
+                pickup_slot_codes=split_slot_codes(
+                    row["pickup_slot_codes"], row["pickup_time"]
+                ),
             )
 
     def get_confirmed_reservations_for_farm(
@@ -100,19 +108,72 @@ class ReservationExpandedRepository:
             )
             rows = cur.fetchall()
 
-        results: List[ReservationRecord] = []
-        for row in rows:
-            results.append(
-                ReservationRecord(
-                    id=int(row["reservation_id"]),
-                    consumer_id=int(row["consumer_id"]),
-                    farm_id=int(row["farm_id"]),
-                    pickup_slot_code=row["pickup_slot_code"],
-                    pickup_display=row["pickup_display"],   # ★
-                    created_at=row["created_at"],
-                    items_json=row["items_json"],
-                    rice_subtotal=row["rice_subtotal"],
-                    status=row["status"],
-                )
-            )
-        return results
+        return [_to_reservation_record(row) for row in rows]
+
+    # ------------------------------------------------------------
+    # pickup_events 経由（イベント確定済みの予約）
+    #
+    # event_id 導入前に確定した行は event_start_at で突き合わせる
+    # （書式が "YYYY-MM-DD HH:MM:SS" / isoformat のどちらでも同じ時刻なら一致させる）
+    # ------------------------------------------------------------
+    _EVENT_JOIN_SQL = """
+        FROM pickup_events AS e
+        JOIN reservations AS r
+          ON r.farm_id = e.farm_id
+         AND (
+              r.event_id = e.event_id
+              OR (
+                  r.event_id IS NULL
+                  AND julianday(r.event_start_at) = julianday(e.event_start_at)
+              )
+         )
+       WHERE e.event_id = ?
+         AND r.status = 'confirmed'
+    """
+
+    def get_confirmed_reservations_for_event(
+        self,
+        event_id: int,
+    ) -> List[ReservationRecord]:
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT
+                    r.reservation_id,
+                    r.consumer_id,
+                    r.farm_id,
+                    r.pickup_slot_code,
+                    r.pickup_display,
+                    r.created_at,
+                    r.items_json,
+                    r.rice_subtotal,
+                    r.status
+                {self._EVENT_JOIN_SQL}
+                ORDER BY r.reservation_id ASC
+                """,
+                (event_id,),
+            ).fetchall()
+
+        return [_to_reservation_record(row) for row in rows]
+
+    def count_confirmed_reservations_for_event(self, event_id: int) -> int:
+        with self._get_connection() as conn:
+            row = conn.execute(
+                f"SELECT COUNT(*) {self._EVENT_JOIN_SQL}",
+                (event_id,),
+            ).fetchone()
+        return int(row[0])
+
+
+def _to_reservation_record(row: sqlite3.Row) -> ReservationRecord:
+    return ReservationRecord(
+        id=int(row["reservation_id"]),
+        consumer_id=int(row["consumer_id"]),
+        farm_id=int(row["farm_id"]),
+        pickup_slot_code=row["pickup_slot_code"],
+        pickup_display=row["pickup_display"],   # ★
+        created_at=row["created_at"],
+        items_json=row["items_json"],
+        rice_subtotal=row["rice_subtotal"],
+        status=row["status"],
+    )
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Optional, Dict, Any
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 # ============================================================
@@ -25,7 +25,7 @@ def get_reservation_by_id(
     - cancel / confirm の判断は service 層の責務
     """
 
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     conn.row_factory = sqlite3.Row
     try:
         cur = conn.cursor()
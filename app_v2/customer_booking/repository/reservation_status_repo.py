@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import sqlite3
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, Tuple
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.db.datetimes import parse_db_datetime
 
 
 class ReservationStatusRepository:
@@ -28,7 +28,7 @@ class ReservationStatusRepository:
     # READ
     # -----------------------------
     def get_current_status(self, reservation_id: int) -> Optional[str]:
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -59,7 +59,8 @@ class ReservationStatusRepository:
             created_at (datetime): UTC 前提の datetime
             pickup_slot_code (str)
         """
-        conn = sqlite3.connect(self.db_path)
+        # created_at は DATETIME 列なので datetime（UTC aware）で受け取る
+        conn = connect(self.db_path, parse_datetimes=True)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -76,15 +77,8 @@ class ReservationStatusRepository:
 
             created_at_raw, pickup_slot_code = row
 
-            # created_at は TEXT/DATETIME として保存されている前提
-            # （既存仕様に合わせ、ここでは最小限の変換のみ行う）
-            created_at = datetime.fromisoformat(
-                created_at_raw.replace(" ", "T")
-            )
-
-            # tz-naive → UTC aware に正規化
-            if created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
+            # 壊れた値は converter が文字列のまま返すので、ここで ValueError になる
+            created_at = parse_db_datetime(created_at_raw)
             return created_at, pickup_slot_code
         finally:
             conn.close()
@@ -93,7 +87,7 @@ class ReservationStatusRepository:
     # WRITE : status
     # -----------------------------
     def update_status_cancelled(self, reservation_id: int) -> None:
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -116,7 +110,7 @@ class ReservationStatusRepository:
         既存互換用:
         status を confirmed にするだけの処理
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -141,6 +135,7 @@ class ReservationStatusRepository:
         reservation_id: int,
         event_start_at: datetime,
         event_end_at: datetime,
+        event_id: Optional[int] = None,
     ) -> None:
         """
         confirm 時に呼ばれる想定。
@@ -148,10 +143,11 @@ class ReservationStatusRepository:
         - status を confirmed に更新
         - payment_succeeded_at をセット
         - event_start_at / event_end_at を確定保存
+        - event_id（pickup_events）が分かっていれば紐づける
 
         ※ event_* は既存ロジックで計算済みの datetime をそのまま保存する
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
@@ -160,12 +156,14 @@ class ReservationStatusRepository:
                 SET status = 'confirmed',
                     payment_succeeded_at = CURRENT_TIMESTAMP,
                     event_start_at = ?,
-                    event_end_at   = ?
+                    event_end_at   = ?,
+                    event_id       = COALESCE(?, event_id)
                 WHERE reservation_id = ?
                 """,
                 (
                     event_start_at.isoformat(),
                     event_end_at.isoformat(),
+                    event_id,
                     reservation_id,
                 ),
             )
@@ -191,7 +189,7 @@ class ReservationStatusRepository:
         Magic Link consume 時など、
         「誰の予約か」を確定させるために使用する。
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             cur = conn.cursor()
             cur.execute(
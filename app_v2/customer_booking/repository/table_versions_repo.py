@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Optional
+
+from app_v2.db.core import connect
+
+# ============================================================
+# table_versions（テーブル群の変更バージョン）
+#
+# - version はトリガ（src/schema.sql / mig_table_versions_create.py）が
+#   farms / farm_pickup_slots への書き込みごとに +1 する。ここは読むだけ
+# - 公開 API の ETag 用。主キー 1 行の SELECT なので、304 を返す経路は
+#   farms の行を一切読まない
+# - テーブルが無い DB（マイグレーション前）では None を返す
+#   （呼び出し側はキャッシュ用ヘッダを付けずに通常どおり返す）
+# ============================================================
+
+
+@dataclass(frozen=True)
+class TableVersionRow:
+    table_name: str
+    version: int
+    updated_at: str
+
+
+def fetch_table_version(
+    table_name: str,
+    *,
+    db_path: Optional[str] = None,
+) -> Optional[TableVersionRow]:
+    conn = connect(db_path)
+    try:
+        row = conn.execute(
+            """
+            SELECT version, updated_at
+              FROM table_versions
+             WHERE table_name = ?
+            """,
+            (table_name,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # no such table: table_versions
+        return None
+    finally:
+        conn.close()
+
+    if row is None:
+        return None
+    return TableVersionRow(
+        table_name=table_name,
+        version=int(row[0]),
+        updated_at=str(row[1] or ""),
+    )
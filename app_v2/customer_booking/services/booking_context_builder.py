@@ -4,6 +4,7 @@ import json
 from typing import Any, Dict
 from zoneinfo import ZoneInfo
 
+from app_v2.common.trusted_dto import build_trusted
 from app_v2.customer_booking.dtos import BookingContextDTO
 from app_v2.customer_booking.services.reservation_expanded_service import (
     _generate_pickup_code,
@@ -60,7 +61,8 @@ class BookingContextBuilder:
         items = self._parse_items(reservation.get("items_json") or "[]")
         qty_5, qty_10, qty_25, s5, s10, s25 = self._aggregate_rice_items(items)
 
-        ctx = BookingContextDTO(
+        ctx = build_trusted(
+            BookingContextDTO,
             reservation_id=int(reservation["reservation_id"]),
             pickup_display=reservation.get("pickup_display") or "",
             pickup_place_name=farm.get("pickup_place_name") or "",
@@ -9,6 +9,7 @@ from app_v2.customer_booking.repository.reservation_repo import (
     get_reservation_by_id,
 )
 from app_v2.customer_booking.utils.cancel_token import CancelTokenPayload
+from app_v2.db.datetimes import parse_db_datetime
 
 # 状態遷移はここに集約（キャンセルの本体）
 from app_v2.customer_booking.services.booking_lifecycle_service import (
@@ -99,9 +100,7 @@ class CancelService:
             raise CancelDomainError("EVENT_START_NOT_SET")
 
         # DB に保存されている UTC 時刻をそのまま使う
-        event_start = datetime.fromisoformat(event_start_raw)
-        if event_start.tzinfo is None:
-            event_start = event_start.replace(tzinfo=UTC)
+        event_start = parse_db_datetime(event_start_raw)
 
         cancel_limit = event_start - timedelta(hours=3)
         now_utc = datetime.now(UTC)
@@ -11,11 +11,12 @@ from app_v2.customer_booking.dtos import (
 
 from app_v2.customer_booking.utils.pickup_time_utils import (
     JST,
-    compute_next_pickup,
+    get_schedule,
 )
 
 from app_v2.customer_booking.repository.confirm_repo import (
     create_pending_reservation,
+    fetch_pickup_slot_codes,
 )
 
 
@@ -28,7 +29,7 @@ class ConfirmService:
     ConfirmPage 用 Service（V2 / orchestration 専用）
 
     責務:
-    - クライアント / サーバ締切の最終検証
+    - クライアント / サーバ締切の最終検証（スロットが farm のものかも確認）
     - confirm_repo による pending reservation 作成
 
     ※ 状態遷移（confirmed / cancelled）は一切行わない
@@ -59,8 +60,9 @@ class ConfirmService:
         )
 
         # --- サーバ側締切（最終安全装置） ---
-        self._check_server_deadline(
+        pickup_slot_code = self._check_server_deadline(
             now=now,
+            farm_id=payload.farm_id,
             pickup_slot_code=payload.pickup_slot_code,
         )
 
@@ -73,7 +75,7 @@ class ConfirmService:
         # ----------------------------------------------------
         result = create_pending_reservation(
             farm_id=payload.farm_id,
-            pickup_slot_code=payload.pickup_slot_code,
+            pickup_slot_code=pickup_slot_code,
             pickup_display=payload.pickup_display,  # ★ 追加
             items=payload.items,
             service_fee=self.SERVICE_FEE,
@@ -127,21 +129,41 @@ class ConfirmService:
         self,
         *,
         now: datetime,
+        farm_id: int,
         pickup_slot_code: str,
-    ) -> None:
+    ) -> str:
+        """
+        選ばれたスロットが farm のスロットか確認し、そのスロットの締切を検証する。
+        戻り値は保存用のスロットコード（farm 側の表記に揃える）。
+        """
         if not pickup_slot_code or not pickup_slot_code.strip():
             raise HTTPException(
                 status_code=400,
                 detail="pickup_slot_code is required",
             )
 
-        _start_dt, deadline_dt = compute_next_pickup(
-            now,
-            pickup_slot_code.strip(),
-        )
+        farm_slot_codes = fetch_pickup_slot_codes(farm_id=farm_id)
+        if not farm_slot_codes:
+            # farm が無い / 受け渡し時間が未設定
+            raise HTTPException(
+                status_code=409,
+                detail="この農家は現在予約を受け付けていません。",
+            )
+
+        slot = get_schedule(farm_slot_codes).find(pickup_slot_code)
+        if slot is None:
+            # 受け渡し時間が変更された後の古い画面など
+            raise HTTPException(
+                status_code=409,
+                detail="選択された受け渡し時間は現在受け付けていません。",
+            )
+
+        _start_dt, deadline_dt = slot.next_pickup(now, JST)
 
         if now >= deadline_dt:
             raise HTTPException(
                 status_code=409,
                 detail="今週分の予約受付は締め切りました。",
             )
+
+        return slot.code
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app_v2.common.single_flight import SingleFlight
+from app_v2.domain.geo import MAP_TILE_PX, mercator_xy
+
+# ============================================================
+# 地図モーダル用の公開農家の空間インデックス（プロセス内）
+#
+# - 公開農家の位置（farm_id・緯度経度・顔写真）を 1 回だけ読み、緯度順に持つ
+# - 表示範囲の問い合わせは、範囲内の農家（緯度を bisect・経度で絞る）だけを
+#   「画面上 cell_px 四方の格子（Web メルカトル）」でまとめて返す（DB は読まない）。
+#   クラスタの件数の合計は count_in_bounds と一致する（範囲外の農家は数えない）
+# - 返すクラスタ数は表示範囲に掛かる格子の数まで（service が MAP_CLUSTER_MAX_GRID_CELLS を
+#   超えないズームを選ぶ）
+# - 公開農家集合の version（table_versions の 'farms'）ごとに作り直す。
+#   保持するのは最新の version の 1 つだけ
+# ============================================================
+
+# (farm_id, lat, lng, face_image_url)
+FarmMarker = Tuple[int, float, float, str]
+GridKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class MapCluster:
+    key: GridKey
+    count: int
+    lat: float
+    lng: float
+    min_lat: float
+    max_lat: float
+    min_lng: float
+    max_lng: float
+    representative_farm_id: int
+    representative_face_image_url: str
+
+
+@dataclass(frozen=True)
+class _Point:
+    farm_id: int
+    lat: float
+    lng: float
+    x: float
+    y: float
+    face_image_url: str
+
+
+class FarmMapIndex:
+    """
+    1 version 分の公開農家の位置（immutable）。
+    """
+
+    def __init__(self, markers: List[FarmMarker], *, cell_px: int) -> None:
+        points = []
+        for farm_id, lat, lng, face_image_url in markers:
+            x, y = mercator_xy(lat, lng)
+            points.append(_Point(farm_id, lat, lng, x, y, face_image_url))
+        # 緯度順（表示範囲内の件数を bisect で数える）
+        points.sort(key=lambda p: (p.lat, p.farm_id))
+        self._points = points
+        self._lats = [p.lat for p in points]
+        self.cell_px = max(1, cell_px)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def count_in_bounds(
+        self, min_lat: float, max_lat: float, min_lng: float, max_lng: float
+    ) -> int:
+        return sum(1 for _ in self._points_in_bounds(min_lat, max_lat, min_lng, max_lng))
+
+    def clusters_in_bounds(
+        self,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ) -> List[MapCluster]:
+        """
+        表示範囲内の農家を格子ごとにまとめたクラスタ（格子の左上から順）。
+        格子のうち表示範囲の外にある農家は含まない（件数の合計 = count_in_bounds）。
+        """
+        scale = self._cells_per_unit(zoom)
+        groups: Dict[GridKey, List[_Point]] = {}
+        for p in self._points_in_bounds(min_lat, max_lat, min_lng, max_lng):
+            groups.setdefault((int(p.x * scale), int(p.y * scale)), []).append(p)
+
+        return [
+            _aggregate(key, groups[key])
+            for key in sorted(groups, key=lambda k: (k[1], k[0]))
+        ]
+
+    def grid_cells_in_bounds(
+        self,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ) -> int:
+        """
+        表示範囲に掛かる格子の数（返し得るクラスタ数の上限）。
+        """
+        col0, col1, row0, row1 = self._grid_range(zoom, min_lat, max_lat, min_lng, max_lng)
+        return (col1 - col0 + 1) * (row1 - row0 + 1)
+
+    def _grid_range(
+        self,
+        zoom: int,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ) -> Tuple[int, int, int, int]:
+        scale = self._cells_per_unit(zoom)
+        x0, y0 = mercator_xy(max_lat, min_lng)
+        x1, y1 = mercator_xy(min_lat, max_lng)
+        return int(x0 * scale), int(x1 * scale), int(y0 * scale), int(y1 * scale)
+
+    def _points_in_bounds(
+        self, min_lat: float, max_lat: float, min_lng: float, max_lng: float
+    ) -> Iterator[_Point]:
+        lo = bisect_left(self._lats, min_lat)
+        hi = bisect_right(self._lats, max_lat)
+        return (p for p in self._points[lo:hi] if min_lng <= p.lng <= max_lng)
+
+    def _cells_per_unit(self, zoom: int) -> float:
+        # 正規化座標 1 あたりの格子数（= ズーム z の世界のピクセル幅 / cell_px）
+        return MAP_TILE_PX * (2 ** zoom) / self.cell_px
+
+
+def _aggregate(key: GridKey, members: List[_Point]) -> MapCluster:
+    n = len(members)
+    lat = sum(p.lat for p in members) / n
+    lng = sum(p.lng for p in members) / n
+    # 代表：重心に最も近い農家（同じなら farm_id の小さい方）
+    rep = min(
+        members,
+        key=lambda p: ((p.lat - lat) ** 2 + (p.lng - lng) ** 2, p.farm_id),
+    )
+    return MapCluster(
+        key=key,
+        count=n,
+        lat=lat,
+        lng=lng,
+        min_lat=min(p.lat for p in members),
+        max_lat=max(p.lat for p in members),
+        min_lng=min(p.lng for p in members),
+        max_lng=max(p.lng for p in members),
+        representative_farm_id=rep.farm_id,
+        representative_face_image_url=rep.face_image_url,
+    )
+
+
+class FarmMapIndexCache:
+    """
+    最新 version の FarmMapIndex を 1 つ持つ。
+    """
+
+    def __init__(self, *, cell_px: int) -> None:
+        self.cell_px = cell_px
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._index: Optional[FarmMapIndex] = None
+        self._flight: SingleFlight[FarmMapIndex] = SingleFlight("public_farms.map_index")
+
+    def get(
+        self,
+        *,
+        version: Optional[int],
+        load_markers: Callable[[], List[FarmMarker]],
+    ) -> FarmMapIndex:
+        """
+        version が None（table_versions の無い DB）のときは毎回作る（保持しない）。
+        """
+        if version is None:
+            return FarmMapIndex(load_markers(), cell_px=self.cell_px)
+
+        with self._lock:
+            if self._index is not None and self._version == version:
+                return self._index
+
+        return self._flight.do(version, lambda: self._build(version, load_markers))
+
+    def _build(
+        self, version: int, load_markers: Callable[[], List[FarmMarker]]
+    ) -> FarmMapIndex:
+        index = FarmMapIndex(load_markers(), cell_px=self.cell_px)
+        with self._lock:
+            if self._version is None or version >= self._version:
+                self._version = version
+                self._index = index
+        return index
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app_v2.common.single_flight import SingleFlight
+from app_v2.domain.geo import GridCell, distance_km, grid_cell, grid_cell_center
+
+# ============================================================
+# 公開一覧の「距離順の farm_id の並び」キャッシュ
+#
+# - 一覧はユーザー位置からの距離順なので、そのままではキャッシュが効かない。
+#   ユーザー位置を cell_km 四方の格子に丸め、格子の中心からの距離順の並びを共有する
+#   （ユーザーは数か所の町に集まるので、格子の数はそれほど増えない）
+# - キーは (公開農家集合の version, 格子)。version は table_versions の 'farms'
+#   （farms / farm_pickup_slots の書き込みで上がる）。新しい version を見たら全部捨てる
+# - 保持するのは farm_id・格子中心からの距離・位置だけ。カードは service が
+#   ページ分の行だけ DB から読んで作る
+# - 格子中心基準の並びは、ユーザー位置基準の順とは近い距離の農家どうしで入れ替わり得る。
+#   ユーザーと格子中心の距離を m とすると、どの農家も |ユーザーからの距離 − 中心からの距離| <= m
+#   なので、ページに入り得る農家は中心基準の並びの先頭付近に限られる。
+#   その範囲だけユーザー位置から距離を計算し直して並べる（結果は全件を並べた場合と同じ）
+# ============================================================
+
+FarmLocation = Tuple[int, float, float]
+
+
+@dataclass(frozen=True)
+class FarmRanking:
+    center_lat: float
+    center_lng: float
+    # 格子中心からの距離の昇順（同距離は farm_id 順）
+    farm_ids: Tuple[int, ...]
+    center_distances_km: Tuple[float, ...]
+    locations: Dict[int, Tuple[float, float]]
+
+    def page(self, lat: float, lng: float, start: int, end: int) -> List[int]:
+        """
+        (lat, lng) からの距離順（同距離は farm_id 順）で [start, end) 番目の farm_id。
+        """
+        end = min(end, len(self.farm_ids))
+        if start >= end:
+            return []
+
+        margin = distance_km(lat, lng, self.center_lat, self.center_lng)
+        # 中心基準の先頭 end 件のユーザーからの最遠距離 U。ユーザー基準の先頭 end 件は
+        # すべてユーザーから U 以内 → 中心から U + margin 以内にある
+        upper = max(self._user_distance(lat, lng, farm_id) for farm_id in self.farm_ids[:end])
+        candidates = self.farm_ids[: bisect_right(self.center_distances_km, upper + margin)]
+
+        ranked = sorted(
+            (self._user_distance(lat, lng, farm_id), farm_id) for farm_id in candidates
+        )
+        return [farm_id for _, farm_id in ranked[start:end]]
+
+    def _user_distance(self, lat: float, lng: float, farm_id: int) -> float:
+        farm_lat, farm_lng = self.locations[farm_id]
+        return distance_km(lat, lng, farm_lat, farm_lng)
+
+    def any_within(self, lat: float, lng: float, radius_km: float) -> bool:
+        """
+        (lat, lng) から radius_km 以内の農家があるか（厳密）。
+
+        三角不等式で、格子中心からの距離が radius_km + (ユーザーと中心の距離) を
+        超えた先は調べない。
+        """
+        limit = radius_km + distance_km(lat, lng, self.center_lat, self.center_lng)
+        for farm_id, center_distance in zip(self.farm_ids, self.center_distances_km):
+            if center_distance > limit:
+                return False
+            if self._user_distance(lat, lng, farm_id) <= radius_km:
+                return True
+        return False
+
+
+class FarmRankingCache:
+    def __init__(self, *, cell_km: float, max_cells: int) -> None:
+        self.cell_km = cell_km
+        self.max_cells = max(1, max_cells)
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._locations: Optional[Dict[int, Tuple[float, float]]] = None
+        self._rankings: "OrderedDict[GridCell, FarmRanking]" = OrderedDict()
+        self._flight: SingleFlight[FarmRanking] = SingleFlight("public_farms.ranking")
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.cell_km > 0
+
+    def get(
+        self,
+        *,
+        version: int,
+        lat: float,
+        lng: float,
+        load_locations: Callable[[], List[FarmLocation]],
+    ) -> FarmRanking:
+        """
+        (lat, lng) の格子の並び。無ければ load_locations（公開農家の位置一覧）から作る。
+        """
+        cell = grid_cell(lat, lng, self.cell_km)
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._version = version
+                self._locations = None
+                self._rankings.clear()
+            ranking = self._rankings.get(cell) if version == self._version else None
+            if ranking is not None:
+                self._rankings.move_to_end(cell)
+                self._stats["hits"] += 1
+                return ranking
+            self._stats["misses"] += 1
+
+        return self._flight.do(
+            (version, cell),
+            lambda: self._build(version, cell, load_locations),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cells"] = len(self._rankings)
+        return stats
+
+    def _build(
+        self,
+        version: int,
+        cell: GridCell,
+        load_locations: Callable[[], List[FarmLocation]],
+    ) -> FarmRanking:
+        with self._lock:
+            locations = self._locations if version == self._version else None
+        if locations is None:
+            locations = {farm_id: (lat, lng) for farm_id, lat, lng in load_locations()}
+
+        center_lat, center_lng = grid_cell_center(cell, self.cell_km)
+        ranked = sorted(
+            (distance_km(center_lat, center_lng, lat, lng), farm_id)
+            for farm_id, (lat, lng) in locations.items()
+        )
+        ranking = FarmRanking(
+            center_lat=center_lat,
+            center_lng=center_lng,
+            farm_ids=tuple(farm_id for _, farm_id in ranked),
+            center_distances_km=tuple(d for d, _ in ranked),
+            locations=locations,
+        )
+
+        with self._lock:
+            # 作っている間に新しい version が来ていたら、その結果は使うが保持しない
+            if version == self._version:
+                self._locations = locations
+                self._rankings[cell] = ranking
+                self._rankings.move_to_end(cell)
+                while len(self._rankings) > self.max_cells:
+                    self._rankings.popitem(last=False)
+        return ranking
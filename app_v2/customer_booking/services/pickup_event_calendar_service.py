@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+from app_v2.common.background_jobs import get_job_runner
+from app_v2.customer_booking.repository.pickup_events_repo import (
+    PickupEventsRepository,
+    PickupEventSpec,
+)
+from app_v2.domain.pickup_slot import BOOKING_DEADLINE, UTC, PickupSlot
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# 受け渡しイベントのカレンダー（pickup_events）
+#
+# - farm のスロットごとに「今表示すべき週」から PICKUP_EVENT_WEEKS_AHEAD 週分を先行生成
+#   （複数スロットの farm は週に複数イベント。event_start_at が違うので一意性は保たれる）
+# - 週の判定は reservations.event_start_at と同じ UTC 基準
+#   （reservation_expanded / admin / 決済確定と同じ PickupSlot.event_for_export）
+# - 表示ラベルはスロットの時刻そのまま（"11月29日（土）10:00〜11:00"）
+# - スロット変更時（PickupSettingsService.update_settings）は作り直す
+# - 定期ジョブで 1 日 1 回全 farm を補充する
+# ============================================================
+
+PICKUP_EVENT_WEEKS_AHEAD = 8
+PICKUP_EVENT_REFRESH_INTERVAL_SEC = 24 * 60 * 60
+
+_ONE_WEEK = timedelta(days=7)
+_WEEKDAY_JP = ["月", "火", "水", "木", "金", "土", "日"]
+
+
+def format_slot_event_label(event_start: datetime, slot: PickupSlot) -> str:
+    """
+    "11月29日（土）10:00〜11:00"（日付は event_start、時刻はスロットのまま）
+    """
+    return (
+        f"{event_start.month}月{event_start.day}日"
+        f"（{_WEEKDAY_JP[event_start.weekday()]}）"
+        f"{slot.start_hour:02d}:00〜{slot.end_hour:02d}:00"
+    )
+
+
+def build_event_spec(
+    farm_id: int,
+    slot: PickupSlot,
+    event_start: datetime,
+    event_end: datetime,
+) -> PickupEventSpec:
+    return PickupEventSpec(
+        farm_id=farm_id,
+        pickup_slot_code=slot.code,
+        event_start_at=event_start,
+        event_end_at=event_end,
+        deadline_at=event_start - BOOKING_DEADLINE,
+        display_label=format_slot_event_label(event_start, slot),
+    )
+
+
+class PickupEventCalendarService:
+    def __init__(self, repo: Optional[PickupEventsRepository] = None) -> None:
+        self.repo = repo or PickupEventsRepository()
+
+    # --------------------------------------------------------
+    # 生成
+    # --------------------------------------------------------
+
+    def build_upcoming(
+        self,
+        *,
+        farm_id: int,
+        pickup_slot_code: str,
+        now: datetime,
+        weeks: int = PICKUP_EVENT_WEEKS_AHEAD,
+    ) -> List[PickupEventSpec]:
+        slot = PickupSlot.from_code(pickup_slot_code)
+        start, end = slot.event_for_export(now, UTC)
+        return [
+            build_event_spec(farm_id, slot, start + _ONE_WEEK * i, end + _ONE_WEEK * i)
+            for i in range(weeks)
+        ]
+
+    def ensure_upcoming(
+        self,
+        *,
+        farm_id: int,
+        pickup_slot_code: str,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """
+        今後の週のイベントを（無ければ）作る。戻り値は対象週数。
+        """
+        now = now or datetime.now(UTC)
+        specs = self.build_upcoming(
+            farm_id=farm_id,
+            pickup_slot_code=pickup_slot_code,
+            now=now,
+        )
+        self.repo.upsert_events(specs, now=now)
+        return len(specs)
+
+    def regenerate_for_farm(
+        self,
+        *,
+        farm_id: int,
+        pickup_slot_codes: Sequence[str],
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        スロット変更時：予約の付いていない旧スロットの今後の週を消し、新スロットで作り直す。
+        """
+        codes = [c for c in pickup_slot_codes if c]
+        if not codes:
+            return
+        now = now or datetime.now(UTC)
+        self.repo.delete_unused_future_events(
+            farm_id=farm_id,
+            after=now,
+            keep_slot_codes=codes,
+        )
+        for code in codes:
+            self.ensure_upcoming(
+                farm_id=farm_id,
+                pickup_slot_code=code,
+                now=now,
+            )
+
+    def refresh_all(self, now: Optional[datetime] = None) -> int:
+        """
+        全 farm の今後の週を補充する（定期ジョブ）。戻り値は処理した farm 数。
+        """
+        now = now or datetime.now(UTC)
+        done = 0
+        for farm_id, slot_codes in self.repo.list_active_farm_slots():
+            try:
+                for slot_code in slot_codes:
+                    self.ensure_upcoming(
+                        farm_id=farm_id,
+                        pickup_slot_code=slot_code,
+                        now=now,
+                    )
+            except ValueError as e:
+                # 不正なスロットコードの farm は飛ばす
+                logger.warning(
+                    "skip farm %s: %s",
+                    farm_id,
+                    e,
+                    extra={"event": "pickup_events.skip_farm", "farm_id": farm_id},
+                )
+                continue
+            done += 1
+        return done
+
+    # --------------------------------------------------------
+    # 予約確定時
+    # --------------------------------------------------------
+
+    def event_id_for_booking(
+        self,
+        *,
+        farm_id: int,
+        pickup_slot_code: str,
+        event_start: datetime,
+        event_end: datetime,
+    ) -> int:
+        """
+        確定した (event_start, event_end) に対応する event_id（無ければ作る）。
+        """
+        slot = PickupSlot.from_code(pickup_slot_code)
+        spec = build_event_spec(
+            farm_id,
+            slot,
+            event_start.astimezone(UTC),
+            event_end.astimezone(UTC),
+        )
+        return self.repo.get_or_create_event_id(spec, now=datetime.now(UTC))
+
+    def find_event_id(self, *, farm_id: int, event_start: datetime) -> Optional[int]:
+        row = self.repo.find_event(
+            farm_id=farm_id,
+            event_start_at=event_start.astimezone(UTC),
+        )
+        return row.event_id if row else None
+
+    def find_event_id_or_none(self, *, farm_id: int, event_start: datetime) -> Optional[int]:
+        """
+        読み取り経路用：pickup_events が未作成（migration 前）でも None を返すだけにする。
+        """
+        try:
+            return self.find_event_id(farm_id=farm_id, event_start=event_start)
+        except sqlite3.Error:
+            return None
+
+
+# ============================================================
+# 定期ジョブ
+# ============================================================
+
+def _refresh_and_reschedule() -> None:
+    try:
+        n = PickupEventCalendarService().refresh_all()
+        logger.info(
+            "refreshed %d farms",
+            n,
+            extra={"event": "pickup_events.refreshed", "farms": n},
+        )
+    finally:
+        get_job_runner().submit(
+            "pickup_events:refresh",
+            _refresh_and_reschedule,
+            delay_sec=PICKUP_EVENT_REFRESH_INTERVAL_SEC,
+            max_attempts=1,
+        )
+
+
+def schedule_pickup_event_refresh(*, delay_sec: float = 0.0) -> None:
+    """
+    起動時に 1 回呼ぶ。以後 PICKUP_EVENT_REFRESH_INTERVAL_SEC ごとに自分で再投入する。
+    """
+    get_job_runner().submit(
+        "pickup_events:refresh",
+        _refresh_and_reschedule,
+        delay_sec=delay_sec,
+        max_attempts=1,
+    )
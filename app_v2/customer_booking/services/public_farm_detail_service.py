@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Hashable, Optional
 
-from app_v2.customer_booking.dtos import PublicFarmDetailDTO
+from app_v2.common.single_flight import SingleFlight
+from app_v2.customer_booking.dtos import PickupSlotOptionDTO, PublicFarmDetailDTO
 from app_v2.customer_booking.repository.public_farm_detail_repo import (
     PublicFarmDetailRepository,
     PublicFarmDetailRow,
@@ -12,7 +13,7 @@ from app_v2.customer_booking.repository.public_farm_detail_repo import (
 
 from app_v2.customer_booking.utils.pickup_time_utils import (
     JST,
-    compute_next_pickup,
+    get_schedule,
 )
 
 from app_v2.customer_booking.services.public_farms_service import (
@@ -35,6 +36,12 @@ def calc_harvest_year_from_date(now: datetime) -> int:
     return now.year if now.month >= 9 else now.year - 1
 
 
+# 同時に来た同じ farm の詳細は 1 回の計算にまとめる（app_v2.common.single_flight）
+_detail_flight: SingleFlight[Optional[PublicFarmDetailDTO]] = SingleFlight(
+    "public_farm_detail"
+)
+
+
 # ============================================================
 # Service
 # ============================================================
@@ -46,15 +53,28 @@ class PublicFarmDetailService:
     def get_public_farm_detail(
         self,
         farm_id: int,
+        content_key: Hashable = None,
     ) -> Optional[PublicFarmDetailDTO]:
         """
         公開用 農家詳細取得
 
+        content_key: API 層の PublicCacheCheck.content_key（ETag を決めた version と時間帯）。
+        同じ計算をまとめるのは content_key も同じ呼び出しだけ
+
         【画像仕様（最終合意）】
         - cover_image_url は farmer_settings_service が決定済み
         - 本 Service では「判定・再選択・フォールバック」を一切行わない
         - DTO が必須なら upstream の値をそのまま流す
         """
+        return _detail_flight.do(
+            (content_key, farm_id),
+            lambda: self._compute_public_farm_detail(farm_id),
+        )
+
+    def _compute_public_farm_detail(
+        self,
+        farm_id: int,
+    ) -> Optional[PublicFarmDetailDTO]:
 
         row: PublicFarmDetailRow | None = (
             self.repo.fetch_publishable_farm_detail(farm_id=farm_id)
@@ -67,20 +87,23 @@ class PublicFarmDetailService:
         # -------------------------
         # 次回受け渡し
         # -------------------------
-        start_dt, deadline_dt = compute_next_pickup(
-            now,
-            row.pickup_slot_code,
-        )
-
-        next_pickup_display = _format_next_pickup_display(
-            start_dt,
-            row.pickup_slot_code,
-        )
+        # 複数スロットの farm は全スロットの次回枠を近い順に並べ、先頭を「次回」とする
+        schedule = get_schedule(row.pickup_slot_codes or (row.pickup_slot_code,))
+        pickup_slots = [
+            PickupSlotOptionDTO(
+                pickup_slot_code=slot.code,
+                next_pickup_display=_format_next_pickup_display(start, slot),
+                next_pickup_start=start.isoformat(),
+                next_pickup_deadline=deadline.isoformat(),
+            )
+            for slot, start, deadline in schedule.upcoming_pickups(now, JST)
+        ]
+        next_slot = pickup_slots[0]
 
         # -------------------------
         # PR画像（順序そのまま）
         # -------------------------
-        pr_images = _parse_pr_images(row.pr_images_raw)
+        pr_images, pr_thumbnail_urls = _parse_pr_images(row.pr_images_raw)
 
         # -------------------------
         # オーナー情報
@@ -116,6 +139,7 @@ class PublicFarmDetailService:
             face_image_url=row.face_image_url,
             cover_image_url=row.cover_image_url,  # ★ farmer_settings 決定値をそのまま使用
             pr_images=pr_images,                  # ★ 並び順そのまま
+            pr_thumbnail_urls=pr_thumbnail_urls,  # ★ pr_images と同じ並び
 
             rice_variety_label=row.rice_variety_label,
             harvest_year=harvest_year,
@@ -127,10 +151,11 @@ class PublicFarmDetailService:
             pr_title=row.pr_title,
             pr_text=row.pr_text,
 
-            pickup_slot_code=row.pickup_slot_code,
-            next_pickup_display=next_pickup_display,
-            next_pickup_start=start_dt.isoformat(),
-            next_pickup_deadline=deadline_dt.isoformat(),
+            pickup_slot_code=next_slot.pickup_slot_code,
+            next_pickup_display=next_slot.next_pickup_display,
+            next_pickup_start=next_slot.next_pickup_start,
+            next_pickup_deadline=next_slot.next_pickup_deadline,
+            pickup_slots=pickup_slots,
 
             pickup_place_name=row.pickup_place_name,
             pickup_notes=row.pickup_notes,
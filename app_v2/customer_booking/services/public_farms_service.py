@@ -1,24 +1,38 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from datetime import datetime
-from math import radians, sin, cos, asin, sqrt
-from typing import List, Optional, Tuple
+from typing import Hashable, List, Optional, Tuple
 import json
 import ast
 
+from app_v2.common.single_flight import SingleFlight
+from app_v2.common.trusted_dto import build_trusted
+from app_v2.config.settings import get_settings
 from app_v2.customer_booking.dtos import (
     PublicFarmCardDTO,
     PublicFarmListResponse,
+    PublicFarmMapClusterDTO,
+    PublicFarmMapClustersResponse,
 )
 from app_v2.customer_booking.repository.public_farms_repo import (
     PublicFarmsRepository,
     PublicFarmRow,
 )
+from app_v2.customer_booking.services.farm_map_index import (
+    FarmMapIndexCache,
+    MapCluster,
+)
+from app_v2.customer_booking.services.farm_ranking_cache import FarmRankingCache
+from app_v2.domain.geo import distance_km
+from app_v2.domain.pickup_schedule import PickupSchedule
+from app_v2.domain.pickup_slot import PickupSlot
 from app_v2.customer_booking.utils.pickup_time_utils import (
     JST,
-    compute_next_pickup,
-    parse_slot_code,
+    SlotLike,
+    get_schedule,
+    get_slot,
 )
 
 # ============================================================
@@ -31,8 +45,44 @@ PAGE_SIZE = 8
 DEFAULT_CENTER_LAT = 34.0703
 DEFAULT_CENTER_LNG = 134.5548
 
+NEARBY_RADIUS_KM = 100.0
+
 WEEKDAY_JP = ["月", "火", "水", "木", "金", "土", "日"]
 
+# 同時に来た同じ一覧リクエストは 1 回の計算にまとめる（app_v2.common.single_flight）
+_list_flight: SingleFlight[PublicFarmListResponse] = SingleFlight("public_farms.list")
+
+# ユーザー位置を格子に丸めた「距離順の farm_id の並び」（farm_ranking_cache 参照）と
+# 地図のクラスタ用の空間インデックス（farm_map_index 参照）。
+# どちらもプロセスで 1 つ・初めて使うときに settings から作る
+_ranking_cache: Optional[FarmRankingCache] = None
+_map_index_cache: Optional[FarmMapIndexCache] = None
+_caches_lock = threading.Lock()
+
+
+def _get_ranking_cache() -> FarmRankingCache:
+    global _ranking_cache
+    if _ranking_cache is None:
+        with _caches_lock:
+            if _ranking_cache is None:
+                settings = get_settings()
+                _ranking_cache = FarmRankingCache(
+                    cell_km=settings.location_cache_grid_km,
+                    max_cells=settings.location_cache_max_cells,
+                )
+    return _ranking_cache
+
+
+def _get_map_index_cache() -> FarmMapIndexCache:
+    global _map_index_cache
+    if _map_index_cache is None:
+        with _caches_lock:
+            if _map_index_cache is None:
+                _map_index_cache = FarmMapIndexCache(
+                    cell_px=get_settings().map_cluster_cell_px,
+                )
+    return _map_index_cache
+
 
 # ============================================================
 # Service 本体
@@ -57,25 +107,105 @@ class PublicFarmsService:
         page: int,
         lat: Optional[float],
         lng: Optional[float],
+        content_key: Hashable = None,
     ) -> PublicFarmListResponse:
-
+        """
+        content_key: API 層の PublicCacheCheck.content_key（ETag を決めた version と時間帯）。
+        同じ計算をまとめるのは content_key も同じ呼び出しだけ
+        """
         center_lat, center_lng = _resolve_center(lat, lng)
 
+        return _list_flight.do(
+            (content_key, page, center_lat, center_lng),
+            lambda: self._compute_public_farms(page, center_lat, center_lng),
+        )
+
+    def _compute_public_farms(
+        self,
+        page: int,
+        center_lat: float,
+        center_lng: float,
+    ) -> PublicFarmListResponse:
+        ranking_cache = _get_ranking_cache()
+        version = (
+            self.repo.fetch_publish_set_version() if ranking_cache.enabled else None
+        )
+        if version is None:
+            return self._compute_public_farms_all(page, center_lat, center_lng)
+
+        # 並び順はキャッシュから（ページ分だけユーザー位置で並べ直す）。
+        # カードはページ分の行だけ読んで作る
+        ranking = ranking_cache.get(
+            version=version,
+            lat=center_lat,
+            lng=center_lng,
+            load_locations=self.repo.fetch_publishable_farm_locations,
+        )
+
+        total_count = len(ranking.farm_ids)
+        start_idx = (page - 1) * PAGE_SIZE
+        end_idx = start_idx + PAGE_SIZE
+        page_ids = ranking.page(center_lat, center_lng, start_idx, end_idx)
+
+        rows_by_id = {
+            r.farm_id: r for r in self.repo.fetch_publishable_farms_by_ids(page_ids)
+        }
+
+        now = datetime.now(JST)
+        page_items: List[PublicFarmCardDTO] = []
+
+        for farm_id in page_ids:
+            r = rows_by_id.get(farm_id)
+            if r is None:
+                # 並びを作った後に非公開になった（次の version で並びから消える）
+                continue
+
+            schedule = get_schedule(r.pickup_slot_codes or (r.pickup_slot_code,))
+            slot, start_dt, deadline_dt = schedule.next_pickup(now, JST)
+            display = _format_next_pickup_display(start_dt, slot)
+
+            page_items.append(
+                _build_card_dto(r, schedule, slot, start_dt, deadline_dt, display)
+            )
+
+        return PublicFarmListResponse(
+            page=page,
+            page_size=PAGE_SIZE,
+            total_count=total_count,
+            has_next=end_idx < total_count,
+            no_farms_within_100km=not ranking.any_within(
+                center_lat, center_lng, NEARBY_RADIUS_KM
+            ),
+            farms=page_items,
+        )
+
+    def _compute_public_farms_all(
+        self,
+        page: int,
+        center_lat: float,
+        center_lng: float,
+    ) -> PublicFarmListResponse:
+        """
+        キャッシュなし（LOCATION_CACHE_GRID_KM<=0・table_versions の無い DB）：
+        全件を読んでユーザー位置からの距離順に並べる。
+        """
+
         rows: List[PublicFarmRow] = self.repo.fetch_publishable_farms()
 
         now = datetime.now(JST)
         enriched: List[Tuple[float, PublicFarmCardDTO]] = []
 
         for r in rows:
-            distance_km = _compute_distance_km(
+            dist_km = distance_km(
                 center_lat, center_lng, r.pickup_lat, r.pickup_lng
             )
 
-            start_dt, deadline_dt = compute_next_pickup(now, r.pickup_slot_code)
-            display = _format_next_pickup_display(start_dt, r.pickup_slot_code)
+            schedule = get_schedule(r.pickup_slot_codes or (r.pickup_slot_code,))
+            slot, start_dt, deadline_dt = schedule.next_pickup(now, JST)
+            display = _format_next_pickup_display(start_dt, slot)
 
-            dto = _build_card_dto(r, start_dt, deadline_dt, display)
-            enriched.append((distance_km, dto))
+            dto = _build_card_dto(r, schedule, slot, start_dt, deadline_dt, display)
+            enriched.append((dist_km, dto))
 
         enriched.sort(key=lambda x: x[0])
         sorted_dtos = [dto for _, dto in enriched]
@@ -88,7 +218,7 @@ class PublicFarmsService:
         has_next = end_idx < total_count
 
         no_farms_within_100km = (
-            all(dist > 100.0 for dist, _ in enriched) if enriched else True
+            all(dist > NEARBY_RADIUS_KM for dist, _ in enriched) if enriched else True
         )
 
         return PublicFarmListResponse(
@@ -131,14 +261,83 @@ class PublicFarmsService:
         result: List[PublicFarmCardDTO] = []
 
         for r in rows:
-            start_dt, deadline_dt = compute_next_pickup(now, r.pickup_slot_code)
-            display = _format_next_pickup_display(start_dt, r.pickup_slot_code)
-            dto = _build_card_dto(r, start_dt, deadline_dt, display)
+            schedule = get_schedule(r.pickup_slot_codes or (r.pickup_slot_code,))
+            slot, start_dt, deadline_dt = schedule.next_pickup(now, JST)
+            display = _format_next_pickup_display(start_dt, slot)
+            dto = _build_card_dto(r, schedule, slot, start_dt, deadline_dt, display)
             result.append(dto)
 
         return result
 
 
+    # --------------------------------------------------------
+    # 地図表示用（クラスタ）
+    # --------------------------------------------------------
+    def get_public_farm_clusters_for_map(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+        zoom: int,
+    ) -> PublicFarmMapClustersResponse:
+        """
+        低ズーム：表示範囲の農家を格子でまとめたクラスタだけを返す（DB は version のみ）。
+        高ズーム（MAP_CLUSTER_CARD_MIN_ZOOM 以上）で範囲内が MAP_CLUSTER_MAX_CARDS 件以下：
+        カードを返す（get_public_farms_for_map と同じ）。
+        """
+        if min_lat > max_lat:
+            min_lat, max_lat = max_lat, min_lat
+        if min_lng > max_lng:
+            min_lng, max_lng = max_lng, min_lng
+
+        settings = get_settings()
+        index = _get_map_index_cache().get(
+            version=self.repo.fetch_publish_set_version(),
+            load_markers=self.repo.fetch_publishable_farm_markers,
+        )
+        total_count = index.count_in_bounds(min_lat, max_lat, min_lng, max_lng)
+
+        if (
+            zoom >= settings.map_cluster_card_min_zoom
+            and total_count <= settings.map_cluster_max_cards
+        ):
+            farms = (
+                self.get_public_farms_for_map(
+                    min_lat=min_lat,
+                    max_lat=max_lat,
+                    min_lng=min_lng,
+                    max_lng=max_lng,
+                    limit=settings.map_cluster_max_cards,
+                )
+                if total_count
+                else []
+            )
+            return build_trusted(
+                PublicFarmMapClustersResponse,
+                zoom=zoom,
+                mode="farms",
+                total_count=total_count,
+                farms=farms,
+            )
+
+        # 返すクラスタ数を抑える（範囲が広すぎるときは粗い格子で集計する）
+        grid_zoom = zoom
+        while grid_zoom > 0 and index.grid_cells_in_bounds(
+            grid_zoom, min_lat, max_lat, min_lng, max_lng
+        ) > settings.map_cluster_max_grid_cells:
+            grid_zoom -= 1
+
+        clusters = index.clusters_in_bounds(grid_zoom, min_lat, max_lat, min_lng, max_lng)
+        return build_trusted(
+            PublicFarmMapClustersResponse,
+            zoom=zoom,
+            mode="clusters",
+            total_count=total_count,
+            clusters=[_build_cluster_dto(grid_zoom, c) for c in clusters],
+        )
+
+
 # ============================================================
 # 内部ユーティリティ（Service 専用）
 # ============================================================
@@ -153,30 +352,24 @@ def _resolve_center(
     return DEFAULT_CENTER_LAT, DEFAULT_CENTER_LNG
 
 
-def _compute_distance_km(
-    lat1: float, lng1: float, lat2: float, lng2: float
-) -> float:
-    R = 6371.0
-    d_lat = radians(lat2 - lat1)
-    d_lng = radians(lng2 - lng1)
-    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(
-        d_lng / 2
-    ) ** 2
-    return 2 * R * asin(sqrt(a))
-
-
-def _format_next_pickup_display(start_dt: datetime, slot_code: str) -> str:
-    weekday_idx, start_hour, end_hour = parse_slot_code(slot_code)
+def _format_next_pickup_display(start_dt: datetime, slot_code: SlotLike) -> str:
+    slot = get_slot(slot_code)
     return (
         f"{start_dt.month}/{start_dt.day}"
-        f"（{WEEKDAY_JP[weekday_idx]}）"
-        f"{start_hour:02d}:00–{end_hour:02d}:00"
+        f"（{WEEKDAY_JP[slot.weekday]}）"
+        f"{slot.start_hour:02d}:00–{slot.end_hour:02d}:00"
     )
 
 
-def _parse_pr_images(raw: Optional[str]) -> List[str]:
+def _parse_pr_images(raw: Optional[str]) -> Tuple[List[str], List[str]]:
+    """
+    pr_images_json → (表示用 URL リスト, サムネイル URL リスト)
+
+    - 2 つのリストは同じ順序・同じ長さ
+    - thumbnail_url を持たない旧データは表示用 URL で代用する
+    """
     if not raw:
-        return []
+        return [], []
 
     try:
         data = json.loads(raw)
@@ -184,35 +377,50 @@ def _parse_pr_images(raw: Optional[str]) -> List[str]:
         try:
             data = ast.literal_eval(raw)
         except Exception:
-            return []
+            return [], []
 
     if isinstance(data, dict):
         items = [data]
     elif isinstance(data, list):
         items = data
     else:
-        return []
+        return [], []
+
+    urls: List[str] = []
+    thumbnail_urls: List[str] = []
+    for i in items:
+        if not isinstance(i, dict) or not i.get("url"):
+            continue
+        url = str(i["url"])
+        urls.append(url)
+        thumbnail_urls.append(str(i.get("thumbnail_url") or url))
 
-    return [str(i["url"]) for i in items if isinstance(i, dict) and i.get("url")]
+    return urls, thumbnail_urls
 
 
 def _build_card_dto(
     r: PublicFarmRow,
+    schedule: PickupSchedule,
+    slot: PickupSlot,
     start_dt: datetime,
     deadline_dt: datetime,
     display: str,
 ) -> PublicFarmCardDTO:
     owner_full_name = f"{r.owner_last_name}{r.owner_first_name}"
-    return PublicFarmCardDTO(
+    pr_images, pr_thumbnail_urls = _parse_pr_images(r.pr_images_raw)
+    return build_trusted(
+        PublicFarmCardDTO,
         farm_id=r.farm_id,
         owner_label=f"{owner_full_name}さんのお米",
         owner_address_label=_build_owner_address_label(r.owner_address),
         owner_full_name=owner_full_name,
         price_10kg=r.price_10kg,
         face_image_url=r.face_image_url,
-        pr_images=_parse_pr_images(r.pr_images_raw),
+        pr_images=pr_images,
+        pr_thumbnail_urls=pr_thumbnail_urls,
         pr_title=r.pr_title,
-        pickup_slot_code=r.pickup_slot_code,
+        pickup_slot_code=slot.code,
+        pickup_slot_codes=list(schedule.codes),
         next_pickup_display=display,
         next_pickup_start=start_dt.isoformat(),
         next_pickup_deadline=deadline_dt.isoformat(),
@@ -221,6 +429,23 @@ def _build_card_dto(
     )
 
 
+def _build_cluster_dto(zoom: int, c: MapCluster) -> PublicFarmMapClusterDTO:
+    col, row = c.key
+    return build_trusted(
+        PublicFarmMapClusterDTO,
+        cluster_id=f"{zoom}/{col}/{row}",
+        lat=c.lat,
+        lng=c.lng,
+        count=c.count,
+        min_lat=c.min_lat,
+        max_lat=c.max_lat,
+        min_lng=c.min_lng,
+        max_lng=c.max_lng,
+        representative_farm_id=c.representative_farm_id,
+        representative_face_image_url=c.representative_face_image_url,
+    )
+
+
 def _build_owner_address_label(address: str) -> str:
     base = (address or "").strip()
     for i, ch in enumerate(base):
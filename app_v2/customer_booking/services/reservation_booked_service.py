@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import Optional
 
 from pydantic import BaseModel
@@ -19,6 +19,7 @@ from app_v2.customer_booking.utils.cancel_token import (
     CancelTokenPayload,
     create_cancel_token,
 )
+from app_v2.db.datetimes import parse_db_datetime
 
 
 class ReservationBookedViewDTO(BaseModel):
@@ -52,13 +53,7 @@ class ReservationBookedService:
     def _parse_utc(value) -> Optional[datetime]:
         if value is None:
             return None
-        if isinstance(value, datetime):
-            dt = value
-        else:
-            dt = datetime.fromisoformat(str(value).replace(" ", "T"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
+        return parse_db_datetime(value if isinstance(value, datetime) else str(value))
 
     def get_view_for_reservation(
         self,
@@ -3,9 +3,10 @@ from __future__ import annotations
 import json
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timedelta, time, timezone
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
+from app_v2.common.trusted_dto import build_trusted
 from app_v2.customer_booking.dtos import (
     ExportBundleItemSummaryDTO,
     ExportBundleSummaryDTO,
@@ -19,21 +20,21 @@ from app_v2.customer_booking.repository.reservation_expanded_repo import (
     ReservationRecord,
     FarmRecord,
 )
+from app_v2.customer_booking.services.pickup_event_calendar_service import (
+    PickupEventCalendarService,
+)
+from app_v2.db.datetimes import parse_db_datetime
+from app_v2.domain.pickup_event_batch import (
+    booking_event_starts_us,
+    datetime_to_epoch_us,
+)
+from app_v2.domain.pickup_schedule import PickupSchedule
+from app_v2.domain.pickup_slot import UTC, PickupSlot
 
 # ============================================================
 # pickup_slot_code utilities（ロジック専用・表示禁止）
 # ============================================================
 
-_WEEKDAY_CODE_TO_INDEX: Dict[str, int] = {
-    "MON": 0,
-    "TUE": 1,
-    "WED": 2,
-    "THU": 3,
-    "FRI": 4,
-    "SAT": 5,
-    "SUN": 6,
-}
-
 _PICKUP_SALT = 7919
 
 
@@ -46,26 +47,14 @@ def _parse_db_datetime(value: str) -> datetime:
     SQLite に保存されている DATETIME 文字列を
     UTC aware datetime に正規化する。
     """
-    dt = datetime.fromisoformat(value.replace(" ", "T"))
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+    return parse_db_datetime(value)
 
 
 def _decode_pickup_slot_code(code: str) -> Tuple[int, int, int]:
     """
     "SAT_10_11" → (weekday_index, start_hour, end_hour)
     """
-    try:
-        weekday_str, start_str, end_str = code.split("_")
-    except ValueError:
-        raise ValueError(f"Invalid pickup_slot_code format: {code}")
-
-    weekday_index = _WEEKDAY_CODE_TO_INDEX.get(weekday_str.upper())
-    if weekday_index is None:
-        raise ValueError(f"Unknown weekday in pickup_slot_code: {code}")
-
-    return weekday_index, int(start_str), int(end_str)
+    return PickupSlot.from_code(code).as_tuple()
 
 
 def _calc_base_week_event(
@@ -77,23 +66,7 @@ def _calc_base_week_event(
     pickup_slot_code の event_start / event_end を UTC で計算する。
     ※ ロジック専用（表示には使わない）
     """
-    base = base.astimezone(timezone.utc)
-    weekday_index, start_hour, end_hour = _decode_pickup_slot_code(pickup_slot_code)
-
-    week_start_date = base.date() - timedelta(days=base.weekday())
-    event_date = week_start_date + timedelta(days=weekday_index)
-
-    event_start = datetime.combine(
-        event_date,
-        time(hour=start_hour),
-        tzinfo=timezone.utc,
-    )
-    event_end = datetime.combine(
-        event_date,
-        time(hour=end_hour),
-        tzinfo=timezone.utc,
-    )
-    return event_start, event_end
+    return PickupSlot.from_code(pickup_slot_code).week_event(base, UTC)
 
 
 def _calc_event_for_export(
@@ -104,16 +77,7 @@ def _calc_event_for_export(
     Export ページで「今週 or 来週」を判定するためのロジック（UTC）。
     ※ filtering 用。表示には使わない。
     """
-    base_event_start, base_event_end = _calc_base_week_event(now, pickup_slot_code)
-    grace_until = base_event_end + timedelta(hours=3)
-
-    if now <= grace_until:
-        return base_event_start, base_event_end
-
-    return (
-        base_event_start + timedelta(days=7),
-        base_event_end + timedelta(days=7),
-    )
+    return PickupSlot.from_code(pickup_slot_code).event_for_export(now, UTC)
 
 
 def _calc_event_for_booking(
@@ -124,19 +88,7 @@ def _calc_event_for_booking(
     予約がどの週のイベントに属するかを決める（UTC）。
     ※ filtering 用。表示には使わない。
     """
-    base_event_start, base_event_end = _calc_base_week_event(
-        created_at,
-        pickup_slot_code,
-    )
-    deadline = base_event_start - timedelta(hours=3)
-
-    if created_at <= deadline:
-        return base_event_start, base_event_end
-
-    return (
-        base_event_start + timedelta(days=7),
-        base_event_end + timedelta(days=7),
-    )
+    return PickupSlot.from_code(pickup_slot_code).event_for_booking(created_at, UTC)
 
 
 # ============================================================
@@ -176,8 +128,49 @@ class ReservationExpandedService:
     def __init__(
         self,
         repo: Optional[ReservationExpandedRepository] = None,
+        calendar: Optional[PickupEventCalendarService] = None,
     ) -> None:
         self.repo = repo or ReservationExpandedRepository()
+        self.calendar = calendar or PickupEventCalendarService()
+
+    def _records_for_event(
+        self,
+        *,
+        farm_id: int,
+        pickup_slot_code: str,
+        event_start: datetime,
+    ) -> List[ReservationRecord]:
+        """
+        今回の export 対象イベントに属する confirmed 予約。
+
+        - pickup_events があれば join 1 本で取る
+        - 無ければ（移行前・生成前）従来どおり created_at から週を判定する
+        """
+        event_id = self.calendar.find_event_id_or_none(
+            farm_id=farm_id,
+            event_start=event_start,
+        )
+        if event_id is not None:
+            return self.repo.get_confirmed_reservations_for_event(event_id)
+
+        records: List[ReservationRecord] = (
+            self.repo.get_confirmed_reservations_for_farm(
+                farm_id=farm_id,
+                pickup_slot_code=pickup_slot_code,
+            )
+        )
+
+        # 各予約の booking event を一括で計算（created_at が壊れている行は None）
+        event_start_us = datetime_to_epoch_us(event_start)
+        booking_starts_us = booking_event_starts_us(
+            [rec.created_at for rec in records],
+            pickup_slot_code,
+        )
+        return [
+            rec
+            for rec, booking_start_us in zip(records, booking_starts_us)
+            if booking_start_us == event_start_us
+        ]
 
     def build_export_view(self, farm_id: int) -> ExportReservationsResponseDTO:
         farm: Optional[FarmRecord] = self.repo.get_farm(farm_id)
@@ -190,41 +183,24 @@ class ReservationExpandedService:
                 bundle_summary=ExportBundleSummaryDTO(items=[], total_rice_subtotal=0),
             )
 
-        pickup_slot_code = farm.pickup_time
-
-        reservation_records: List[ReservationRecord] = (
-            self.repo.get_confirmed_reservations_for_farm(
-                farm_id=farm_id,
-                pickup_slot_code=pickup_slot_code,
-            )
+        # 複数スロットの farm は「今表示すべき」最も早いスロットのイベント
+        schedule = PickupSchedule.from_codes(
+            farm.pickup_slot_codes or (farm.pickup_time,)
         )
-
         now = datetime.now(timezone.utc)
-        export_event_start, _ = _calc_event_for_export(
-            now,
-            pickup_slot_code,
+        slot, export_event_start, _ = schedule.event_for_export(now, UTC)
+        pickup_slot_code = slot.code
+
+        reservation_records = self._records_for_event(
+            farm_id=farm_id,
+            pickup_slot_code=pickup_slot_code,
+            event_start=export_event_start,
         )
 
         rows: List[ExportReservationRowDTO] = []
         bundle_acc: Dict[int, _BundleAccumulator] = defaultdict(_BundleAccumulator)
 
         for rec in reservation_records:
-            if not rec.created_at:
-                continue
-
-            try:
-                created_at_dt = _parse_db_datetime(rec.created_at)
-            except Exception:
-                continue
-
-            booking_event_start, _ = _calc_event_for_booking(
-                created_at_dt,
-                pickup_slot_code,
-            )
-
-            # 今回の export 対象イベント以外は除外
-            if booking_event_start.date() != export_event_start.date():
-                continue
 
             items: List[ExportReservationItemDTO] = []
             rice_subtotal_from_items = 0
@@ -263,7 +239,8 @@ class ReservationExpandedService:
                         continue
 
                     items.append(
-                        ExportReservationItemDTO(
+                        build_trusted(
+                            ExportReservationItemDTO,
                             size_kg=size_kg,
                             quantity=quantity,
                             unit_price=unit_price,
@@ -287,7 +264,8 @@ class ReservationExpandedService:
             pickup_code = _generate_pickup_code(rec.id, rec.consumer_id)
 
             rows.append(
-                ExportReservationRowDTO(
+                build_trusted(
+                    ExportReservationRowDTO,
                     reservation_id=rec.id,
                     pickup_code=pickup_code,
                     created_at=rec.created_at,  # 表示目的では使わない
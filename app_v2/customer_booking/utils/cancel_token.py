@@ -1,4 +1,3 @@
-import os
 import json
 import base64
 import hmac
@@ -8,6 +7,8 @@ from dataclasses import dataclass
 
 from fastapi import HTTPException
 
+from app_v2.config.settings import get_settings
+
 
 @dataclass
 class CancelTokenPayload:
@@ -32,7 +33,7 @@ def _get_secret_key() -> bytes:
     環境変数 CANCEL_TOKEN_SECRET を優先し、
     なければ開発用の固定値を使う。
     """
-    secret = os.getenv("CANCEL_TOKEN_SECRET")
+    secret = get_settings().cancel_token_secret
     if not secret:
         # 将来、本番環境では必ず環境変数で上書きする想定
         secret = "dev-cancel-token-secret"
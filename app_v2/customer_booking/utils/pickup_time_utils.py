@@ -1,27 +1,49 @@
 # app_v2/customer_booking/utils/pickup_time_utils.py
 from __future__ import annotations
 
-from datetime import datetime, timedelta, time
-from typing import Tuple
-from zoneinfo import ZoneInfo
+from datetime import datetime
+from typing import Iterable, Tuple, Union
 
-# 共通タイムゾーン（JST）
-JST = ZoneInfo("Asia/Tokyo")
+from app_v2.domain.pickup_schedule import PickupSchedule
+from app_v2.domain.pickup_slot import JST, WEEKDAY_CODES, PickupSlot
 
 # pickup_slot_code 用の曜日マップ
 # "MON"=0 .. "SUN"=6（datetime.weekday と一致）
-WEEKDAY_MAP = {
-    "MON": 0,
-    "TUE": 1,
-    "WED": 2,
-    "THU": 3,
-    "FRI": 4,
-    "SAT": 5,
-    "SUN": 6,
-}
+WEEKDAY_MAP = {code: i for i, code in enumerate(WEEKDAY_CODES)}
 
 _WEEKDAY_JP = ["月", "火", "水", "木", "金", "土", "日"]
 
+# ============================================================
+# 実装は app_v2.domain.pickup_slot.PickupSlot（JST 基準）。
+# ここは従来の関数 API を残すための薄いラッパ。
+# ループ内では PickupSlot を 1 度だけ取って使い回すこと。
+# ============================================================
+
+SlotLike = Union[str, PickupSlot]
+
+
+def get_slot(slot_code: SlotLike) -> PickupSlot:
+    """
+    pickup_slot_code → PickupSlot（寛容な解析・同じコードなら同じインスタンス）
+    """
+    if isinstance(slot_code, PickupSlot):
+        return slot_code
+    return PickupSlot.from_code_lenient(slot_code, tz=JST)
+
+
+def get_schedule(slot_codes: Iterable[str]) -> PickupSchedule:
+    """
+    farm の全スロットコード → PickupSchedule（複数スロット farm 用）
+
+    - 正しいコードだけなら intern 済みのものを返す
+    - 想定外のコードを含む場合は get_slot と同じ寛容な解析で都度組み立てる
+    """
+    codes = tuple(slot_codes) or ("",)
+    try:
+        return PickupSchedule.from_codes(codes)
+    except ValueError:
+        return PickupSchedule(get_slot(c) for c in codes)
+
 
 # ============================================================
 # slot_code parsing
@@ -38,19 +60,7 @@ def parse_slot_code(slot_code: str) -> Tuple[int, int, int]:
     想定外フォーマットの場合:
         - 「今日の曜日インデックス」と「0:00–1:00」を返す
     """
-    try:
-        parts = slot_code.split("_")
-        if len(parts) != 3:
-            raise ValueError
-        day_str, start_str, end_str = parts
-    except Exception:
-        weekday_idx = datetime.now(JST).weekday()
-        return weekday_idx, 0, 1
-
-    weekday_idx = WEEKDAY_MAP.get(day_str.upper(), 0)
-    start_hour = int(start_str)
-    end_hour = int(end_str)
-    return weekday_idx, start_hour, end_hour
+    return get_slot(slot_code).as_tuple()
 
 
 # ============================================================
@@ -59,28 +69,13 @@ def parse_slot_code(slot_code: str) -> Tuple[int, int, int]:
 
 def calc_base_week_event(
     base: datetime,
-    pickup_slot_code: str,
+    pickup_slot_code: SlotLike,
 ) -> Tuple[datetime, datetime]:
     """
     指定した base が属する「週」（月曜はじまり）における
     pickup_slot_code の event_start / event_end を計算する。
     """
-    base = base.astimezone(JST)
-    weekday_idx, start_hour, end_hour = parse_slot_code(pickup_slot_code)
-
-    # 月曜始まりの週
-    week_start_date = base.date() - timedelta(days=base.weekday())
-    event_date = week_start_date + timedelta(days=weekday_idx)
-
-    event_start = datetime.combine(
-        event_date,
-        time(hour=start_hour, minute=0, tzinfo=JST),
-    )
-    event_end = datetime.combine(
-        event_date,
-        time(hour=end_hour, minute=0, tzinfo=JST),
-    )
-    return event_start, event_end
+    return get_slot(pickup_slot_code).week_event(base, JST)
 
 
 # ============================================================
@@ -89,7 +84,7 @@ def calc_base_week_event(
 
 def calc_event_for_booking(
     created_at: datetime,
-    pickup_slot_code: str,
+    pickup_slot_code: SlotLike,
 ) -> Tuple[datetime, datetime]:
     """
     予約確定時に「どの週のイベント扱いにするか」を決める。
@@ -98,18 +93,12 @@ def calc_event_for_booking(
     - event_start の 3時間前 までは「今週のイベント」
     - それ以降に入った予約は「次週のイベント」
     """
-    base_start, base_end = calc_base_week_event(created_at, pickup_slot_code)
-    deadline = base_start - timedelta(hours=3)
-
-    if created_at <= deadline:
-        return base_start, base_end
-
-    return base_start + timedelta(days=7), base_end + timedelta(days=7)
+    return get_slot(pickup_slot_code).event_for_booking(created_at, JST)
 
 
 def calc_event_for_export(
     now: datetime,
-    pickup_slot_code: str,
+    pickup_slot_code: SlotLike,
 ) -> Tuple[datetime, datetime]:
     """
     Export / 管理画面で「今表示すべきイベント週」を決める。
@@ -118,18 +107,12 @@ def calc_event_for_export(
     - now <= event_end + 3h → 今週
     - それ以降 → 次週
     """
-    base_start, base_end = calc_base_week_event(now, pickup_slot_code)
-    grace_until = base_end + timedelta(hours=3)
-
-    if now <= grace_until:
-        return base_start, base_end
-
-    return base_start + timedelta(days=7), base_end + timedelta(days=7)
+    return get_slot(pickup_slot_code).event_for_export(now, JST)
 
 
 def compute_next_pickup(
     now: datetime,
-    slot_code: str,
+    slot_code: SlotLike,
 ) -> Tuple[datetime, datetime]:
     """
     pickup_slot_code と現在時刻から
@@ -140,36 +123,7 @@ def compute_next_pickup(
     - 受付締切は start - 3時間
     - 今週分が「3時間前ルール」でアウトなら、来週へ
     """
-    weekday_idx, start_hour, _ = parse_slot_code(slot_code)
-
-    today_wd = now.weekday()
-    days_ahead = (weekday_idx - today_wd) % 7
-    candidate_date = (now + timedelta(days=days_ahead)).date()
-
-    start_dt = datetime(
-        candidate_date.year,
-        candidate_date.month,
-        candidate_date.day,
-        start_hour,
-        0,
-        0,
-        tzinfo=JST,
-    )
-
-    if start_dt - now <= timedelta(hours=3):
-        candidate_date = candidate_date + timedelta(days=7)
-        start_dt = datetime(
-            candidate_date.year,
-            candidate_date.month,
-            candidate_date.day,
-            start_hour,
-            0,
-            0,
-            tzinfo=JST,
-        )
-
-    deadline_dt = start_dt - timedelta(hours=3)
-    return start_dt, deadline_dt
+    return get_slot(slot_code).next_pickup(now, JST)
 
 
 # ============================================================
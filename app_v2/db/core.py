@@ -1,6 +1,51 @@
 # app_v2/db/core.py
 import os
+import sqlite3
 from pathlib import Path
 
+from app_v2.config.settings import get_settings
+from app_v2.observability.db_stats import MeteredConnection
+
+
 def resolve_db_path() -> Path:
     return Path(os.getenv("DB_PATH", "app.db")).resolve()
+
+
+def _connection_class() -> type:
+    if get_settings().sql_trace_enabled:
+        from app_v2.db.sql_trace import TracedConnection
+
+        return TracedConnection
+    return MeteredConnection
+
+
+def connect(
+    db_path=None,
+    *,
+    parse_datetimes: bool = False,
+    row_factory=None,
+) -> sqlite3.Connection:
+    """
+    DB に接続する（db_path 省略時は resolve_db_path()）。
+
+    接続は MeteredConnection（リクエスト中はクエリ数・時間が /metrics に載る）。
+    SQL_TRACE=1 のときは TracedConnection（slow query / N+1 のログ）。
+
+    parse_datetimes=True の場合、宣言型 DATETIME の列は
+    datetime（UTC aware）で返る（app_v2.db.datetimes の共通パーサ）。
+    """
+    if parse_datetimes:
+        from app_v2.db.datetimes import register_datetime_converter
+
+        register_datetime_converter()
+        conn = sqlite3.connect(
+            db_path or resolve_db_path(),
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            factory=_connection_class(),
+        )
+    else:
+        conn = sqlite3.connect(db_path or resolve_db_path(), factory=_connection_class())
+
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
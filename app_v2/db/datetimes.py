@@ -0,0 +1,98 @@
+# app_v2/db/datetimes.py
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, Union
+
+# ============================================================
+# SQLite DATETIME 文字列の共通パーサ
+#
+# - 戻り値は常に UTC aware datetime
+#   （タイムゾーン無しは UTC とみなす・他のオフセットは UTC に変換）
+# - "YYYY-MM-DD HH:MM:SS[.ffffff]"（CURRENT_TIMESTAMP 等）は
+#   "+00:00" を付けて fromisoformat に渡す（replace(tzinfo=...) より速い）
+# - 同じ文字列は何度も来る（created_at / event_start_at）ので
+#   生の文字列をキーに LRU キャッシュする（datetime は immutable なので共有して安全）
+# ============================================================
+
+UTC = timezone.utc
+
+DB_DATETIME_CACHE_SIZE = 8192
+
+DbDatetimeValue = Union[str, bytes, datetime]
+
+
+@lru_cache(maxsize=DB_DATETIME_CACHE_SIZE)
+def _parse_text(text: str) -> datetime:
+    n = len(text)
+    if (
+        (n == 19 or (n == 26 and text[19] == "." and text[20:].isdigit()))
+        and text[10] in " T"
+        and text[4] == "-"
+    ):
+        # タイムゾーン無しの固定書式（fast path）。
+        # 26 文字でも ".12345Z" のように末尾にゾーンがあるものは下の一般形へ
+        return datetime.fromisoformat(text + "+00:00")
+
+    dt = datetime.fromisoformat(text.replace(" ", "T"))
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    if dt.utcoffset():
+        return dt.astimezone(UTC)
+    return dt
+
+
+def parse_db_datetime(value: DbDatetimeValue) -> datetime:
+    """
+    DB の DATETIME 値（TEXT / bytes / datetime）→ UTC aware datetime。
+    解釈できない場合は ValueError。
+    """
+    if type(value) is str:
+        return _parse_text(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC)
+        return value.astimezone(UTC)
+    if isinstance(value, bytes):
+        return _parse_text(value.decode("utf-8"))
+    if isinstance(value, str):
+        return _parse_text(str(value))
+    raise ValueError(f"invalid datetime value: {value!r}")
+
+
+def parse_db_datetime_or_none(value: Optional[DbDatetimeValue]) -> Optional[datetime]:
+    """
+    parse_db_datetime の寛容版。None / 空文字 / 解釈できない値は None。
+    """
+    if value is None or value == "" or value == b"":
+        return None
+    try:
+        return parse_db_datetime(value)
+    except ValueError:
+        return None
+
+
+def clear_db_datetime_cache() -> None:
+    _parse_text.cache_clear()
+
+
+# ============================================================
+# sqlite3 converter（detect_types=PARSE_DECLTYPES の接続だけに効く）
+# ============================================================
+
+def _convert_datetime(raw: bytes) -> Union[datetime, str]:
+    # 壊れた値でクエリ全体を落とさない（文字列のまま返す）
+    try:
+        return parse_db_datetime(raw)
+    except ValueError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def register_datetime_converter() -> None:
+    """
+    宣言型が DATETIME の列を datetime（UTC aware）で受け取れるようにする。
+    何度呼んでもよい。
+    """
+    sqlite3.register_converter("DATETIME", _convert_datetime)
@@ -0,0 +1,255 @@
+# app_v2/db/sql_trace.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import sqlite3
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_v2.config.settings import get_settings
+from app_v2.observability.db_stats import (
+    DbStats,
+    MeteredConnection,
+    MeteredCursor,
+    current_db_stats,
+)
+
+# ============================================================
+# SQL トレース（SQL_TRACE=1 のときだけ connect() がこの接続を使う）
+#
+# - 文ごとに fingerprint（リテラル → ?、IN (?, ?, ...) → IN (...)）を取り、
+#   リクエスト単位で [回数, 秒, 行数] を集計する（DbStats.statements）
+# - SQL_SLOW_MS を超えた文は EXPLAIN QUERY PLAN 付きでログに出す
+# - リクエスト終了時（RequestMetricsMiddleware）に
+#     同じ fingerprint が SQL_REPEAT_THRESHOLD 回以上 → N+1 の疑い
+#     文の数が SQL_QUERY_BUDGET 超え → 内訳
+#   をログに出す
+# ============================================================
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = Tuple[str, str]  # (短い id, 正規化した SQL)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, ?\?)*\)", re.IGNORECASE)
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+_LOG_SQL_MAX_CHARS = 200
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> Fingerprint:
+    """
+    SQL → (id, 正規化した SQL)。repo の SQL は定数文字列なので文字列ごとにキャッシュする。
+    """
+    text = _STRING_LITERAL.sub("?", sql)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    text = _IN_LIST.sub("IN (...)", text)
+    fid = hashlib.blake2b(text.encode("utf-8"), digest_size=4).hexdigest()
+    return fid, text
+
+
+def _short(text: str) -> str:
+    if len(text) <= _LOG_SQL_MAX_CHARS:
+        return text
+    return text[:_LOG_SQL_MAX_CHARS] + "…"
+
+
+def _explain(conn: sqlite3.Connection, sql: str, parameters: Any) -> str:
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return "-"
+    try:
+        # 素の Connection.execute（トレースを通さない）
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    except sqlite3.Error as e:
+        return f"(explain failed: {e})"
+    return " | ".join(str(r[-1]) for r in rows) or "-"
+
+
+class _StatementTrace:
+    __slots__ = ("fp", "sql", "parameters", "elapsed", "entry", "logged")
+
+    def __init__(self, fp: Fingerprint, sql: str, parameters: Any, entry: Optional[List]) -> None:
+        self.fp = fp
+        self.sql = sql
+        self.parameters = parameters
+        self.elapsed = 0.0
+        self.entry = entry
+        self.logged = False
+
+
+class TracedCursor(MeteredCursor):
+    _trace: Optional[_StatementTrace] = None
+
+    # --------------------------------------------------------
+    # execute
+    # --------------------------------------------------------
+
+    def execute(self, sql, parameters=(), /):
+        t0 = perf_counter()
+        try:
+            return sqlite3.Cursor.execute(self, sql, parameters)
+        finally:
+            self._begin(sql, parameters, perf_counter() - t0, explain=True)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        t0 = perf_counter()
+        try:
+            return sqlite3.Cursor.executemany(self, sql, seq_of_parameters)
+        finally:
+            self._begin(sql, None, perf_counter() - t0, explain=False)
+
+    # --------------------------------------------------------
+    # fetch（時間と行数を直前の文に足す）
+    # --------------------------------------------------------
+
+    def fetchone(self):
+        t0 = perf_counter()
+        row = sqlite3.Cursor.fetchone(self)
+        self._fetched(perf_counter() - t0, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        t0 = perf_counter()
+        if size is None:
+            rows = sqlite3.Cursor.fetchmany(self)
+        else:
+            rows = sqlite3.Cursor.fetchmany(self, size)
+        self._fetched(perf_counter() - t0, len(rows))
+        return rows
+
+    def fetchall(self):
+        t0 = perf_counter()
+        rows = sqlite3.Cursor.fetchall(self)
+        self._fetched(perf_counter() - t0, len(rows))
+        return rows
+
+    # --------------------------------------------------------
+    # 内部
+    # --------------------------------------------------------
+
+    def _begin(self, sql: str, parameters: Any, elapsed: float, *, explain: bool) -> None:
+        fp = fingerprint(sql)
+        stats = current_db_stats()
+        entry = None
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+            entry = _entry_for(stats, fp)
+            entry[0] += 1
+            entry[1] += elapsed
+            if self.rowcount > 0:
+                entry[2] += self.rowcount
+
+        trace = _StatementTrace(fp, sql, parameters if explain else None, entry)
+        self._trace = trace
+        self._add_elapsed(trace, elapsed, explain=explain)
+
+    def _fetched(self, elapsed: float, rows: int) -> None:
+        stats = current_db_stats()
+        if stats is not None:
+            stats.seconds += elapsed
+        trace = self._trace
+        if trace is None:
+            return
+        if trace.entry is not None:
+            trace.entry[1] += elapsed
+            trace.entry[2] += rows
+        self._add_elapsed(trace, elapsed, explain=trace.parameters is not None)
+
+    def _add_elapsed(self, trace: _StatementTrace, elapsed: float, *, explain: bool) -> None:
+        trace.elapsed += elapsed
+        if trace.logged or trace.elapsed * 1000 < get_settings().sql_slow_ms:
+            return
+        trace.logged = True
+        fid, text = trace.fp
+        plan = _explain(self.connection, trace.sql, trace.parameters) if explain else "-"
+        logger.warning(
+            "slow query %.1fms: %s",
+            trace.elapsed * 1000,
+            _short(text),
+            extra={
+                "event": "sql.slow",
+                "elapsed_ms": round(trace.elapsed * 1000, 1),
+                "fingerprint": fid,
+                "plan": plan,
+            },
+        )
+
+
+class TracedConnection(MeteredConnection):
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+
+def _entry_for(stats: DbStats, fp: Fingerprint) -> List:
+    statements: Optional[Dict[Fingerprint, List]] = stats.statements
+    if statements is None:
+        statements = stats.statements = {}
+    entry = statements.get(fp)
+    if entry is None:
+        entry = statements[fp] = [0, 0.0, 0]
+    return entry
+
+
+# ============================================================
+# リクエスト終了時のレポート
+# ============================================================
+
+def report_request_sql(route: str, stats: DbStats) -> None:
+    statements: Optional[Dict[Fingerprint, List]] = stats.statements
+    if not statements:
+        return
+
+    settings = get_settings()
+    by_count = sorted(statements.items(), key=lambda kv: -kv[1][0])
+
+    for (fid, text), (count, seconds, rows) in by_count:
+        if count < settings.sql_repeat_threshold:
+            break
+        logger.warning(
+            "possible N+1 on %s: %dx %s",
+            route,
+            count,
+            _short(text),
+            extra={
+                "event": "sql.n_plus_one",
+                "route": route,
+                "count": count,
+                "elapsed_ms": round(seconds * 1000, 1),
+                "rows": rows,
+                "fingerprint": fid,
+            },
+        )
+
+    if stats.queries > settings.sql_query_budget:
+        logger.warning(
+            "query budget exceeded on %s: %d queries (budget %d)",
+            route,
+            stats.queries,
+            settings.sql_query_budget,
+            extra={
+                "event": "sql.query_budget",
+                "route": route,
+                "queries": stats.queries,
+                "budget": settings.sql_query_budget,
+                "db_ms": round(stats.seconds * 1000, 1),
+                "top": [
+                    {
+                        "count": count,
+                        "elapsed_ms": round(seconds * 1000, 1),
+                        "rows": rows,
+                        "fingerprint": fid,
+                        "sql": _short(text),
+                    }
+                    for (fid, text), (count, seconds, rows) in by_count[:5]
+                ],
+            },
+        )
@@ -0,0 +1,73 @@
+# app_v2/domain/geo.py
+from __future__ import annotations
+
+from math import asin, cos, log, pi, radians, sin, sqrt
+from typing import Tuple
+
+# ============================================================
+# 緯度経度の計算（距離・格子への量子化）
+#
+# - 距離は球面（haversine）。公開一覧の並び順・100km 判定で使う
+# - 格子は「一辺 cell_km のおおよそ正方形」。緯度方向は 1 度 ≒ 111.32km、
+#   経度方向は格子の行（緯度）ごとの cos で割る（同じ行なら同じ幅）
+# ============================================================
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+GridCell = Tuple[int, int]
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    d_lat = radians(lat2 - lat1)
+    d_lng = radians(lng2 - lng1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(
+        d_lng / 2
+    ) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def _lat_step_deg(cell_km: float) -> float:
+    return cell_km / KM_PER_DEG_LAT
+
+
+def _lng_step_deg(cell_km: float, row: int) -> float:
+    # 行の中央の緯度で幅を決める（極付近は cos を下限で止める）
+    lat_mid = (row + 0.5) * _lat_step_deg(cell_km)
+    return cell_km / (KM_PER_DEG_LAT * max(cos(radians(lat_mid)), 0.01))
+
+
+def grid_cell(lat: float, lng: float, cell_km: float) -> GridCell:
+    """
+    (lat, lng) を含む格子の (行, 列)。cell_km > 0 であること。
+    """
+    row = int(lat // _lat_step_deg(cell_km))
+    col = int(lng // _lng_step_deg(cell_km, row))
+    return row, col
+
+
+def grid_cell_center(cell: GridCell, cell_km: float) -> Tuple[float, float]:
+    row, col = cell
+    return (
+        (row + 0.5) * _lat_step_deg(cell_km),
+        (col + 0.5) * _lng_step_deg(cell_km, row),
+    )
+
+
+# ============================================================
+# Web メルカトル（地図タイルの座標）
+#
+# - x, y は 0..1 の正規化座標（ズーム z のピクセル座標は x * 256 * 2**z）
+# - 地図のクラスタ格子は「画面上で同じ大きさ」になるようこの座標で切る
+# ============================================================
+
+MERCATOR_MAX_LAT = 85.05112878
+MAP_TILE_PX = 256
+
+
+def mercator_xy(lat: float, lng: float) -> Tuple[float, float]:
+    lat = max(-MERCATOR_MAX_LAT, min(MERCATOR_MAX_LAT, lat))
+    x = (lng + 180.0) / 360.0
+    s = sin(radians(lat))
+    y = 0.5 - log((1 + s) / (1 - s)) / (4 * pi)
+    return x, y
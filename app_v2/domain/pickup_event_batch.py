@@ -0,0 +1,189 @@
+# app_v2/domain/pickup_event_batch.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app_v2.db.datetimes import parse_db_datetime_or_none
+from app_v2.domain.pickup_slot import BOOKING_DEADLINE, PickupSlot
+
+try:  # 任意依存（入っていて、かつ ndarray を渡された場合だけ使う）
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# ============================================================
+# 受け渡しイベントの一括計算（予約の列 → event_start / event_end の列）
+#
+# PickupSlot.event_for_booking と同じ規則を、datetime を作らずに
+# 「epoch マイクロ秒（int）」の四則演算だけで行う。
+#
+#   1970-01-05 00:00 (UTC) が月曜なので、
+#   週の頭 = t - ((t - MONDAY) mod WEEK)
+#   event_start = 週の頭 + スロットのオフセット
+#   t > event_start - 3h なら次週
+#
+# tz は固定オフセット（秒）で渡す。既定は UTC（reservation_expanded /
+# admin / 決済と同じ基準）。JST なら 9 * 3600。
+# ============================================================
+
+_US = 1_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+MONDAY_EPOCH_US = 345_600 * _US
+WEEK_US = 604_800 * _US
+BOOKING_DEADLINE_US = int(BOOKING_DEADLINE.total_seconds()) * _US
+
+SlotCodes = Union[str, Sequence[str]]
+
+
+# ============================================================
+# epoch 変換
+# ============================================================
+
+def datetime_to_epoch_us(dt: datetime) -> int:
+    """
+    aware datetime → epoch マイクロ秒（naive は UTC とみなす）
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def epoch_us_to_datetime(value: int, tz: timezone = timezone.utc) -> datetime:
+    return (_EPOCH + timedelta(microseconds=int(value))).astimezone(tz)
+
+
+def parse_db_datetimes_us(values: Iterable[Any]) -> List[Optional[int]]:
+    """
+    DB の created_at 列（TEXT / datetime）→ epoch マイクロ秒の列。
+
+    - 文字列は "YYYY-MM-DD HH:MM:SS" / ISO 8601 のどちらも可
+    - タイムゾーン無しは UTC とみなす（_parse_db_datetime と同じ）
+    - 解釈できない値は None
+    """
+    out: List[Optional[int]] = []
+    append = out.append
+    for v in values:
+        dt = parse_db_datetime_or_none(v) if isinstance(v, (str, datetime)) else None
+        append(None if dt is None else datetime_to_epoch_us(dt))
+    return out
+
+
+# ============================================================
+# 一括計算
+# ============================================================
+
+def _slot_offsets_us(slot: PickupSlot) -> Tuple[int, int]:
+    return (
+        slot.start_offset // timedelta(microseconds=1),
+        slot.end_offset // timedelta(microseconds=1),
+    )
+
+
+def event_windows_for_booking(
+    created_at_us: Sequence[int],
+    slot_codes: SlotCodes,
+    *,
+    tz_offset_sec: int = 0,
+) -> Tuple[Sequence[int], Sequence[int]]:
+    """
+    予約の created_at（epoch マイクロ秒）とスロットコードの列から、
+    各予約が属するイベントの (event_start の列, event_end の列) を返す。
+
+    - slot_codes は列、または全行共通のコード 1 つ
+    - 戻り値も epoch マイクロ秒（UTC 基準の絶対時刻）
+    - numpy があり created_at_us が ndarray の場合は ndarray を返す
+    - 未知のスロットコードは ValueError（PickupSlot.from_code と同じ）
+    """
+    tz_us = int(tz_offset_sec) * _US
+
+    if np is not None and isinstance(created_at_us, np.ndarray):
+        return _event_windows_numpy(created_at_us, slot_codes, tz_us)
+
+    n = len(created_at_us)
+    if isinstance(slot_codes, str):
+        slot_codes = [slot_codes] * n
+    elif len(slot_codes) != n:
+        raise ValueError("created_at_us and slot_codes must have the same length")
+
+    offsets: Dict[str, Tuple[int, int]] = {}
+    starts: List[int] = [0] * n
+    ends: List[int] = [0] * n
+
+    for i in range(n):
+        code = slot_codes[i]
+        off = offsets.get(code)
+        if off is None:
+            off = offsets[code] = _slot_offsets_us(PickupSlot.from_code(code))
+        start_off, end_off = off
+
+        local = created_at_us[i] + tz_us
+        week_start = local - (local - MONDAY_EPOCH_US) % WEEK_US
+        start = week_start + start_off
+        shift = WEEK_US if local > start - BOOKING_DEADLINE_US else 0
+
+        starts[i] = start + shift - tz_us
+        ends[i] = week_start + end_off + shift - tz_us
+
+    return starts, ends
+
+
+def _event_windows_numpy(created_at_us, slot_codes: SlotCodes, tz_us: int):
+    t = created_at_us
+    if np.issubdtype(t.dtype, np.datetime64):
+        t = t.astype("datetime64[us]").astype(np.int64)
+    else:
+        t = t.astype(np.int64, copy=False)
+
+    if isinstance(slot_codes, str):
+        start_off, end_off = _slot_offsets_us(PickupSlot.from_code(slot_codes))
+    else:
+        codes, inverse = np.unique(np.asarray(slot_codes, dtype=object), return_inverse=True)
+        if len(inverse) != len(t):
+            raise ValueError("created_at_us and slot_codes must have the same length")
+        table = np.array(
+            [_slot_offsets_us(PickupSlot.from_code(str(c))) for c in codes],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        start_off = table[inverse, 0]
+        end_off = table[inverse, 1]
+
+    local = t + tz_us
+    week_start = local - np.mod(local - MONDAY_EPOCH_US, WEEK_US)
+    start = week_start + start_off
+    shift = np.where(local > start - BOOKING_DEADLINE_US, WEEK_US, 0)
+
+    return start + shift - tz_us, week_start + end_off + shift - tz_us
+
+
+def booking_event_starts_us(
+    created_at_values: Sequence[Any],
+    slot_codes: SlotCodes,
+    *,
+    tz_offset_sec: int = 0,
+) -> List[Optional[int]]:
+    """
+    DB の created_at 列（TEXT のまま）から、各予約の event_start（epoch マイクロ秒）。
+    created_at が解釈できない行は None。
+
+    Python 側で「今のイベントに属する予約だけ」を拾う用途向け。
+    """
+    created_us = parse_db_datetimes_us(created_at_values)
+    valid = [i for i, v in enumerate(created_us) if v is not None]
+
+    if isinstance(slot_codes, str):
+        valid_codes: SlotCodes = slot_codes
+    else:
+        valid_codes = [slot_codes[i] for i in valid]
+
+    starts, _ = event_windows_for_booking(
+        [created_us[i] for i in valid],
+        valid_codes,
+        tz_offset_sec=tz_offset_sec,
+    )
+
+    out: List[Optional[int]] = [None] * len(created_us)
+    for i, start in zip(valid, starts):
+        out[i] = start
+    return out
@@ -0,0 +1,204 @@
+# app_v2/domain/pickup_schedule.py
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
+from app_v2.domain.pickup_slot import BOOKING_DEADLINE, EXPORT_GRACE, JST, PickupSlot
+
+# ============================================================
+# farm の受け渡しスケジュール（週に複数スロット）
+#
+# - farm_pickup_slots の全スロットを「週の月曜 0:00 からの秒数」で
+#   昇順に前計算しておき、次の枠は bisect で求める（スロット数ぶん回さない）
+# - スロット 1 つのときの結果は PickupSlot の同名メソッドと完全に一致する
+# - 同じコードの組なら同じインスタンス（from_codes で intern）
+# ============================================================
+
+MAX_PICKUP_SLOTS_PER_FARM = 3
+
+_ONE_WEEK = timedelta(days=7)
+_GRACE_SEC = int(EXPORT_GRACE.total_seconds())
+
+
+def _week_start(base: datetime, tz: tzinfo) -> datetime:
+    base = base.astimezone(tz)
+    return datetime(base.year, base.month, base.day, tzinfo=tz) - timedelta(
+        days=base.weekday()
+    )
+
+
+def _ceil_seconds(delta: timedelta) -> int:
+    return delta.days * 86400 + delta.seconds + (1 if delta.microseconds else 0)
+
+
+class PickupSchedule:
+    """
+    farm の受け渡しスロット一式（immutable）。
+
+    slots は週内の開始時刻順（同時刻なら終了時刻順）。
+    通常は PickupSchedule.from_codes() で取得する。
+    """
+
+    __slots__ = ("slots", "_start_secs", "_end_secs_prefix_max", "_by_code")
+
+    slots: Tuple[PickupSlot, ...]
+
+    def __init__(self, slots: Iterable[PickupSlot]) -> None:
+        unique = {slot.code.upper(): slot for slot in slots}
+        if not unique:
+            raise ValueError("PickupSchedule needs at least one slot")
+
+        ordered = tuple(
+            sorted(unique.values(), key=lambda s: (s.start_offset, s.end_offset, s.code))
+        )
+
+        # 開始は昇順。終了は「ここまでの最大」（枠が重なっても単調になる）
+        start_secs = tuple(int(s.start_offset.total_seconds()) for s in ordered)
+        end_prefix_max = []
+        running = -1
+        for s in ordered:
+            running = max(running, int(s.end_offset.total_seconds()))
+            end_prefix_max.append(running)
+
+        _set = object.__setattr__
+        _set(self, "slots", ordered)
+        _set(self, "_start_secs", start_secs)
+        _set(self, "_end_secs_prefix_max", tuple(end_prefix_max))
+        _set(self, "_by_code", {s.code.upper(): s for s in ordered})
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError("PickupSchedule is immutable")
+
+    def __repr__(self) -> str:
+        return f"PickupSchedule({list(self.codes)!r})"
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    # --------------------------------------------------------
+    # 生成
+    # --------------------------------------------------------
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> "PickupSchedule":
+        """
+        ["SAT_10_11", "WED_19_20"] → PickupSchedule（同じ組なら同じインスタンス）
+
+        想定外フォーマットのコードがあれば ValueError（PickupSlot.from_code と同じ）。
+        """
+        key = tuple(sorted({c.strip() for c in codes if c and c.strip()}))
+        return _compile_schedule(key)
+
+    # --------------------------------------------------------
+    # 参照
+    # --------------------------------------------------------
+
+    @property
+    def codes(self) -> Tuple[str, ...]:
+        return tuple(s.code for s in self.slots)
+
+    def find(self, code: str) -> Optional[PickupSlot]:
+        """
+        スケジュールに含まれるスロット（大文字小文字は区別しない）。無ければ None。
+        """
+        if not code:
+            return None
+        return self._by_code.get(code.strip().upper())
+
+    # --------------------------------------------------------
+    # イベント計算
+    # --------------------------------------------------------
+
+    def next_pickup(
+        self,
+        now: datetime,
+        tz: tzinfo = JST,
+    ) -> Tuple[PickupSlot, datetime, datetime]:
+        """
+        全スロットの中で最も近い予約可能な枠の (slot, start, 受付締切)。
+
+        「start - 締切時間 > now」を満たす最初の start を
+        (now + 締切時間) の週内オフセットで bisect して求める。
+        """
+        threshold = now + BOOKING_DEADLINE
+        week = _week_start(threshold, tz)
+        t = int((threshold - week).total_seconds())
+
+        i = bisect_right(self._start_secs, t)
+        if i == len(self.slots):
+            i = 0
+            week += _ONE_WEEK
+
+        slot = self.slots[i]
+        start = week + slot.start_offset
+        return slot, start, start - BOOKING_DEADLINE
+
+    def event_for_export(
+        self,
+        now: datetime,
+        tz: tzinfo = JST,
+    ) -> Tuple[PickupSlot, datetime, datetime]:
+        """
+        Export / 管理画面で今表示すべきイベント (slot, start, end)。
+
+        各スロットの PickupSlot.event_for_export のうち開始が最も早いもの
+        （now の週で event_end + 猶予をまだ過ぎていない最初の枠、無ければ翌週の最初の枠）。
+        """
+        week = _week_start(now, tz)
+        # 「end + 猶予 >= now」を秒単位で判定するので切り上げる（1 秒未満の超過も次週）
+        t = _ceil_seconds(now - week)
+
+        i = bisect_left(self._end_secs_prefix_max, t - _GRACE_SEC)
+        if i == len(self.slots):
+            i = 0
+            week += _ONE_WEEK
+
+        slot = self.slots[i]
+        return slot, week + slot.start_offset, week + slot.end_offset
+
+    def upcoming_pickups(
+        self,
+        now: datetime,
+        tz: tzinfo = JST,
+    ) -> Sequence[Tuple[PickupSlot, datetime, datetime]]:
+        """
+        スロットごとの次回枠 (slot, start, 受付締切) を start 順に並べたもの（1 周ぶん）。
+        """
+        threshold = now + BOOKING_DEADLINE
+        week = _week_start(threshold, tz)
+        t = int((threshold - week).total_seconds())
+
+        first = bisect_right(self._start_secs, t)
+        n = len(self.slots)
+        result = []
+        for k in range(n):
+            i = first + k
+            base = week if i < n else week + _ONE_WEEK
+            slot = self.slots[i % n]
+            start = base + slot.start_offset
+            result.append((slot, start, start - BOOKING_DEADLINE))
+        return result
+
+
+# ============================================================
+# 解析（コードの組ごとにキャッシュ = intern）
+# ============================================================
+
+@lru_cache(maxsize=1024)
+def _compile_schedule(codes: Tuple[str, ...]) -> PickupSchedule:
+    return PickupSchedule(PickupSlot.from_code(c) for c in codes)
+
+
+def split_slot_codes(raw: Optional[str], fallback: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    DB の GROUP_CONCAT（"SAT_10_11,WED_19_20"）→ コードのタプル。
+    空なら fallback（farms.pickup_time）を 1 件として扱う。
+    """
+    if raw:
+        codes = tuple(c for c in raw.split(",") if c)
+        if codes:
+            return codes
+    return (fallback,) if fallback else ()
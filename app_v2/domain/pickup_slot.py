@@ -0,0 +1,205 @@
+# app_v2/domain/pickup_slot.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Tuple
+from zoneinfo import ZoneInfo
+
+# ============================================================
+# 受け渡しスロット（pickup_slot_code = "SAT_10_11"）
+#
+# - コード 1 つにつき PickupSlot 1 つ（from_code で intern）
+# - 曜日・時刻は「週の月曜 0:00 からのオフセット」として前計算済み
+# - イベント計算は tz を引数で受ける
+#     顧客向け（締切・次回表示）は JST、
+#     reservation_expanded / admin / 決済の週判定は従来どおり UTC
+# ============================================================
+
+JST = ZoneInfo("Asia/Tokyo")
+UTC = timezone.utc
+
+# "MON"=0 .. "SUN"=6（datetime.weekday と一致）
+WEEKDAY_CODES: Tuple[str, ...] = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+_WEEKDAY_INDEX = {code: i for i, code in enumerate(WEEKDAY_CODES)}
+
+# 受付締切：event_start の 3 時間前
+BOOKING_DEADLINE = timedelta(hours=3)
+# export 表示：event_end の 3 時間後までは今週扱い
+EXPORT_GRACE = timedelta(hours=3)
+
+_ONE_WEEK = timedelta(days=7)
+
+
+class PickupSlot:
+    """
+    pickup_slot_code の解析結果（immutable）。
+
+    直接生成せず PickupSlot.from_code() を使う。
+    """
+
+    __slots__ = (
+        "code",
+        "weekday",
+        "start_hour",
+        "end_hour",
+        "start_offset",
+        "end_offset",
+    )
+
+    code: str
+    weekday: int
+    start_hour: int
+    end_hour: int
+    start_offset: timedelta
+    end_offset: timedelta
+
+    def __init__(self, code: str, weekday: int, start_hour: int, end_hour: int) -> None:
+        if not 0 <= weekday <= 6:
+            raise ValueError(f"Invalid weekday in pickup_slot_code: {code}")
+        if not (0 <= start_hour <= 24 and 0 <= end_hour <= 24):
+            raise ValueError(f"Invalid hour in pickup_slot_code: {code}")
+
+        _set = object.__setattr__
+        _set(self, "code", code)
+        _set(self, "weekday", weekday)
+        _set(self, "start_hour", start_hour)
+        _set(self, "end_hour", end_hour)
+        _set(self, "start_offset", timedelta(days=weekday, hours=start_hour))
+        _set(self, "end_offset", timedelta(days=weekday, hours=end_hour))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PickupSlot is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("PickupSlot is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PickupSlot):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __repr__(self) -> str:
+        return f"PickupSlot({self.code!r})"
+
+    # --------------------------------------------------------
+    # 生成
+    # --------------------------------------------------------
+
+    @classmethod
+    def from_code(cls, code: str) -> "PickupSlot":
+        """
+        "SAT_10_11" / "sat_10_11" → PickupSlot（同じコードなら同じインスタンス）
+
+        想定外フォーマット・未知の曜日は ValueError。
+        """
+        return _compile(code, False)
+
+    @classmethod
+    def from_code_lenient(cls, code: str, *, tz: tzinfo = JST) -> "PickupSlot":
+        """
+        顧客向け表示用の寛容な解析（pickup_time_utils の従来仕様）。
+
+        - 未知の曜日 → 月曜
+        - "_" 区切りが 3 つでない → 「今日の曜日」の 0:00–1:00（intern しない）
+        - 時刻が数値でない場合は ValueError
+        """
+        if not isinstance(code, str):
+            return cls(str(code), datetime.now(tz).weekday(), 0, 1)
+        try:
+            return _compile(code, False)
+        except _SlotFormatError:
+            return cls(code, datetime.now(tz).weekday(), 0, 1)
+        except _UnknownWeekdayError:
+            return _compile(code, True)
+
+    def as_tuple(self) -> Tuple[int, int, int]:
+        return self.weekday, self.start_hour, self.end_hour
+
+    # --------------------------------------------------------
+    # イベント計算
+    # --------------------------------------------------------
+
+    def week_event(self, base: datetime, tz: tzinfo = JST) -> Tuple[datetime, datetime]:
+        """
+        base が属する週（月曜はじまり・tz 基準）の (event_start, event_end)。
+        """
+        base = base.astimezone(tz)
+        week_start = datetime(base.year, base.month, base.day, tzinfo=tz) - timedelta(
+            days=base.weekday()
+        )
+        return week_start + self.start_offset, week_start + self.end_offset
+
+    def event_for_booking(
+        self,
+        created_at: datetime,
+        tz: tzinfo = JST,
+    ) -> Tuple[datetime, datetime]:
+        """
+        予約がどの週のイベントに属するか。
+        event_start の 3 時間前までは今週、それ以降は次週。
+        """
+        start, end = self.week_event(created_at, tz)
+        if created_at <= start - BOOKING_DEADLINE:
+            return start, end
+        return start + _ONE_WEEK, end + _ONE_WEEK
+
+    def event_for_export(
+        self,
+        now: datetime,
+        tz: tzinfo = JST,
+    ) -> Tuple[datetime, datetime]:
+        """
+        Export / 管理画面で今表示すべきイベント週。
+        event_end + 3 時間までは今週、それ以降は次週。
+        """
+        start, end = self.week_event(now, tz)
+        if now <= end + EXPORT_GRACE:
+            return start, end
+        return start + _ONE_WEEK, end + _ONE_WEEK
+
+    def next_pickup(self, now: datetime, tz: tzinfo = JST) -> Tuple[datetime, datetime]:
+        """
+        now から見て最も近い予約可能な枠の (start, 受付締切)。
+
+        - now の暦日・曜日から数える（呼び出し側は tz の now を渡す）
+        - start までが 3 時間を切っていれば来週
+        """
+        days_ahead = (self.weekday - now.weekday()) % 7
+        start = datetime(now.year, now.month, now.day, tzinfo=tz) + timedelta(
+            days=days_ahead, hours=self.start_hour
+        )
+        if start - now <= BOOKING_DEADLINE:
+            start += _ONE_WEEK
+        return start, start - BOOKING_DEADLINE
+
+
+# ============================================================
+# 解析（コードごとにキャッシュ = intern）
+# ============================================================
+
+class _SlotFormatError(ValueError):
+    pass
+
+
+class _UnknownWeekdayError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=1024)
+def _compile(code: str, lenient: bool) -> PickupSlot:
+    parts = code.split("_")
+    if len(parts) != 3:
+        raise _SlotFormatError(f"Invalid pickup_slot_code format: {code}")
+
+    day_str, start_str, end_str = parts
+    weekday = _WEEKDAY_INDEX.get(day_str.upper())
+    if weekday is None:
+        if not lenient:
+            raise _UnknownWeekdayError(f"Unknown weekday in pickup_slot_code: {code}")
+        weekday = 0
+
+    return PickupSlot(code, weekday, int(start_str), int(end_str))
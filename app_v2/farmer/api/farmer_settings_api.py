@@ -12,6 +12,8 @@ from fastapi import (
 )
 from pydantic import BaseModel, field_validator
 
+from app_v2.common.upload_guard import UploadTooLargeError, open_bounded_upload
+from app_v2.config.upload_limits import IMAGE_MAX_FILE_BYTES
 from app_v2.farmer.dtos import FarmerSettingsDTO
 from app_v2.farmer.services.farmer_settings_service import FarmerSettingsService
 
@@ -172,7 +174,7 @@ def admin_update_active_flag(
     "/face-image/me",
     response_model=FarmerSettingsDTO,
 )
-async def upload_face_image_me(
+def upload_face_image_me(
     request: Request,
     file: UploadFile = File(...),
 ):
@@ -180,17 +182,18 @@ async def upload_face_image_me(
 
     service = FarmerSettingsService()
     try:
-        file_bytes = await file.read()
-        return service.upload_face_image_from_bytes(
+        # 受信済み（一時ファイルへ spool 済み）の中身をそのまま渡す
+        source = open_bounded_upload(file, max_bytes=IMAGE_MAX_FILE_BYTES)
+        return service.upload_face_image(
             farm_id=farm_id,
-            file_bytes=file_bytes,
+            source=source,
             filename=file.filename or "face_image",
         )
     except ValueError as e:
         msg = str(e)
-        if "monthly upload limit exceeded" in msg:
+        if isinstance(e, UploadTooLargeError) or "monthly upload limit exceeded" in msg:
             raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
                 detail=msg,
             )
         raise HTTPException(
@@ -203,7 +206,7 @@ async def upload_face_image_me(
     "/cover-image/me",
     response_model=FarmerSettingsDTO,
 )
-async def upload_cover_image_me(
+def upload_cover_image_me(
     request: Request,
     file: UploadFile = File(...),
 ):
@@ -211,17 +214,18 @@ async def upload_cover_image_me(
 
     service = FarmerSettingsService()
     try:
-        file_bytes = await file.read()
-        return service.upload_cover_image_from_bytes(
+        # 受信済み（一時ファイルへ spool 済み）の中身をそのまま渡す
+        source = open_bounded_upload(file, max_bytes=IMAGE_MAX_FILE_BYTES)
+        return service.upload_cover_image(
             farm_id=farm_id,
-            file_bytes=file_bytes,
+            source=source,
             filename=file.filename or "cover_image",
         )
     except ValueError as e:
         msg = str(e)
-        if "monthly upload limit exceeded" in msg:
+        if isinstance(e, UploadTooLargeError) or "monthly upload limit exceeded" in msg:
             raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
                 detail=msg,
             )
         raise HTTPException(
@@ -234,7 +238,7 @@ async def upload_cover_image_me(
     "/pr-images/me",
     response_model=FarmerSettingsDTO,
 )
-async def upload_pr_images_me(
+def upload_pr_images_me(
     request: Request,
     files: List[UploadFile] = File(...),
 ):
@@ -242,18 +246,22 @@ async def upload_pr_images_me(
 
     service = FarmerSettingsService()
     try:
-        data = []
-        for f in files:
-            data.append((await f.read(), f.filename or "pr_image"))
-        return service.upload_pr_images_from_bytes(
+        data = [
+            (
+                open_bounded_upload(f, max_bytes=IMAGE_MAX_FILE_BYTES),
+                f.filename or "pr_image",
+            )
+            for f in files
+        ]
+        return service.upload_pr_images(
             farm_id=farm_id,
             files=data,
         )
     except ValueError as e:
         msg = str(e)
-        if "monthly upload limit exceeded" in msg:
+        if isinstance(e, UploadTooLargeError) or "monthly upload limit exceeded" in msg:
             raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
                 detail=msg,
             )
         raise HTTPException(
@@ -317,11 +325,11 @@ def delete_pr_image_me(
     "/me/pr-images",
     response_model=FarmerSettingsDTO,
 )
-async def upload_pr_images_me_alias(
+def upload_pr_images_me_alias(
     request: Request,
     files: List[UploadFile] = File(...),
 ):
-    return await upload_pr_images_me(request=request, files=files)
+    return upload_pr_images_me(request=request, files=files)
 
 
 @router.put(
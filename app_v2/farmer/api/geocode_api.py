@@ -7,7 +7,7 @@ from pydantic import BaseModel
 
 from app_v2.farmer.services.location_service import (
     GeocodeResult,
-    geocode_address,
+    geocode_address_async,
 )
 
 router = APIRouter(
@@ -35,18 +35,20 @@ class GeocodeResponse(BaseModel):
     lng: float | None = None
     status: str
     error_message: str | None = None
+    precision: str | None = None
 
 
 @router.post("", response_model=GeocodeResponse)
-def geocode(req: GeocodeRequest) -> GeocodeResponse:
+async def geocode(req: GeocodeRequest) -> GeocodeResponse:
     """
     V2 版 /api/geocode エンドポイント。
-    - 実処理は location_service.geocode_address() に委譲する。
+    - 実処理は location_service.geocode_address_async() に委譲する
+      （外部呼び出しの待ち時間にスレッドを占有しない）。
     - V1 の geocoding.py と同じ JSON 形式を返す。
     - APIキー未設定やネットワークエラー時は HTTP エラーとして扱い、
       それ以外（住所が曖昧など）は 200 OK + ok=False で返す。
     """
-    result: GeocodeResult = geocode_address(
+    result: GeocodeResult = await geocode_address_async(
         address=req.address,
         region=req.region or "jp",
     )
@@ -73,4 +75,6 @@ def geocode(req: GeocodeRequest) -> GeocodeResponse:
         lng=result.lng,
         status=result.status,
         error_message=result.error_message,
+        precision=result.precision,
     )
+
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, status, Request
 from pydantic import BaseModel, Field
@@ -11,6 +11,7 @@ from app_v2.farmer.services.pickup.pickup_settings_facade import (
 )
 from app_v2.farmer.services.pickup.pickup_settings_service import (
     FarmNotFoundError,
+    InvalidPickupTimesError,
 )
 
 router = APIRouter(
@@ -33,6 +34,11 @@ class PickupFarmResponse(BaseModel):
     pickup_place_name: str
     pickup_notes: Optional[str] = None
     pickup_time: str
+    # 全スロット（週内の時刻順・pickup_time はその先頭）
+    pickup_times: List[str] = []
+
+    # "done" = owner 座標確定 / "pending" = 解決中（代表点） / "failed" = 解決できず
+    owner_geocode_status: str = "done"
 
 
 class PickupStatusResponse(BaseModel):
@@ -55,6 +61,11 @@ class PickupSettingsUpdateRequest(BaseModel):
     pickup_time: str = Field(
         ..., description='受け渡し時間スロット（例: "WED_19_20"）'
     )
+    pickup_times: Optional[List[str]] = Field(
+        None,
+        description='複数スロット（最大 3 つ・例: ["WED_19_20", "SAT_10_11"]）。'
+        "指定時は pickup_time より優先",
+    )
 
 
 # ※ ME 用（farm_id を受け取らない）
@@ -66,6 +77,11 @@ class PickupSettingsUpdateMeRequest(BaseModel):
     pickup_time: str = Field(
         ..., description='受け渡し時間スロット（例: "WED_19_20"）'
     )
+    pickup_times: Optional[List[str]] = Field(
+        None,
+        description='複数スロット（最大 3 つ・例: ["WED_19_20", "SAT_10_11"]）。'
+        "指定時は pickup_time より優先",
+    )
 
 
 # ============================================================
@@ -143,6 +159,7 @@ def update_pickup_settings_me(
             pickup_place_name=payload.pickup_place_name,
             pickup_notes=payload.pickup_notes,
             pickup_time=payload.pickup_time,
+            pickup_times=payload.pickup_times,
         )
 
     except FarmNotFoundError as e:
@@ -151,6 +168,12 @@ def update_pickup_settings_me(
             detail=str(e),
         )
 
+    except InvalidPickupTimesError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
     except PickupLockedError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -198,6 +221,7 @@ def update_pickup_settings(
             pickup_place_name=payload.pickup_place_name,
             pickup_notes=payload.pickup_notes,
             pickup_time=payload.pickup_time,
+            pickup_times=payload.pickup_times,
         )
 
     except FarmNotFoundError as e:
@@ -206,6 +230,12 @@ def update_pickup_settings(
             detail=str(e),
         )
 
+    except InvalidPickupTimesError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
     except PickupLockedError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
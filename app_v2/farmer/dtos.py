@@ -74,6 +74,7 @@ class PickupSettingsResponseDTO(BaseModel):
 class PRImageDTO(BaseModel):
     id: str
     url: str
+    thumbnail_url: Optional[str] = None
     order: int
 
 
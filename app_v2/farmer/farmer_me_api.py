@@ -1,8 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel
-import sqlite3
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 router = APIRouter(
     prefix="/farmer",
@@ -14,6 +13,8 @@ class FarmerMeResponse(BaseModel):
     farm_id: int
     is_registered: bool
     email: str | None
+    # owner 座標の確定状態（"done" / "pending" / "failed"）
+    owner_geocode_status: str = "done"
 
 
 @router.get(
@@ -40,13 +41,14 @@ def get_farmer_me(request: Request) -> FarmerMeResponse:
         )
 
     # ② DB から email / registration 状態を取得
-    conn = sqlite3.connect(resolve_db_path())
+    conn = connect(resolve_db_path())
     try:
         row = conn.execute(
             """
             SELECT
                 email,
-                owner_farmer_id
+                owner_farmer_id,
+                geocode_status
             FROM farms
             WHERE farm_id = ?
             """,
@@ -62,11 +64,12 @@ def get_farmer_me(request: Request) -> FarmerMeResponse:
             detail="farm not found",
         )
 
-    email, owner_farmer_id = row
+    email, owner_farmer_id, geocode_status = row
     is_registered = owner_farmer_id is not None
 
     return FarmerMeResponse(
         farm_id=farm_id,
         is_registered=is_registered,
         email=email,
+        owner_geocode_status=geocode_status or "done",
     )
@@ -5,7 +5,7 @@ import sqlite3
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class FarmerSettingsRepository:
@@ -18,7 +18,7 @@ class FarmerSettingsRepository:
     """
 
     def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(resolve_db_path())
+        conn = connect(resolve_db_path())
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -165,6 +165,44 @@ class FarmerSettingsRepository:
         if fields:
             self.update_farm_fields(farm_id, **fields)
 
+    def reserve_monthly_upload_bytes(self, farm_id: int, size: int) -> bool:
+        """
+        月間アップロード枠を size バイト分「先に確保」する。
+
+        - 上限チェックと加算を 1 つの UPDATE で行う（並列リクエストでも超過しない）
+        - 確保できなければ False
+        """
+        with self._get_conn() as conn:
+            cur = conn.execute(
+                """
+                UPDATE farms
+                   SET monthly_upload_bytes = COALESCE(monthly_upload_bytes, 0) + ?
+                 WHERE farm_id = ?
+                   AND COALESCE(monthly_upload_bytes, 0) + ?
+                       <= COALESCE(monthly_upload_limit, 0)
+                """,
+                (int(size), farm_id, int(size)),
+            )
+            return cur.rowcount == 1
+
+    def release_monthly_upload_bytes(self, farm_id: int, size: int) -> None:
+        """
+        確保済みの枠を返却する（アップロード失敗分の払い戻し）。
+        """
+        if size <= 0:
+            return
+
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                UPDATE farms
+                   SET monthly_upload_bytes =
+                       MAX(COALESCE(monthly_upload_bytes, 0) - ?, 0)
+                 WHERE farm_id = ?
+                """,
+                (int(size), farm_id),
+            )
+
     # ============================================================
     # Reservation
     # ============================================================
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app_v2.db.core import connect, resolve_db_path
+
+
+class GeocodeCacheRepository:
+    """
+    geocode_cache 用 Repository。
+
+    - sqlite3 直叩き
+    - キーは (正規化済み住所, region)
+    - 期限切れの判定は SQL 側で行う（期限切れ行は「無い」扱い）
+    """
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = connect(resolve_db_path())
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_valid(
+        self,
+        *,
+        address_key: str,
+        region: str,
+        now: datetime,
+    ) -> Optional[Dict[str, Any]]:
+        with self._get_conn() as conn:
+            row = conn.execute(
+                """
+                SELECT address_key, region, status, lat, lng, error_message,
+                       expires_at, created_at
+                  FROM geocode_cache
+                 WHERE address_key = ?
+                   AND region = ?
+                   AND expires_at > ?
+                """,
+                (address_key, region, now.isoformat()),
+            ).fetchone()
+            return dict(row) if row else None
+
+    def upsert(
+        self,
+        *,
+        address_key: str,
+        region: str,
+        status: str,
+        lat: Optional[float],
+        lng: Optional[float],
+        error_message: Optional[str],
+        expires_at: datetime,
+        created_at: datetime,
+    ) -> None:
+        with self._get_conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO geocode_cache (
+                    address_key, region, status, lat, lng, error_message,
+                    expires_at, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (address_key, region) DO UPDATE SET
+                    status = excluded.status,
+                    lat = excluded.lat,
+                    lng = excluded.lng,
+                    error_message = excluded.error_message,
+                    expires_at = excluded.expires_at,
+                    created_at = excluded.created_at
+                """,
+                (
+                    address_key,
+                    region,
+                    status,
+                    lat,
+                    lng,
+                    error_message,
+                    expires_at.isoformat(),
+                    created_at.isoformat(),
+                ),
+            )
+
+    def delete_expired(self, *, now: datetime) -> int:
+        with self._get_conn() as conn:
+            cur = conn.execute(
+                "DELETE FROM geocode_cache WHERE expires_at <= ?",
+                (now.isoformat(),),
+            )
+            return cur.rowcount
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from app_v2.db.core import connect, resolve_db_path
+
+
+class OwnerGeocodeRepository:
+    """
+    owner 座標（farms.lat / lng）のバックグラウンド解決用 Repository。
+
+    - sqlite3 直叩き
+    - 更新は「解決を始めた時の住所のまま pending」の場合だけ反映する
+      （途中で住所が変わった場合に古い結果で上書きしない）
+    """
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = connect(resolve_db_path())
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_geocode_source(self, farm_id: int) -> Optional[Dict[str, Any]]:
+        with self._get_conn() as conn:
+            row = conn.execute(
+                """
+                SELECT farm_id, postal_code, address, geocode_status
+                  FROM farms
+                 WHERE farm_id = ?
+                """,
+                (farm_id,),
+            ).fetchone()
+            return dict(row) if row else None
+
+    def list_pending_farm_ids(self) -> List[int]:
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT farm_id
+                  FROM farms
+                 WHERE geocode_status = 'pending'
+                 ORDER BY farm_id
+                """
+            ).fetchall()
+            return [int(r["farm_id"]) for r in rows]
+
+    def resolve_pending(
+        self,
+        *,
+        farm_id: int,
+        address: str,
+        lat: Optional[float],
+        lng: Optional[float],
+        geocode_status: str,
+    ) -> bool:
+        """
+        pending を確定させる。lat / lng が None の場合は座標を変えない。
+        """
+        with self._get_conn() as conn:
+            cur = conn.execute(
+                """
+                UPDATE farms
+                   SET lat = COALESCE(?, lat),
+                       lng = COALESCE(?, lng),
+                       geocode_status = ?
+                 WHERE farm_id = ?
+                   AND address = ?
+                   AND geocode_status = 'pending'
+                """,
+                (lat, lng, geocode_status, farm_id, address),
+            )
+            return cur.rowcount == 1
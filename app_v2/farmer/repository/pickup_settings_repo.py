@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Sequence, Tuple
 import sqlite3
 from datetime import datetime
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    fetch_farm_pickup_slot_codes,
+    replace_farm_pickup_slots,
+)
 
 
 class PickupSettingsRepository:
@@ -18,7 +22,7 @@ class PickupSettingsRepository:
 
     def __init__(self, db: Any = None) -> None:
         # db 引数は互換性のためだけに受け取るが使わない
-        self.conn = sqlite3.connect(resolve_db_path())
+        self.conn = connect(resolve_db_path())
         self.conn.row_factory = sqlite3.Row
 
     # ---------------------------------------------------------
@@ -32,6 +36,7 @@ class PickupSettingsRepository:
                 farm_id,
                 lat AS owner_lat,
                 lng AS owner_lng,
+                geocode_status AS owner_geocode_status,
                 pickup_lat,
                 pickup_lng,
                 pickup_place_name,
@@ -46,6 +51,12 @@ class PickupSettingsRepository:
         row = cur.fetchone()
         return dict(row) if row else None
 
+    def fetch_pickup_slot_codes(self, farm_id: int) -> Tuple[str, ...]:
+        """
+        farm の全スロット（farm_pickup_slots。未設定なら pickup_time の 1 件）。
+        """
+        return fetch_farm_pickup_slot_codes(self.conn, farm_id)
+
     # ---------------------------------------------------------
     # Pickup 情報の更新
     # ---------------------------------------------------------
@@ -81,6 +92,12 @@ class PickupSettingsRepository:
             ),
         )
 
+    def replace_pickup_slots(self, farm_id: int, codes: Sequence[str]) -> None:
+        """
+        farm_pickup_slots を置き換える（commit は呼び出し側）。
+        """
+        replace_farm_pickup_slots(self.conn, farm_id, codes)
+
     # ---------------------------------------------------------
     # トランザクション操作
     # ---------------------------------------------------------
@@ -3,14 +3,17 @@ from __future__ import annotations
 import sqlite3
 from typing import Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
+from app_v2.customer_booking.repository.farm_pickup_slots_repo import (
+    replace_farm_pickup_slots,
+)
 from app_v2.farmer.dtos import OwnerDTO, FarmPickupDTO
 
 
 class RegistrationRepository:
     def __init__(self) -> None:
         db_path = resolve_db_path()
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path)
         self.conn.row_factory = sqlite3.Row
 
     # -------------------------------------------------
@@ -42,8 +45,9 @@ class RegistrationRepository:
         farm_id: int,
         owner: OwnerDTO,
         pickup: FarmPickupDTO,
-        owner_lat: float,
-        owner_lng: float,
+        owner_lat: Optional[float],
+        owner_lng: Optional[float],
+        geocode_status: str,
         active_flag: int,
         is_public: int,
         is_accepting_reservations: int,
@@ -65,6 +69,7 @@ class RegistrationRepository:
                 address = ?,
                 lat = ?,
                 lng = ?,
+                geocode_status = ?,
 
                 pickup_lat = ?,
                 pickup_lng = ?,
@@ -88,6 +93,7 @@ class RegistrationRepository:
                 full_address,
                 owner_lat,
                 owner_lng,
+                geocode_status,
                 pickup.pickup_lat,
                 pickup.pickup_lng,
                 pickup.pickup_place_name,
@@ -100,6 +106,10 @@ class RegistrationRepository:
             ),
         )
 
+        # 登録時はスロット 1 つ（複数スロットは pickup settings から）
+        if pickup.pickup_time:
+            replace_farm_pickup_slots(self.conn, farm_id, [pickup.pickup_time])
+
     def set_owner_farmer_id(
         self,
         *,
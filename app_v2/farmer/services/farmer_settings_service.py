@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Tuple, Dict, Any
-
-from app_v2.common.client import upload_bytes
+from typing import Optional, List, Tuple, Dict, Any, BinaryIO, Union
+
+from app_v2.common.storage import delete_public_id, find_existing, upload_bytes
+from app_v2.common.image_pipeline import ImageVariant, ProcessedImage, process_image
+from app_v2.config.upload_limits import (
+    FACE_IMAGE_MAX_EDGE,
+    PR_IMAGE_MAX_EDGE,
+    PR_IMAGE_THUMB_EDGE,
+    PR_IMAGE_MAX_FILES_PER_REQUEST,
+    PR_IMAGE_UPLOAD_MAX_WORKERS,
+)
 from app_v2.farmer.dtos import FarmerSettingsDTO, PRImageDTO
 from app_v2.farmer.repository.farmer_settings_repo import (
     FarmerSettingsRepository,
 )
 
 
+# ============================================================
+# アップロード用 worker pool（プロセス共有・上限付き）
+# ============================================================
+
+_upload_executor: Optional[ThreadPoolExecutor] = None
+_upload_executor_lock = threading.Lock()
+
+
+# 画像の入力（bytes / 受信済みファイルのどちらでも加工できる）
+ImageSource = Union[bytes, BinaryIO]
+
+
+def _get_upload_executor() -> ThreadPoolExecutor:
+    global _upload_executor
+    if _upload_executor is None:
+        with _upload_executor_lock:
+            if _upload_executor is None:
+                _upload_executor = ThreadPoolExecutor(
+                    max_workers=PR_IMAGE_UPLOAD_MAX_WORKERS,
+                    thread_name_prefix="pr-image-upload",
+                )
+    return _upload_executor
+
+
 class FarmerSettingsService:
     """
     Farmer Settings service 層。
@@ -131,12 +165,16 @@ class FarmerSettingsService:
             PRImageDTO(
                 id=item.get("id"),
                 url=item.get("url"),
+                thumbnail_url=item.get("thumbnail_url"),
                 order=int(item.get("order", 0)),
             )
             for item in pr_sorted
         ]
 
         cover_image_url = pr_images[0].url if pr_images else None
+        cover_thumbnail_url = (
+            (pr_images[0].thumbnail_url or cover_image_url) if pr_images else None
+        )
 
         price_10kg = farm.get("price_10kg")
         price_5kg = farm.get("price_5kg")
@@ -165,7 +203,7 @@ class FarmerSettingsService:
             monthly_upload_bytes=int(profile.get("monthly_upload_bytes") or 0),
             monthly_upload_limit=int(profile.get("monthly_upload_limit") or 50_000_000),
             next_reset_at=profile.get("next_reset_at"),
-            thumbnail_url=cover_image_url,
+            thumbnail_url=cover_thumbnail_url,
         )
 
     # ============================================================
@@ -228,52 +266,210 @@ class FarmerSettingsService:
     # PR images
     # ============================================================
 
+    def _ensure_upload_quota_left(self, farm_id: int) -> None:
+        """
+        枠を使い切っている場合は、画像を読む前に断る。
+        （加工後サイズでの厳密な判定は reserve_monthly_upload_bytes）
+        """
+        # 初期プロフィール（上限値など）の存在も保証される
+        state = self.repo.get_monthly_upload_state(farm_id)
+        used = int(state.get("monthly_upload_bytes") or 0)
+        limit = int(state.get("monthly_upload_limit") or 0)
+        if used >= limit:
+            raise ValueError("monthly upload limit exceeded")
+
+    def _process_images_concurrently(
+        self,
+        *,
+        files: List[Tuple[ImageSource, str]],
+        max_edge: int,
+        thumb_edge: Optional[int],
+    ) -> List[ProcessedImage]:
+        """
+        表示サイズへの縮小・再エンコードを worker pool で並列に行う。
+        1 枚でも画像として読めなければ ValueError（枠の確保前に弾く）。
+        """
+        executor = _get_upload_executor()
+        futures = [
+            executor.submit(
+                process_image,
+                content,
+                filename,
+                max_edge=max_edge,
+                thumb_edge=thumb_edge,
+            )
+            for content, filename in files
+        ]
+        return [future.result() for future in futures]
+
+    def _upload_files_concurrently(
+        self,
+        *,
+        files: List[Tuple[bytes, str]],
+        folder: str,
+    ) -> List[Any]:
+        """
+        files を worker pool で並列アップロードする。
+
+        戻り値は files と同じ順序で、
+        成功 → upload_bytes の結果 dict / 失敗 → 発生した Exception
+        """
+        executor = _get_upload_executor()
+        futures = [
+            executor.submit(
+                upload_bytes,
+                content,
+                filename=filename,
+                folder=folder,
+            )
+            for content, filename in files
+        ]
+
+        results: List[Any] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
     def upload_pr_images_from_bytes(
         self,
         *,
         farm_id: int,
         files: List[Tuple[bytes, str]],
     ) -> FarmerSettingsDTO:
-        state = self.repo.get_monthly_upload_state(farm_id)
-        used = int(state.get("monthly_upload_bytes") or 0)
-        limit = int(state.get("monthly_upload_limit") or 0)
+        return self.upload_pr_images(farm_id=farm_id, files=files)
 
-        pr_list = self.repo.load_pr_images_list(farm_id)
-        next_order = max([int(x.get("order", 0)) for x in pr_list], default=0) + 1
+    def upload_pr_images(
+        self,
+        *,
+        farm_id: int,
+        files: List[Tuple[ImageSource, str]],
+        to_front: bool = False,
+    ) -> FarmerSettingsDTO:
+        """
+        to_front=True のときは、今回の画像を一覧の先頭（= cover image）に並べる。
+        """
+        if len(files) > PR_IMAGE_MAX_FILES_PER_REQUEST:
+            raise ValueError("too many files")
+
+        self._ensure_upload_quota_left(farm_id)
+
+        # 表示サイズ + サムネイルに加工（枠は加工後のサイズで消費する）
+        processed = self._process_images_concurrently(
+            files=files,
+            max_edge=PR_IMAGE_MAX_EDGE,
+            thumb_edge=PR_IMAGE_THUMB_EDGE,
+        )
 
-        for content, filename in files:
-            size = len(content)
-            if used + size > limit:
-                raise ValueError("monthly upload limit exceeded")
+        folder = f"farms/{farm_id}/pr_images"
 
-            result = upload_bytes(
-                content,
-                filename=filename,
-                folder=f"farms/{farm_id}/pr_images",
+        # display / thumbnail を交互に並べる（results も同じ並び）
+        variants: List[ImageVariant] = []
+        for p in processed:
+            variants.append(p.display)
+            variants.append(p.thumbnail)
+
+        # 保存済みと同じ内容は既存 URL を使い回す（通信なし・枠も消費しない）
+        results: List[Any] = [
+            find_existing(v.content, folder=folder) for v in variants
+        ]
+
+        # 未保存分は同じ内容を 1 回だけアップロードする
+        pending: Dict[bytes, List[int]] = {}
+        for i, v in enumerate(variants):
+            if results[i] is None:
+                pending.setdefault(v.content, []).append(i)
+
+        # 月間枠は未保存分を先に確保する（失敗分は後で返却）
+        total_size = sum(len(content) for content in pending)
+        if not self.repo.reserve_monthly_upload_bytes(farm_id, total_size):
+            raise ValueError("monthly upload limit exceeded")
+
+        try:
+            uploaded_results = self._upload_files_concurrently(
+                files=[(content, variants[idxs[0]].filename) for content, idxs in pending.items()],
+                folder=folder,
             )
+        except Exception:
+            self.repo.release_monthly_upload_bytes(farm_id, total_size)
+            raise
+
+        new_sizes: Dict[int, int] = {}
+        for (content, idxs), res in zip(pending.items(), uploaded_results):
+            for i in idxs:
+                results[i] = res
+            new_sizes[idxs[0]] = len(content)
+
+        errors: List[Exception] = []
+        uploaded: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        failed_pairs: List[Tuple[int, int]] = []
+
+        for n in range(len(processed)):
+            pair = (2 * n, 2 * n + 1)
+            pair_errors = [results[i] for i in pair if isinstance(results[i], Exception)]
+            if pair_errors:
+                errors.extend(pair_errors)
+                failed_pairs.append(pair)
+                continue
+            uploaded.append((results[pair[0]], results[pair[1]]))
+
+        # 失敗ペアのうち今回新しく上げた分：枠を返却し、孤児ファイルを残さない
+        kept_ids = {r["public_id"] for pair in uploaded for r in pair}
+        failed_size = 0
+        for pair in failed_pairs:
+            for i in pair:
+                if i not in new_sizes:
+                    continue
+                res = results[i]
+                if isinstance(res, Exception):
+                    failed_size += new_sizes[i]
+                elif res["public_id"] not in kept_ids:
+                    failed_size += new_sizes[i]
+                    delete_public_id(res["public_id"])
+
+        self.repo.release_monthly_upload_bytes(farm_id, failed_size)
+
+        pr_list = self.repo.load_pr_images_list(farm_id)
+        next_order = max([int(x.get("order", 0)) for x in pr_list], default=0) + 1
 
+        # 成功分のみ、送信順のまま追加する（一覧に既にある画像は重複させない）
+        listed_ids = {x.get("id") for x in pr_list}
+        for display_res, thumb_res in uploaded:
+            if display_res["public_id"] in listed_ids:
+                continue
+            listed_ids.add(display_res["public_id"])
             pr_list.append(
                 {
-                    "id": result["public_id"],
-                    "url": result["url"],
+                    "id": display_res["public_id"],
+                    "url": display_res["url"],
+                    "thumbnail_url": thumb_res["url"],
                     "order": next_order,
                 }
             )
             next_order += 1
-            used += size
 
-        self.repo.save_pr_images_list(farm_id, pr_list)
-        self.repo.set_monthly_upload_state(
-            farm_id,
-            monthly_upload_bytes=used,
-        )
+        if uploaded and to_front:
+            front_ids = list(dict.fromkeys(display_res["public_id"] for display_res, _ in uploaded))
+            pr_sorted = sorted(pr_list, key=lambda x: int(x.get("order", 0)))
+            pr_list = [x for i in front_ids for x in pr_sorted if x.get("id") == i]
+            pr_list += [x for x in pr_sorted if x.get("id") not in front_ids]
+            for idx, item in enumerate(pr_list, start=1):
+                item["order"] = idx
 
-        pr_sorted = sorted(pr_list, key=lambda x: int(x.get("order", 0)))
-        if pr_sorted:
-            self.repo.update_farm_fields(
-                farm_id,
-                cover_image_url=pr_sorted[0]["url"],
-            )
+        if uploaded:
+            self.repo.save_pr_images_list(farm_id, pr_list)
+
+            pr_sorted = sorted(pr_list, key=lambda x: int(x.get("order", 0)))
+            if pr_sorted:
+                self.repo.update_farm_fields(
+                    farm_id,
+                    cover_image_url=pr_sorted[0]["url"],
+                )
+
+        if errors:
+            raise errors[0]
 
         settings = self.load_settings(farm_id)
         self._advance_to_publish_ready_if_needed(
@@ -282,6 +478,23 @@ class FarmerSettingsService:
         )
         return settings
 
+    # ============================================================
+    # Cover image（= pr_images の先頭）
+    # ============================================================
+
+    def upload_cover_image(
+        self,
+        *,
+        farm_id: int,
+        source: ImageSource,
+        filename: str,
+    ) -> FarmerSettingsDTO:
+        return self.upload_pr_images(
+            farm_id=farm_id,
+            files=[(source, filename)],
+            to_front=True,
+        )
+
     def reorder_pr_images(
         self,
         *,
@@ -359,30 +572,52 @@ class FarmerSettingsService:
         file_bytes: bytes,
         filename: str,
     ) -> FarmerSettingsDTO:
-        state = self.repo.get_monthly_upload_state(farm_id)
-        used = int(state.get("monthly_upload_bytes") or 0)
-        limit = int(state.get("monthly_upload_limit") or 0)
+        return self.upload_face_image(
+            farm_id=farm_id,
+            source=file_bytes,
+            filename=filename,
+        )
 
-        size = len(file_bytes)
-        if used + size > limit:
-            raise ValueError("monthly upload limit exceeded")
+    def upload_face_image(
+        self,
+        *,
+        farm_id: int,
+        source: ImageSource,
+        filename: str,
+    ) -> FarmerSettingsDTO:
+        self._ensure_upload_quota_left(farm_id)
 
-        result = upload_bytes(
-            file_bytes,
-            filename=filename,
-            folder=f"farms/{farm_id}/face_image",
+        processed = process_image(
+            source,
+            filename,
+            max_edge=FACE_IMAGE_MAX_EDGE,
         )
 
+        folder = f"farms/{farm_id}/face_image"
+        content = processed.display.content
+
+        # 保存済みと同じ内容なら既存 URL を使う（通信なし・枠も消費しない）
+        result = find_existing(content, folder=folder)
+        if result is None:
+            size = len(content)
+            if not self.repo.reserve_monthly_upload_bytes(farm_id, size):
+                raise ValueError("monthly upload limit exceeded")
+
+            try:
+                result = upload_bytes(
+                    content,
+                    filename=processed.display.filename,
+                    folder=folder,
+                )
+            except Exception:
+                self.repo.release_monthly_upload_bytes(farm_id, size)
+                raise
+
         self.repo.update_profile_fields(
             farm_id,
             face_image_url=result["url"],
         )
 
-        self.repo.set_monthly_upload_state(
-            farm_id,
-            monthly_upload_bytes=used + size,
-        )
-
         settings = self.load_settings(farm_id)
         self._advance_to_publish_ready_if_needed(
             farm_id=farm_id,
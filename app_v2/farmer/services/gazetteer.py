@@ -0,0 +1,159 @@
+# app_v2/farmer/services/gazetteer.py
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import re
+import struct
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# ============================================================
+# オフライン gazetteer（郵便番号・市町村 → 代表点）
+#
+# バイナリ形式（little endian）：
+#   header : magic "GZT1" + uint32 件数
+#   record : uint64 キー + float32 lat + float32 lng（16 byte・キー昇順）
+#
+# キーは blake2b("<kind>:<正規化名>") の先頭 8 byte。
+# mmap したまま二分探索するので、読み込みコストはほぼゼロ。
+# ============================================================
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+DEFAULT_GAZETTEER_PATH = DATA_DIR / "gazetteer.bin"
+DEFAULT_GAZETTEER_CSV = DATA_DIR / "tokushima_gazetteer.csv"
+
+KIND_POSTCODE = "P"
+KIND_MUNICIPALITY = "C"
+
+_MAGIC = b"GZT1"
+_HEADER = struct.Struct("<4sI")
+_RECORD = struct.Struct("<Qff")
+_KEY = struct.Struct("<Q")
+
+_SPACES_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\D")
+
+
+def normalize_name(kind: str, name: str) -> str:
+    text = unicodedata.normalize("NFKC", name or "")
+    if kind == KIND_POSTCODE:
+        return _DIGITS_RE.sub("", text)
+    return _SPACES_RE.sub("", text)
+
+
+def gazetteer_key(kind: str, name: str) -> int:
+    raw = f"{kind}:{normalize_name(kind, name)}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+
+
+def write_gazetteer(
+    entries: Iterable[Tuple[str, str, float, float]],
+    path: Path,
+) -> int:
+    """
+    (kind, name, lat, lng) の列からバイナリを書き出す。戻り値は件数。
+    同じキーが複数ある場合は先勝ち。
+    """
+    records = {}
+    for kind, name, lat, lng in entries:
+        records.setdefault(gazetteer_key(kind, name), (float(lat), float(lng)))
+
+    ordered = sorted(records.items())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(ordered)))
+        for key, (lat, lng) in ordered:
+            f.write(_RECORD.pack(key, lat, lng))
+    return len(ordered)
+
+
+class Gazetteer:
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"invalid gazetteer file: {path}")
+        if len(self._mm) < _HEADER.size + count * _RECORD.size:
+            raise ValueError(f"truncated gazetteer file: {path}")
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key_at(self, i: int) -> int:
+        return _KEY.unpack_from(self._mm, _HEADER.size + i * _RECORD.size)[0]
+
+    def lookup(self, kind: str, name: str) -> Optional[Tuple[float, float]]:
+        key = gazetteer_key(kind, name)
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < self._count and self._key_at(lo) == key:
+            _, lat, lng = _RECORD.unpack_from(
+                self._mm, _HEADER.size + lo * _RECORD.size
+            )
+            # float32 の端数（~1m 未満）は落とす
+            return round(lat, 6), round(lng, 6)
+        return None
+
+
+# ============================================================
+# CSV 読み込み（build スクリプト用）
+# ============================================================
+
+def read_gazetteer_csv(path: Path) -> List[Tuple[str, str, float, float]]:
+    """
+    CSV（kind,name,lat,lng・# 行はコメント）を読み込む。
+    市町村名に郡が含まれる場合は、郡を省いた別名も登録する。
+    """
+    entries: List[Tuple[str, str, float, float]] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or line.startswith("kind,"):
+                continue
+            kind, name, lat, lng = [x.strip() for x in line.split(",")]
+            entries.append((kind, name, float(lat), float(lng)))
+
+            if kind == KIND_MUNICIPALITY and "郡" in name:
+                alias = re.sub(r"(?<=[都道府県])[^都道府県]+?郡", "", name)
+                if alias != name:
+                    entries.append((kind, alias, float(lat), float(lng)))
+    return entries
+
+
+# ============================================================
+# プロセス共有インスタンス
+# ============================================================
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_loaded = False
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """
+    gazetteer.bin を開く（プロセスで 1 回）。ファイルが無ければ None。
+    """
+    global _gazetteer, _gazetteer_loaded
+    if _gazetteer_loaded:
+        return _gazetteer
+
+    with _gazetteer_lock:
+        if not _gazetteer_loaded:
+            if DEFAULT_GAZETTEER_PATH.exists():
+                _gazetteer = Gazetteer(DEFAULT_GAZETTEER_PATH)
+            _gazetteer_loaded = True
+        return _gazetteer
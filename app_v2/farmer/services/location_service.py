@@ -2,21 +2,82 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
 import math
-import os
+import random
+import re
+import threading
+import time
+import unicodedata
 from dataclasses import dataclass
-from typing import Optional
-from urllib.parse import urlencode
-from urllib.request import urlopen
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app_v2.common.http_clients import get_async_client, get_sync_client
+from app_v2.config.settings import get_settings
+from app_v2.farmer.repository.geocode_cache_repo import GeocodeCacheRepository
+from app_v2.farmer.services.gazetteer import (
+    KIND_MUNICIPALITY,
+    KIND_POSTCODE,
+    get_gazetteer,
+)
 
 # V2 共通：受け渡し地点の標準半径（400mルール）
 DEFAULT_PICKUP_RADIUS_METERS: int = 400
 
-# .env からキーを読む（V1 geocoding.py と同じ優先順位）
-GEOCODING_API_KEY: Optional[str] = os.getenv("GOOGLE_GEOCODING_API_KEY") or os.getenv(
-    "GOOGLE_MAPS_API_KEY"
-)
+# API キー（GOOGLE_GEOCODING_API_KEY → GOOGLE_MAPS_API_KEY）と
+# backend（"google"（既定） / "stub"：テスト・ローカル用。通信せず決定的な座標を返す）は
+# app_v2.config.settings から読む
+
+# GeocodeResult.precision
+PRECISION_ADDRESS = "address"            # 番地レベル（Google / キャッシュ）
+PRECISION_POSTCODE = "postcode"          # 郵便番号 7 桁の代表点
+PRECISION_MUNICIPALITY = "municipality"  # 市町村の代表点（役所付近）
+PRECISION_POSTCODE_AREA = "postcode_area"  # 郵便番号上 3 桁の地域中心
+
+# 一時的な失敗（住所自体の問題ではない・時間をおけば通る）
+TRANSIENT_GEOCODE_STATUSES = {
+    "NO_API_KEY",
+    "NETWORK_ERROR",
+    "OVER_QUERY_LIMIT",
+    "UNKNOWN_ERROR",
+    "PARSE_ERROR",
+}
+
+# ============================================================
+# geocode キャッシュ
+# ============================================================
+
+# 成功結果は長めに、ZERO_RESULTS（住所不明）は短めに保持する
+GEOCODE_CACHE_TTL = timedelta(days=90)
+GEOCODE_NEGATIVE_CACHE_TTL = timedelta(days=1)
+
+# NO_API_KEY / NETWORK_ERROR などの一時的な失敗はキャッシュしない
+_NEGATIVE_CACHE_STATUSES = {"ZERO_RESULTS"}
+
+_cache_repo = GeocodeCacheRepository()
+
+_cache_stats: Dict[str, int] = {
+    "hits": 0,
+    "negative_hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "errors": 0,
+    "coalesced": 0,
+}
+_cache_stats_lock = threading.Lock()
+
+# 住所表記ゆれ（ハイフン類）の統一
+_DASH_CHARS = "‐‑‒–—―−"
+_DASH_TABLE = str.maketrans({ch: "-" for ch in _DASH_CHARS})
+_SPACES_RE = re.compile(r"\s+")
+# 日本語の前後の空白は意味を持たない（"徳島市 万代町" = "徳島市万代町"）
+_CJK_SPACE_RE = re.compile(r"(?<=[^\x00-\x7f]) | (?=[^\x00-\x7f])")
+# 登録画面は "日本〒770-0000徳島県…" の形で送ってくるので、先頭の国名・郵便番号は落とす
+_ADDRESS_PREFIX_RE = re.compile(r"^(日本)?(〒?\d{3}-?\d{4})?")
 
 
 @dataclass
@@ -31,12 +92,53 @@ class GeocodeResult:
     lng: Optional[float]
     status: str
     error_message: Optional[str] = None
+    # 座標の粒度（PRECISION_*）。失敗時は None
+    precision: Optional[str] = None
 
 
-def geocode_address(address: str, region: str = "jp", timeout_sec: float = 5.0) -> GeocodeResult:
+def normalize_address_key(address: str) -> str:
+    """
+    キャッシュキー用の住所正規化。
+
+    - NFKC（全角英数・記号 → 半角）
+    - ハイフン類を "-" に統一
+    - 空白を詰め（日本語の前後は除去）、英字は小文字に揃える
+    - 先頭の「日本」「〒xxx-xxxx」は落とす（同じ住所を同じキーにする）
+    """
+    text = unicodedata.normalize("NFKC", address or "")
+    text = text.translate(_DASH_TABLE)
+    text = _SPACES_RE.sub(" ", text).strip()
+    text = _CJK_SPACE_RE.sub("", text)
+    text = _ADDRESS_PREFIX_RE.sub("", text)
+    return text.lower()
+
+
+def get_geocode_cache_stats() -> Dict[str, int]:
+    """
+    プロセス起動以降のキャッシュ統計（/metrics に載せる）。
     """
-    Google Geocoding API を使って、住所から (lat, lng) を取得する。
+    with _cache_stats_lock:
+        return dict(_cache_stats)
 
+
+def _count(name: str) -> None:
+    with _cache_stats_lock:
+        _cache_stats[name] += 1
+
+
+def geocode_address(
+    address: str,
+    region: str = "jp",
+    timeout_sec: float = 5.0,
+    *,
+    use_cache: bool = True,
+) -> GeocodeResult:
+    """
+    住所から (lat, lng) を取得する。
+
+    - 住所が市町村名だけなら gazetteer で即答する（通信なし）。
+    - 次に geocode_cache を引き、無ければ Google Geocoding API（または stub）を呼ぶ。
+    - 成功と ZERO_RESULTS はキャッシュする（TTL は別々）。
     - HTTP エラーやネットワークエラーの場合も Exception は投げず、
       GeocodeResult(ok=False, status=..., error_message=...) を返す。
     - FastAPI の HTTPException はここでは使わない（API 層で wrap する）。
@@ -51,36 +153,189 @@ def geocode_address(address: str, region: str = "jp", timeout_sec: float = 5.0)
             error_message="address is empty",
         )
 
-    if not GEOCODING_API_KEY:
+    address_key = normalize_address_key(addr)
+    region_key = (region or "").strip().lower()
+
+    # 市町村名だけの住所は、Google に聞いても代表点しか返らない
+    area = lookup_gazetteer(city=address_key)
+    if area is not None:
+        return area
+
+    if use_cache:
+        cached = _lookup_cache(address_key, region_key)
+        if cached is not None:
+            return cached
+
+    if get_settings().geocoder_backend == "stub":
+        result = _geocode_stub(address_key)
+    else:
+        result = _geocode_google(addr, region, timeout_sec)
+
+    if use_cache:
+        _store_cache(address_key, region_key, result)
+
+    return result
+
+
+def _lookup_cache(address_key: str, region: str) -> Optional[GeocodeResult]:
+    try:
+        row = _cache_repo.get_valid(
+            address_key=address_key,
+            region=region,
+            now=datetime.now(timezone.utc),
+        )
+    except Exception:
+        # キャッシュ障害（テーブル未作成など）は素通しにする
+        _count("errors")
+        return None
+
+    if row is None:
+        _count("misses")
+        return None
+
+    ok = row["status"] == "OK"
+    _count("hits" if ok else "negative_hits")
+    return GeocodeResult(
+        ok=ok,
+        lat=row["lat"],
+        lng=row["lng"],
+        status=row["status"],
+        error_message=row["error_message"],
+        precision=PRECISION_ADDRESS if ok else None,
+    )
+
+
+def _store_cache(address_key: str, region: str, result: GeocodeResult) -> None:
+    if result.ok:
+        ttl = GEOCODE_CACHE_TTL
+    elif result.status in _NEGATIVE_CACHE_STATUSES:
+        ttl = GEOCODE_NEGATIVE_CACHE_TTL
+    else:
+        return
+
+    now = datetime.now(timezone.utc)
+    try:
+        _cache_repo.upsert(
+            address_key=address_key,
+            region=region,
+            status=result.status,
+            lat=result.lat,
+            lng=result.lng,
+            error_message=result.error_message,
+            expires_at=now + ttl,
+            created_at=now,
+        )
+    except Exception:
+        _count("errors")
+        return
+
+    _count("stores")
+
+
+def _geocode_stub(address_key: str) -> GeocodeResult:
+    """
+    通信しないジオコーダ（GEOCODER_BACKEND=stub）。
+
+    - 同じ住所には常に同じ座標（徳島市中心から ±約 5km）を返す
+    - "zero_results" を含む住所は ZERO_RESULTS を返す（住所不明のテスト用）
+    """
+    if "zero_results" in address_key:
         return GeocodeResult(
             ok=False,
             lat=None,
             lng=None,
-            status="NO_API_KEY",
-            error_message="GOOGLE_GEOCODING_API_KEY (or GOOGLE_MAPS_API_KEY) is not configured",
+            status="ZERO_RESULTS",
+            error_message="no results",
         )
 
+    digest = hashlib.blake2b(address_key.encode("utf-8"), digest_size=8).digest()
+    dlat = (int.from_bytes(digest[:4], "big") / 0xFFFFFFFF - 0.5) * 0.09
+    dlng = (int.from_bytes(digest[4:], "big") / 0xFFFFFFFF - 0.5) * 0.11
+    return GeocodeResult(
+        ok=True,
+        lat=round(34.0703 + dlat, 7),
+        lng=round(134.5548 + dlng, 7),
+        status="OK",
+        precision=PRECISION_ADDRESS,
+    )
+
+
+# ============================================================
+# Google Geocoding API（共有コネクションプール + リトライ）
+# ============================================================
+
+GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# 一時的な失敗は最大 3 回まで（全体で timeout_sec を超えない範囲で）
+GEOCODE_MAX_ATTEMPTS = 3
+GEOCODE_RETRY_BASE_SEC = 0.2
+
+# Google が 200 で返す「時間をおけば通る」status
+_RETRYABLE_GOOGLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+
+def _retry_delay(attempt: int) -> float:
+    # 指数バックオフ + jitter（同時に失敗したリクエストが同時に再送しないように）
+    return GEOCODE_RETRY_BASE_SEC * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+def _no_api_key_result() -> GeocodeResult:
+    return GeocodeResult(
+        ok=False,
+        lat=None,
+        lng=None,
+        status="NO_API_KEY",
+        error_message="GOOGLE_GEOCODING_API_KEY (or GOOGLE_MAPS_API_KEY) is not configured",
+    )
+
+
+def _network_error_result(e: Exception) -> GeocodeResult:
+    return GeocodeResult(
+        ok=False,
+        lat=None,
+        lng=None,
+        status="NETWORK_ERROR",
+        error_message=f"failed to call Google Geocoding API: {e}",
+    )
+
+
+def _google_params(address: str, region: str) -> dict[str, str]:
     params: dict[str, str] = {
-        "address": addr,
-        "key": GEOCODING_API_KEY,
+        "address": address,
+        "key": get_settings().geocoding_api_key or "",
     }
     if region:
         params["region"] = region
+    return params
 
-    url = "https://maps.googleapis.com/maps/api/geocode/json?" + urlencode(params)
+
+def _result_from_response(resp: httpx.Response) -> Tuple[GeocodeResult, bool]:
+    """
+    HTTP レスポンス → (結果, リトライしてよいか)
+    """
+    if resp.status_code != 200:
+        retryable = resp.status_code == 429 or resp.status_code >= 500
+        return _network_error_result(Exception(f"HTTP {resp.status_code}")), retryable
 
     try:
-        with urlopen(url, timeout=timeout_sec) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        data = resp.json()
     except Exception as e:
-        return GeocodeResult(
-            ok=False,
-            lat=None,
-            lng=None,
-            status="NETWORK_ERROR",
-            error_message=f"failed to call Google Geocoding API: {e}",
+        return (
+            GeocodeResult(
+                ok=False,
+                lat=None,
+                lng=None,
+                status="PARSE_ERROR",
+                error_message=f"failed to parse geocoding response: {e}",
+            ),
+            False,
         )
 
+    result = _parse_google_response(data)
+    return result, result.status in _RETRYABLE_GOOGLE_STATUSES
+
+
+def _parse_google_response(data: dict) -> GeocodeResult:
     status = str(data.get("status") or "")
     error_message = data.get("error_message")
     results = data.get("results") or []
@@ -114,9 +369,226 @@ def geocode_address(address: str, region: str = "jp", timeout_sec: float = 5.0)
         lng=lng,
         status=status,
         error_message=error_message,
+        precision=PRECISION_ADDRESS,
     )
 
 
+def _geocode_google(address: str, region: str, timeout_sec: float) -> GeocodeResult:
+    if not get_settings().geocoding_api_key:
+        return _no_api_key_result()
+
+    client = get_sync_client()
+    params = _google_params(address, region)
+    deadline = time.monotonic() + timeout_sec
+
+    result = _network_error_result(Exception("timeout"))
+    for attempt in range(GEOCODE_MAX_ATTEMPTS):
+        if attempt:
+            delay = _retry_delay(attempt)
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        try:
+            resp = client.get(GOOGLE_GEOCODE_URL, params=params, timeout=remaining)
+            result, retryable = _result_from_response(resp)
+        except httpx.HTTPError as e:
+            result, retryable = _network_error_result(e), True
+
+        if not retryable:
+            break
+
+    return result
+
+
+async def _geocode_google_async(
+    address: str,
+    region: str,
+    timeout_sec: float,
+) -> GeocodeResult:
+    if not get_settings().geocoding_api_key:
+        return _no_api_key_result()
+
+    client = get_async_client()
+    params = _google_params(address, region)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_sec
+
+    result = _network_error_result(Exception("timeout"))
+    for attempt in range(GEOCODE_MAX_ATTEMPTS):
+        if attempt:
+            delay = _retry_delay(attempt)
+            if loop.time() + delay >= deadline:
+                break
+            await asyncio.sleep(delay)
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+
+        try:
+            resp = await client.get(GOOGLE_GEOCODE_URL, params=params, timeout=remaining)
+            result, retryable = _result_from_response(resp)
+        except httpx.HTTPError as e:
+            result, retryable = _network_error_result(e), True
+
+        if not retryable:
+            break
+
+    return result
+
+
+# ============================================================
+# async 版 geocode_address（/api/geocode 用）
+# ============================================================
+
+# 同じ住所の同時リクエストは 1 本の外部呼び出しにまとめる
+_inflight: Dict[Tuple[int, str, str], "asyncio.Task[GeocodeResult]"] = {}
+
+
+async def geocode_address_async(
+    address: str,
+    region: str = "jp",
+    timeout_sec: float = 5.0,
+    *,
+    use_cache: bool = True,
+) -> GeocodeResult:
+    """
+    geocode_address と同じ結果を返す async 版。
+
+    - 外部呼び出しは共有 AsyncClient（keep-alive）で行い、スレッドを占有しない
+    - 同じ住所で実行中の呼び出しがあれば、その結果を待つ（coalescing）
+    """
+    addr = (address or "").strip()
+    if not addr:
+        return GeocodeResult(
+            ok=False,
+            lat=None,
+            lng=None,
+            status="INVALID_ARGUMENT",
+            error_message="address is empty",
+        )
+
+    address_key = normalize_address_key(addr)
+    region_key = (region or "").strip().lower()
+
+    area = lookup_gazetteer(city=address_key)
+    if area is not None:
+        return area
+
+    if use_cache:
+        cached = await asyncio.to_thread(_lookup_cache, address_key, region_key)
+        if cached is not None:
+            return cached
+
+    loop = asyncio.get_running_loop()
+    inflight_key = (id(loop), address_key, region_key)
+
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = loop.create_task(
+            _resolve_remote_async(
+                addr,
+                address_key=address_key,
+                region=region,
+                region_key=region_key,
+                timeout_sec=timeout_sec,
+                use_cache=use_cache,
+            )
+        )
+        _inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    else:
+        _count("coalesced")
+
+    # 待っている側がキャンセルされても、共有の呼び出しは止めない
+    return await asyncio.shield(task)
+
+
+async def _resolve_remote_async(
+    address: str,
+    *,
+    address_key: str,
+    region: str,
+    region_key: str,
+    timeout_sec: float,
+    use_cache: bool,
+) -> GeocodeResult:
+    if get_settings().geocoder_backend == "stub":
+        result = _geocode_stub(address_key)
+    else:
+        result = await _geocode_google_async(address, region, timeout_sec)
+
+    if use_cache:
+        await asyncio.to_thread(_store_cache, address_key, region_key, result)
+
+    return result
+
+
+# ============================================================
+# オフライン gazetteer（郵便番号・市町村）
+# ============================================================
+
+def lookup_gazetteer(
+    *,
+    postcode: Optional[str] = None,
+    city: Optional[str] = None,
+) -> Optional[GeocodeResult]:
+    """
+    郵便番号・市町村名から代表点を返す（通信なし・数 µs）。
+
+    - 優先順：郵便番号 7 桁 → 市町村（"徳島県徳島市" の形）→ 郵便番号上 3 桁
+    - どれにも当たらなければ None
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+
+    digits = "".join(ch for ch in unicodedata.normalize("NFKC", postcode or "") if ch.isdigit())
+
+    candidates = []
+    if len(digits) == 7:
+        candidates.append((KIND_POSTCODE, digits, PRECISION_POSTCODE))
+    if city:
+        candidates.append((KIND_MUNICIPALITY, city, PRECISION_MUNICIPALITY))
+    if len(digits) >= 3:
+        candidates.append((KIND_POSTCODE, digits[:3], PRECISION_POSTCODE_AREA))
+
+    for kind, name, precision in candidates:
+        hit = gazetteer.lookup(kind, name)
+        if hit is not None:
+            return GeocodeResult(
+                ok=True,
+                lat=hit[0],
+                lng=hit[1],
+                status="OK",
+                precision=precision,
+            )
+    return None
+
+
+def lookup_cached_geocode(address: str, region: str = "jp") -> Optional[GeocodeResult]:
+    """
+    通信せずに分かる範囲だけで住所を引く（gazetteer の市町村 → geocode_cache）。
+    どちらにも無ければ None。
+    """
+    addr = (address or "").strip()
+    if not addr:
+        return None
+
+    address_key = normalize_address_key(addr)
+
+    area = lookup_gazetteer(city=address_key)
+    if area is not None:
+        return area
+
+    return _lookup_cache(address_key, (region or "").strip().lower())
+
+
 def haversine_distance_m(
     lat1: float,
     lng1: float,
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+
+from app_v2.common.background_jobs import get_job_runner
+from app_v2.farmer.repository.owner_geocode_repo import OwnerGeocodeRepository
+from app_v2.farmer.services.location_service import (
+    TRANSIENT_GEOCODE_STATUSES,
+    geocode_address,
+)
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# owner 座標のバックグラウンド解決
+#
+# registration は外部 API を待たずに保存し（geocode_status = 'pending'）、
+# ここで Google に問い合わせて farms.lat / lng を確定させる。
+# ============================================================
+
+GEOCODE_STATUS_PENDING = "pending"
+GEOCODE_STATUS_DONE = "done"
+GEOCODE_STATUS_FAILED = "failed"
+
+# 一時障害のリトライ：5s → 10s → 20s … 最大 8 回（合計 約 20 分）
+OWNER_GEOCODE_MAX_ATTEMPTS = 8
+OWNER_GEOCODE_BACKOFF_BASE_SEC = 5.0
+
+
+class OwnerGeocodeRetry(Exception):
+    """時間をおけば解決できる失敗（ジョブを再実行させる）"""
+
+
+def run_owner_geocode(farm_id: int) -> None:
+    repo = OwnerGeocodeRepository()
+
+    src = repo.get_geocode_source(farm_id)
+    if src is None or src.get("geocode_status") != GEOCODE_STATUS_PENDING:
+        return
+
+    address = src.get("address") or ""
+    result = geocode_address(address=address, region="jp")
+
+    if result.ok and result.lat is not None and result.lng is not None:
+        repo.resolve_pending(
+            farm_id=farm_id,
+            address=address,
+            lat=float(result.lat),
+            lng=float(result.lng),
+            geocode_status=GEOCODE_STATUS_DONE,
+        )
+        return
+
+    if result.status in TRANSIENT_GEOCODE_STATUSES:
+        raise OwnerGeocodeRetry(f"{result.status}: {result.error_message}")
+
+    # 住所自体が引けない（ZERO_RESULTS など）：代表点のまま failed にする
+    repo.resolve_pending(
+        farm_id=farm_id,
+        address=address,
+        lat=None,
+        lng=None,
+        geocode_status=GEOCODE_STATUS_FAILED,
+    )
+
+
+def _mark_failed(farm_id: int) -> None:
+    repo = OwnerGeocodeRepository()
+    src = repo.get_geocode_source(farm_id)
+    if src is None:
+        return
+    repo.resolve_pending(
+        farm_id=farm_id,
+        address=src.get("address") or "",
+        lat=None,
+        lng=None,
+        geocode_status=GEOCODE_STATUS_FAILED,
+    )
+
+
+def enqueue_owner_geocode(farm_id: int, *, delay_sec: float = 0.0) -> None:
+    get_job_runner().submit(
+        f"owner_geocode:{farm_id}",
+        run_owner_geocode,
+        farm_id,
+        delay_sec=delay_sec,
+        max_attempts=OWNER_GEOCODE_MAX_ATTEMPTS,
+        backoff_base_sec=OWNER_GEOCODE_BACKOFF_BASE_SEC,
+        on_give_up=lambda _e: _mark_failed(farm_id),
+    )
+
+
+def resume_pending_owner_geocodes() -> int:
+    """
+    起動時に pending のまま残っている farm を拾い直す。戻り値は件数。
+    """
+    try:
+        farm_ids = OwnerGeocodeRepository().list_pending_farm_ids()
+    except Exception as e:
+        # migration 前（geocode_status 列なし）でも起動は止めない
+        logger.warning(
+            "skip resuming owner geocodes: %s",
+            e,
+            extra={"event": "jobs.owner_geocode_resume_skipped"},
+        )
+        return 0
+
+    for farm_id in farm_ids:
+        enqueue_owner_geocode(farm_id)
+    return len(farm_ids)
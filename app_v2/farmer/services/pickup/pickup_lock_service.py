@@ -1,17 +1,20 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 
 from app_v2.customer_booking.utils.pickup_time_utils import JST
 from app_v2.customer_booking.repository.reservation_expanded_repo import (
     ReservationExpandedRepository,
 )
-from app_v2.customer_booking.services.reservation_expanded_service import (
-    _calc_event_for_export,
-    _calc_event_for_booking,
-    _parse_db_datetime,
+from app_v2.customer_booking.services.pickup_event_calendar_service import (
+    PickupEventCalendarService,
 )
+from app_v2.domain.pickup_event_batch import (
+    booking_event_starts_us,
+    datetime_to_epoch_us,
+)
+from app_v2.domain.pickup_slot import UTC, PickupSlot
 
 
 class PickupLockService:
@@ -30,6 +33,7 @@ class PickupLockService:
 
     def __init__(self) -> None:
         self.reservation_repo = ReservationExpandedRepository()
+        self.calendar = PickupEventCalendarService()
 
     # ---------------------------------------------------------
     # 内部: 現在イベントに属する confirmed 件数を数える
@@ -51,6 +55,18 @@ class PickupLockService:
         if not pickup_time:
             return 0
 
+        slot = PickupSlot.from_code(pickup_time)
+        now = datetime.now(JST)
+        export_event_start, _ = slot.event_for_export(now, UTC)
+
+        # pickup_events があれば COUNT 1 本で済ませる
+        event_id = self.calendar.find_event_id_or_none(
+            farm_id=farm_id,
+            event_start=export_event_start,
+        )
+        if event_id is not None:
+            return self.reservation_repo.count_confirmed_reservations_for_event(event_id)
+
         # 該当 farm / スロットの confirmed 予約を全取得
         records = self.reservation_repo.get_confirmed_reservations_for_farm(
             farm_id=farm_id,
@@ -60,30 +76,16 @@ class PickupLockService:
         if not records:
             return 0
 
-        now = datetime.now(JST)
-        export_event_start, _ = _calc_event_for_export(now, pickup_time)
-
-        count = 0
-        for rec in records:
-            if not rec.created_at:
-                continue
-
-            try:
-                created_at_dt = _parse_db_datetime(rec.created_at)
-            except Exception:
-                # 壊れた created_at は無視
-                continue
-
-            booking_event_start, _ = _calc_event_for_booking(
-                created_at_dt,
-                pickup_time,
-            )
+        export_event_start_us = datetime_to_epoch_us(export_event_start)
 
-            # 今表示対象のイベントと同じ週か
-            if booking_event_start.date() == export_event_start.date():
-                count += 1
+        # 壊れた created_at は None になり、数えない
+        booking_starts_us = booking_event_starts_us(
+            [rec.created_at for rec in records],
+            pickup_time,
+        )
 
-        return count
+        # 今表示対象のイベントと同じ週か
+        return sum(1 for s in booking_starts_us if s == export_event_start_us)
 
     # ---------------------------------------------------------
     # 公開 API
@@ -93,15 +95,20 @@ class PickupLockService:
         self,
         farm_id: int,
         pickup_time: Optional[str],
+        pickup_slot_codes: Sequence[str] = (),
     ) -> int:
         """
         今のイベントに属する confirmed 予約数を返す。
+        複数スロットの farm はスロットごとの「今のイベント」の合計。
         例外は外に出さない。
         """
         try:
-            return self._count_confirmed_for_current_event(
-                farm_id=farm_id,
-                pickup_time=pickup_time,
+            return sum(
+                self._count_confirmed_for_current_event(
+                    farm_id=farm_id,
+                    pickup_time=code,
+                )
+                for code in (pickup_slot_codes or (pickup_time,))
             )
         except Exception:
             # 何か壊れても「予約なし」として扱う（編集不能にしない）
@@ -111,6 +118,7 @@ class PickupLockService:
         self,
         farm_id: int,
         pickup_time: Optional[str],
+        pickup_slot_codes: Sequence[str] = (),
     ) -> bool:
         """
         pickup 設定がロックされているかどうか。
@@ -121,4 +129,5 @@ class PickupLockService:
         return self.get_active_reservations_count(
             farm_id=farm_id,
             pickup_time=pickup_time,
+            pickup_slot_codes=pickup_slot_codes,
         ) > 0
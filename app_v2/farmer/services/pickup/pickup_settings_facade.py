@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional, Sequence
 
 from app_v2.farmer.services.pickup.pickup_settings_service import (
     PickupSettingsService,
@@ -90,6 +91,7 @@ class PickupSettingsFacade:
             active_count = self.lock_service.get_active_reservations_count(
                 farm_id=farm.farm_id,
                 pickup_time=farm.pickup_time,
+                pickup_slot_codes=farm.pickup_times,
             )
         except Exception:
             # lock 判定に失敗した場合は「編集可能」にする
@@ -116,6 +118,7 @@ class PickupSettingsFacade:
         pickup_place_name: str,
         pickup_notes: str | None,
         pickup_time: str,
+        pickup_times: Optional[Sequence[str]] = None,
     ) -> PickupSettingsFacadeResult:
         """
         Pickup Settings を更新する。
@@ -129,6 +132,7 @@ class PickupSettingsFacade:
         active_count = self.lock_service.get_active_reservations_count(
             farm_id=farm.farm_id,
             pickup_time=farm.pickup_time,
+            pickup_slot_codes=farm.pickup_times,
         )
 
         if active_count > 0:
@@ -145,6 +149,7 @@ class PickupSettingsFacade:
             pickup_place_name=pickup_place_name,
             pickup_notes=pickup_notes,
             pickup_time=pickup_time,
+            pickup_times=pickup_times,
         )
 
         # 保存後の最新状態を返す
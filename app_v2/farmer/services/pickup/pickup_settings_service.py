@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
 
+from app_v2.customer_booking.services.pickup_event_calendar_service import (
+    PickupEventCalendarService,
+)
+from app_v2.domain.pickup_schedule import MAX_PICKUP_SLOTS_PER_FARM, PickupSchedule
 from app_v2.farmer.repository.pickup_settings_repo import (
     PickupSettingsRepository,
 )
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================
 # 例外
@@ -23,6 +30,10 @@ class FarmNotFoundError(PickupSettingsError):
         super().__init__(f"farm not found for farm_id={farm_id}")
 
 
+class InvalidPickupTimesError(PickupSettingsError):
+    """受け渡し時間スロットが不正（書式・個数）"""
+
+
 # ============================================================
 # DTO（farm 単体）
 # ============================================================
@@ -40,6 +51,12 @@ class PickupFarmDTO:
     pickup_notes: Optional[str]
     pickup_time: str
 
+    # owner 座標の確定状態（"pending" の間は郵便番号・市町村の代表点）
+    owner_geocode_status: str = "done"
+
+    # 全スロット（週内の時刻順）。pickup_time はその先頭（代表スロット）
+    pickup_times: List[str] = field(default_factory=list)
+
 
 # ============================================================
 # Service 本体（純粋化）
@@ -54,16 +71,18 @@ class PickupSettingsService:
     - pickup 設定の取得
     - pickup 設定の更新
     - farm の存在確認
+    - 保存後の pickup_events 再生成の呼び出し（計算は PickupEventCalendarService）
 
     非責務:
     - reservation 判定
-    - lock / active / event
+    - lock / active / event の判定・計算
     - 差分チェック
     - HTTP / API 文脈
     """
 
     def __init__(self) -> None:
         self.repo = PickupSettingsRepository()
+        self.calendar = PickupEventCalendarService()
 
     # ---------------------------------------------------------
     # GET
@@ -86,6 +105,10 @@ class PickupSettingsService:
             pickup_place_name=farm_row.get("pickup_place_name") or "",
             pickup_notes=farm_row.get("pickup_notes"),
             pickup_time=farm_row.get("pickup_time") or "",
+            owner_geocode_status=farm_row.get("owner_geocode_status") or "done",
+            pickup_times=self._ordered_pickup_times(
+                self.repo.fetch_pickup_slot_codes(farm_id)
+            ),
         )
 
     # ---------------------------------------------------------
@@ -101,16 +124,24 @@ class PickupSettingsService:
         pickup_place_name: str,
         pickup_notes: Optional[str],
         pickup_time: str,
+        pickup_times: Optional[Sequence[str]] = None,
     ) -> None:
         """
         pickup 設定を保存する。
 
+        - pickup_times（複数スロット）があればそれを、無ければ pickup_time 1 件を保存
+        - farms.pickup_time には週内で最も早いスロットを入れる（代表スロット）
+
         ※ lock 判定・差分判定は一切行わない
         """
         farm_row = self.repo.fetch_farm_pickup(farm_id)
         if farm_row is None:
             raise FarmNotFoundError(farm_id)
 
+        slot_codes = self._validate_pickup_times(
+            list(pickup_times) if pickup_times else [pickup_time]
+        )
+
         try:
             self.repo.update_pickup_settings(
                 farm_id=farm_id,
@@ -118,9 +149,55 @@ class PickupSettingsService:
                 pickup_lng=pickup_lng,
                 pickup_place_name=pickup_place_name,
                 pickup_notes=pickup_notes,
-                pickup_time=pickup_time,
+                pickup_time=slot_codes[0],
             )
+            self.repo.replace_pickup_slots(farm_id, slot_codes)
             self.repo.commit()
         except Exception:
             self.repo.rollback()
             raise
+
+        # 受け渡しイベント（pickup_events）を新しいスロットで作り直す
+        try:
+            self.calendar.regenerate_for_farm(
+                farm_id=farm_id,
+                pickup_slot_codes=slot_codes,
+            )
+        except Exception as e:
+            # 設定の保存は済んでいる。イベントは定期ジョブで補充される
+            logger.warning(
+                "regenerate failed for farm %s: %s",
+                farm_id,
+                e,
+                extra={"event": "pickup_events.regenerate_failed", "farm_id": farm_id},
+            )
+
+    # ---------------------------------------------------------
+    # 内部
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _ordered_pickup_times(codes: Sequence[str]) -> List[str]:
+        """
+        表示用に週内の時刻順へ並べる（不正なコードを含む旧データはそのまま）。
+        """
+        try:
+            return list(PickupSchedule.from_codes(codes).codes)
+        except ValueError:
+            return list(codes)
+
+    @staticmethod
+    def _validate_pickup_times(codes: List[str]) -> List[str]:
+        """
+        スロットコードを検証し、週内の時刻順に並べて返す（大文字に揃え、重複は 1 つに）。
+        """
+        codes = [c.strip().upper() for c in codes if c and c.strip()]
+        if not codes or len(codes) > MAX_PICKUP_SLOTS_PER_FARM:
+            raise InvalidPickupTimesError(
+                f"pickup_times must have 1 to {MAX_PICKUP_SLOTS_PER_FARM} slots"
+            )
+        try:
+            schedule = PickupSchedule.from_codes(codes)
+        except ValueError as e:
+            raise InvalidPickupTimesError(str(e)) from e
+        return list(schedule.codes)
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from app_v2.farmer.dtos import OwnerDTO, FarmPickupDTO
 from app_v2.farmer.repository.registration_repo import RegistrationRepository
 from app_v2.farmer.services.location_service import (
-    geocode_address,
-    GeocodeResult,
+    lookup_cached_geocode,
+    lookup_gazetteer,
+)
+from app_v2.farmer.services.owner_geocode_job import (
+    GEOCODE_STATUS_DONE,
+    GEOCODE_STATUS_PENDING,
+    enqueue_owner_geocode,
 )
 
 
@@ -41,23 +47,40 @@ class RegistrationService:
     # Internal helpers
     # --------------------------------------------------------
 
-    def _geocode_owner_address(
+    def _resolve_owner_location(
         self,
         *,
+        owner_postcode: str,
         owner_pref: str,
         owner_city: str,
         owner_addr_line: str,
-    ) -> tuple[float, float]:
+    ) -> tuple[Optional[float], Optional[float], str]:
+        """
+        owner 座標を外部 API を待たずに決める。
+
+        - geocode_cache に番地レベルの結果があれば確定（登録画面が同じ住所で
+          /api/geocode を済ませているので、通常はここで決まる）
+        - 無ければ郵便番号・市町村の代表点を仮置きして pending
+          （バックグラウンドジョブが後で確定させる）
+        """
         address = f"{owner_pref}{owner_city}{owner_addr_line}".strip()
         if not address:
             raise RegistrationError("owner address is empty")
 
-        result: GeocodeResult = geocode_address(address=address, region="jp")
-
-        if not result.ok or result.lat is None or result.lng is None:
-            raise RegistrationError("failed to geocode owner address")
+        cached = lookup_cached_geocode(address, region="jp")
+        if cached is not None:
+            if not cached.ok or cached.lat is None or cached.lng is None:
+                # 住所不明（ZERO_RESULTS）が確定している
+                raise RegistrationError("failed to geocode owner address")
+            return float(cached.lat), float(cached.lng), GEOCODE_STATUS_DONE
 
-        return float(result.lat), float(result.lng)
+        approx = lookup_gazetteer(
+            postcode=owner_postcode,
+            city=f"{owner_pref}{owner_city}",
+        )
+        if approx is not None:
+            return approx.lat, approx.lng, GEOCODE_STATUS_PENDING
+        return None, None, GEOCODE_STATUS_PENDING
 
     # --------------------------------------------------------
     # Public API（最終形）
@@ -110,8 +133,9 @@ class RegistrationService:
             pickup_time=pickup_time,
         )
 
-        # 3. geocode owner address
-        owner_lat, owner_lng = self._geocode_owner_address(
+        # 3. owner 座標（外部 API は待たない）
+        owner_lat, owner_lng, geocode_status = self._resolve_owner_location(
+            owner_postcode=owner_postcode,
             owner_pref=owner_pref,
             owner_city=owner_city,
             owner_addr_line=owner_addr_line,
@@ -130,6 +154,7 @@ class RegistrationService:
                 pickup=pickup_dto,
                 owner_lat=owner_lat,
                 owner_lng=owner_lng,
+                geocode_status=geocode_status,
                 active_flag=active_flag,
                 is_public=is_public,
                 is_accepting_reservations=is_accepting_reservations,
@@ -153,6 +178,10 @@ class RegistrationService:
             self.repo.rollback()
             raise
 
+        # 6. 座標が仮置きならバックグラウンドで確定させる（commit 後に投入）
+        if geocode_status == GEOCODE_STATUS_PENDING:
+            enqueue_owner_geocode(farm_id)
+
         return RegistrationResult(
             farm_id=farm_id,
             settings_url_hint=f"/farmer/settings?farm_id={farm_id}",
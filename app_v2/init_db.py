@@ -3,9 +3,6 @@ import os
 import sqlite3
 
 
-print("INIT_DB FILE:", __file__)
-
-
 def resolve_project_root() -> Path:
     # ローカル:
     #   C:\Users\...\komet\app_v2\init_db.py
@@ -37,13 +34,15 @@ def resolve_db_path() -> Path:
 
 PROJECT_ROOT = resolve_project_root()
 SCHEMA_PATH = PROJECT_ROOT / "src" / "schema.sql"
-DB_PATH = resolve_db_path()
 
 
 def init_db():
+    db_path = resolve_db_path()
+
+    print("INIT_DB FILE:", __file__)
     print("=== INIT_DB START ===")
     print("PROJECT_ROOT:", PROJECT_ROOT)
-    print("DB_PATH:", DB_PATH)
+    print("DB_PATH:", db_path)
     print("SCHEMA_PATH:", SCHEMA_PATH)
 
     # schema.sql の存在確認
@@ -60,9 +59,9 @@ def init_db():
 
     try:
         # 親ディレクトリが無いと SQLite は作れない
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        conn = sqlite3.connect(str(DB_PATH))
+        conn = sqlite3.connect(str(db_path))
         print("sqlite connected")
 
         conn.executescript(schema_sql)
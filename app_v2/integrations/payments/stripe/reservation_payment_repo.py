@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 from typing import Any, Dict, Optional
 
-from app_v2.db.core import resolve_db_path
+from app_v2.db.core import connect, resolve_db_path
 
 
 class ReservationPaymentRepository:
@@ -20,7 +20,7 @@ class ReservationPaymentRepository:
     # DB connection
     # ==================================================
     def open_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(resolve_db_path())
+        conn = connect(resolve_db_path())
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from datetime import datetime, UTC
 from typing import Any, Dict, Optional
 
@@ -12,6 +13,11 @@ from app_v2.customer_booking.repository.reservation_status_repo import (
 from app_v2.customer_booking.services.reservation_expanded_service import (
     _calc_event_for_booking,
 )
+from app_v2.customer_booking.services.pickup_event_calendar_service import (
+    PickupEventCalendarService,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class ReservationPaymentService:
@@ -31,6 +37,7 @@ class ReservationPaymentService:
     ) -> None:
         self._repo = repo or ReservationPaymentRepository()
         self._status_repo = ReservationStatusRepository()
+        self._calendar = PickupEventCalendarService()
 
     # ==================================================
     # 支払い成功の反映
@@ -104,9 +111,49 @@ class ReservationPaymentService:
             pickup_slot_code,
         )
 
+        # pickup_events への紐づけ（失敗しても確定は止めない）
+        event_id = self._resolve_event_id(
+            reservation=reservation,
+            pickup_slot_code=pickup_slot_code,
+            event_start_at=event_start_at,
+            event_end_at=event_end_at,
+        )
+
         # ③ confirmed + event_* を同時に確定
         self._status_repo.update_confirmed_with_event(
             reservation_id=rid,
             event_start_at=event_start_at,
             event_end_at=event_end_at,
+            event_id=event_id,
         )
+
+    def _resolve_event_id(
+        self,
+        *,
+        reservation: Dict[str, Any],
+        pickup_slot_code: str,
+        event_start_at: datetime,
+        event_end_at: datetime,
+    ) -> Optional[int]:
+        farm_id = reservation.get("farm_id")
+        if farm_id is None:
+            return None
+        try:
+            return self._calendar.event_id_for_booking(
+                farm_id=int(farm_id),
+                pickup_slot_code=pickup_slot_code,
+                event_start=event_start_at,
+                event_end=event_end_at,
+            )
+        except Exception as e:
+            logger.warning(
+                "event_id not resolved for reservation %s: %s",
+                reservation.get("reservation_id"),
+                e,
+                extra={
+                    "event": "pickup_events.event_id_unresolved",
+                    "reservation_id": reservation.get("reservation_id"),
+                    "farm_id": farm_id,
+                },
+            )
+            return None
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import os
-import sqlite3
-
 from fastapi import APIRouter, HTTPException, Request, status, Body
 
-from app_v2.db.core import resolve_db_path
+from app_v2.config.settings import get_settings
+from app_v2.db.core import connect, resolve_db_path
 from app_v2.customer_booking.dtos import ReservationFormDTO
 from app_v2.customer_booking.services.confirm_service import ConfirmService
 from app_v2.integrations.payments.stripe.reservation_payment_repo import (
@@ -94,7 +92,7 @@ def checkout_from_confirm(
     # 2) consumer email を DB から取得（人格ID）
     # --------------------------------------------------
     db_path = resolve_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     try:
         cur = conn.cursor()
         cur.execute(
@@ -179,7 +177,7 @@ def checkout_from_confirm(
     # --------------------------------------------------
     # 6) Stripe Checkout
     # --------------------------------------------------
-    frontend_origin = os.getenv("FRONTEND_BASE_URL")
+    frontend_origin = get_settings().frontend_base_url
     if not frontend_origin:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
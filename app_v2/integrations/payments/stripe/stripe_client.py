@@ -1,17 +1,37 @@
-import os
-from dotenv import load_dotenv
-import stripe
+import threading
+
+from app_v2.config.settings import get_settings
 
 # ------------------------------------------------------------
-# Env / Stripe setup
+# Stripe setup（初回利用時）
+#
+# stripe パッケージは import だけで 0.8 秒近くかかるので、
+# 起動時には読まず、最初に Stripe を呼ぶときに import して api_key を設定する。
 # ------------------------------------------------------------
-load_dotenv()
+_stripe = None
+_stripe_lock = threading.Lock()
+
+
+def get_stripe(*, require_api_key: bool = True):
+    """
+    api_key 設定済みの stripe モジュール。
+
+    require_api_key=True（API 呼び出し用）で STRIPE_SECRET_KEY が無ければ RuntimeError。
+    Webhook の署名検証だけなら api_key は要らない（require_api_key=False）。
+    """
+    global _stripe
+    secret_key = get_settings().stripe_secret_key
+    if require_api_key and not secret_key:
+        raise RuntimeError("STRIPE_SECRET_KEY is not set")
 
-STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
-if not STRIPE_SECRET_KEY:
-    raise RuntimeError("STRIPE_SECRET_KEY is not set")
+    if _stripe is None:
+        with _stripe_lock:
+            if _stripe is None:
+                import stripe
 
-stripe.api_key = STRIPE_SECRET_KEY
+                stripe.api_key = secret_key
+                _stripe = stripe
+    return _stripe
 
 
 def create_checkout_session(
@@ -44,7 +64,7 @@ def create_checkout_session(
     if consumer_email:
         pi_meta["consumer_email"] = consumer_email
 
-    return stripe.checkout.Session.create(
+    return get_stripe().checkout.Session.create(
         mode="payment",
         payment_method_types=["card"],
         line_items=[
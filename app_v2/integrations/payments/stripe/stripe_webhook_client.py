@@ -1,22 +1,19 @@
 # app_v2/integrations/payments/stripe/stripe_webhook_client.py
-import os
-import stripe
-
-STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
-STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
-
-stripe.api_key = STRIPE_SECRET_KEY
+from app_v2.config.settings import get_settings
+from app_v2.integrations.payments.stripe.stripe_client import get_stripe
 
 
 def construct_event(*, payload: bytes, sig_header: str):
-    if not STRIPE_WEBHOOK_SECRET:
+    webhook_secret = get_settings().stripe_webhook_secret
+    if not webhook_secret:
         raise ValueError("STRIPE_WEBHOOK_SECRET is not set")
 
+    stripe = get_stripe(require_api_key=False)
     try:
         return stripe.Webhook.construct_event(
             payload=payload,
             sig_header=sig_header,
-            secret=STRIPE_WEBHOOK_SECRET,
+            secret=webhook_secret,
         )
     except stripe.error.SignatureVerificationError:
         raise ValueError("Invalid signature")
@@ -1,40 +1,108 @@
+# .env の読み込みはエントリポイント（ここ）だけで行う。設定値は app_v2.config.settings
 from dotenv import load_dotenv
 load_dotenv()
 
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.routing import APIRoute
-import os
+from contextlib import asynccontextmanager
 from urllib.parse import urlparse
 from typing import Optional
 
+from app_v2.common.background_jobs import get_job_runner
+from app_v2.common.http_clients import close_http_clients
+from app_v2.farmer.services.owner_geocode_job import resume_pending_owner_geocodes
+from app_v2.customer_booking.services.pickup_event_calendar_service import (
+    schedule_pickup_event_refresh,
+)
+from app_v2.config.settings import get_settings
 from app_v2.db.core import resolve_db_path
+from app_v2.observability.logging_setup import configure_logging, shutdown_logging
+
+settings = get_settings()
 
+logger = logging.getLogger("app_v2.boot")
 
 # ============================
 # ENV 判定（cookie 用・本番判定）
 # ============================
-IS_RENDER = os.getenv("RENDER", "") == "true"
+IS_RENDER = settings.is_render
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}_{route.name}" if route.tags else route.name
 
 
+# ============================
+# Lifespan（起動・終了時の処理）
+# ============================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ログは JSON 1 行ずつ・別スレッドで書き出す（LOG_FORMAT=text でローカル向け表示）。
+    # import 時には設定しない（import しただけのテスト・スクリプトの logging を奪わない）
+    configure_logging()
+
+    logger.info(
+        "resolved DB_PATH = %s",
+        resolve_db_path(),
+        extra={"event": "boot.db_path"},
+    )
+
+    # バックグラウンドジョブ（owner 座標の解決など）
+    job_runner = get_job_runner()
+    job_runner.start()
+    resumed = resume_pending_owner_geocodes()
+    if resumed:
+        logger.info(
+            "resumed %d pending owner geocode jobs",
+            resumed,
+            extra={"event": "boot.owner_geocodes_resumed", "jobs": resumed},
+        )
+    # pickup_events の先行生成（以後 1 日 1 回）
+    schedule_pickup_event_refresh()
+
+    yield
+
+    job_runner.stop()
+    # 外部 API 用の共有コネクションプールを閉じる
+    await close_http_clients()
+    # キューに残ったログを書き出してから止める
+    shutdown_logging()
+
+
 app = FastAPI(
     title="Rice Reservation API (V2 only)",
     description="Tokushima Rice Reservation System - V2 Backend Only",
     version="2.0.0",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # ============================
-# DB PATH RESOLUTION（重要）
+# Upload body limit（画像アップロードの受信上限）
+# CORS より内側（先に登録）に置き、早期の 413 にも CORS ヘッダを付ける
 # ============================
-db_path = resolve_db_path()
-print(f"[BOOT] resolved DB_PATH = {db_path}")
+from app_v2.common.upload_guard import UploadBodyLimitMiddleware
+from app_v2.config.upload_limits import (
+    IMAGE_MAX_FILE_BYTES,
+    UPLOAD_MAX_REQUEST_BYTES,
+    UPLOAD_SINGLE_FILE_MAX_REQUEST_BYTES,
+)
 
+app.add_middleware(
+    UploadBodyLimitMiddleware,
+    path_prefixes=["/api/farmer/settings-v2/"],
+    max_body_bytes=UPLOAD_MAX_REQUEST_BYTES,
+    # 1 ファイルだけ受ける route は 1 枚分まで
+    path_max_body_bytes={
+        "/api/farmer/settings-v2/face-image/me": UPLOAD_SINGLE_FILE_MAX_REQUEST_BYTES,
+        "/api/farmer/settings-v2/cover-image/me": UPLOAD_SINGLE_FILE_MAX_REQUEST_BYTES,
+    },
+    max_part_bytes=IMAGE_MAX_FILE_BYTES,
+)
 
 # ============================
 # CORS
@@ -44,14 +112,8 @@ origins = [
     "http://127.0.0.1:5173",
 ]
 
-FRONTEND_URL = os.getenv("FRONTEND_URL")
-if FRONTEND_URL:
-    origins.append(FRONTEND_URL)
-
-for env_key in ["VERCEL_FRONTEND_URL", "VERCEL_FRONTEND_URL_PREVIEW"]:
-    url = os.getenv(env_key)
-    if url:
-        origins.append(url)
+# FRONTEND_URL / VERCEL_FRONTEND_URL / VERCEL_FRONTEND_URL_PREVIEW
+origins.extend(settings.cors_extra_origins)
 
 clean_origins = []
 for url in origins:
@@ -69,7 +131,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Existing-Farm-Id", "X-Settings-URL"],
+    expose_headers=["X-Existing-Farm-Id", "X-Settings-URL", settings.request_id_header],
 )
 
 # ============================
@@ -77,12 +139,45 @@ app.add_middleware(
 # ============================
 app.add_middleware(
     SessionMiddleware,
-    secret_key=os.getenv("SESSION_SECRET", "dev-secret-key"),
+    secret_key=settings.session_secret,
     same_site="none" if IS_RENDER else "lax",
     https_only=True if IS_RENDER else False,
     max_age=60 * 60 * 24 * 30,  # ← 追加（30日）
 )
 
+# ============================
+# On-demand profiling（PROFILE_TOKEN / PROFILE_SAMPLE_RATE 指定時のみ）
+# ============================
+from app_v2.observability.middleware import RequestProfilerMiddleware
+
+if settings.profiling_enabled:
+    app.add_middleware(
+        RequestProfilerMiddleware,
+        route_label=custom_generate_unique_id,
+        token=settings.profile_token or "",
+        sample_rate=settings.profile_sample_rate,
+        interval_sec=settings.profile_interval_ms / 1000.0,
+    )
+
+# ============================
+# Request metrics（/metrics・一番外側で計測）
+# ============================
+from app_v2.observability.metrics_api import METRICS_PATH
+from app_v2.observability.middleware import RequestMetricsMiddleware
+
+app.add_middleware(
+    RequestMetricsMiddleware,
+    route_label=custom_generate_unique_id,
+    exclude_paths=[METRICS_PATH],
+)
+
+# ============================
+# Request ID（ログの相関 ID・最外周）
+# ============================
+from app_v2.observability.middleware import RequestIdMiddleware
+
+app.add_middleware(RequestIdMiddleware, header_name=settings.request_id_header)
+
 # ============================
 # Routers
 # ============================
@@ -148,6 +243,9 @@ from app_v2.admin.api.admin_reservation_api import (
 from app_v2.admin.api.admin_farm_api import (
     router as admin_farm_router,
 )
+from app_v2.observability.profiles_api import (
+    router as admin_profiles_router,
+)
 
 # ============================
 # Router Registration
@@ -197,6 +295,33 @@ app.include_router(stripe_webhook_router)
 
 app.include_router(admin_reservations_router)
 app.include_router(admin_farm_router)
+app.include_router(admin_profiles_router)
+
+# Metrics（Prometheus）
+from app_v2.observability.metrics_api import router as metrics_router
+
+app.include_router(metrics_router)
+
+# ============================
+# Local media（STORAGE_BACKEND=local のときだけ）
+# ============================
+from fastapi.staticfiles import StaticFiles
+
+from app_v2.common.storage import (
+    LOCAL_MEDIA_MOUNT_PATH,
+    get_local_media_dir,
+    is_local_backend,
+)
+
+if is_local_backend():
+    media_dir = get_local_media_dir()
+    media_dir.mkdir(parents=True, exist_ok=True)
+    app.mount(
+        LOCAL_MEDIA_MOUNT_PATH,
+        StaticFiles(directory=str(media_dir)),
+        name="media",
+    )
+
 
 @app.get("/")
 def root():
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import sqlite3
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+# ============================================================
+# リクエスト単位の DB クエリ計測
+#
+# - app_v2.db.core.connect() の接続は MeteredConnection
+# - RequestMetricsMiddleware がリクエストごとに DbStats を contextvar に置く
+#   （sync endpoint は threadpool で動くが contextvar はコピーされるので同じ DbStats に足される）
+# - リクエスト外（バックグラウンドジョブ・migration）では何もしない
+# - 時間は execute* と fetch* の合計（カーソルを直接 for で回した分は入らない）
+# ============================================================
+
+
+class DbStats:
+    __slots__ = ("queries", "seconds", "statements")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        # SQL_TRACE 有効時のみ：fingerprint → [回数, 秒, 行数]（app_v2.db.sql_trace）
+        self.statements = None
+
+
+_current_db_stats: ContextVar[Optional[DbStats]] = ContextVar(
+    "current_db_stats", default=None
+)
+
+
+def begin_db_stats() -> "tuple[DbStats, object]":
+    """
+    新しい DbStats を現在のコンテキストに置く。戻り値の token は end_db_stats に渡す。
+    """
+    stats = DbStats()
+    return stats, _current_db_stats.set(stats)
+
+
+def end_db_stats(token) -> None:
+    _current_db_stats.reset(token)
+
+
+def current_db_stats() -> Optional[DbStats]:
+    return _current_db_stats.get()
+
+
+class MeteredCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=(), /):
+        stats = _current_db_stats.get()
+        if stats is None:
+            return super().execute(sql, parameters)
+        t0 = perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            stats.queries += 1
+            stats.seconds += perf_counter() - t0
+
+    def executemany(self, sql, seq_of_parameters, /):
+        stats = _current_db_stats.get()
+        if stats is None:
+            return super().executemany(sql, seq_of_parameters)
+        t0 = perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            stats.queries += 1
+            stats.seconds += perf_counter() - t0
+
+    def executescript(self, sql_script, /):
+        stats = _current_db_stats.get()
+        if stats is None:
+            return super().executescript(sql_script)
+        t0 = perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            stats.queries += 1
+            stats.seconds += perf_counter() - t0
+
+    # fetch は件数に数えず時間だけ足す（SELECT の大半は step = fetch 側）
+    def fetchone(self):
+        stats = _current_db_stats.get()
+        if stats is None:
+            return super().fetchone()
+        t0 = perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            stats.seconds += perf_counter() - t0
+
+    def fetchmany(self, size=None):
+        stats = _current_db_stats.get()
+        if stats is None:
+            return super().fetchmany() if size is None else super().fetchmany(size)
+        t0 = perf_counter()
+        try:
+            return super().fetchmany() if size is None else super().fetchmany(size)
+        finally:
+            stats.seconds += perf_counter() - t0
+
+    def fetchall(self):
+        stats = _current_db_stats.get()
+        if stats is None:
+            return super().fetchall()
+        t0 = perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            stats.seconds += perf_counter() - t0
+
+
+class MeteredConnection(sqlite3.Connection):
+    """
+    sqlite3.connect(..., factory=MeteredConnection) 用。
+    conn.execute 系も MeteredCursor を通す。
+    """
+
+    def cursor(self, factory=MeteredCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script, /):
+        return self.cursor().executescript(sql_script)
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app_v2.config.settings import get_settings
+
+# ============================================================
+# 構造化ログ（JSON）の出力設定
+#
+# - 呼び出し側（リクエスト処理中のスレッド・イベントループ）は QueueHandler で
+#   キューに積むだけ。JSON 化と stdout への書き出しは QueueListener のスレッドで行う
+# - キューが溢れたら捨てて数える（書き出しが詰まってもリクエストは待たない）
+# - 各レコードに相関 ID（request_id）を付ける。値は RequestIdMiddleware が
+#   ContextVar に入れる（threadpool で動く sync endpoint にも引き継がれる）
+# - 量の多いイベントは LOG_SAMPLE_RATES で間引く
+#
+# 使い方（各モジュール）:
+#   logger = logging.getLogger(__name__)
+#   logger.info("refreshed farms", extra={"event": "pickup_events.refreshed", "farms": n})
+#   → event は間引きのキー・集計用の名前。その他の extra は JSON のフィールドになる
+# ============================================================
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def bind_request_id(request_id: Optional[str]):
+    """
+    戻り値の token を reset_request_id() に渡して元に戻す。
+    """
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token) -> None:
+    _request_id.reset(token)
+
+
+# ============================================================
+# Filter（呼び出し側のスレッドで動く）
+# ============================================================
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = _request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    record.event（無ければ logger 名）ごとの割合で間引く。WARNING 以上は常に通す。
+    通したレコードには sample_rate を付ける（集計側で 1/rate 倍して戻せるように）。
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        self.rates = dict(rates)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+        key = getattr(record, "event", None) or record.name
+        rate = self.rates.get(key)
+        if rate is None or rate >= 1.0:
+            return True
+        if rate > 0.0 and random.random() < rate:
+            record.sample_rate = rate
+            return True
+        self.sampled_out += 1
+        return False
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    "uvicorn.access=0.1,sql.n_plus_one=0.2" → {"uvicorn.access": 0.1, ...}
+    """
+    rates: Dict[str, float] = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        name = name.strip()
+        if not name or not sep:
+            continue
+        try:
+            rates[name] = min(1.0, max(0.0, float(value)))
+        except ValueError:
+            continue
+    return rates
+
+
+# ============================================================
+# Handler / Formatter
+# ============================================================
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    put_nowait で積むだけの QueueHandler。満杯なら捨てて dropped を数える。
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 引数の文字列化と traceback の文字列化だけここで行う
+        # （別スレッドに渡すので、フレームや可変オブジェクトへの参照を残さない）。
+        # 標準の prepare と違い、フォーマット（JSON 化）はリスナー側に任せる
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+# LogRecord 標準の属性（これ以外は extra として JSON に出す）
+# （color_message は uvicorn が付ける端末用の色付き版）
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "request_id", "event", "sample_rate", "color_message"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    {"ts", "level", "logger", "msg", "request_id", "event", ...extra, "exc"} の 1 行 JSON。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, object] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+        event = getattr(record, "event", None)
+        if event:
+            payload["event"] = event
+        sample_rate = getattr(record, "sample_rate", None)
+        if sample_rate is not None:
+            payload["sample_rate"] = sample_rate
+
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    ローカル開発用。"時刻 LEVEL [request_id] logger: msg" + extra（key=value）。
+    """
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        line = super().format(record)
+        extras = [
+            f"{key}={value}"
+            for key, value in vars(record).items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        ]
+        event = getattr(record, "event", None)
+        if event:
+            extras.insert(0, f"event={event}")
+        if extras:
+            # traceback があれば 1 行目の後ろに付ける
+            head, sep, rest = line.partition("\n")
+            line = f"{head} {' '.join(extras)}{sep}{rest}"
+        return line
+
+
+# ============================================================
+# セットアップ
+# ============================================================
+
+# uvicorn は自前の handler を持ち propagate しないので、こちらのキューに差し替える
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_lock = threading.Lock()
+_handler: Optional[NonBlockingQueueHandler] = None
+_sampler: Optional[SamplingFilter] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging() -> None:
+    """
+    root logger を QueueHandler → QueueListener(stdout) 構成にする。設定済みなら何もしない。
+    エントリポイント（main.py の lifespan）から呼ぶ。
+    """
+    global _handler, _sampler, _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        settings = get_settings()
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(
+            maxsize=max(1, settings.log_queue_max)
+        )
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(TextFormatter() if settings.log_format == "text" else JsonFormatter())
+
+        handler = NonBlockingQueueHandler(log_queue)
+        sampler = SamplingFilter(parse_sample_rates(settings.log_sample_rates))
+        # 相関 ID は呼び出し側のスレッド（Context）でしか取れないので、キューに積む前に付ける
+        handler.addFilter(RequestIdFilter())
+        handler.addFilter(sampler)
+
+        root = logging.getLogger()
+        for old in list(root.handlers):
+            root.removeHandler(old)
+        root.addHandler(handler)
+        root.setLevel(settings.log_level)
+
+        for name in _UVICORN_LOGGERS:
+            uvicorn_logger = logging.getLogger(name)
+            for old in list(uvicorn_logger.handlers):
+                uvicorn_logger.removeHandler(old)
+            uvicorn_logger.propagate = True
+
+        listener = QueueListener(log_queue, stream, respect_handler_level=False)
+        listener.start()
+
+        _handler, _sampler, _listener = handler, sampler, listener
+
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    キューに残っている分を書き出してからリスナーを止める。
+    """
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def log_pipeline_stats() -> Dict[str, int]:
+    """
+    /metrics 用：溢れて捨てた件数・間引いた件数。
+    """
+    return {
+        "dropped": _handler.dropped if _handler is not None else 0,
+        "sampled_out": _sampler.sampled_out if _sampler is not None else 0,
+    }
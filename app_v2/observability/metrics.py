@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# ============================================================
+# ルート別のリクエスト計測（Prometheus テキスト形式で出力）
+#
+# - ラベルは route（main.custom_generate_unique_id の名前）と method
+# - ヒストグラムは固定バケット。記録は「バケット index に +1」だけで、
+#   累積は render() のときに計算する
+# - 外部ライブラリ（prometheus_client）は使わない
+# ============================================================
+
+LATENCY_BUCKETS_SEC: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _RouteStats:
+    __slots__ = (
+        "bucket_counts",
+        "duration_sum",
+        "count",
+        "status_counts",
+        "db_queries",
+        "db_seconds",
+    )
+
+    def __init__(self) -> None:
+        # 末尾は +Inf
+        self.bucket_counts: List[int] = [0] * (len(LATENCY_BUCKETS_SEC) + 1)
+        self.duration_sum = 0.0
+        self.count = 0
+        self.status_counts: Dict[int, int] = {}
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+
+    def observe_request(
+        self,
+        *,
+        route: str,
+        method: str,
+        status: int,
+        duration_sec: float,
+        db_queries: int = 0,
+        db_seconds: float = 0.0,
+    ) -> None:
+        idx = bisect_left(LATENCY_BUCKETS_SEC, duration_sec)
+        key = (route, method)
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = _RouteStats()
+            stats.bucket_counts[idx] += 1
+            stats.duration_sum += duration_sec
+            stats.count += 1
+            stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+            stats.db_queries += db_queries
+            stats.db_seconds += db_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def route_totals(self) -> Dict[Tuple[str, str], Tuple[int, int, float]]:
+        """
+        (route, method) → (リクエスト数, DB クエリ数, DB 秒)。ベンチマーク用。
+        """
+        with self._lock:
+            return {
+                key: (s.count, s.db_queries, s.db_seconds)
+                for key, s in self._routes.items()
+            }
+
+    # --------------------------------------------------------
+    # 出力
+    # --------------------------------------------------------
+
+    def render(self) -> str:
+        with self._lock:
+            snapshot = [
+                (
+                    route,
+                    method,
+                    list(s.bucket_counts),
+                    s.duration_sum,
+                    s.count,
+                    dict(s.status_counts),
+                    s.db_queries,
+                    s.db_seconds,
+                )
+                for (route, method), s in sorted(self._routes.items())
+            ]
+
+        requests_lines: List[str] = []
+        duration_lines: List[str] = []
+        db_query_lines: List[str] = []
+        db_seconds_lines: List[str] = []
+
+        for route, method, buckets, dsum, count, statuses, dbq, dbs in snapshot:
+            base = f'route="{_escape(route)}",method="{_escape(method)}"'
+
+            for status in sorted(statuses):
+                requests_lines.append(
+                    f'app_http_requests_total{{{base},status="{status}"}} {statuses[status]}'
+                )
+
+            cumulative = 0
+            for le, n in zip(LATENCY_BUCKETS_SEC, buckets):
+                cumulative += n
+                duration_lines.append(
+                    f'app_http_request_duration_seconds_bucket{{{base},le="{le}"}} {cumulative}'
+                )
+            duration_lines.append(
+                f'app_http_request_duration_seconds_bucket{{{base},le="+Inf"}} {count}'
+            )
+            duration_lines.append(f"app_http_request_duration_seconds_sum{{{base}}} {dsum:.6f}")
+            duration_lines.append(f"app_http_request_duration_seconds_count{{{base}}} {count}")
+
+            db_query_lines.append(f"app_db_queries_total{{{base}}} {dbq}")
+            db_seconds_lines.append(f"app_db_query_duration_seconds_total{{{base}}} {dbs:.6f}")
+
+        out: List[str] = [
+            "# HELP app_http_requests_total HTTP requests by route, method and status.",
+            "# TYPE app_http_requests_total counter",
+            *requests_lines,
+            "# HELP app_http_request_duration_seconds HTTP request latency by route.",
+            "# TYPE app_http_request_duration_seconds histogram",
+            *duration_lines,
+            "# HELP app_db_queries_total SQLite statements executed while serving the route.",
+            "# TYPE app_db_queries_total counter",
+            *db_query_lines,
+            "# HELP app_db_query_duration_seconds_total Time spent in SQLite while serving the route.",
+            "# TYPE app_db_query_duration_seconds_total counter",
+            *db_seconds_lines,
+        ]
+        return "\n".join(out) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _registry
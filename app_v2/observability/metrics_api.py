@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+
+from app_v2.common.single_flight import single_flight_stats
+from app_v2.config.settings import get_settings
+from app_v2.farmer.services.location_service import get_geocode_cache_stats
+from app_v2.observability.logging_setup import log_pipeline_stats
+from app_v2.observability.metrics import CONTENT_TYPE_LATEST, get_metrics_registry
+
+router = APIRouter(tags=["metrics"])
+
+METRICS_PATH = "/metrics"
+
+
+def _require_metrics_token(request: Request) -> None:
+    token = get_settings().metrics_token
+    # METRICS_TOKEN 未設定なら存在自体を見せない
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    given = request.headers.get("authorization", "")
+    if not hmac.compare_digest(given, f"Bearer {token}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="not authenticated",
+        )
+
+
+@router.get(METRICS_PATH, include_in_schema=False)
+def get_metrics(request: Request) -> Response:
+    """
+    Prometheus テキスト形式のメトリクス。
+
+    Authorization: Bearer <METRICS_TOKEN> が必要（METRICS_TOKEN 未設定なら 404）。
+    """
+    _require_metrics_token(request)
+
+    return Response(
+        content=get_metrics_registry().render()
+        + _render_log_pipeline()
+        + _render_single_flight()
+        + _render_geocode_cache(),
+        media_type=CONTENT_TYPE_LATEST,
+    )
+
+
+def _render_log_pipeline() -> str:
+    stats = log_pipeline_stats()
+    return "\n".join(
+        [
+            "# HELP app_log_records_dropped_total Log records dropped because the log queue was full.",
+            "# TYPE app_log_records_dropped_total counter",
+            f"app_log_records_dropped_total {stats['dropped']}",
+            "# HELP app_log_records_sampled_out_total Log records skipped by LOG_SAMPLE_RATES.",
+            "# TYPE app_log_records_sampled_out_total counter",
+            f"app_log_records_sampled_out_total {stats['sampled_out']}",
+        ]
+    ) + "\n"
+
+
+def _render_single_flight() -> str:
+    lines = [
+        "# HELP app_single_flight_calls_total Coalesced computations: leader ran it, shared waited for the leader's result.",
+        "# TYPE app_single_flight_calls_total counter",
+    ]
+    for name, stats in sorted(single_flight_stats().items()):
+        lines.append(f'app_single_flight_calls_total{{flight="{name}",result="leader"}} {stats["leaders"]}')
+        lines.append(f'app_single_flight_calls_total{{flight="{name}",result="shared"}} {stats["shared"]}')
+    return "\n".join(lines) + "\n"
+
+
+def _render_geocode_cache() -> str:
+    stats = get_geocode_cache_stats()
+    return "\n".join(
+        [
+            "# HELP app_geocode_cache_lookups_total geocode_cache lookups by result (negative_hit = cached ZERO_RESULTS).",
+            "# TYPE app_geocode_cache_lookups_total counter",
+            f'app_geocode_cache_lookups_total{{result="hit"}} {stats["hits"]}',
+            f'app_geocode_cache_lookups_total{{result="negative_hit"}} {stats["negative_hits"]}',
+            f'app_geocode_cache_lookups_total{{result="miss"}} {stats["misses"]}',
+            "# HELP app_geocode_cache_stores_total Geocode results written to geocode_cache.",
+            "# TYPE app_geocode_cache_stores_total counter",
+            f"app_geocode_cache_stores_total {stats['stores']}",
+            "# HELP app_geocode_cache_errors_total geocode_cache reads/writes that failed (the lookup fell through).",
+            "# TYPE app_geocode_cache_errors_total counter",
+            f"app_geocode_cache_errors_total {stats['errors']}",
+            "# HELP app_geocode_coalesced_total Geocode requests that waited for an identical in-flight request.",
+            "# TYPE app_geocode_coalesced_total counter",
+            f"app_geocode_coalesced_total {stats['coalesced']}",
+        ]
+    ) + "\n"
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hmac
+import logging
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+from app_v2.db.sql_trace import report_request_sql
+from app_v2.observability.logging_setup import bind_request_id, reset_request_id
+from app_v2.observability.db_stats import begin_db_stats, end_db_stats
+from app_v2.observability.metrics import MetricsRegistry, get_metrics_registry
+from app_v2.observability.profile_store import (
+    ProfileStore,
+    get_profile_store,
+    new_profile_id,
+)
+from app_v2.observability.profiler import ProfileResult, RequestProfiler
+
+UNMATCHED_ROUTE = "unmatched"
+
+PROFILE_REQUEST_HEADER = b"x-profile-request"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# 外から受け取る相関 ID の形（それ以外は捨てて振り直す）
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+logger = logging.getLogger(__name__)
+
+
+def route_name(route, route_label: Callable[[APIRoute], str]) -> str:
+    if route is None:
+        return UNMATCHED_ROUTE
+    if isinstance(route, APIRoute):
+        return route_label(route)
+    return getattr(route, "name", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    リクエストごとに route / method / status / 所要時間 / DB クエリ数・時間を記録する。
+
+    - route は FastAPI がマッチした APIRoute から route_label(route) で決める
+      （main.custom_generate_unique_id を渡す）。マッチしない場合は "unmatched"
+    - ラベルは route オブジェクトごとにキャッシュする
+    - exclude_paths（/metrics 自身など）は記録しない
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        route_label: Callable[[APIRoute], str],
+        exclude_paths: Iterable[str] = (),
+        registry: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.app = app
+        self.route_label = route_label
+        self.exclude_paths: Tuple[str, ...] = tuple(exclude_paths)
+        self.registry = registry or get_metrics_registry()
+        self._labels: Dict[int, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats, token = begin_db_stats()
+        t0 = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = perf_counter() - t0
+            end_db_stats(token)
+            route = self._label_for(scope.get("route"))
+            self.registry.observe_request(
+                route=route,
+                method=scope["method"],
+                status=status_code,
+                duration_sec=duration,
+                db_queries=stats.queries,
+                db_seconds=stats.seconds,
+            )
+            if stats.statements is not None:
+                # SQL_TRACE=1 のときだけ（N+1 / クエリ数超過のログ）
+                report_request_sql(route, stats)
+
+    def _label_for(self, route) -> str:
+        if route is None:
+            return UNMATCHED_ROUTE
+        key = id(route)
+        label = self._labels.get(key)
+        if label is None:
+            label = self._labels[key] = route_name(route, self.route_label)
+        return label
+
+
+class RequestProfilerMiddleware:
+    """
+    指定したリクエストだけサンプリングプロファイラを掛け、結果を ProfileStore に保存する。
+
+    - X-Profile-Request: <token>（管理者用トークン）のリクエスト、
+      または sample_rate の割合でランダムに選ばれたリクエストが対象
+    - 対象のレスポンスには X-Profile-Id を付ける（/api/admin/profiles/<id>/... で取得）
+    - 対象外のリクエストはヘッダを見るだけ。PROFILE_TOKEN も PROFILE_SAMPLE_RATE も
+      無ければ main で登録自体しない
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        route_label: Callable[[APIRoute], str],
+        token: str = "",
+        sample_rate: float = 0.0,
+        interval_sec: float = 0.002,
+        store: Optional[ProfileStore] = None,
+        exclude_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.route_label = route_label
+        self.token = token.encode("utf-8")
+        self.sample_rate = sample_rate
+        self.interval_sec = interval_sec
+        self.store = store or get_profile_store()
+        self.exclude_paths: Tuple[str, ...] = tuple(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER, profile_id.encode("ascii")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = RequestProfiler(
+            interval_sec=self.interval_sec,
+            anchor_frame=sys._getframe(),
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            meta = {
+                "profile_id": profile_id,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "trigger": trigger,
+                "route": route_name(scope.get("route"), self.route_label),
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+            }
+            profiler.finish(lambda result: self._save(profile_id, meta, result))
+
+    def _trigger(self, scope) -> Optional[str]:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_REQUEST_HEADER:
+                    if hmac.compare_digest(value, self.token):
+                        return "header"
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def _save(self, profile_id: str, meta: Dict, result: ProfileResult) -> None:
+        # サンプリング用スレッドから呼ばれる
+        meta = {
+            **meta,
+            "duration_ms": round(result.duration_sec * 1000, 2),
+            "samples": result.samples,
+            "interval_ms": result.interval_sec * 1000,
+        }
+        self.store.save(
+            profile_id,
+            meta=meta,
+            pstats_data=result.pstats_bytes(),
+            folded=result.collapsed(),
+        )
+        logger.info(
+            "profile saved",
+            extra={
+                "event": "profile.saved",
+                "profile_id": profile_id,
+                "route": meta["route"],
+                "duration_ms": meta["duration_ms"],
+                "samples": result.samples,
+            },
+        )
+
+
+class RequestIdMiddleware:
+    """
+    リクエストごとの相関 ID を決め、ログ（request_id）とレスポンスヘッダに載せる。
+
+    - リクエストに header（既定 X-Request-ID）があり、形が妥当ならそれを使う
+      （前段のプロキシ・フロントエンドの ID とつなげるため）。無ければ uuid4 を振る
+    - ID は ContextVar に入れる。threadpool で動く sync endpoint にも Context ごと渡る
+    - 一番外側に置く（他のミドルウェアのログにも ID が付くように）
+    """
+
+    def __init__(self, app, *, header_name: str = "X-Request-ID") -> None:
+        self.app = app
+        self.header = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming(scope) or uuid.uuid4().hex
+        encoded = request_id.encode("ascii")
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != self.header
+                ]
+                headers.append((self.header, encoded))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = bind_request_id(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            reset_request_id(token)
+
+    def _incoming(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                try:
+                    candidate = value.decode("ascii")
+                except UnicodeDecodeError:
+                    return None
+                return candidate if _REQUEST_ID_PATTERN.match(candidate) else None
+        return None
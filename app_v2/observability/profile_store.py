@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import secrets
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app_v2.config.settings import get_settings
+
+# ============================================================
+# プロファイル結果の保存先（ディスク上のリングバッファ）
+#
+# - 1 件 = <id>.json（メタ情報）+ <id>.pstats + <id>.folded
+# - id は "20251129T101500-1a2b3c4d"（時刻順に並ぶ）
+# - 保存のたびに max_entries を超えた古いものを消す
+# - .json を最後に書くので、一覧には書き終わったものだけが出る
+# ============================================================
+
+PROFILE_KINDS = ("pstats", "folded")
+
+_PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+
+def new_profile_id(now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return f"{now:%Y%m%dT%H%M%S}-{secrets.token_hex(4)}"
+
+
+def is_valid_profile_id(profile_id: str) -> bool:
+    return bool(_PROFILE_ID.match(profile_id))
+
+
+class ProfileStore:
+    def __init__(self, directory: Path, *, max_entries: int) -> None:
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+
+    def save(
+        self,
+        profile_id: str,
+        *,
+        meta: Dict[str, Any],
+        pstats_data: bytes,
+        folded: str,
+    ) -> None:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self._path(profile_id, "pstats"), pstats_data)
+            _write_atomic(self._path(profile_id, "folded"), folded.encode("utf-8"))
+            _write_atomic(
+                self._path(profile_id, "json"),
+                json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+            )
+            self._prune()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        新しい順のメタ情報。
+        """
+        items: List[Dict[str, Any]] = []
+        for profile_id in reversed(self._ids()):
+            try:
+                items.append(json.loads(self._path(profile_id, "json").read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return items
+
+    def file_path(self, profile_id: str, kind: str) -> Optional[Path]:
+        if kind not in PROFILE_KINDS or not is_valid_profile_id(profile_id):
+            return None
+        path = self._path(profile_id, kind)
+        return path if path.is_file() else None
+
+    # --------------------------------------------------------
+    # 内部
+    # --------------------------------------------------------
+
+    def _path(self, profile_id: str, ext: str) -> Path:
+        return self.directory / f"{profile_id}.{ext}"
+
+    def _ids(self) -> List[str]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(
+            p.stem for p in self.directory.glob("*.json") if is_valid_profile_id(p.stem)
+        )
+
+    def _prune(self) -> None:
+        ids = self._ids()
+        for profile_id in ids[: max(0, len(ids) - self.max_entries)]:
+            for ext in ("json", *PROFILE_KINDS):
+                try:
+                    self._path(profile_id, ext).unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    if _store is None:
+        settings = get_settings()
+        _store = ProfileStore(
+            Path(settings.profile_dir),
+            max_entries=settings.profile_max_entries,
+        )
+    return _store
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import logging
+import marshal
+import os
+import sys
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from types import CodeType, FrameType
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ============================================================
+# リクエスト単位のサンプリングプロファイラ
+#
+# - cProfile は有効にしたスレッドしか計測しないが、sync endpoint・レスポンス検証は
+#   threadpool（anyio のワーカースレッド）で動くため、別スレッドから
+#   sys._current_frames() を一定間隔で覗くサンプリング方式にする
+# - CPU を使い続けるコードの間は GIL の切り替え間隔（既定 5ms）より細かくは取れないので、
+#   時間は「前回のサンプルからの実経過時間」で重み付けする
+# - 対象スタックの判定
+#     イベントループのスレッド: このリクエストのミドルウェアのフレームを含むもの
+#     ワーカースレッド: 実行中の Context に current_profile としてこのプロファイラが入っているもの
+#       （run_in_threadpool は呼び出し時の Context をコピーして渡す）
+# - 結果は pstats 互換（nc/cc は呼び出し回数ではなくサンプル数）と
+#   collapsed stacks（flamegraph.pl / speedscope 用）
+# ============================================================
+
+Stack = Tuple[CodeType, ...]  # 外側 → 内側
+
+_current_profile: ContextVar[Optional["RequestProfiler"]] = ContextVar(
+    "current_profile", default=None
+)
+
+logger = logging.getLogger(__name__)
+
+_LOOP_ROOT = "[loop]"
+_WORKER_ROOT = "[worker]"
+
+
+def _worker_run_code() -> Optional[CodeType]:
+    # anyio のワーカースレッドは WorkerThread.run の中で context.run(func, *args) を呼ぶ
+    try:
+        from anyio._backends._asyncio import WorkerThread
+    except Exception:
+        return None
+    return getattr(WorkerThread.run, "__code__", None)
+
+
+_WORKER_RUN_CODE = _worker_run_code()
+
+
+class ProfileResult:
+    __slots__ = ("samples", "interval_sec", "stacks", "duration_sec")
+
+    def __init__(
+        self,
+        *,
+        samples: int,
+        interval_sec: float,
+        stacks: Dict[Tuple[str, Stack], List],
+        duration_sec: float,
+    ) -> None:
+        self.samples = samples
+        self.interval_sec = interval_sec
+        # (スレッド種別, スタック) → [サンプル数, 秒]
+        self.stacks = stacks
+        self.duration_sec = duration_sec
+
+    # --------------------------------------------------------
+    # 出力
+    # --------------------------------------------------------
+
+    def collapsed(self) -> str:
+        """
+        "[worker];func (path:line);... <サンプル数>" の行（flamegraph 用）
+        """
+        lines = []
+        for (root, stack), (count, _seconds) in sorted(
+            self.stacks.items(), key=lambda kv: -kv[1][0]
+        ):
+            frames = ";".join([root] + [_label(code) for code in stack])
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def pstats_bytes(self) -> bytes:
+        """
+        pstats.Stats(path) で読める marshal 形式。
+        """
+        stats: Dict[Tuple, List] = {}
+
+        for (_root, stack), (count, weight) in self.stacks.items():
+            seen = set()
+            caller_key = None
+            for i, code in enumerate(stack):
+                key = _func_key(code)
+                entry = stats.get(key)
+                if entry is None:
+                    # [cc, nc, tt, ct, callers]
+                    entry = stats[key] = [0, 0, 0.0, 0.0, {}]
+                innermost = i == len(stack) - 1
+                if key not in seen:
+                    seen.add(key)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += weight
+                if innermost:
+                    entry[2] += weight
+                if caller_key is not None:
+                    edge = entry[4].get(caller_key) or (0, 0, 0.0, 0.0)
+                    entry[4][caller_key] = (
+                        edge[0] + count,
+                        edge[1] + count,
+                        edge[2] + (weight if innermost else 0.0),
+                        edge[3] + weight,
+                    )
+                caller_key = key
+
+        return marshal.dumps(
+            {key: (cc, nc, tt, ct, callers) for key, (cc, nc, tt, ct, callers) in stats.items()}
+        )
+
+
+class RequestProfiler:
+    """
+    1 リクエスト分のサンプラ。start() → （リクエスト処理）→ finish(callback)。
+
+    サンプリング用スレッドは finish() 後に結果を callback(ProfileResult) に渡して終わる
+    （ファイル書き出しもそのスレッドで行い、リクエストを待たせない）。
+    """
+
+    def __init__(self, *, interval_sec: float, anchor_frame: FrameType) -> None:
+        self.interval_sec = interval_sec
+        self._anchor = anchor_frame
+        self._loop_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._callback: Optional[Callable[[ProfileResult], None]] = None
+        self._stacks: Dict[Tuple[str, Stack], List] = {}
+        self._samples = 0
+        self._thread = threading.Thread(
+            target=self._run,
+            name="request-profiler",
+            daemon=True,
+        )
+        self._token = None
+        self._t0 = 0.0
+
+    def start(self) -> None:
+        self._token = _current_profile.set(self)
+        self._t0 = perf_counter()
+        self._thread.start()
+
+    def finish(self, callback: Callable[[ProfileResult], None]) -> None:
+        if self._token is not None:
+            _current_profile.reset(self._token)
+            self._token = None
+        self._callback = callback
+        self._stop.set()
+
+    # --------------------------------------------------------
+    # サンプリング（専用スレッド）
+    # --------------------------------------------------------
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        last = self._t0
+        while not self._stop.wait(self.interval_sec):
+            now = perf_counter()
+            self._sample(own_id, now - last)
+            last = now
+        duration = perf_counter() - self._t0
+
+        callback = self._callback
+        if callback is None:
+            return
+        try:
+            callback(
+                ProfileResult(
+                    samples=self._samples,
+                    interval_sec=self.interval_sec,
+                    stacks=self._stacks,
+                    duration_sec=duration,
+                )
+            )
+        except Exception:
+            logger.exception("failed to save profile", extra={"event": "profile.save_failed"})
+
+    def _sample(self, own_id: int, elapsed: float) -> None:
+        self._samples += 1
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if thread_id == self._loop_thread_id:
+                root, stack = _LOOP_ROOT, self._loop_stack(frame)
+            else:
+                root, stack = _WORKER_ROOT, self._worker_stack(frame)
+            if stack:
+                entry = self._stacks.get((root, stack))
+                if entry is None:
+                    entry = self._stacks[(root, stack)] = [0, 0.0]
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def _loop_stack(self, frame: Optional[FrameType]) -> Optional[Stack]:
+        # ミドルウェア（anchor）より内側だけ
+        codes: List[CodeType] = []
+        while frame is not None:
+            if frame is self._anchor:
+                codes.reverse()
+                return tuple(codes)
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        return None
+
+    def _worker_stack(self, frame: Optional[FrameType]) -> Optional[Stack]:
+        # WorkerThread.run の Context がこのリクエストのものなら、その内側だけ
+        codes: List[CodeType] = []
+        while frame is not None:
+            if frame.f_code is _WORKER_RUN_CODE:
+                context = frame.f_locals.get("context")
+                if context is None or context.get(_current_profile) is not self:
+                    return None
+                codes.reverse()
+                return tuple(codes) or None
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        return None
+
+
+def current_profile() -> Optional[RequestProfiler]:
+    return _current_profile.get()
+
+
+# ============================================================
+# 表示用
+# ============================================================
+
+_PATH_PREFIXES = sorted(
+    {p for p in sys.path if p and os.path.isdir(p)},
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def _label(code: CodeType) -> str:
+    return f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _func_key(code: CodeType) -> Tuple[str, int, str]:
+    return code.co_filename, code.co_firstlineno, code.co_name
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hmac
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+
+from app_v2.config.settings import get_settings
+from app_v2.observability.profile_store import PROFILE_KINDS, get_profile_store
+
+router = APIRouter(
+    prefix="/api/admin/profiles",
+    tags=["admin_profiles"],
+)
+
+_MEDIA_TYPES = {
+    "pstats": "application/octet-stream",
+    "folded": "text/plain; charset=utf-8",
+}
+
+
+class ProfileListResponse(BaseModel):
+    items: List[Dict[str, Any]]
+
+
+def _require_profile_token(request: Request) -> None:
+    token = get_settings().profile_token
+    # PROFILE_TOKEN 未設定なら存在自体を見せない
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    given = request.headers.get("authorization", "")
+    if not hmac.compare_digest(given, f"Bearer {token}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="not authenticated",
+        )
+
+
+@router.get("", response_model=ProfileListResponse)
+def list_profiles(request: Request) -> ProfileListResponse:
+    """
+    保存済みプロファイルの一覧（新しい順）。
+    """
+    _require_profile_token(request)
+    return ProfileListResponse(items=get_profile_store().list())
+
+
+@router.get("/{profile_id}/{kind}")
+def download_profile(profile_id: str, kind: str, request: Request) -> FileResponse:
+    """
+    kind:
+    - pstats: python -m pstats / snakeviz で開く
+    - folded: collapsed stacks（flamegraph.pl / speedscope）
+    """
+    _require_profile_token(request)
+    if kind not in PROFILE_KINDS:
+        raise HTTPException(status_code=404, detail="unknown profile kind")
+
+    path = get_profile_store().file_path(profile_id, kind)
+    if path is None:
+        raise HTTPException(status_code=404, detail="profile not found")
+
+    return FileResponse(
+        path,
+        media_type=_MEDIA_TYPES[kind],
+        filename=f"{profile_id}.{kind}",
+    )
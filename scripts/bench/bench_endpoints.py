@@ -0,0 +1,414 @@
+# scripts/bench/bench_endpoints.py
+#
+# 主要エンドポイントのレイテンシ（p50 / p95 / p99）と 1 リクエストあたりの DB クエリ数を測る。
+# アプリはプロセス内で動かす（httpx.ASGITransport。ネットワーク・uvicorn は通らない）。
+#
+#   python scripts/bench/seed_data.py --db /tmp/bench.db --scale 100k
+#   python scripts/bench/bench_endpoints.py --db /tmp/bench.db --requests 200
+#   python scripts/bench/bench_endpoints.py --db /tmp/bench.db --save bench_baseline.json
+#   python scripts/bench/bench_endpoints.py --db /tmp/bench.db --compare bench_baseline.json
+#
+# - DB クエリ数は /metrics と同じ RequestMetricsMiddleware の集計から取る
+# - confirm → stripe webhook は実際に予約を作って確定させる（使い捨ての DB で実行すること）
+# - --compare: p95 か クエリ数/リクエスト が基準より --max-regression を超えて悪化したら exit 1
+# - 非 2xx のレスポンスがあった場合も exit 1
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import sys
+import time
+from base64 import b64encode
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+# Stripe / セッションはベンチ用の固定値（アプリ import 前に設定する）
+STRIPE_WEBHOOK_SECRET = os.environ.setdefault("STRIPE_WEBHOOK_SECRET", "whsec_bench")
+os.environ.setdefault("STRIPE_SECRET_KEY", "sk_test_bench")
+SESSION_SECRET = os.environ.setdefault("SESSION_SECRET", "bench-session-secret")
+
+import httpx  # noqa: E402
+from itsdangerous import TimestampSigner  # noqa: E402
+
+# 徳島市役所付近
+USER_LAT = 34.0703
+USER_LNG = 134.5548
+
+# 徳島県全体
+MAP_BOUNDS = {"min_lat": 33.5, "max_lat": 34.3, "min_lng": 133.6, "max_lng": 134.8}
+
+SendFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    queries_per_request: float
+    db_ms_per_request: float
+
+
+@dataclass
+class BenchTargets:
+    busy_farm_id: int
+    confirm_farm_id: int
+    confirm_slot_code: str
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def _session_cookie(data: Dict) -> str:
+    # starlette SessionMiddleware と同じ形式（base64(JSON) を TimestampSigner で署名）
+    payload = b64encode(json.dumps(data).encode("utf-8"))
+    return TimestampSigner(SESSION_SECRET).sign(payload).decode("utf-8")
+
+
+def _stripe_signature(payload: bytes) -> str:
+    ts = int(time.time())
+    signed = f"{ts}.".encode("utf-8") + payload
+    sig = hmac.new(STRIPE_WEBHOOK_SECRET.encode("utf-8"), signed, hashlib.sha256).hexdigest()
+    return f"t={ts},v1={sig}"
+
+
+def _pick_targets(db_path: Path) -> BenchTargets:
+    conn = sqlite3.connect(db_path)
+    try:
+        busy = conn.execute(
+            """
+            SELECT farm_id FROM reservations
+             WHERE status = 'confirmed'
+             GROUP BY farm_id
+             ORDER BY COUNT(*) DESC
+             LIMIT 1
+            """
+        ).fetchone()
+        # confirm 用：予約を受け付けている farm のうち予約の少ないもの（ロックにかからない）
+        quiet = conn.execute(
+            """
+            SELECT f.farm_id, f.pickup_time
+              FROM farms AS f
+              LEFT JOIN reservations AS r ON r.farm_id = f.farm_id
+             WHERE f.active_flag = 1
+               AND f.is_accepting_reservations = 1
+               AND f.pickup_time IS NOT NULL
+             GROUP BY f.farm_id
+             ORDER BY COUNT(r.reservation_id), f.farm_id
+             LIMIT 1
+            """
+        ).fetchone()
+    finally:
+        conn.close()
+
+    if busy is None or quiet is None:
+        sys.exit("[bench] no data (run scripts/bench/seed_data.py first)")
+    return BenchTargets(
+        busy_farm_id=int(busy[0]),
+        confirm_farm_id=int(quiet[0]),
+        confirm_slot_code=str(quiet[1]),
+    )
+
+
+# ============================================================
+# シナリオ
+# ============================================================
+
+def _build_scenarios(targets: BenchTargets) -> Dict[str, SendFn]:
+    created_reservation_ids: List[int] = []
+
+    async def public_farms(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/api/public/farms",
+            params={"page": 1 + i % 3, "lat": USER_LAT, "lng": USER_LNG},
+        )
+
+    async def public_farms_map(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get("/api/public/farms/map", params=MAP_BOUNDS)
+
+    async def public_farms_map_clusters(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/api/public/farms/map/clusters",
+            params={**MAP_BOUNDS, "zoom": 8 + i % 4},
+        )
+
+    async def public_farm_detail(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(f"/api/public/farms/{targets.busy_farm_id}")
+
+    async def reservations_expanded(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/reservations/expanded",
+            headers={"Cookie": f"session={_session_cookie({'farm_id': targets.busy_farm_id})}"},
+        )
+
+    async def admin_reservations(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/api/admin/reservations",
+            params={"farm_id": targets.busy_farm_id, "limit": 50, "offset": (i % 4) * 50},
+        )
+
+    async def admin_reservation_weeks(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/api/admin/reservations/weeks",
+            params={"farm_id": targets.busy_farm_id},
+        )
+
+    async def confirm(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        res = await client.post(
+            "/api/confirm",
+            json={
+                "farm_id": targets.confirm_farm_id,
+                "pickup_slot_code": targets.confirm_slot_code,
+                "pickup_display": "bench",
+                "items": [{"size_kg": 10, "quantity": 1}],
+            },
+        )
+        if res.status_code == 200:
+            created_reservation_ids.append(res.json()["reservation_id"])
+        return res
+
+    async def stripe_webhook(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        # confirm で作った pending 予約を順に確定させる（足りなければ先頭から使い回す）
+        if not created_reservation_ids:
+            raise RuntimeError("stripe_webhook needs the confirm scenario to run first")
+        rid = created_reservation_ids[i % len(created_reservation_ids)]
+        payload = json.dumps(
+            {
+                "id": f"evt_bench_{i}",
+                "object": "event",
+                "type": "checkout.session.completed",
+                "data": {
+                    "object": {
+                        "id": f"cs_bench_{rid}",
+                        "object": "checkout.session",
+                        "payment_intent": f"pi_bench_{rid}",
+                        "metadata": {"reservation_id": str(rid)},
+                    }
+                },
+            }
+        ).encode("utf-8")
+        return await client.post(
+            "/stripe/webhook",
+            content=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Stripe-Signature": _stripe_signature(payload),
+            },
+        )
+
+    return {
+        "public_farms": public_farms,
+        "public_farms_map": public_farms_map,
+        "public_farms_map_clusters": public_farms_map_clusters,
+        "public_farm_detail": public_farm_detail,
+        "reservations_expanded": reservations_expanded,
+        "admin_reservations": admin_reservations,
+        "admin_reservation_weeks": admin_reservation_weeks,
+        "confirm": confirm,
+        "stripe_webhook": stripe_webhook,
+    }
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    registry,
+    name: str,
+    send: SendFn,
+    *,
+    requests: int,
+    warmup: int,
+) -> ScenarioResult:
+    for i in range(warmup):
+        await send(client, i)
+
+    registry.reset()
+    latencies: List[float] = []
+    errors = 0
+    for i in range(requests):
+        t0 = time.perf_counter()
+        res = await send(client, warmup + i)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if not 200 <= res.status_code < 300:
+            errors += 1
+            if errors == 1:
+                print(f"[bench] {name}: HTTP {res.status_code} {res.text[:200]}")
+
+    totals = registry.route_totals().values()
+    count = sum(t[0] for t in totals) or 1
+    queries = sum(t[1] for t in totals)
+    db_seconds = sum(t[2] for t in totals)
+
+    latencies.sort()
+    return ScenarioResult(
+        name=name,
+        requests=requests,
+        errors=errors,
+        p50_ms=_percentile(latencies, 50),
+        p95_ms=_percentile(latencies, 95),
+        p99_ms=_percentile(latencies, 99),
+        max_ms=latencies[-1] if latencies else 0.0,
+        queries_per_request=queries / count,
+        db_ms_per_request=db_seconds * 1000 / count,
+    )
+
+
+# ============================================================
+# 出力 / 基準との比較
+# ============================================================
+
+def _print_table(results: List[ScenarioResult]) -> None:
+    header = (
+        f"{'scenario':<26}{'n':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'max ms':>9}{'q/req':>8}{'db ms/req':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.name:<26}{r.requests:>6}{r.errors:>5}{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}"
+            f"{r.p99_ms:>9.2f}{r.max_ms:>9.2f}{r.queries_per_request:>8.1f}"
+            f"{r.db_ms_per_request:>11.2f}"
+        )
+
+
+def _compare(
+    results: List[ScenarioResult], baseline_path: Path, max_regression: float
+) -> List[str]:
+    baseline = {
+        r["name"]: r
+        for r in json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    }
+    failures: List[str] = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        limit = 1.0 + max_regression
+        if base["p95_ms"] > 0 and r.p95_ms > base["p95_ms"] * limit:
+            failures.append(f"{r.name}: p95 {base['p95_ms']:.2f}ms -> {r.p95_ms:.2f}ms")
+        # クエリ数は決定的なので少しでも増えたら落とす
+        if r.queries_per_request > base["queries_per_request"] + 0.05:
+            failures.append(
+                f"{r.name}: queries/request {base['queries_per_request']:.1f} "
+                f"-> {r.queries_per_request:.1f}"
+            )
+    return failures
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="エンドポイントのベンチマーク（プロセス内）")
+    parser.add_argument("--db", required=True, help="seed_data.py で作った SQLite ファイル")
+    parser.add_argument("--requests", type=int, default=200, help="シナリオごとの計測リクエスト数")
+    parser.add_argument("--warmup", type=int, default=10, help="シナリオごとの捨てリクエスト数")
+    parser.add_argument(
+        "--only",
+        help="実行するシナリオ（カンマ区切り）。stripe_webhook は confirm と一緒に指定する",
+    )
+    parser.add_argument("--save", help="結果を JSON で保存する（--compare の基準になる）")
+    parser.add_argument("--compare", help="基準の JSON と比較する")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="p95 の悪化の許容率（0.2 = 20%%）",
+    )
+    return parser.parse_args()
+
+
+async def _amain(args: argparse.Namespace) -> int:
+    db_path = Path(args.db).resolve()
+    if not db_path.exists():
+        sys.exit(f"[bench] {db_path} not found (run scripts/bench/seed_data.py first)")
+    os.environ["DB_PATH"] = str(db_path)
+
+    from app_v2.main import app  # noqa: E402
+    from app_v2.observability.logging_setup import configure_logging  # noqa: E402
+    from app_v2.observability.metrics import get_metrics_registry  # noqa: E402
+
+    # ASGITransport は lifespan を動かさないので、本番と同じログ構成をここで作る
+    configure_logging()
+
+    targets = _pick_targets(db_path)
+    scenarios = _build_scenarios(targets)
+    names = args.only.split(",") if args.only else list(scenarios)
+    unknown = [n for n in names if n not in scenarios]
+    if unknown:
+        sys.exit(f"[bench] unknown scenario: {', '.join(unknown)}")
+
+    print(
+        f"[bench] db={db_path} busy_farm={targets.busy_farm_id} "
+        f"confirm_farm={targets.confirm_farm_id} ({targets.confirm_slot_code})"
+    )
+
+    registry = get_metrics_registry()
+    transport = httpx.ASGITransport(app=app)
+    results: List[ScenarioResult] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in names:
+            results.append(
+                await _run_scenario(
+                    client,
+                    registry,
+                    name,
+                    scenarios[name],
+                    requests=args.requests,
+                    warmup=args.warmup,
+                )
+            )
+
+    _print_table(results)
+    status = 0
+
+    if any(r.errors for r in results):
+        print("[bench] some requests failed")
+        status = 1
+
+    if args.save:
+        Path(args.save).write_text(
+            json.dumps(
+                {
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "db": str(db_path),
+                    "results": [asdict(r) for r in results],
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        print(f"[bench] saved {args.save}")
+
+    if args.compare:
+        failures = _compare(results, Path(args.compare), args.max_regression)
+        for f in failures:
+            print(f"[bench] REGRESSION {f}")
+        if failures:
+            status = 1
+
+    return status
+
+
+def main() -> None:
+    sys.exit(asyncio.run(_amain(_parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# scripts/bench/bench_image_pipeline.py
+#
+# アップロード前加工（縮小 + WebP 再エンコード）でどれだけ転送量が減るかを測る。
+#
+#   python scripts/bench/bench_image_pipeline.py photo1.jpg photo2.jpg ...
+#
+# 引数なしの場合は、スマホ写真相当（4032x3024 JPEG）の合成画像で測る。
+
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from app_v2.common.image_pipeline import process_image  # noqa: E402
+from app_v2.config.upload_limits import (  # noqa: E402
+    PR_IMAGE_MAX_EDGE,
+    PR_IMAGE_THUMB_EDGE,
+)
+
+
+def _synthetic_photo(seed: int) -> bytes:
+    # 単色だと圧縮が効きすぎるので、グラデーション + 図形でそれらしくする
+    w, h = 4032, 3024
+    img = Image.linear_gradient("L").resize((w, h)).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for i in range(200):
+        x = (i * 97 + seed * 31) % w
+        y = (i * 53 + seed * 17) % h
+        color = ((i * 7) % 256, (i * 13 + seed) % 256, (i * 29) % 256)
+        draw.ellipse((x, y, x + 180, y + 120), fill=color)
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=92)
+    return buf.getvalue()
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        samples = [(Path(p).name, Path(p).read_bytes()) for p in sys.argv[1:]]
+    else:
+        samples = [(f"synthetic_{i}.jpg", _synthetic_photo(i)) for i in range(3)]
+
+    total_in = 0
+    total_out = 0
+
+    for name, content in samples:
+        t0 = time.perf_counter()
+        processed = process_image(
+            content,
+            name,
+            max_edge=PR_IMAGE_MAX_EDGE,
+            thumb_edge=PR_IMAGE_THUMB_EDGE,
+        )
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        total_in += len(content)
+        total_out += processed.total_bytes
+
+        thumb = processed.thumbnail
+        print(
+            f"{name}: {len(content):>9,d} B"
+            f" -> display {len(processed.display.content):>8,d} B"
+            f" ({processed.display.width}x{processed.display.height})"
+            f" + thumb {len(thumb.content) if thumb else 0:>7,d} B"
+            f"  [{elapsed_ms:.0f} ms]"
+        )
+
+    if total_in:
+        print(
+            f"total: {total_in:,d} B -> {total_out:,d} B"
+            f" ({100 * (1 - total_out / total_in):.1f}% 削減)"
+        )
+
+
+if __name__ == "__main__":
+    main()
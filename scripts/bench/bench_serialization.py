@@ -0,0 +1,202 @@
+# scripts/bench/bench_serialization.py
+#
+# 大きい一覧レスポンスの JSON 化にかかる CPU 時間を、旧経路と新経路で比べる。
+#   旧: FastAPI の response_model 処理（serialize_response: dump → 再検証 → serialize）+ JSONResponse
+#   新: app_v2.common.json_response.trusted_json_response（pydantic-core の dump_json のみ）
+# あわせて DTO 1 件の組み立て（検証あり: Model(**fields) / 検証なし: build_trusted）も比べる。
+#
+#   python scripts/bench/seed_data.py --db /tmp/bench.db --scale 100k
+#   python scripts/bench/bench_serialization.py --db /tmp/bench.db
+#   python scripts/bench/bench_serialization.py --db /tmp/bench.db --iterations 500
+#
+# - DTO は実際の service で DB から 1 回だけ組み立て、同じものを繰り返し JSON 化する
+#   （DB・ルーティングの時間は含まない。time.process_time で CPU 時間だけを測る）
+# - 両経路の出力 bytes が一致しない場合は exit 1
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+# 徳島県全体
+MAP_BOUNDS = {"min_lat": 33.5, "max_lat": 34.3, "min_lng": 133.6, "max_lng": 134.8}
+
+
+def _route(app, path: str) -> APIRoute:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route
+    raise SystemExit(f"route not found: {path}")
+
+
+def _busy_farm_id(db_path: str) -> int:
+    from app_v2.db.core import connect
+
+    conn = connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT farm_id FROM reservations GROUP BY farm_id ORDER BY COUNT(*) DESC LIMIT 1"
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        raise SystemExit("no reservations in DB (run seed_data.py first)")
+    return int(row[0])
+
+
+def _cases(app, db_path: str) -> List[Tuple[str, APIRoute, Any, Any]]:
+    """
+    (名前, route, service の戻り値, trusted_json_response に渡す型)
+    """
+    from app_v2.admin.api.admin_reservation_api import AdminReservationListResponse
+    from app_v2.admin.usecases.by_farm import list_admin_reservations_by_farm
+    from app_v2.customer_booking.dtos import PublicFarmCardDTO
+    from app_v2.customer_booking.repository.public_farms_repo import PublicFarmsRepository
+    from app_v2.customer_booking.services.public_farms_service import PublicFarmsService
+
+    service = PublicFarmsService(repo=PublicFarmsRepository())
+
+    farms_map = service.get_public_farms_for_map(limit=500, **MAP_BOUNDS)
+    farms_page = service.get_public_farms(page=1, lat=34.0703, lng=134.5548)
+
+    items, total = list_admin_reservations_by_farm(farm_id=_busy_farm_id(db_path), limit=200)
+    admin_list = AdminReservationListResponse(items=items, total_count=total)
+
+    return [
+        (
+            f"public_farms_map ({len(farms_map)} cards)",
+            _route(app, "/api/public/farms/map"),
+            farms_map,
+            list[PublicFarmCardDTO],
+        ),
+        (
+            f"public_farms ({len(farms_page.farms)} cards)",
+            _route(app, "/api/public/farms"),
+            farms_page,
+            None,
+        ),
+        (
+            f"admin_reservations ({len(items)} items)",
+            _route(app, "/api/admin/reservations"),
+            admin_list,
+            None,
+        ),
+    ]
+
+
+def _construction_cases(cases) -> List[Tuple[str, Any, List[dict]]]:
+    """
+    (DTO 名, DTO クラス, 各 item の field dict)。service の出力から取り出す
+    """
+    from app_v2.admin.dto.admin_reservation_dtos import AdminReservationListItemDTO
+    from app_v2.customer_booking.dtos import PublicFarmCardDTO
+
+    farms_map = cases[0][2]
+    admin_items = cases[2][2].items
+    return [
+        ("PublicFarmCardDTO", PublicFarmCardDTO, [dict(dto) for dto in farms_map]),
+        ("AdminReservationListItemDTO", AdminReservationListItemDTO, [dict(dto) for dto in admin_items]),
+    ]
+
+
+def _cpu_us_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    for _ in range(min(10, iterations)):
+        fn()
+    t0 = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - t0) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="一覧レスポンスの JSON 化 CPU 時間（旧経路 / 新経路）")
+    parser.add_argument("--db", required=True, help="seed_data.py で作った SQLite ファイル")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["DB_PATH"] = str(Path(args.db).resolve())
+
+    from app_v2.common import trusted_dto
+    from app_v2.common.json_response import trusted_json_response
+    from app_v2.main import app
+
+    # 旧経路（FastAPI の model_dump）は build_trusted の DTO の str URL に警告を出す（出力は同じ）
+    warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
+
+    loop = asyncio.new_event_loop()
+    failed = False
+
+    print(f"{'case':<34} {'old µs':>10} {'new µs':>10} {'speedup':>8} {'bytes':>9}")
+    cases = _cases(app, args.db)
+    for name, route, content, response_type in cases:
+
+        def old_path(route=route, content=content) -> bytes:
+            # sync endpoint と同じ引数（threadpool は使わず同じスレッドで測る）
+            serialized = loop.run_until_complete(
+                serialize_response(
+                    field=route.response_field,
+                    response_content=content,
+                    is_coroutine=True,
+                )
+            )
+            return JSONResponse(serialized).body
+
+        def new_path(content=content, response_type=response_type) -> bytes:
+            return trusted_json_response(content, response_type).body
+
+        old_body, new_body = old_path(), new_path()
+        if old_body != new_body:
+            print(f"[serialization] MISMATCH in {name}: old and new bodies differ")
+            failed = True
+
+        old_us = _cpu_us_per_call(old_path, args.iterations)
+        new_us = _cpu_us_per_call(new_path, args.iterations)
+        print(
+            f"{name:<34} {old_us:>10.0f} {new_us:>10.0f} "
+            f"{old_us / new_us if new_us else 0:>7.1f}x {len(new_body):>9}"
+        )
+
+    loop.close()
+
+    if trusted_dto.strict_dto_validation():
+        print("\n[serialization] STRICT_DTO_VALIDATION=1: build_trusted validates, skipping construction table")
+        sys.exit(1 if failed else 0)
+
+    print()
+    print(f"{'DTO construction (per item)':<34} {'valid µs':>10} {'trust µs':>10} {'speedup':>8} {'items':>9}")
+    for name, model, field_dicts in _construction_cases(cases):
+        if not field_dicts:
+            continue
+
+        def validated(model=model, field_dicts=field_dicts) -> None:
+            for fields in field_dicts:
+                model(**fields)
+
+        def trusted(model=model, field_dicts=field_dicts) -> None:
+            for fields in field_dicts:
+                trusted_dto.build_trusted(model, **fields)
+
+        n = len(field_dicts)
+        validated_us = _cpu_us_per_call(validated, args.iterations) / n
+        trusted_us = _cpu_us_per_call(trusted, args.iterations) / n
+        print(
+            f"{name:<34} {validated_us:>10.1f} {trusted_us:>10.1f} "
+            f"{validated_us / trusted_us if trusted_us else 0:>7.1f}x {n:>9}"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# scripts/bench/bench_single_flight.py
+#
+# 同じ公開リクエストが一斉に来たときの DB クエリ数を、同時数を上げながら測る。
+# （app_v2.common.single_flight で同じ計算がまとまっていることの確認用）
+#
+#   python scripts/bench/seed_data.py --db /tmp/bench.db --scale 100k
+#   python scripts/bench/bench_single_flight.py --db /tmp/bench.db
+#   python scripts/bench/bench_single_flight.py --db /tmp/bench.db --concurrency 1,50,200 --rounds 5
+#
+# - 各ラウンドで N 件を同時に送る（asyncio.gather。sync endpoint は threadpool で並行に動く）
+# - identical: 全件同じ URL（まとめられる） / distinct: 全件違う URL（まとめられない・比較用）
+# - 公開 API は ETag 用に table_versions を 1 リクエスト 1 回読む（まとめない）。
+#   data q/round はそれを除いた、farms を読むクエリの数
+# - 最大同時数で identical の data q/round が distinct より減っていない（まとまっていない）場合は exit 1
+#   まとまるのは計算が重なった分だけなので、計算の短い詳細（PK 1 件）は一覧ほどは減らない
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+import httpx  # noqa: E402
+
+# 徳島市役所付近
+USER_LAT = 34.0703
+USER_LNG = 134.5548
+
+# 公開 API 1 リクエストあたりの ETag 用クエリ（table_versions）
+VERSION_QUERIES_PER_REQUEST = 1
+
+UrlFn = Callable[[int], str]
+
+
+def _scenarios(farm_id: int) -> Dict[str, Dict[str, UrlFn]]:
+    return {
+        "public_farms": {
+            "identical": lambda i: f"/api/public/farms?page=1&lat={USER_LAT}&lng={USER_LNG}",
+            "distinct": lambda i: f"/api/public/farms?page=1&lat={USER_LAT + i * 1e-6}&lng={USER_LNG}",
+        },
+        "public_farm_detail": {
+            "identical": lambda i: f"/api/public/farms/{farm_id}",
+            # 存在しない farm も 1 回ずつ問い合わせる
+            "distinct": lambda i: f"/api/public/farms/{farm_id if i == 0 else 10_000_000 + i}",
+        },
+    }
+
+
+def _any_public_farm_id() -> int:
+    from app_v2.db.core import connect
+
+    conn = connect()
+    try:
+        row = conn.execute(
+            """
+            SELECT farm_id FROM farms
+             WHERE active_flag = 1 AND is_accepting_reservations = 1
+             ORDER BY farm_id
+             LIMIT 1
+            """
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        sys.exit("[single_flight] no public farms in DB (run scripts/bench/seed_data.py first)")
+    return int(row[0])
+
+
+async def _round(client: httpx.AsyncClient, url: UrlFn, n: int) -> float:
+    t0 = time.perf_counter()
+    responses = await asyncio.gather(*(client.get(url(i)) for i in range(n)))
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    bad = [r for r in responses if r.status_code != 200]
+    if bad:
+        sys.exit(f"[single_flight] HTTP {bad[0].status_code} {bad[0].text[:200]}")
+    return elapsed_ms
+
+
+async def _amain(args: argparse.Namespace) -> int:
+    db_path = Path(args.db).resolve()
+    if not db_path.exists():
+        sys.exit(f"[single_flight] {db_path} not found (run scripts/bench/seed_data.py first)")
+    os.environ["DB_PATH"] = str(db_path)
+
+    from app_v2.common.single_flight import single_flight_stats  # noqa: E402
+    from app_v2.main import app  # noqa: E402
+    from app_v2.observability.metrics import get_metrics_registry  # noqa: E402
+
+    # httpx の 1 リクエスト 1 行の INFO ログで表が崩れるので止める
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    registry = get_metrics_registry()
+    scenarios = _scenarios(_any_public_farm_id())
+    status = 0
+
+    print(
+        f"{'scenario':<20} {'mode':<10} {'conc':>5} {'q/round':>8} {'data q/round':>13} "
+        f"{'shared':>7} {'ms/round':>9}"
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, modes in scenarios.items():
+            top: Dict[str, float] = {}
+            for mode, url in modes.items():
+                await _round(client, url, 1)  # warmup
+                data_round = 0.0
+                for n in levels:
+                    registry.reset()
+                    before = sum(s["shared"] for s in single_flight_stats().values())
+                    elapsed = 0.0
+                    for _ in range(args.rounds):
+                        elapsed += await _round(client, url, n)
+                    shared = sum(s["shared"] for s in single_flight_stats().values()) - before
+
+                    queries = sum(t[1] for t in registry.route_totals().values())
+                    q_round = queries / args.rounds
+                    data_round = q_round - n * VERSION_QUERIES_PER_REQUEST
+                    print(
+                        f"{name:<20} {mode:<10} {n:>5} {q_round:>8.1f} {data_round:>13.1f} "
+                        f"{shared / args.rounds:>7.1f} {elapsed / args.rounds:>9.1f}"
+                    )
+
+                top[mode] = data_round
+
+            if levels[-1] > 1 and top["identical"] >= top["distinct"]:
+                print(
+                    f"[single_flight] {name}: identical requests were not coalesced "
+                    f"({top['identical']:.1f} vs {top['distinct']:.1f} data queries per round)"
+                )
+                status = 1
+
+    return status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="同時リクエストの single flight 確認")
+    parser.add_argument("--db", required=True, help="seed_data.py で作った SQLite ファイル")
+    parser.add_argument("--concurrency", default="1,10,50,100,200")
+    parser.add_argument("--rounds", type=int, default=3)
+    sys.exit(asyncio.run(_amain(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
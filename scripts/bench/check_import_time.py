@@ -0,0 +1,125 @@
+# scripts/bench/check_import_time.py
+#
+# app_v2.main の import 時間（= コールドスタート時間の大半）が予算内かを確かめる。
+# Render のインスタンス起動を遅くしないためのチェック。デプロイ前・CI で実行する。
+#
+#   python scripts/bench/check_import_time.py
+#   python scripts/bench/check_import_time.py --budget-ms 1200 --runs 5
+#
+# 同じ判定は tests/test_import_time.py（pytest）でも行う
+#
+# - python -X importtime -c "import app_v2.main" を別プロセスで --runs 回実行し、最小値で判定
+# - 起動時に import してはいけない重いパッケージ（stripe / cloudinary）が読まれていても失敗
+# - 失敗時は exit 1。累積時間の大きいモジュール上位を出すので、原因の目安にする
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+TARGET_MODULE = "app_v2.main"
+
+# 初回利用時に import する前提のパッケージ
+LAZY_PACKAGES = ("stripe", "cloudinary")
+
+DEFAULT_BUDGET_MS = 1500.0
+
+
+def _run_importtime() -> Tuple[float, Dict[str, int]]:
+    """
+    1 回分。(TARGET_MODULE の累積 ms, {モジュール: 累積 µs})
+    """
+    env = dict(os.environ)
+    env.setdefault("DB_PATH", str(BASE_DIR / "app.db"))
+    env["PYTHONPATH"] = str(BASE_DIR)
+    # .pyc は作られている前提（初回実行のコンパイル時間は測らない）
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET_MODULE}"],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"[import-time] import failed:\n{proc.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # ヘッダ行
+        cumulative[parts[2].strip()] = int(parts[1])
+
+    if TARGET_MODULE not in cumulative:
+        sys.exit(f"[import-time] {TARGET_MODULE} not found in -X importtime output")
+    return cumulative[TARGET_MODULE] / 1000.0, cumulative
+
+
+def measure_import_time(runs: int) -> Tuple[List[float], Dict[str, int]]:
+    """
+    runs 回測る。([各回の ms], 最小の回の {モジュール: 累積 µs})
+    """
+    _run_importtime()  # .pyc の生成を済ませる
+
+    results = [_run_importtime() for _ in range(max(1, runs))]
+    _, cumulative = min(results, key=lambda r: r[0])
+    return [ms for ms, _ in results], cumulative
+
+
+def eager_lazy_packages(cumulative: Dict[str, int]) -> List[str]:
+    """
+    起動時に読まれてしまった LAZY_PACKAGES（トップレベル名）。
+    """
+    return sorted(
+        {name.split(".")[0] for name in cumulative if name.split(".")[0] in LAZY_PACKAGES}
+    )
+
+
+def _top_app_modules(cumulative: Dict[str, int], n: int = 10) -> List[Tuple[str, int]]:
+    return sorted(
+        ((name, us) for name, us in cumulative.items() if name != TARGET_MODULE),
+        key=lambda kv: -kv[1],
+    )[:n]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="app_v2.main の import 時間チェック")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    runs, cumulative = measure_import_time(args.runs)
+    best_ms = min(runs)
+    print(
+        f"[import-time] {TARGET_MODULE}: best {best_ms:.0f}ms "
+        f"(runs: {', '.join(f'{ms:.0f}' for ms in runs)}) budget {args.budget_ms:.0f}ms"
+    )
+
+    failed = False
+
+    eager = eager_lazy_packages(cumulative)
+    if eager:
+        print(f"[import-time] FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+
+    if best_ms > args.budget_ms:
+        print(f"[import-time] FAIL: over budget by {best_ms - args.budget_ms:.0f}ms")
+        failed = True
+
+    if failed:
+        print("[import-time] slowest modules (cumulative):")
+        for name, us in _top_app_modules(cumulative):
+            print(f"  {us / 1000:8.1f}ms  {name}")
+        sys.exit(1)
+
+    print("[import-time] OK")
+
+
+if __name__ == "__main__":
+    main()
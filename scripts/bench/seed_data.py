@@ -0,0 +1,477 @@
+# scripts/bench/seed_data.py
+#
+# ベンチマーク / 負荷試験用の合成データを作る（新しい SQLite ファイルに src/schema.sql から）。
+#
+#   python scripts/bench/seed_data.py --db /tmp/bench.db --scale 100k
+#   python scripts/bench/seed_data.py --db /tmp/bench.db --scale 1M --years 5 --overwrite
+#
+# - farms: 徳島県内の市町村まわりに散らした座標、1〜3 個の受け渡しスロット、pr_images_json
+# - consumers: 連番メール
+# - reservations: --years 年分の過去週 + 今週〜先 7 週（人気 farm に偏らせる）
+# - pickup_events: 予約の付いた週を含む farm × スロット × 週ぶん（reservations.event_id も埋める）
+#
+# 乱数は --seed 固定なので、同じ引数なら同じデータになる。
+# 既存の DB には書かない（--overwrite でファイルを作り直す）。
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from app_v2.customer_booking.services.pickup_event_calendar_service import (  # noqa: E402
+    PICKUP_EVENT_WEEKS_AHEAD,
+    format_slot_event_label,
+)
+from app_v2.domain.pickup_schedule import (  # noqa: E402
+    MAX_PICKUP_SLOTS_PER_FARM,
+    PickupSchedule,
+)
+from app_v2.domain.pickup_slot import BOOKING_DEADLINE, UTC, WEEKDAY_CODES  # noqa: E402
+
+SCHEMA_PATH = BASE_DIR / "src" / "schema.sql"
+
+
+@dataclass(frozen=True)
+class Scale:
+    farms: int
+    consumers: int
+    reservations: int
+
+
+SCALES: Dict[str, Scale] = {
+    "1k": Scale(farms=30, consumers=500, reservations=1_000),
+    "100k": Scale(farms=600, consumers=25_000, reservations=100_000),
+    "1M": Scale(farms=3_000, consumers=200_000, reservations=1_000_000),
+}
+
+# 徳島県の市町村（役場付近の座標）
+MUNICIPALITIES: List[Tuple[str, float, float]] = [
+    ("徳島市", 34.0703, 134.5548),
+    ("鳴門市", 34.1726, 134.6087),
+    ("小松島市", 34.0047, 134.5906),
+    ("阿南市", 33.9217, 134.6597),
+    ("吉野川市", 34.0656, 134.3589),
+    ("阿波市", 34.1014, 134.2962),
+    ("美馬市", 34.0533, 134.1700),
+    ("三好市", 34.0258, 133.8072),
+    ("勝浦町", 33.9303, 134.5103),
+    ("佐那河内村", 33.9928, 134.4533),
+    ("石井町", 34.0744, 134.4403),
+    ("神山町", 33.9672, 134.3500),
+    ("那賀町", 33.8572, 134.4981),
+    ("美波町", 33.7344, 134.5353),
+    ("海陽町", 33.6017, 134.3522),
+    ("松茂町", 34.1339, 134.5803),
+    ("北島町", 34.1250, 134.5469),
+    ("藍住町", 34.1269, 134.4950),
+    ("上板町", 34.1214, 134.4050),
+    ("つるぎ町", 34.0372, 134.0633),
+]
+
+LAST_NAMES = ["佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "森", "岡田", "近藤", "吉田", "三木"]
+FIRST_NAMES = ["一郎", "健二", "誠", "浩", "茂", "和子", "恵子", "美香", "直樹", "大輔", "由美", "翔太"]
+RICE_VARIETIES = ["コシヒカリ", "あきさかり", "キヌヒカリ", "ヒノヒカリ", "にこまる", "ミルキークイーン"]
+
+# 受け渡しは週末寄り
+SLOT_WEEKDAY_WEIGHTS = [6, 4, 6, 4, 8, 30, 20]
+SLOT_START_HOURS = list(range(8, 19))
+
+IMAGE_BASE_URL = "https://res.cloudinary.com/demo/image/upload"
+
+SERVICE_FEE = 300
+CHUNK_SIZE = 50_000
+
+
+def _fmt_ts(dt: datetime) -> str:
+    # CURRENT_TIMESTAMP と同じ書式（UTC）
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _image(farm_id: int, name: str) -> str:
+    return f"{IMAGE_BASE_URL}/v1/farms/{farm_id}/{name}.webp"
+
+
+# ============================================================
+# farms / farm_pickup_slots
+# ============================================================
+
+def _random_slot_codes(rng: random.Random) -> List[str]:
+    n = rng.choices(range(1, MAX_PICKUP_SLOTS_PER_FARM + 1), weights=[60, 30, 10])[0]
+    # pickup_events は (farm_id, event_start_at) で一意なので開始時刻が重ならないようにする
+    starts = set()
+    codes = []
+    while len(codes) < n:
+        weekday = rng.choices(WEEKDAY_CODES, weights=SLOT_WEEKDAY_WEIGHTS)[0]
+        start = rng.choice(SLOT_START_HOURS)
+        if (weekday, start) in starts:
+            continue
+        starts.add((weekday, start))
+        end = min(start + rng.choice((1, 1, 2)), 24)
+        codes.append(f"{weekday}_{start}_{end}")
+    return codes
+
+
+def _farm_row(rng: random.Random, farm_id: int, codes: List[str], now: datetime) -> tuple:
+    town, base_lat, base_lng = rng.choice(MUNICIPALITIES)
+    lat = round(base_lat + rng.gauss(0, 0.03), 6)
+    lng = round(base_lng + rng.gauss(0, 0.03), 6)
+    last = rng.choice(LAST_NAMES)
+    first = rng.choice(FIRST_NAMES)
+
+    price_10kg = rng.randrange(4000, 7100, 100)
+    price_5kg = round(price_10kg * 0.53, -1)
+    price_25kg = round(price_10kg * 2.4, -2)
+
+    pr_images = [
+        {
+            "url": _image(farm_id, f"pr_{i}"),
+            "thumbnail_url": _image(farm_id, f"pr_{i}_thumb"),
+            "public_id": f"farms/{farm_id}/pr_{i}",
+        }
+        for i in range(rng.randint(0, 5))
+    ]
+
+    # pickup_time は代表スロット（週内で最も早いもの）
+    representative = PickupSchedule.from_codes(codes).codes[0]
+    accepting = 1 if rng.random() < 0.97 else 0
+    activated = now - timedelta(days=rng.randint(30, 1500))
+
+    return (
+        farm_id,
+        last,
+        first,
+        f"{last}農園",
+        f"徳島県{town}{rng.randint(1, 30)}-{rng.randint(1, 200)}",
+        lat,
+        lng,
+        "done",
+        int(price_5kg),
+        int(price_10kg),
+        int(price_25kg),
+        representative,
+        round(lat + rng.gauss(0, 0.003), 6),
+        round(lng + rng.gauss(0, 0.003), 6),
+        f"{last}農園 倉庫前",
+        "軽トラックの横でお渡しします。",
+        1,
+        1,
+        accepting,
+        rng.choice(RICE_VARIETIES),
+        str(now.year - rng.choice((0, 0, 1))),
+        f"{town}の{rng.choice(RICE_VARIETIES)}",
+        "減農薬で育てたお米です。精米したてをお渡しします。",
+        _image(farm_id, "face"),
+        _image(farm_id, "cover"),
+        json.dumps(pr_images, ensure_ascii=False),
+        activated.isoformat(),
+        f"farm{farm_id}@example.com",
+        "PUBLISH_READY",
+    )
+
+
+FARM_INSERT_SQL = """
+    INSERT INTO farms (
+        farm_id, last_name, first_name, name, address, lat, lng, geocode_status,
+        price_5kg, price_10kg, price_25kg,
+        pickup_time, pickup_lat, pickup_lng, pickup_place_name, pickup_notes,
+        active_flag, is_public, is_accepting_reservations,
+        rice_variety_label, harvest_year, pr_title, pr_text,
+        face_image_url, cover_image_url, pr_images_json,
+        first_activated_at, email, registration_status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def seed_farms(
+    conn: sqlite3.Connection, rng: random.Random, count: int, now: datetime
+) -> Dict[int, List[str]]:
+    slots_by_farm: Dict[int, List[str]] = {}
+    farm_rows = []
+    slot_rows = []
+    for farm_id in range(1, count + 1):
+        codes = _random_slot_codes(rng)
+        slots_by_farm[farm_id] = codes
+        farm_rows.append(_farm_row(rng, farm_id, codes, now))
+        slot_rows.extend((farm_id, c, now.isoformat()) for c in codes)
+
+    conn.executemany(FARM_INSERT_SQL, farm_rows)
+    conn.executemany(
+        "INSERT INTO farm_pickup_slots (farm_id, pickup_slot_code, created_at) VALUES (?, ?, ?)",
+        slot_rows,
+    )
+    return slots_by_farm
+
+
+# ============================================================
+# consumers
+# ============================================================
+
+def seed_consumers(
+    conn: sqlite3.Connection, rng: random.Random, count: int, now: datetime
+) -> None:
+    for lo in range(1, count + 1, CHUNK_SIZE):
+        hi = min(lo + CHUNK_SIZE, count + 1)
+        conn.executemany(
+            "INSERT INTO consumers (consumer_id, created_at, email, registration_status) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (
+                    cid,
+                    _fmt_ts(now - timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60))),
+                    f"consumer{cid}@example.com",
+                    "REGISTERED",
+                )
+                for cid in range(lo, hi)
+            ],
+        )
+
+
+# ============================================================
+# pickup_events + reservations
+# ============================================================
+
+EventKey = Tuple[int, str, int]  # (farm_id, slot code, 今週からの週数。過去は負)
+
+
+def seed_pickup_events(
+    conn: sqlite3.Connection,
+    slots_by_farm: Dict[int, List[str]],
+    weeks_back: int,
+    now: datetime,
+) -> Dict[EventKey, Tuple[int, datetime, datetime, str]]:
+    """
+    過去 weeks_back 週 〜 先 PICKUP_EVENT_WEEKS_AHEAD 週のイベント。
+    週の判定は PickupEventCalendarService と同じ（UTC の event_for_export）。
+    """
+    events: Dict[EventKey, Tuple[int, datetime, datetime, str]] = {}
+    rows = []
+    event_id = 0
+    one_week = timedelta(days=7)
+    created_at = now.isoformat()
+
+    for farm_id, codes in slots_by_farm.items():
+        schedule = PickupSchedule.from_codes(codes)
+        for slot in schedule.slots:
+            start0, end0 = slot.event_for_export(now, UTC)
+            for week in range(-weeks_back, PICKUP_EVENT_WEEKS_AHEAD):
+                event_id += 1
+                start = start0 + one_week * week
+                end = end0 + one_week * week
+                label = format_slot_event_label(start, slot)
+                events[(farm_id, slot.code, week)] = (event_id, start, end, label)
+                rows.append(
+                    (
+                        event_id,
+                        farm_id,
+                        slot.code,
+                        start.isoformat(),
+                        end.isoformat(),
+                        (start - BOOKING_DEADLINE).isoformat(),
+                        label,
+                        created_at,
+                    )
+                )
+                if len(rows) >= CHUNK_SIZE:
+                    _insert_events(conn, rows)
+                    rows = []
+    _insert_events(conn, rows)
+    return events
+
+
+def _insert_events(conn: sqlite3.Connection, rows: list) -> None:
+    if rows:
+        conn.executemany(
+            """
+            INSERT INTO pickup_events (
+                event_id, farm_id, pickup_slot_code,
+                event_start_at, event_end_at, deadline_at, display_label,
+                created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+
+RESERVATION_INSERT_SQL = """
+    INSERT INTO reservations (
+        consumer_id, farm_id, pickup_slot_code, pickup_display,
+        items_json, rice_subtotal, service_fee, currency, status, created_at,
+        payment_intent_id, payment_status, payment_succeeded_at,
+        event_start_at, event_end_at, event_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 過去週 / 今週以降の status 比率
+PAST_STATUSES = (["confirmed", "cancelled", "pending"], [88, 10, 2])
+UPCOMING_STATUSES = (["confirmed", "pending", "cancelled"], [70, 25, 5])
+UPCOMING_RATIO = 0.08
+
+SIZES = (5, 10, 25)
+SIZE_WEIGHTS = (30, 55, 15)
+
+
+def seed_reservations(
+    conn: sqlite3.Connection,
+    rng: random.Random,
+    count: int,
+    consumers: int,
+    slots_by_farm: Dict[int, List[str]],
+    prices: Dict[int, Dict[int, int]],
+    events: Dict[EventKey, Tuple[int, datetime, datetime, str]],
+    weeks_back: int,
+) -> None:
+    farm_ids = list(slots_by_farm)
+    # 人気 farm に偏らせる（パレート分布の重み）
+    farm_weights = [rng.paretovariate(1.2) for _ in farm_ids]
+    cum_weights = []
+    total = 0.0
+    for w in farm_weights:
+        total += w
+        cum_weights.append(total)
+
+    rows = []
+    for n in range(1, count + 1):
+        farm_id = rng.choices(farm_ids, cum_weights=cum_weights)[0]
+        code = rng.choice(slots_by_farm[farm_id])
+
+        if rng.random() < UPCOMING_RATIO:
+            week = rng.randrange(0, PICKUP_EVENT_WEEKS_AHEAD)
+            status = rng.choices(*UPCOMING_STATUSES)[0]
+        else:
+            week = -rng.randint(1, weeks_back)
+            status = rng.choices(*PAST_STATUSES)[0]
+
+        event_id, start, end, label = events[(farm_id, code, week)]
+        created = start - BOOKING_DEADLINE - timedelta(minutes=rng.randint(1, 10 * 24 * 60))
+
+        items = []
+        subtotal_sum = 0
+        for size in sorted(set(rng.choices(SIZES, weights=SIZE_WEIGHTS, k=rng.randint(1, 2)))):
+            quantity = rng.choices((1, 2, 3), weights=(75, 20, 5))[0]
+            unit_price = prices[farm_id][size]
+            subtotal = unit_price * quantity
+            subtotal_sum += subtotal
+            items.append(
+                {
+                    "size_kg": size,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "subtotal": subtotal,
+                }
+            )
+
+        if status == "pending":
+            payment = (None, None, None)
+            event = (None, None, None)
+        else:
+            payment = (
+                f"pi_seed_{n}",
+                "succeeded",
+                _fmt_ts(created + timedelta(minutes=rng.randint(1, 15))),
+            )
+            event = (start.isoformat(), end.isoformat(), event_id)
+
+        rows.append(
+            (
+                rng.randint(1, consumers),
+                farm_id,
+                code,
+                label,
+                json.dumps(items, ensure_ascii=False),
+                subtotal_sum,
+                SERVICE_FEE,
+                "jpy",
+                status,
+                _fmt_ts(created),
+                *payment,
+                *event,
+            )
+        )
+        if len(rows) >= CHUNK_SIZE:
+            conn.executemany(RESERVATION_INSERT_SQL, rows)
+            rows = []
+            print(f"[seed] reservations {n}/{count}")
+    if rows:
+        conn.executemany(RESERVATION_INSERT_SQL, rows)
+
+
+# ============================================================
+# main
+# ============================================================
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ベンチマーク用の合成データを作る")
+    parser.add_argument("--db", required=True, help="作成する SQLite ファイル")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k", help="reservations の件数規模")
+    parser.add_argument("--farms", type=int, help="farm 数（scale の既定値を上書き）")
+    parser.add_argument("--consumers", type=int, help="consumer 数（scale の既定値を上書き）")
+    parser.add_argument("--reservations", type=int, help="予約件数（scale の既定値を上書き）")
+    parser.add_argument("--years", type=int, default=3, help="過去何年分の予約を作るか")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--overwrite", action="store_true", help="既存ファイルを消して作り直す")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    scale = SCALES[args.scale]
+    farms = args.farms or scale.farms
+    consumers = args.consumers or scale.consumers
+    reservations = args.reservations or scale.reservations
+    weeks_back = max(1, args.years * 52)
+
+    db_path = Path(args.db).resolve()
+    if db_path.exists():
+        if not args.overwrite:
+            sys.exit(f"[seed] {db_path} already exists (use --overwrite)")
+        db_path.unlink()
+
+    rng = random.Random(args.seed)
+    now = datetime.now(UTC)
+    t0 = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        # 使い捨ての DB なので耐障害性より速度
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        slots_by_farm = seed_farms(conn, rng, farms, now)
+        prices = {
+            farm_id: {5: p5, 10: p10, 25: p25}
+            for farm_id, p5, p10, p25 in conn.execute(
+                "SELECT farm_id, price_5kg, price_10kg, price_25kg FROM farms"
+            )
+        }
+        print(f"[seed] farms={farms} slots={sum(len(c) for c in slots_by_farm.values())}")
+
+        seed_consumers(conn, rng, consumers, now)
+        print(f"[seed] consumers={consumers}")
+
+        events = seed_pickup_events(conn, slots_by_farm, weeks_back, now)
+        print(f"[seed] pickup_events={len(events)}")
+
+        seed_reservations(
+            conn, rng, reservations, consumers, slots_by_farm, prices, events, weeks_back
+        )
+        print(f"[seed] reservations={reservations}")
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"[seed] done db={db_path} ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
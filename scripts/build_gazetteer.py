@@ -0,0 +1,34 @@
+# scripts/build_gazetteer.py
+#
+# app_v2/farmer/data/tokushima_gazetteer.csv → gazetteer.bin を作る。
+#
+#   python scripts/build_gazetteer.py [csv ...]
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app_v2.farmer.services.gazetteer import (  # noqa: E402
+    DEFAULT_GAZETTEER_CSV,
+    DEFAULT_GAZETTEER_PATH,
+    read_gazetteer_csv,
+    write_gazetteer,
+)
+
+
+def main():
+    sources = [Path(p) for p in sys.argv[1:]] or [DEFAULT_GAZETTEER_CSV]
+
+    entries = []
+    for src in sources:
+        rows = read_gazetteer_csv(src)
+        print(f"[gazetteer] {src}: {len(rows)} entries")
+        entries.extend(rows)
+
+    count = write_gazetteer(entries, DEFAULT_GAZETTEER_PATH)
+    print(f"[gazetteer] wrote {count} records -> {DEFAULT_GAZETTEER_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/migrations/mig_farm_pickup_slots_create.py
+#
+# farm_pickup_slots（farm ごとの受け渡しスロット）を作り、
+# 既存 farm の farms.pickup_time を 1 件目のスロットとして移す。
+# farms.pickup_time は代表スロットとしてそのまま残す。
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from datetime import datetime, timezone
+from app_v2.db.core import resolve_db_path
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        cur.execute(
+            """
+            CREATE TABLE farm_pickup_slots (
+                farm_id INTEGER NOT NULL,
+                pickup_slot_code TEXT NOT NULL,
+
+                created_at TEXT NOT NULL,
+
+                PRIMARY KEY (farm_id, pickup_slot_code),
+                FOREIGN KEY (farm_id) REFERENCES farms(farm_id)
+            )
+            """
+        )
+
+        cur.execute(
+            """
+            INSERT INTO farm_pickup_slots (farm_id, pickup_slot_code, created_at)
+            SELECT farm_id, pickup_time, ?
+              FROM farms
+             WHERE pickup_time IS NOT NULL
+               AND pickup_time != ''
+            """,
+            (datetime.now(timezone.utc).isoformat(),),
+        )
+        print(f"[migrate] copied pickup_time of {cur.rowcount} farms")
+
+        conn.commit()
+        print("[migrate] success")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,41 @@
+# scripts/migrations/mig_farms_geocode_status.py
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from app_v2.db.core import resolve_db_path
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        # owner 座標（farms.lat / lng）の確定状態
+        #   NULL / 'done' = 確定, 'pending' = バックグラウンドで解決中, 'failed' = 解決できず
+        cur.execute("ALTER TABLE farms ADD COLUMN geocode_status TEXT")
+
+        conn.commit()
+        print("[migrate] success")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
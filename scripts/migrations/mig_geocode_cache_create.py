@@ -0,0 +1,62 @@
+# scripts/migrations/mig_geocode_cache_create.py
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from app_v2.db.core import resolve_db_path
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        cur.execute(
+            """
+            CREATE TABLE geocode_cache (
+                address_key TEXT NOT NULL,
+                region TEXT NOT NULL,
+
+                status TEXT NOT NULL,
+                lat REAL,
+                lng REAL,
+                error_message TEXT,
+
+                expires_at TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+
+                PRIMARY KEY (address_key, region)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX idx_geocode_cache_expires_at
+                ON geocode_cache (expires_at)
+            """
+        )
+
+        conn.commit()
+        print("[migrate] success")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,166 @@
+# scripts/migrations/mig_pickup_events_create.py
+#
+# pickup_events（farm × 週の受け渡しイベント）を作り、
+# - reservations.event_id を追加
+# - confirmed の既存予約を event_id で紐づけ（event_start_at が無ければ created_at から計算）
+# - 有効な farm の今後の週を先行生成
+# する。
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from datetime import datetime, timezone
+from app_v2.db.core import resolve_db_path
+from app_v2.db.datetimes import parse_db_datetime_or_none
+from app_v2.domain.pickup_slot import PickupSlot, UTC
+
+
+def _backfill_event_ids(cur: sqlite3.Cursor) -> int:
+    # ここで import（テーブル作成後に Service を使う）
+    from app_v2.customer_booking.services.pickup_event_calendar_service import (
+        build_event_spec,
+    )
+
+    rows = cur.execute(
+        """
+        SELECT reservation_id, farm_id, pickup_slot_code,
+               created_at, event_start_at, event_end_at
+          FROM reservations
+         WHERE status = 'confirmed'
+           AND event_id IS NULL
+           AND farm_id IS NOT NULL
+           AND pickup_slot_code IS NOT NULL
+           AND pickup_slot_code != ''
+        """
+    ).fetchall()
+
+    now = datetime.now(timezone.utc).isoformat()
+    linked = 0
+    for rid, farm_id, code, created_at, start_raw, end_raw in rows:
+        try:
+            slot = PickupSlot.from_code(code)
+        except ValueError:
+            print(f"[migrate] skip reservation_id={rid}: bad pickup_slot_code {code!r}")
+            continue
+
+        start = parse_db_datetime_or_none(start_raw)
+        end = parse_db_datetime_or_none(end_raw)
+        if start is None or end is None:
+            created = parse_db_datetime_or_none(created_at)
+            if created is None:
+                print(f"[migrate] skip reservation_id={rid}: bad created_at {created_at!r}")
+                continue
+            start, end = slot.event_for_booking(created, UTC)
+
+        spec = build_event_spec(int(farm_id), slot, start, end)
+        cur.execute(
+            """
+            INSERT INTO pickup_events (
+                farm_id, pickup_slot_code,
+                event_start_at, event_end_at, deadline_at, display_label,
+                created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (farm_id, event_start_at) DO NOTHING
+            """,
+            (
+                spec.farm_id,
+                spec.pickup_slot_code,
+                spec.event_start_at.isoformat(),
+                spec.event_end_at.isoformat(),
+                spec.deadline_at.isoformat(),
+                spec.display_label,
+                now,
+            ),
+        )
+        cur.execute(
+            """
+            UPDATE reservations
+               SET event_id = (
+                       SELECT event_id FROM pickup_events
+                        WHERE farm_id = ? AND event_start_at = ?
+                   ),
+                   event_start_at = ?,
+                   event_end_at = ?
+             WHERE reservation_id = ?
+            """,
+            (
+                spec.farm_id,
+                spec.event_start_at.isoformat(),
+                spec.event_start_at.isoformat(),
+                spec.event_end_at.isoformat(),
+                rid,
+            ),
+        )
+        linked += 1
+    return linked
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        cur.execute(
+            """
+            CREATE TABLE pickup_events (
+                event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                farm_id INTEGER NOT NULL,
+                pickup_slot_code TEXT NOT NULL,
+
+                event_start_at TEXT NOT NULL,
+                event_end_at TEXT NOT NULL,
+                deadline_at TEXT NOT NULL,
+                display_label TEXT NOT NULL,
+
+                created_at TEXT NOT NULL,
+
+                UNIQUE (farm_id, event_start_at),
+                FOREIGN KEY (farm_id) REFERENCES farms(farm_id)
+            )
+            """
+        )
+        cur.execute(
+            "ALTER TABLE reservations ADD COLUMN event_id INTEGER "
+            "REFERENCES pickup_events(event_id)"
+        )
+        cur.execute(
+            """
+            CREATE INDEX idx_reservations_event_id
+                ON reservations (event_id)
+            """
+        )
+
+        linked = _backfill_event_ids(cur)
+        print(f"[migrate] linked reservations = {linked}")
+
+        conn.commit()
+        print("[migrate] success")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+    # 今後の週の先行生成（別接続・Service 経由）
+    from app_v2.customer_booking.services.pickup_event_calendar_service import (
+        PickupEventCalendarService,
+    )
+    n = PickupEventCalendarService().refresh_all()
+    print(f"[migrate] generated upcoming events for {n} farms")
+
+
+if __name__ == "__main__":
+    migrate()
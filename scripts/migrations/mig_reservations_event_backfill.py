@@ -0,0 +1,113 @@
+# scripts/migrations/mig_reservations_event_backfill.py
+#
+# confirmed なのに event_start_at / event_end_at が NULL の旧データを埋める。
+# 値は決済確定時（reservation_payment_service）と同じ規則・同じ書式
+# （UTC・isoformat）で、created_at と pickup_slot_code から一括計算する。
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from app_v2.db.core import resolve_db_path
+from app_v2.domain.pickup_event_batch import (
+    epoch_us_to_datetime,
+    event_windows_for_booking,
+    parse_db_datetimes_us,
+)
+
+BATCH_SIZE = 5000
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        rows = cur.execute(
+            """
+            SELECT reservation_id, created_at, pickup_slot_code
+              FROM reservations
+             WHERE status = 'confirmed'
+               AND event_start_at IS NULL
+               AND pickup_slot_code IS NOT NULL
+               AND pickup_slot_code != ''
+            """
+        ).fetchall()
+        print(f"[migrate] candidates = {len(rows)}")
+
+        updated = 0
+        skipped = 0
+        for i in range(0, len(rows), BATCH_SIZE):
+            chunk = rows[i:i + BATCH_SIZE]
+            created_us = parse_db_datetimes_us([r[1] for r in chunk])
+
+            targets = []
+            for r, t in zip(chunk, created_us):
+                if t is None:
+                    print(f"[migrate] skip reservation_id={r[0]}: bad created_at {r[1]!r}")
+                    skipped += 1
+                    continue
+                targets.append((r[0], t, r[2]))
+
+            try:
+                starts, ends = event_windows_for_booking(
+                    [t[1] for t in targets],
+                    [t[2] for t in targets],
+                )
+            except ValueError:
+                # 不正なスロットコードが混ざっている：行ごとに判定して飛ばす
+                starts, ends, ok_targets = [], [], []
+                for t in targets:
+                    try:
+                        s, e = event_windows_for_booking([t[1]], t[2])
+                    except ValueError:
+                        print(f"[migrate] skip reservation_id={t[0]}: bad pickup_slot_code {t[2]!r}")
+                        skipped += 1
+                        continue
+                    starts.append(s[0])
+                    ends.append(e[0])
+                    ok_targets.append(t)
+                targets = ok_targets
+
+            cur.executemany(
+                """
+                UPDATE reservations
+                   SET event_start_at = ?,
+                       event_end_at = ?
+                 WHERE reservation_id = ?
+                   AND event_start_at IS NULL
+                """,
+                [
+                    (
+                        epoch_us_to_datetime(s).isoformat(),
+                        epoch_us_to_datetime(e).isoformat(),
+                        t[0],
+                    )
+                    for t, s, e in zip(targets, starts, ends)
+                ],
+            )
+            updated += len(targets)
+
+        conn.commit()
+        print(f"[migrate] success (updated = {updated}, skipped = {skipped})")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,62 @@
+# scripts/migrations/mig_storage_dedupe_create.py
+#
+# storage_dedupe（画像ストレージの同一内容の索引）を作る。
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from app_v2.db.core import resolve_db_path
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        cur.execute(
+            """
+            CREATE TABLE storage_dedupe (
+                folder TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+
+                url TEXT NOT NULL,
+                public_id TEXT NOT NULL,
+                bytes INTEGER NOT NULL DEFAULT 0,
+
+                created_at TEXT NOT NULL,
+
+                PRIMARY KEY (folder, sha256)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX idx_storage_dedupe_public_id
+                ON storage_dedupe (public_id)
+            """
+        )
+
+        conn.commit()
+        print("[migrate] success")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,76 @@
+# scripts/migrations/mig_table_versions_create.py
+#
+# table_versions（公開 API の ETag 用の変更バージョン）を作り、
+# farms / farm_pickup_slots への INSERT / UPDATE / DELETE で 'farms' の version を
+# +1 するトリガを張る。
+
+import sys
+from pathlib import Path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import sqlite3
+from app_v2.db.core import resolve_db_path
+
+# バージョンを上げる対象（テーブル名, バージョンのキー）
+VERSIONED_TABLES = (
+    ("farms", "farms"),
+    ("farm_pickup_slots", "farms"),
+)
+
+
+def migrate():
+    db_path = resolve_db_path()
+    print(f"[migrate] db = {db_path}")
+
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+
+    try:
+        print("[migrate] begin")
+        cur.execute("PRAGMA foreign_keys = OFF;")
+
+        cur.execute(
+            """
+            CREATE TABLE table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+        for key in sorted({key for _, key in VERSIONED_TABLES}):
+            cur.execute(
+                "INSERT INTO table_versions (table_name, version) VALUES (?, 1)",
+                (key,),
+            )
+
+        for table, key in VERSIONED_TABLES:
+            for op in ("INSERT", "UPDATE", "DELETE"):
+                cur.execute(
+                    f"""
+                    CREATE TRIGGER trg_{table}_version_{op.lower()} AFTER {op} ON {table}
+                    BEGIN
+                        UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                         WHERE table_name = '{key}';
+                    END
+                    """
+                )
+            print(f"[migrate] triggers on {table} -> table_versions.{key}")
+
+        conn.commit()
+        print("[migrate] success")
+
+    except Exception as e:
+        conn.rollback()
+        print("[migrate] failed:", e)
+        raise
+
+    finally:
+        cur.execute("PRAGMA foreign_keys = ON;")
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -29,10 +29,15 @@ CREATE TABLE reservations (
     confirmed_at DATETIME,
     event_start_at DATETIME,
     event_end_at DATETIME,
+    event_id INTEGER,
     FOREIGN KEY (consumer_id) REFERENCES consumers(consumer_id),
-    FOREIGN KEY (farm_id) REFERENCES farms(farm_id)
+    FOREIGN KEY (farm_id) REFERENCES farms(farm_id),
+    FOREIGN KEY (event_id) REFERENCES pickup_events(event_id)
 );
 
+CREATE INDEX idx_reservations_event_id
+    ON reservations (event_id);
+
 -- =========================================================
 -- email_otp_tokens
 -- =========================================================
@@ -74,6 +79,7 @@ CREATE TABLE farms (
     map_url TEXT,
     lat REAL,
     lng REAL,
+    geocode_status TEXT,
 
     price_5kg INTEGER,
     price_10kg INTEGER,
@@ -144,3 +150,127 @@ CREATE TABLE consumers (
     registration_status TEXT,
     email TEXT
 );
+
+-- =========================================================
+-- geocode_cache
+-- =========================================================
+CREATE TABLE geocode_cache (
+    address_key TEXT NOT NULL,
+    region TEXT NOT NULL,
+
+    status TEXT NOT NULL,
+    lat REAL,
+    lng REAL,
+    error_message TEXT,
+
+    expires_at TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+
+    PRIMARY KEY (address_key, region)
+);
+
+CREATE INDEX idx_geocode_cache_expires_at
+    ON geocode_cache (expires_at);
+
+-- =========================================================
+-- storage_dedupe（画像ストレージの同一内容の索引）
+--   同じ folder に同じ内容（SHA-256）を再アップロードしたとき、既存の保存結果を返す
+-- =========================================================
+CREATE TABLE storage_dedupe (
+    folder TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+
+    url TEXT NOT NULL,
+    public_id TEXT NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+
+    created_at TEXT NOT NULL,
+
+    PRIMARY KEY (folder, sha256)
+);
+
+CREATE INDEX idx_storage_dedupe_public_id
+    ON storage_dedupe (public_id);
+
+-- =========================================================
+-- pickup_events（farm × 週ごとの受け渡しイベント）
+-- =========================================================
+CREATE TABLE pickup_events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    farm_id INTEGER NOT NULL,
+    pickup_slot_code TEXT NOT NULL,
+
+    -- reservations.event_start_at / event_end_at と同じ書式（UTC isoformat）
+    event_start_at TEXT NOT NULL,
+    event_end_at TEXT NOT NULL,
+    deadline_at TEXT NOT NULL,
+    display_label TEXT NOT NULL,
+
+    created_at TEXT NOT NULL,
+
+    UNIQUE (farm_id, event_start_at),
+    FOREIGN KEY (farm_id) REFERENCES farms(farm_id)
+);
+
+-- =========================================================
+-- farm_pickup_slots（farm ごとの受け渡しスロット・週に最大 3 つ）
+--   farms.pickup_time は代表スロット（週内で最も早いもの）として残す
+-- =========================================================
+CREATE TABLE farm_pickup_slots (
+    farm_id INTEGER NOT NULL,
+    pickup_slot_code TEXT NOT NULL,
+
+    created_at TEXT NOT NULL,
+
+    PRIMARY KEY (farm_id, pickup_slot_code),
+    FOREIGN KEY (farm_id) REFERENCES farms(farm_id)
+);
+
+-- =========================================================
+-- table_versions（テーブル群の変更バージョン）
+--   公開 API の ETag 用。farms / farm_pickup_slots への書き込みごとに
+--   'farms' の version を +1 する（トリガで維持するので、書き込み側のコードは触らない）
+-- =========================================================
+CREATE TABLE table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO table_versions (table_name, version) VALUES ('farms', 1);
+
+CREATE TRIGGER trg_farms_version_insert AFTER INSERT ON farms
+BEGIN
+    UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+     WHERE table_name = 'farms';
+END;
+
+CREATE TRIGGER trg_farms_version_update AFTER UPDATE ON farms
+BEGIN
+    UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+     WHERE table_name = 'farms';
+END;
+
+CREATE TRIGGER trg_farms_version_delete AFTER DELETE ON farms
+BEGIN
+    UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+     WHERE table_name = 'farms';
+END;
+
+CREATE TRIGGER trg_farm_pickup_slots_version_insert AFTER INSERT ON farm_pickup_slots
+BEGIN
+    UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+     WHERE table_name = 'farms';
+END;
+
+CREATE TRIGGER trg_farm_pickup_slots_version_update AFTER UPDATE ON farm_pickup_slots
+BEGIN
+    UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+     WHERE table_name = 'farms';
+END;
+
+CREATE TRIGGER trg_farm_pickup_slots_version_delete AFTER DELETE ON farm_pickup_slots
+BEGIN
+    UPDATE table_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+     WHERE table_name = 'farms';
+END;
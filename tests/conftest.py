@@ -0,0 +1,67 @@
+# tests/conftest.py
+#
+# テスト共通の fixture
+#
+#   python -m pytest -q
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+SCHEMA_PATH = BASE_DIR / "src" / "schema.sql"
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """
+    src/schema.sql から作った空の DB（DB_PATH をこのファイルに向ける）。
+    """
+    path = tmp_path / "app.db"
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    finally:
+        conn.close()
+    monkeypatch.setenv("DB_PATH", str(path))
+    return path
+
+
+@pytest.fixture(scope="session")
+def seed_1k_db(tmp_path_factory):
+    """
+    scripts/bench/seed_data.py --scale 1k で作った DB（読み取り専用で使う）。
+    """
+    path = tmp_path_factory.mktemp("seed") / "bench_1k.db"
+    subprocess.run(
+        [sys.executable, "scripts/bench/seed_data.py", "--db", str(path), "--scale", "1k"],
+        cwd=BASE_DIR,
+        check=True,
+        capture_output=True,
+    )
+    return path
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """
+    環境変数を差し替えて get_settings() を読み直させる（None は削除）。
+    """
+    from app_v2.config.settings import get_settings
+
+    def _set(**env):
+        for name, value in env.items():
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, value)
+        get_settings.cache_clear()
+
+    get_settings.cache_clear()
+    yield _set
+    get_settings.cache_clear()
@@ -0,0 +1,283 @@
+# tests/test_background_jobs.py
+#
+# プロセス内バックグラウンドジョブ（app_v2.common.background_jobs）と
+# owner 座標の解決ジョブ（app_v2.farmer.services.owner_geocode_job）
+# - 失敗したジョブは max_attempts 回まで再実行し、使い切ったら on_give_up
+# - 一時障害が続けば farm を failed に、住所不明は再実行せずに failed、成功で done
+# - 起動時（lifespan）に pending の farm を拾い直す
+# - 住所がどこにも当たらなくても registration は座標 NULL・pending で保存する
+
+import logging
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app_v2.common import background_jobs
+from app_v2.common.background_jobs import BackgroundJobRunner
+from app_v2.farmer.services import owner_geocode_job
+from app_v2.farmer.services.location_service import GeocodeResult
+
+BACKOFF_SEC = 0.01
+ADDRESS = "徳島県徳島市万代町1-1"
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """
+    get_job_runner() が返すプロセス共有のランナーをテスト用に差し替える（未起動）。
+    """
+    runner = BackgroundJobRunner(name="test-jobs")
+    monkeypatch.setattr(background_jobs, "_runner", runner)
+    yield runner
+    runner.stop()
+
+
+# ============================================================
+# BackgroundJobRunner
+# ============================================================
+
+def test_failing_job_retries_then_gives_up(runner):
+    calls = []
+    given_up = []
+
+    def fail(n):
+        calls.append(n)
+        raise RuntimeError(f"boom {len(calls)}")
+
+    runner.start()
+    runner.submit(
+        "fail",
+        fail,
+        7,
+        max_attempts=3,
+        backoff_base_sec=BACKOFF_SEC,
+        on_give_up=given_up.append,
+    )
+
+    # gave_up は on_give_up の前に数えるので、on_give_up の呼び出しを待つ
+    assert _wait_for(lambda: given_up)
+    assert calls == [7, 7, 7]
+    assert [str(e) for e in given_up] == ["boom 3"]
+    assert runner.stats() == {
+        "submitted": 1,
+        "succeeded": 0,
+        "retried": 2,
+        "gave_up": 1,
+        "pending": 0,
+    }
+
+
+def test_job_succeeds_after_retry(runner):
+    calls = []
+    given_up = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("transient")
+
+    runner.start()
+    runner.submit("flaky", flaky, max_attempts=5, backoff_base_sec=BACKOFF_SEC, on_give_up=given_up.append)
+
+    assert _wait_for(lambda: runner.stats()["succeeded"] == 1)
+    assert len(calls) == 3
+    assert given_up == []
+    assert runner.stats()["retried"] == 2
+
+
+def test_on_give_up_error_does_not_stop_worker(runner):
+    def fail():
+        raise RuntimeError("boom")
+
+    def broken_give_up(_e):
+        raise ValueError("give up failed")
+
+    done = []
+    runner.start()
+    runner.submit("fail", fail, max_attempts=1, on_give_up=broken_give_up)
+    runner.submit("next", done.append, 1, delay_sec=0.05)
+
+    assert _wait_for(lambda: done == [1])
+
+
+def test_stop_discards_pending_jobs(runner):
+    runner.start()
+    runner.submit("later", lambda: None, delay_sec=60)
+    assert runner.pending_count() == 1
+
+    runner.stop()
+
+    assert runner.pending_count() == 0
+
+
+# ============================================================
+# owner 座標の解決ジョブ
+# ============================================================
+
+def _insert_farm(db_path, farm_id: int, *, geocode_status="pending", lat=None, lng=None):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO farms (
+                farm_id, email, registration_status, address, lat, lng, geocode_status
+            ) VALUES (?, ?, 'PROFILE_COMPLETED', ?, ?, ?, ?)
+            """,
+            (farm_id, f"farm{farm_id}@example.com", ADDRESS, lat, lng, geocode_status),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _farm(db_path, farm_id: int):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT lat, lng, geocode_status FROM farms WHERE farm_id = ?",
+            (farm_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def geocoder(monkeypatch):
+    """
+    owner_geocode_job の geocode_address を差し替える。results を順に返し、最後は繰り返す。
+    """
+    calls = []
+    results = []
+
+    def fake(address, region="jp"):
+        calls.append(address)
+        return results[min(len(calls), len(results)) - 1]
+
+    monkeypatch.setattr(owner_geocode_job, "geocode_address", fake)
+    monkeypatch.setattr(owner_geocode_job, "OWNER_GEOCODE_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(owner_geocode_job, "OWNER_GEOCODE_BACKOFF_BASE_SEC", BACKOFF_SEC)
+    return calls, results
+
+
+def _result(status: str, lat=None, lng=None) -> GeocodeResult:
+    return GeocodeResult(ok=status == "OK", lat=lat, lng=lng, status=status)
+
+
+def test_owner_geocode_gives_up_and_marks_failed(db_path, runner, geocoder):
+    calls, results = geocoder
+    results.append(_result("NETWORK_ERROR"))
+    # 郵便番号の代表点が仮置きされている
+    _insert_farm(db_path, 1, lat=34.07, lng=134.55)
+
+    runner.start()
+    owner_geocode_job.enqueue_owner_geocode(1)
+
+    assert _wait_for(lambda: _farm(db_path, 1)[2] != "pending")
+    assert runner.stats()["gave_up"] == 1
+    assert calls == [ADDRESS] * 3
+    # 代表点のまま failed
+    assert _farm(db_path, 1) == (34.07, 134.55, "failed")
+
+
+def test_owner_geocode_resolves_after_transient_error(db_path, runner, geocoder):
+    _, results = geocoder
+    results.extend([_result("OVER_QUERY_LIMIT"), _result("OK", 34.0703, 134.5548)])
+    _insert_farm(db_path, 1)
+
+    runner.start()
+    owner_geocode_job.enqueue_owner_geocode(1)
+
+    assert _wait_for(lambda: runner.stats()["succeeded"] == 1)
+    assert runner.stats()["retried"] == 1
+    assert _farm(db_path, 1) == (34.0703, 134.5548, "done")
+
+
+def test_owner_geocode_zero_results_fails_without_retry(db_path, runner, geocoder):
+    calls, results = geocoder
+    results.append(_result("ZERO_RESULTS"))
+    _insert_farm(db_path, 1)
+
+    runner.start()
+    owner_geocode_job.enqueue_owner_geocode(1)
+
+    assert _wait_for(lambda: runner.stats()["succeeded"] == 1)
+    assert len(calls) == 1
+    assert _farm(db_path, 1) == (None, None, "failed")
+
+
+@pytest.fixture
+def restore_root_logger():
+    # lifespan がログ構成を変えるので元に戻す
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_startup_resumes_pending_farms(db_path, runner, geocoder, restore_root_logger):
+    from app_v2.main import app
+
+    calls, results = geocoder
+    results.append(_result("OK", 34.0703, 134.5548))
+    _insert_farm(db_path, 1)
+    _insert_farm(db_path, 2, geocode_status="done", lat=34.1, lng=134.6)
+    _insert_farm(db_path, 3)
+
+    with TestClient(app):
+        assert _wait_for(lambda: _farm(db_path, 3)[2] == "done")
+        assert _wait_for(lambda: _farm(db_path, 1)[2] == "done")
+
+    assert calls == [ADDRESS, ADDRESS]
+    assert _farm(db_path, 1) == (34.0703, 134.5548, "done")
+    assert _farm(db_path, 2) == (34.1, 134.6, "done")
+
+
+# ============================================================
+# registration
+# ============================================================
+
+def test_registration_saves_null_owner_location_as_pending(db_path, runner, geocoder):
+    from app_v2.farmer.services.registration_service import RegistrationService
+
+    _, results = geocoder
+    results.append(_result("OK", 34.0703, 134.5548))
+    _insert_farm(db_path, 1, geocode_status=None)
+
+    # gazetteer（郵便番号・市町村）にも geocode_cache にも無い住所
+    RegistrationService().complete_registration(
+        session_farm_id=1,
+        owner_last_name="山田",
+        owner_first_name="太郎",
+        owner_last_kana="ヤマダ",
+        owner_first_kana="タロウ",
+        owner_postcode="",
+        owner_pref="架空県",
+        owner_city="架空市",
+        owner_addr_line="1-1",
+        owner_phone="000-0000-0000",
+        pickup_lat=34.07,
+        pickup_lng=134.55,
+        pickup_place_name="倉庫前",
+        pickup_notes=None,
+        pickup_time="SAT_10_11",
+    )
+
+    assert _farm(db_path, 1) == (None, None, "pending")
+    assert runner.pending_count() == 1
+
+    # 投入されたジョブが座標を確定させる
+    runner.start()
+    assert _wait_for(lambda: _farm(db_path, 1)[2] == "done")
+    assert _farm(db_path, 1) == (34.0703, 134.5548, "done")
@@ -0,0 +1,39 @@
+# tests/test_db_datetimes.py
+#
+# SQLite DATETIME 文字列の共通パーサ（app_v2.db.datetimes）
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app_v2.db.datetimes import parse_db_datetime, parse_db_datetime_or_none
+
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2025-01-01 00:00:00", datetime(2025, 1, 1, tzinfo=UTC)),
+        ("2025-01-01T00:00:00", datetime(2025, 1, 1, tzinfo=UTC)),
+        ("2025-01-01 00:00:00.123456", datetime(2025, 1, 1, 0, 0, 0, 123456, tzinfo=UTC)),
+        ("2025-01-01T00:00:00+00:00", datetime(2025, 1, 1, tzinfo=UTC)),
+        ("2025-01-01T09:00:00+09:00", datetime(2025, 1, 1, tzinfo=UTC)),
+        ("2025-01-01T00:00:00Z", datetime(2025, 1, 1, tzinfo=UTC)),
+        # 26 文字でも末尾にゾーンがあるもの（fast path に入れない）
+        ("2025-01-01T00:00:00.12345Z", datetime(2025, 1, 1, 0, 0, 0, 123450, tzinfo=UTC)),
+        ("2025-01-01T09:00:00.1+09:00", datetime(2025, 1, 1, 0, 0, 0, 100000, tzinfo=UTC)),
+        ("2025-01-01T09:00:00.12+09", datetime(2025, 1, 1, 0, 0, 0, 120000, tzinfo=UTC)),
+        ("2025-01-01T00:00:00.1-01", datetime(2025, 1, 1, 1, 0, 0, 100000, tzinfo=UTC)),
+    ],
+)
+def test_parse_db_datetime(text, expected):
+    parsed = parse_db_datetime(text)
+    assert parsed == expected
+    assert parsed.tzinfo is UTC
+    assert parse_db_datetime(text.encode("utf-8")) == expected
+
+
+@pytest.mark.parametrize("value", [None, "", b"", "not a date", "2025-13-01 00:00:00"])
+def test_parse_db_datetime_or_none_rejects(value):
+    assert parse_db_datetime_or_none(value) is None
@@ -0,0 +1,60 @@
+# tests/test_farm_map_index.py
+#
+# 地図モーダルのクラスタ（FarmMapIndex.clusters_in_bounds）
+# - 表示範囲内の農家だけを格子でまとめる（格子が範囲からはみ出しても外の農家は数えない）
+# - クラスタの件数の合計は total_count（count_in_bounds）と一致する
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app_v2.customer_booking.services.farm_map_index import FarmMapIndex
+
+FACE = "https://img.test/face.webp"
+
+
+def test_clusters_exclude_farms_outside_bounds():
+    # zoom 4・64px 格子 = 約 22.5 度四方。同じ格子に入る 3 件のうち 2 件だけが範囲内
+    index = FarmMapIndex(
+        [(1, 34.05, 134.55, FACE), (2, 34.06, 134.56, FACE), (3, 35.5, 134.9, FACE)],
+        cell_px=64,
+    )
+
+    clusters = index.clusters_in_bounds(4, 34.0, 34.1, 134.5, 134.6)
+
+    assert [c.count for c in clusters] == [2]
+    assert clusters[0].max_lat == 34.06
+    assert clusters[0].representative_farm_id in (1, 2)
+    assert index.count_in_bounds(34.0, 34.1, 134.5, 134.6) == 2
+
+
+def test_clusters_are_ordered_top_left_first():
+    index = FarmMapIndex(
+        [(1, 33.0, 135.0, FACE), (2, 34.0, 134.0, FACE), (3, 34.0, 135.0, FACE)],
+        cell_px=64,
+    )
+
+    clusters = index.clusters_in_bounds(10, 32.0, 35.0, 133.0, 136.0)
+
+    assert [c.representative_farm_id for c in clusters] == [2, 3, 1]
+
+
+@pytest.mark.parametrize(
+    "bounds",
+    [
+        {"zoom": 10, "min_lat": 34.0, "max_lat": 34.1, "min_lng": 134.5, "max_lng": 134.6},
+        {"zoom": 9, "min_lat": 33.9, "max_lat": 34.2, "min_lng": 134.3, "max_lng": 134.7},
+        {"zoom": 7, "min_lat": 33.5, "max_lat": 34.3, "min_lng": 133.6, "max_lng": 134.8},
+    ],
+)
+def test_cluster_counts_sum_to_total_count(seed_1k_db, monkeypatch, bounds):
+    monkeypatch.setenv("DB_PATH", str(seed_1k_db))
+    from app_v2.main import app
+
+    body = TestClient(app).get("/api/public/farms/map/clusters", params=bounds).json()
+
+    assert body["mode"] == "clusters"
+    assert body["total_count"] > 0
+    assert sum(c["count"] for c in body["clusters"]) == body["total_count"]
+    for c in body["clusters"]:
+        assert bounds["min_lat"] <= c["min_lat"] <= c["max_lat"] <= bounds["max_lat"]
+        assert bounds["min_lng"] <= c["min_lng"] <= c["max_lng"] <= bounds["max_lng"]
@@ -0,0 +1,152 @@
+# tests/test_farm_ranking_cache.py
+#
+# 公開一覧の距離順キャッシュ（app_v2.customer_booking.services.farm_ranking_cache）
+# - FarmRanking.page は「ユーザー位置からの距離で全件を並べた」結果と一致する
+#   （格子内のランダムな位置・ページの境界・同じ位置の農家）
+# - any_within は全件を調べた結果と一致する
+# - 新しい version を見たら作り直す。格子は max_cells 個まで（LRU）
+
+import random
+
+import pytest
+
+from app_v2.customer_booking.services.farm_ranking_cache import FarmRankingCache
+from app_v2.domain.geo import distance_km, grid_cell, grid_cell_center
+
+PAGE_SIZE = 8
+# 徳島市役所付近
+BASE = (34.0703, 134.5548)
+
+
+def _farms(rng: random.Random, n: int):
+    """
+    (farm_id, lat, lng)。市街地に集まった農家・散らばった農家・同じ位置の農家を混ぜる。
+    """
+    farms = []
+    for farm_id in range(1, n + 1):
+        r = rng.random()
+        if r < 0.5:
+            lat, lng = BASE[0] + rng.gauss(0, 0.05), BASE[1] + rng.gauss(0, 0.05)
+        elif r < 0.9:
+            lat, lng = BASE[0] + rng.uniform(-1.5, 1.5), BASE[1] + rng.uniform(-1.5, 1.5)
+        else:
+            # 既存の農家と同じ位置（同距離は farm_id 順）
+            _, lat, lng = rng.choice(farms) if farms else (0, *BASE)
+        farms.append((farm_id, lat, lng))
+    return farms
+
+
+def _users_in_cell(rng: random.Random, cell_km: float, n: int):
+    """
+    BASE を含む格子の中のランダムな位置（格子の角の近くも含む）。
+    """
+    cell = grid_cell(*BASE, cell_km)
+    center_lat, center_lng = grid_cell_center(cell, cell_km)
+    users = []
+    while len(users) < n:
+        lat = center_lat + rng.uniform(-1, 1) * cell_km / 111.32 / 2
+        lng = center_lng + rng.uniform(-1, 1) * cell_km / 92.0 / 2
+        if grid_cell(lat, lng, cell_km) == cell:
+            users.append((lat, lng))
+    return users
+
+
+def _brute_ranked(farms, lat, lng):
+    return [farm_id for _, farm_id in sorted((distance_km(lat, lng, a, b), farm_id) for farm_id, a, b in farms)]
+
+
+@pytest.mark.parametrize("cell_km", [0.5, 1.0, 5.0])
+@pytest.mark.parametrize("n_farms", [1, 7, 8, 9, 300])
+def test_page_matches_full_sort(cell_km, n_farms):
+    rng = random.Random(n_farms * 1000 + int(cell_km * 10))
+    farms = _farms(rng, n_farms)
+    cache = FarmRankingCache(cell_km=cell_km, max_cells=16)
+
+    for lat, lng in _users_in_cell(rng, cell_km, 20):
+        ranking = cache.get(version=1, lat=lat, lng=lng, load_locations=lambda: farms)
+        expected = _brute_ranked(farms, lat, lng)
+
+        for start in range(0, n_farms + PAGE_SIZE, PAGE_SIZE):
+            assert ranking.page(lat, lng, start, start + PAGE_SIZE) == expected[start : start + PAGE_SIZE]
+        # ページの境界をまたぐ範囲
+        for start, end in [(PAGE_SIZE - 1, PAGE_SIZE + 1), (1, n_farms), (0, n_farms + 1)]:
+            assert ranking.page(lat, lng, start, end) == expected[start:end]
+
+    # すべて同じ格子なので並びは 1 回だけ作る
+    assert cache.stats()["cells"] == 1
+
+
+@pytest.mark.parametrize("radius_km", [0.0, 0.5, 3.0, 100.0])
+def test_any_within_matches_full_scan(radius_km):
+    rng = random.Random(int(radius_km * 10))
+    farms = _farms(rng, 100)
+    cache = FarmRankingCache(cell_km=1.0, max_cells=16)
+
+    # 格子内の位置と、農家から遠い位置
+    for lat, lng in _users_in_cell(rng, 1.0, 20) + [(36.5, 139.0), (26.2, 127.7)]:
+        ranking = cache.get(version=1, lat=lat, lng=lng, load_locations=lambda: farms)
+        expected = any(distance_km(lat, lng, a, b) <= radius_km for _, a, b in farms)
+        assert ranking.any_within(lat, lng, radius_km) is expected
+
+
+# ============================================================
+# version / LRU
+# ============================================================
+
+class _Loader:
+    def __init__(self, farms):
+        self.farms = farms
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.farms
+
+
+def test_new_version_invalidates_rankings():
+    cache = FarmRankingCache(cell_km=1.0, max_cells=16)
+    old = _Loader([(1, 34.07, 134.55), (2, 34.10, 134.60)])
+    new = _Loader([(2, 34.10, 134.60), (3, 34.07, 134.56)])
+
+    first = cache.get(version=1, lat=34.07, lng=134.55, load_locations=old)
+    assert cache.get(version=1, lat=34.07, lng=134.55, load_locations=old) is first
+    assert old.calls == 1
+
+    ranking = cache.get(version=2, lat=34.07, lng=134.55, load_locations=new)
+    assert new.calls == 1
+    assert sorted(ranking.farm_ids) == [2, 3]
+    assert cache.stats() == {"hits": 1, "misses": 2, "cells": 1}
+
+    # 古い version のリクエスト：計算はするが保持しない（新しい並びを上書きしない）
+    stale = cache.get(version=1, lat=34.07, lng=134.55, load_locations=old)
+    assert sorted(stale.farm_ids) == [1, 2]
+    assert cache.get(version=2, lat=34.07, lng=134.55, load_locations=new) is ranking
+
+
+def test_locations_are_shared_between_cells_of_same_version():
+    cache = FarmRankingCache(cell_km=1.0, max_cells=16)
+    loader = _Loader([(1, 34.07, 134.55), (2, 34.10, 134.60)])
+
+    cache.get(version=1, lat=34.07, lng=134.55, load_locations=loader)
+    cache.get(version=1, lat=34.30, lng=134.90, load_locations=loader)
+
+    assert loader.calls == 1
+    assert cache.stats()["cells"] == 2
+
+
+def test_least_recently_used_cell_is_evicted():
+    cache = FarmRankingCache(cell_km=1.0, max_cells=2)
+    loader = _Loader([(1, 34.07, 134.55), (2, 34.10, 134.60)])
+    a, b, c = (34.07, 134.55), (34.20, 134.70), (34.40, 134.90)
+    assert len({grid_cell(*p, 1.0) for p in (a, b, c)}) == 3
+
+    ranking_a = cache.get(version=1, lat=a[0], lng=a[1], load_locations=loader)
+    cache.get(version=1, lat=b[0], lng=b[1], load_locations=loader)
+    # a を使ってから c を入れる → b が追い出される
+    assert cache.get(version=1, lat=a[0], lng=a[1], load_locations=loader) is ranking_a
+    cache.get(version=1, lat=c[0], lng=c[1], load_locations=loader)
+
+    assert cache.stats() == {"hits": 1, "misses": 3, "cells": 2}
+    assert cache.get(version=1, lat=a[0], lng=a[1], load_locations=loader) is ranking_a
+    cache.get(version=1, lat=b[0], lng=b[1], load_locations=loader)
+    assert cache.stats()["misses"] == 4
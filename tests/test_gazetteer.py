@@ -0,0 +1,112 @@
+# tests/test_gazetteer.py
+#
+# オフライン gazetteer（app_v2.farmer.services.gazetteer / location_service.lookup_gazetteer）
+# - gazetteer.bin は tokushima_gazetteer.csv と一致する（郡を省いた別名も引ける）
+# - 優先順：郵便番号 7 桁 → 市町村 → 郵便番号上 3 桁
+# - 市町村名だけの住所は geocode_address(_async) が通信もキャッシュも使わずに返す
+
+import asyncio
+
+import pytest
+
+from app_v2.farmer.services import location_service
+from app_v2.farmer.services.gazetteer import (
+    DEFAULT_GAZETTEER_CSV,
+    get_gazetteer,
+    read_gazetteer_csv,
+)
+from app_v2.farmer.services.location_service import (
+    PRECISION_ADDRESS,
+    PRECISION_MUNICIPALITY,
+    PRECISION_POSTCODE_AREA,
+    geocode_address,
+    geocode_address_async,
+    get_geocode_cache_stats,
+    lookup_gazetteer,
+)
+
+TOKUSHIMA_CITY = (34.0703, 134.5548)
+
+
+def test_binary_matches_csv():
+    gazetteer = get_gazetteer()
+    assert gazetteer is not None
+
+    entries = read_gazetteer_csv(DEFAULT_GAZETTEER_CSV)
+    for kind, name, lat, lng in entries:
+        # float32 で保存しているので 1e-5 度（~1m）まで
+        assert gazetteer.lookup(kind, name) == pytest.approx((lat, lng), abs=1e-5), name
+    assert gazetteer.lookup("C", "架空県架空市") is None
+
+
+@pytest.mark.parametrize(
+    "kwargs, precision",
+    [
+        ({"city": "徳島県徳島市"}, PRECISION_MUNICIPALITY),
+        ({"city": "徳島県 徳島市"}, PRECISION_MUNICIPALITY),
+        # 郵便番号 7 桁が無ければ市町村、それも無ければ上 3 桁
+        ({"postcode": "770-9999", "city": "徳島県徳島市"}, PRECISION_MUNICIPALITY),
+        ({"postcode": "〒７７０－９９９９"}, PRECISION_POSTCODE_AREA),
+        ({"postcode": "770", "city": "架空県架空市"}, PRECISION_POSTCODE_AREA),
+    ],
+)
+def test_lookup_gazetteer(kwargs, precision):
+    result = lookup_gazetteer(**kwargs)
+
+    assert result is not None and result.ok
+    assert (result.lat, result.lng) == pytest.approx(TOKUSHIMA_CITY, abs=1e-5)
+    assert result.precision == precision
+
+
+def test_lookup_gazetteer_alias_without_gun():
+    full = lookup_gazetteer(city="徳島県板野郡上板町")
+    alias = lookup_gazetteer(city="徳島県上板町")
+
+    assert full is not None and alias == full
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"city": "架空県架空市"}, {"postcode": "100-0001"}, {"postcode": "77"}])
+def test_lookup_gazetteer_miss(kwargs):
+    assert lookup_gazetteer(**kwargs) is None
+
+
+# ============================================================
+# geocode_address は市町村名だけなら通信しない
+# ============================================================
+
+@pytest.fixture
+def no_network(db_path, settings_env, monkeypatch):
+    settings_env(GEOCODER_BACKEND="google", GOOGLE_GEOCODING_API_KEY="test-key")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("geocoder backend must not be called")
+
+    async def fail_async(*args, **kwargs):
+        fail()
+
+    monkeypatch.setattr(location_service, "_geocode_google", fail)
+    monkeypatch.setattr(location_service, "_geocode_google_async", fail_async)
+    monkeypatch.setattr(location_service, "_geocode_stub", fail)
+
+
+@pytest.mark.parametrize("address", ["徳島県徳島市", " 徳島県 徳島市 ", "日本〒770-0000徳島県徳島市"])
+def test_municipality_address_skips_network_and_cache(no_network, address):
+    before = get_geocode_cache_stats()
+
+    result = geocode_address(address)
+    result_async = asyncio.run(geocode_address_async(address))
+
+    assert result == result_async
+    assert (result.lat, result.lng) == pytest.approx(TOKUSHIMA_CITY, abs=1e-5)
+    assert result.precision == PRECISION_MUNICIPALITY
+    # geocode_cache も引かない・書かない
+    assert get_geocode_cache_stats() == before
+
+
+def test_street_address_goes_to_backend(db_path, settings_env):
+    settings_env(GEOCODER_BACKEND="stub")
+
+    result = geocode_address("徳島県徳島市万代町1-1")
+
+    assert result.ok
+    assert result.precision == PRECISION_ADDRESS
@@ -0,0 +1,137 @@
+# tests/test_geocode_cache.py
+#
+# geocode キャッシュ（location_service + geocode_cache テーブル）
+# GEOCODER_BACKEND=stub で通信せずに確かめる
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app_v2.farmer.services import location_service
+from app_v2.farmer.services.location_service import (
+    GEOCODE_CACHE_TTL,
+    GEOCODE_NEGATIVE_CACHE_TTL,
+    geocode_address,
+    get_geocode_cache_stats,
+    normalize_address_key,
+)
+
+ADDRESS = "徳島県徳島市万代町1-1"
+
+
+class _Clock(datetime):
+    """
+    location_service.datetime の差し替え（now() だけ offset 分進める）。
+    """
+
+    offset = timedelta(0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) + cls.offset
+
+
+@pytest.fixture
+def stub_geocoder(db_path, settings_env, monkeypatch):
+    settings_env(GEOCODER_BACKEND="stub")
+
+    calls = []
+    real_stub = location_service._geocode_stub
+
+    def counting_stub(address_key):
+        calls.append(address_key)
+        return real_stub(address_key)
+
+    monkeypatch.setattr(location_service, "_geocode_stub", counting_stub)
+    # 市町村名の gazetteer には当てない（キャッシュの経路だけを見る）
+    monkeypatch.setattr(location_service, "lookup_gazetteer", lambda **_: None)
+    return calls
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(_Clock, "offset", timedelta(0))
+    monkeypatch.setattr(location_service, "datetime", _Clock)
+    return _Clock
+
+
+def _delta(before, name):
+    return get_geocode_cache_stats()[name] - before[name]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "徳島県徳島市万代町1-1",
+        "徳島県 徳島市 万代町１－１",
+        "徳島県徳島市万代町１−１",
+        "日本〒770-0941徳島県徳島市万代町1‐1",
+        "  徳島県徳島市万代町1-1  ",
+    ],
+)
+def test_normalize_address_key(raw):
+    assert normalize_address_key(raw) == ADDRESS
+
+
+def test_normalize_address_key_keeps_latin_word_spaces():
+    assert normalize_address_key("  1-1 Bandai  Cho ") == "1-1 bandai cho"
+
+
+def test_spelling_variants_share_one_cache_entry(stub_geocoder):
+    before = get_geocode_cache_stats()
+
+    first = geocode_address(ADDRESS)
+    again = geocode_address("日本〒770-0941徳島県 徳島市 万代町１－１")
+
+    assert first.ok and again == first
+    assert stub_geocoder == [ADDRESS]
+    assert _delta(before, "misses") == 1
+    assert _delta(before, "hits") == 1
+    assert _delta(before, "stores") == 1
+
+
+def test_success_expires_after_ttl(stub_geocoder, clock):
+    geocode_address(ADDRESS)
+
+    clock.offset = GEOCODE_CACHE_TTL - timedelta(minutes=1)
+    geocode_address(ADDRESS)
+    assert len(stub_geocoder) == 1
+
+    clock.offset = GEOCODE_CACHE_TTL + timedelta(minutes=1)
+    geocode_address(ADDRESS)
+    assert len(stub_geocoder) == 2
+
+
+def test_zero_results_is_cached_with_short_ttl(stub_geocoder, clock):
+    address = "徳島県どこか zero_results"
+    before = get_geocode_cache_stats()
+
+    first = geocode_address(address)
+    again = geocode_address(address)
+
+    assert first.status == again.status == "ZERO_RESULTS"
+    assert not again.ok
+    assert len(stub_geocoder) == 1
+    assert _delta(before, "negative_hits") == 1
+
+    # 成功より短い TTL で期限切れ → 問い合わせ直す
+    assert GEOCODE_NEGATIVE_CACHE_TTL < GEOCODE_CACHE_TTL
+    clock.offset = GEOCODE_NEGATIVE_CACHE_TTL + timedelta(minutes=1)
+    geocode_address(address)
+    assert len(stub_geocoder) == 2
+
+
+def test_transient_failure_is_not_cached(db_path, settings_env, monkeypatch):
+    settings_env(
+        GEOCODER_BACKEND="google",
+        GOOGLE_GEOCODING_API_KEY=None,
+        GOOGLE_MAPS_API_KEY=None,
+    )
+    monkeypatch.setattr(location_service, "lookup_gazetteer", lambda **_: None)
+    before = get_geocode_cache_stats()
+
+    assert geocode_address(ADDRESS).status == "NO_API_KEY"
+    assert geocode_address(ADDRESS).status == "NO_API_KEY"
+
+    assert _delta(before, "stores") == 0
+    assert _delta(before, "misses") == 2
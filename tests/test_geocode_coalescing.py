@@ -0,0 +1,123 @@
+# tests/test_geocode_coalescing.py
+#
+# geocode_address_async の同時呼び出しのまとめ（app_v2.farmer.services.location_service）
+# - 同じ住所（表記ゆれ含む）の同時呼び出しは外部呼び出し 1 回を共有する
+# - 住所・region が違えばまとめない。終わったら _inflight から外す
+# - 待っている側がキャンセルされても共有の呼び出しは止めない
+
+import asyncio
+
+import pytest
+
+from app_v2.farmer.services import location_service
+from app_v2.farmer.services.location_service import (
+    GeocodeResult,
+    geocode_address_async,
+    get_geocode_cache_stats,
+)
+
+N_CALLERS = 10
+ADDRESS = "徳島県徳島市万代町1-1"
+
+
+@pytest.fixture
+def backend(db_path, settings_env, monkeypatch):
+    """
+    外部呼び出し（_geocode_google_async）を数える。release を set するまで返さない。
+    """
+    settings_env(GEOCODER_BACKEND="google", GOOGLE_GEOCODING_API_KEY="test-key")
+    state = {"calls": [], "release": None}
+
+    async def fake_google(address, region, timeout_sec):
+        state["calls"].append((address, region))
+        await state["release"].wait()
+        return GeocodeResult(ok=True, lat=34.07, lng=134.55, status="OK", precision="address")
+
+    monkeypatch.setattr(location_service, "_geocode_google_async", fake_google)
+    return state
+
+
+def _coalesced() -> int:
+    return get_geocode_cache_stats()["coalesced"]
+
+
+async def _gather_after(state, coros, ready):
+    """
+    coros を同時に走らせ、ready() になってから外部呼び出しを返させる。
+    """
+    state["release"] = asyncio.Event()
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + 5
+    while not ready() and loop.time() < deadline:
+        await asyncio.sleep(0.001)
+    state["release"].set()
+    return await asyncio.gather(*tasks)
+
+
+def test_concurrent_calls_share_one_backend_call(backend):
+    before = _coalesced()
+    variants = [ADDRESS, "徳島県 徳島市 万代町１－１", "日本〒770-0941徳島県徳島市万代町1‐1"]
+
+    async def main():
+        # 残り全員が相乗りするまで外部呼び出しを終えない
+        return await _gather_after(
+            backend,
+            [geocode_address_async(variants[i % len(variants)]) for i in range(N_CALLERS)],
+            lambda: _coalesced() - before >= N_CALLERS - 1,
+        )
+
+    results = asyncio.run(main())
+
+    assert len(backend["calls"]) == 1
+    assert all(r == results[0] and r.ok for r in results)
+    assert _coalesced() - before == N_CALLERS - 1
+    assert location_service._inflight == {}
+
+    # 結果はキャッシュされ、次は外部に行かない
+    assert asyncio.run(geocode_address_async(ADDRESS)) == results[0]
+    assert len(backend["calls"]) == 1
+
+
+def test_different_address_or_region_is_not_shared(backend):
+    async def main():
+        return await _gather_after(
+            backend,
+            [
+                geocode_address_async(ADDRESS),
+                geocode_address_async(ADDRESS, region="us"),
+                geocode_address_async("徳島県徳島市万代町2-2"),
+            ],
+            lambda: len(backend["calls"]) == 3,
+        )
+
+    asyncio.run(main())
+
+    assert sorted(backend["calls"]) == sorted(
+        [(ADDRESS, "jp"), (ADDRESS, "us"), ("徳島県徳島市万代町2-2", "jp")]
+    )
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call(backend):
+    before = _coalesced()
+
+    async def main():
+        backend["release"] = asyncio.Event()
+        first = asyncio.ensure_future(geocode_address_async(ADDRESS))
+        second = asyncio.ensure_future(geocode_address_async(ADDRESS))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 5
+        while _coalesced() == before and loop.time() < deadline:
+            await asyncio.sleep(0.001)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        backend["release"].set()
+        return first, await second
+
+    first, result = asyncio.run(main())
+
+    assert first.cancelled()
+    assert result.ok
+    assert len(backend["calls"]) == 1
+    assert location_service._inflight == {}
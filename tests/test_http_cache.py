@@ -0,0 +1,188 @@
+# tests/test_http_cache.py
+#
+# 公開 API の条件付きリクエスト（app_v2.common.http_cache）
+# - If-None-Match が一致すれば 304（W/ 付き・"*" も一致）。304 にも ETag / Cache-Control
+# - If-None-Match があるときは If-Modified-Since を見ない
+# - max-age は次の JST の正時を越えない。ETag は時間帯で変わる
+# - farms / farm_pickup_slots への書き込み（トリガで version が上がる）で ETag が変わる
+
+import sqlite3
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app_v2.common import http_cache
+from app_v2.domain.pickup_slot import JST
+
+PATH = "/api/public/farms/map"
+BOUNDS = {"min_lat": 33.5, "max_lat": 34.3, "min_lng": 133.6, "max_lng": 134.8}
+FUTURE = "Fri, 01 Jan 2100 00:00:00 GMT"
+PAST = "Mon, 01 Jan 2001 00:00:00 GMT"
+
+
+@pytest.fixture
+def client(db_path):
+    from app_v2.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    http_cache が見る現在時刻を固定する（JST の datetime を渡す）。
+    """
+
+    def _set(dt: datetime) -> None:
+        monkeypatch.setattr(http_cache, "time", SimpleNamespace(time=dt.timestamp))
+
+    return _set
+
+
+def _get(client, **headers):
+    return client.get(PATH, params=BOUNDS, headers=headers)
+
+
+def _execute(db_path, sql: str) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# ============================================================
+# If-None-Match
+# ============================================================
+
+def test_if_none_match_returns_304(client):
+    first = _get(client)
+    etag = first.headers["ETag"]
+
+    resp = _get(client, **{"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+    assert resp.headers["Cache-Control"] == first.headers["Cache-Control"]
+    assert resp.headers["Last-Modified"] == first.headers["Last-Modified"]
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ("{etag}", 304),
+        ("W/{etag}", 304),
+        ('"other", W/{etag}', 304),
+        ("*", 304),
+        ('"other"', 200),
+        ('W/"other"', 200),
+    ],
+)
+def test_if_none_match_weak_comparison(client, if_none_match, expected):
+    etag = _get(client).headers["ETag"]
+
+    resp = _get(client, **{"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert resp.status_code == expected
+
+
+def test_etag_differs_per_request_target(client):
+    a = _get(client).headers["ETag"]
+    b = client.get(PATH, params={**BOUNDS, "limit": 10}).headers["ETag"]
+
+    assert a != b
+
+
+# ============================================================
+# If-Modified-Since
+# ============================================================
+
+def test_if_modified_since_without_if_none_match(client):
+    assert _get(client, **{"If-Modified-Since": FUTURE}).status_code == 304
+    assert _get(client, **{"If-Modified-Since": PAST}).status_code == 200
+    assert _get(client, **{"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_modified_since_is_ignored_with_if_none_match(client):
+    resp = _get(client, **{"If-None-Match": '"other"', "If-Modified-Since": FUTURE})
+
+    assert resp.status_code == 200
+
+
+# ============================================================
+# max-age / 時間帯
+# ============================================================
+
+@pytest.mark.parametrize(
+    "now, max_age_env, expected",
+    [
+        # 既定 60 秒。正時まで 30 秒なら 30
+        (datetime(2026, 6, 6, 10, 0, 0, tzinfo=JST), None, 60),
+        (datetime(2026, 6, 6, 10, 59, 30, tzinfo=JST), None, 30),
+        (datetime(2026, 6, 6, 10, 59, 59, 500000, tzinfo=JST), None, 1),
+        (datetime(2026, 6, 6, 10, 55, 0, tzinfo=JST), "600", 300),
+        (datetime(2026, 6, 6, 10, 0, 0, tzinfo=JST), "86400", 3600),
+    ],
+)
+def test_max_age_is_capped_at_next_jst_hour(client, clock, settings_env, now, max_age_env, expected):
+    settings_env(PUBLIC_CACHE_MAX_AGE_SEC=max_age_env)
+    clock(now)
+
+    resp = _get(client)
+
+    assert resp.headers["Cache-Control"] == f"public, max-age={expected}"
+
+
+def test_etag_changes_at_jst_hour(client, clock):
+    clock(datetime(2026, 6, 6, 10, 0, 0, tzinfo=JST))
+    start = _get(client).headers["ETag"]
+    clock(datetime(2026, 6, 6, 10, 59, 59, tzinfo=JST))
+    end = _get(client)
+    clock(datetime(2026, 6, 6, 11, 0, 0, tzinfo=JST))
+    next_hour = _get(client, **{"If-None-Match": start})
+
+    assert end.headers["ETag"] == start
+    assert next_hour.status_code == 200
+    assert next_hour.headers["ETag"] != start
+
+
+# ============================================================
+# version（トリガ）
+# ============================================================
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        """
+        INSERT INTO farms (farm_id, email, registration_status, pickup_time)
+        VALUES (1, 'farmer@example.com', 'PROFILE_COMPLETED', 'SAT_10_11')
+        """,
+        """
+        INSERT INTO farm_pickup_slots (farm_id, pickup_slot_code, created_at)
+        VALUES (1, 'SAT_10_11', '2026-06-01T00:00:00+00:00')
+        """,
+    ],
+    ids=["farms", "farm_pickup_slots"],
+)
+def test_write_changes_etag(client, db_path, sql):
+    before = _get(client).headers["ETag"]
+
+    _execute(db_path, sql)
+    resp = _get(client, **{"If-None-Match": before})
+
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != before
+
+
+def test_no_cache_headers_without_table_versions(client, db_path):
+    _execute(db_path, "DROP TABLE table_versions")
+
+    resp = _get(client, **{"If-None-Match": "*"})
+
+    assert resp.status_code == 200
+    assert "ETag" not in resp.headers
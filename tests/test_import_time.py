@@ -0,0 +1,60 @@
+# tests/test_import_time.py
+#
+# app_v2.main の import 時間（scripts/bench/check_import_time.py と同じ判定）
+# - 最小値が DEFAULT_BUDGET_MS 以内
+# - stripe / cloudinary は起動時に読まない
+# - 設定（環境変数）は import 時に読まない（get_settings は entrypoint から呼ぶ）
+
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import app_v2
+from scripts.bench.check_import_time import (
+    BASE_DIR,
+    DEFAULT_BUDGET_MS,
+    eager_lazy_packages,
+    measure_import_time,
+)
+
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def measured():
+    return measure_import_time(RUNS)
+
+
+def test_main_import_is_within_budget(measured):
+    runs, _ = measured
+    assert min(runs) <= DEFAULT_BUDGET_MS
+
+
+def test_lazy_packages_are_not_imported_at_startup(measured):
+    _, cumulative = measured
+    assert eager_lazy_packages(cumulative) == []
+
+
+def test_modules_do_not_read_settings_at_import():
+    modules = sorted(
+        m.name
+        for m in pkgutil.walk_packages(app_v2.__path__, prefix="app_v2.")
+        if m.name != "app_v2.main"
+    )
+    code = (
+        "import importlib, sys\n"
+        "from app_v2.config.settings import get_settings\n"
+        "for name in sys.argv[1:]:\n"
+        "    importlib.import_module(name)\n"
+        "print(get_settings.cache_info().currsize)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code, *modules],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines()[-1] == "0"
@@ -0,0 +1,51 @@
+# tests/test_logging_setup.py
+#
+# ログ構成（app_v2.observability.logging_setup）
+# - app_v2.main の import だけでは logging を変えない（lifespan で設定・終了時に止める）
+
+import logging
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app_v2.observability import logging_setup
+from app_v2.observability.logging_setup import NonBlockingQueueHandler
+from scripts.bench.check_import_time import BASE_DIR
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    logging_setup.shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_import_does_not_configure_logging():
+    code = (
+        "import logging\n"
+        "import app_v2.main\n"
+        "print(len(logging.getLogger().handlers), logging.getLogger().level)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.split() == ["0", str(logging.WARNING)]
+
+
+def test_lifespan_configures_and_stops_logging(db_path, restore_root_logger):
+    from app_v2.main import app
+
+    with TestClient(app):
+        assert any(isinstance(h, NonBlockingQueueHandler) for h in restore_root_logger.handlers)
+        assert logging_setup._listener is not None
+
+    assert logging_setup._listener is None
@@ -0,0 +1,50 @@
+# tests/test_metrics_api.py
+#
+# /metrics（Prometheus テキスト形式）
+
+import pytest
+from fastapi.testclient import TestClient
+
+TOKEN = "test-metrics-token"
+
+
+@pytest.fixture
+def client(db_path, settings_env):
+    settings_env(METRICS_TOKEN=TOKEN)
+    from app_v2.main import app
+
+    return TestClient(app)
+
+
+def _metrics(client):
+    return client.get("/metrics", headers={"Authorization": f"Bearer {TOKEN}"})
+
+
+def test_geocode_cache_counters_are_exported(client):
+    resp = _metrics(client)
+
+    assert resp.status_code == 200
+    for line in (
+        'app_geocode_cache_lookups_total{result="hit"} ',
+        'app_geocode_cache_lookups_total{result="negative_hit"} ',
+        'app_geocode_cache_lookups_total{result="miss"} ',
+        "app_geocode_cache_stores_total ",
+        "app_geocode_coalesced_total ",
+    ):
+        assert line in resp.text
+
+
+def test_geocode_cache_stats_endpoint_is_removed(client):
+    # 統計は認証付きの /metrics だけで見せる
+    assert client.get("/api/geocode/cache-stats").status_code in (404, 405)
+
+
+def test_metrics_requires_token(client):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_metrics_is_hidden_without_configured_token(client, settings_env):
+    settings_env(METRICS_TOKEN=None)
+    assert client.get("/metrics").status_code == 404
+    assert _metrics(client).status_code == 404
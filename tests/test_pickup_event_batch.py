@@ -0,0 +1,132 @@
+# tests/test_pickup_event_batch.py
+#
+# 受け渡しイベントの一括計算（app_v2.domain.pickup_event_batch）
+# - epoch マイクロ秒での一括計算が PickupSlot.event_for_booking と一致する
+#   （締切・開始・終了の前後と週の端、UTC / JST、numpy あり / なし）
+# - DB の created_at 列（TEXT）からの計算。解釈できない行は None
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app_v2.domain import pickup_event_batch
+from app_v2.domain.pickup_event_batch import (
+    booking_event_starts_us,
+    datetime_to_epoch_us,
+    epoch_us_to_datetime,
+    event_windows_for_booking,
+)
+from app_v2.domain.pickup_slot import BOOKING_DEADLINE, JST, UTC, PickupSlot
+
+CODES = ["MON_0_1", "WED_19_20", "SAT_10_11", "SAT_14_15", "SUN_23_24"]
+
+# 2026-06-01 は月曜
+WEEK_START = datetime(2026, 6, 1, tzinfo=UTC)
+
+TZ_CASES = [(UTC, 0), (JST, 9 * 3600)]
+
+
+def _booking_times(rng: random.Random, n: int):
+    """
+    (created_at, slot_code) の列。半分は締切・開始・終了・週の頭の ±1 秒以内。
+    """
+    out = []
+    for _ in range(n):
+        code = rng.choice(CODES)
+        slot = PickupSlot.from_code(code)
+        week = WEEK_START + timedelta(weeks=rng.randrange(-2, 3))
+        if rng.random() < 0.5:
+            edge = rng.choice(
+                [
+                    week + slot.start_offset - BOOKING_DEADLINE,
+                    week + slot.start_offset,
+                    week + slot.end_offset,
+                    week,
+                ]
+            )
+            # 9 時間ずれた JST の境界も同じ列で当たるように
+            edge -= timedelta(hours=rng.choice([0, 9]))
+            created_at = edge + timedelta(microseconds=rng.randint(-1_000_000, 1_000_000))
+        else:
+            created_at = week + timedelta(microseconds=rng.randrange(7 * 86400 * 1_000_000))
+        out.append((created_at, code))
+    return out
+
+
+def _expected(bookings, tz):
+    starts, ends = [], []
+    for created_at, code in bookings:
+        start, end = PickupSlot.from_code(code).event_for_booking(created_at, tz)
+        starts.append(datetime_to_epoch_us(start))
+        ends.append(datetime_to_epoch_us(end))
+    return starts, ends
+
+
+@pytest.fixture
+def bookings():
+    return _booking_times(random.Random(20260601), 2000)
+
+
+@pytest.mark.parametrize("tz, tz_offset_sec", TZ_CASES, ids=["UTC", "JST"])
+def test_matches_event_for_booking_without_numpy(bookings, tz, tz_offset_sec, monkeypatch):
+    monkeypatch.setattr(pickup_event_batch, "np", None)
+    created_us = [datetime_to_epoch_us(c) for c, _ in bookings]
+    codes = [code for _, code in bookings]
+
+    starts, ends = event_windows_for_booking(created_us, codes, tz_offset_sec=tz_offset_sec)
+
+    assert (list(starts), list(ends)) == _expected(bookings, tz)
+
+
+@pytest.mark.parametrize("tz, tz_offset_sec", TZ_CASES, ids=["UTC", "JST"])
+def test_matches_event_for_booking_with_numpy(bookings, tz, tz_offset_sec):
+    np = pytest.importorskip("numpy")
+    created_us = np.array([datetime_to_epoch_us(c) for c, _ in bookings], dtype=np.int64)
+    codes = [code for _, code in bookings]
+
+    starts, ends = event_windows_for_booking(created_us, codes, tz_offset_sec=tz_offset_sec)
+
+    assert (starts.tolist(), ends.tolist()) == _expected(bookings, tz)
+
+    # datetime64 / 全行共通のコードでも同じ
+    same_code = [(c, "SAT_10_11") for c, _ in bookings]
+    starts, _ = event_windows_for_booking(
+        created_us.astype("datetime64[us]"), "SAT_10_11", tz_offset_sec=tz_offset_sec
+    )
+    assert starts.tolist() == _expected(same_code, tz)[0]
+
+
+def test_single_code_and_length_mismatch(bookings, monkeypatch):
+    monkeypatch.setattr(pickup_event_batch, "np", None)
+    created_us = [datetime_to_epoch_us(c) for c, _ in bookings]
+
+    starts, _ = event_windows_for_booking(created_us, "SAT_10_11")
+
+    assert starts == _expected([(c, "SAT_10_11") for c, _ in bookings], UTC)[0]
+    with pytest.raises(ValueError):
+        event_windows_for_booking(created_us, ["SAT_10_11"])
+    with pytest.raises(ValueError):
+        event_windows_for_booking(created_us[:1], ["XYZ_10_11"])
+
+
+def test_booking_event_starts_from_db_text():
+    # 締切ちょうど（土曜 7:00 UTC）は今週、1 秒後は次週
+    values = [
+        "2026-06-06 07:00:00",
+        "2026-06-06T07:00:01+00:00",
+        "2026-06-06 16:00:01+09:00",
+        "not a date",
+        None,
+    ]
+
+    starts = booking_event_starts_us(values, "SAT_10_11")
+
+    this_week = datetime(2026, 6, 6, 10, tzinfo=UTC)
+    assert [None if s is None else epoch_us_to_datetime(s) for s in starts] == [
+        this_week,
+        this_week + timedelta(weeks=1),
+        this_week + timedelta(weeks=1),
+        None,
+        None,
+    ]
@@ -0,0 +1,173 @@
+# tests/test_pickup_events.py
+#
+# 受け渡しイベント（pickup_events）と予約の突き合わせ
+# - event_id で紐づいた予約 / event_id 導入前の予約（event_start_at で突き合わせ）を数える
+#   旧データの event_start_at は "YYYY-MM-DD HH:MM:SS" / 別のオフセット表記でも同じ時刻なら一致
+# - スロット変更時（PickupSettingsService.update_settings）にイベントを作り直す
+#   予約の付いた週は残す
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app_v2.customer_booking.repository.pickup_events_repo import PickupEventsRepository
+from app_v2.customer_booking.repository.reservation_expanded_repo import (
+    ReservationExpandedRepository,
+)
+from app_v2.customer_booking.services.pickup_event_calendar_service import (
+    PICKUP_EVENT_WEEKS_AHEAD,
+    PickupEventCalendarService,
+)
+from app_v2.domain.pickup_slot import UTC, PickupSlot
+
+FARM_ID = 1
+OTHER_FARM_ID = 2
+# 2026-06-01（月）。SAT_10_11 の今週のイベントは 2026-06-06 10:00 UTC
+NOW = datetime(2026, 6, 1, tzinfo=UTC)
+SAT_START = datetime(2026, 6, 6, 10, tzinfo=UTC)
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        """
+        INSERT INTO farms (farm_id, email, registration_status, pickup_time)
+        VALUES (?, ?, 'PROFILE_COMPLETED', 'SAT_10_11')
+        """,
+        [(FARM_ID, "farmer@example.com"), (OTHER_FARM_ID, "other@example.com")],
+    )
+    conn.executemany(
+        """
+        INSERT INTO farm_pickup_slots (farm_id, pickup_slot_code, created_at)
+        VALUES (?, 'SAT_10_11', '2026-05-01T00:00:00+00:00')
+        """,
+        [(FARM_ID,), (OTHER_FARM_ID,)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _calendar(db_path) -> PickupEventCalendarService:
+    return PickupEventCalendarService(PickupEventsRepository(str(db_path)))
+
+
+def _add_reservation(conn, *, farm_id=FARM_ID, event_id=None, event_start_at=None, status="confirmed"):
+    cur = conn.execute(
+        """
+        INSERT INTO reservations (
+            consumer_id, farm_id, status, pickup_slot_code,
+            created_at, items_json, rice_subtotal, event_start_at, event_id
+        ) VALUES (1, ?, ?, 'SAT_10_11', '2026-06-01 00:00:00', '[]', 0, ?, ?)
+        """,
+        (farm_id, status, event_start_at, event_id),
+    )
+    conn.commit()
+    return cur.lastrowid
+
+
+def _event_starts(conn, farm_id=FARM_ID, code=None):
+    sql = "SELECT event_start_at FROM pickup_events WHERE farm_id = ?"
+    params = [farm_id]
+    if code is not None:
+        sql += " AND pickup_slot_code = ?"
+        params.append(code)
+    return sorted(datetime.fromisoformat(r[0]) for r in conn.execute(sql, params))
+
+
+# ============================================================
+# 予約との突き合わせ
+# ============================================================
+
+def test_event_join_counts_linked_and_legacy_rows(db_path, conn):
+    calendar = _calendar(db_path)
+    calendar.ensure_upcoming(farm_id=FARM_ID, pickup_slot_code="SAT_10_11", now=NOW)
+    calendar.ensure_upcoming(farm_id=OTHER_FARM_ID, pickup_slot_code="SAT_10_11", now=NOW)
+    event_id = calendar.find_event_id(farm_id=FARM_ID, event_start=SAT_START)
+    next_event_id = calendar.find_event_id(farm_id=FARM_ID, event_start=SAT_START + timedelta(weeks=1))
+    assert event_id is not None and next_event_id is not None
+
+    expected = [
+        # event_id で紐づいた行（event_start_at は見ない）
+        _add_reservation(conn, event_id=event_id),
+        # event_id 導入前の行：isoformat / DATETIME 文字列 / JST 表記
+        _add_reservation(conn, event_start_at=SAT_START.isoformat()),
+        _add_reservation(conn, event_start_at="2026-06-06 10:00:00"),
+        _add_reservation(conn, event_start_at="2026-06-06T19:00:00+09:00"),
+    ]
+    # 数えないもの
+    _add_reservation(conn, event_id=next_event_id, event_start_at=SAT_START.isoformat())
+    _add_reservation(conn, event_start_at="2026-06-13 10:00:00")
+    _add_reservation(conn, event_start_at=None)
+    _add_reservation(conn, event_id=event_id, status="pending")
+    _add_reservation(conn, farm_id=OTHER_FARM_ID, event_start_at=SAT_START.isoformat())
+
+    repo = ReservationExpandedRepository(str(db_path))
+
+    assert [r.id for r in repo.get_confirmed_reservations_for_event(event_id)] == expected
+    assert repo.count_confirmed_reservations_for_event(event_id) == len(expected)
+    # 翌週：event_id で紐づいた行と、翌週の event_start_at を持つ旧データ
+    assert repo.count_confirmed_reservations_for_event(next_event_id) == 2
+
+
+def test_lock_counts_legacy_rows_for_current_event(db_path, conn):
+    from app_v2.farmer.services.pickup.pickup_lock_service import PickupLockService
+
+    now = datetime.now(UTC)
+    start, _ = PickupSlot.from_code("SAT_10_11").event_for_export(now, UTC)
+    _calendar(db_path).ensure_upcoming(farm_id=FARM_ID, pickup_slot_code="SAT_10_11", now=now)
+    _add_reservation(conn, event_start_at=start.strftime("%Y-%m-%d %H:%M:%S"))
+    _add_reservation(conn, event_start_at=(start + timedelta(weeks=1)).isoformat())
+
+    service = PickupLockService()
+    service.reservation_repo = ReservationExpandedRepository(str(db_path))
+    service.calendar = _calendar(db_path)
+
+    assert service.get_active_reservations_count(FARM_ID, "SAT_10_11") == 1
+    assert service.is_locked(FARM_ID, "SAT_10_11")
+
+
+# ============================================================
+# スロット変更時の作り直し
+# ============================================================
+
+def test_update_settings_regenerates_events(db_path, conn):
+    from app_v2.farmer.services.pickup.pickup_settings_service import PickupSettingsService
+
+    now = datetime.now(UTC)
+    for farm_id in (FARM_ID, OTHER_FARM_ID):
+        _calendar(db_path).ensure_upcoming(farm_id=farm_id, pickup_slot_code="SAT_10_11", now=now)
+    sat_before = _event_starts(conn, code="SAT_10_11")
+    assert len(sat_before) == PICKUP_EVENT_WEEKS_AHEAD
+
+    # 3 週先の土曜に予約が付いている
+    booked_start = sat_before[3]
+    booked_event_id = _calendar(db_path).find_event_id(farm_id=FARM_ID, event_start=booked_start)
+    _add_reservation(conn, event_id=booked_event_id)
+
+    service = PickupSettingsService()
+    service.calendar = _calendar(db_path)
+    service.update_settings(
+        FARM_ID,
+        pickup_lat=34.07,
+        pickup_lng=134.55,
+        pickup_place_name="倉庫前",
+        pickup_notes=None,
+        pickup_time="WED_19_20",
+        pickup_times=["WED_19_20"],
+    )
+
+    # 予約の付いた週と、始まっている週（終了 + 猶予までは今週扱い）だけ土曜が残る
+    assert _event_starts(conn, code="SAT_10_11") == sorted(
+        {booked_start, *(s for s in sat_before if s <= now)}
+    )
+    wed_start, _ = PickupSlot.from_code("WED_19_20").event_for_export(now, UTC)
+    assert _event_starts(conn, code="WED_19_20") == [
+        wed_start + timedelta(weeks=i) for i in range(PICKUP_EVENT_WEEKS_AHEAD)
+    ]
+    # 予約は元のイベントに紐づいたまま
+    assert _calendar(db_path).find_event_id(farm_id=FARM_ID, event_start=booked_start) == booked_event_id
+    # 他の farm のイベントは触らない
+    assert _event_starts(conn, farm_id=OTHER_FARM_ID) == sat_before
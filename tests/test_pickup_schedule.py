@@ -0,0 +1,240 @@
+# tests/test_pickup_schedule.py
+#
+# 受け渡しスケジュール（app_v2.domain.pickup_schedule.PickupSchedule）
+# - next_pickup / event_for_export / upcoming_pickups を、2 週間分の時刻（と境界の前後）で
+#   「スロットごとに全候補を並べて選ぶ」素朴な計算と比べる（週のまたぎ・複数スロット・重なり）
+# - スロットの個数・書式の検証（設定 API は 400）、farm に無いスロットの予約（confirm は 409）
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app_v2.domain.pickup_schedule import MAX_PICKUP_SLOTS_PER_FARM, PickupSchedule
+from app_v2.domain.pickup_slot import (
+    BOOKING_DEADLINE,
+    EXPORT_GRACE,
+    JST,
+    UTC,
+    PickupSlot,
+)
+
+SCHEDULES = [
+    ("SAT_10_11",),
+    # 週の端（月曜 0 時・日曜 24 時）
+    ("MON_0_1", "SUN_23_24"),
+    ("WED_19_20", "SAT_10_11", "SAT_14_15"),
+    # 枠が重なる（終了の最大値で判定する）
+    ("MON_10_20", "MON_11_12", "THU_9_10"),
+    ("MON_10_12", "MON_11_20"),
+]
+
+# 2026-06-01 は月曜
+WEEK_START = datetime(2026, 6, 1, tzinfo=JST)
+
+
+def _instants(schedule: PickupSchedule):
+    """
+    2 週間分の 20 分刻みと、各スロットの境界（締切・開始・終了・猶予）の前後。
+    """
+    yield from (WEEK_START + timedelta(minutes=20 * i) for i in range(2 * 7 * 24 * 3))
+    for slot in schedule.slots:
+        for week in (0, 1):
+            start = WEEK_START + timedelta(weeks=week) + slot.start_offset
+            end = WEEK_START + timedelta(weeks=week) + slot.end_offset
+            for edge in (start - BOOKING_DEADLINE, start, end, end + EXPORT_GRACE):
+                for delta in (
+                    timedelta(0),
+                    timedelta(microseconds=1),
+                    timedelta(seconds=1),
+                ):
+                    yield edge - delta
+                    yield edge + delta
+
+
+def _candidates(slot: PickupSlot, now: datetime, tz):
+    # now の前後 1 週も含めた、そのスロットの (start, end)
+    start, end = slot.week_event(now, tz)
+    return [(start + timedelta(weeks=k), end + timedelta(weeks=k)) for k in (-1, 0, 1, 2)]
+
+
+def _brute_next_pickup(schedule: PickupSchedule, now: datetime, tz):
+    best = None
+    for order, slot in enumerate(schedule.slots):
+        for start, _end in _candidates(slot, now, tz):
+            if start - BOOKING_DEADLINE > now:
+                key = (start, order)
+                if best is None or key < best[0]:
+                    best = (key, slot, start)
+    _, slot, start = best
+    return slot, start, start - BOOKING_DEADLINE
+
+
+def _brute_event_for_export(schedule: PickupSchedule, now: datetime, tz):
+    best = None
+    for order, slot in enumerate(schedule.slots):
+        for start, end in _candidates(slot, now, tz):
+            # now の週の枠は終了 + 猶予まで、翌週以降の枠はいつでも候補
+            this_week = slot.week_event(now, tz)[0]
+            if start < this_week or (start == this_week and now > end + EXPORT_GRACE):
+                continue
+            key = (start, order)
+            if best is None or key < best[0]:
+                best = (key, slot, start, end)
+    _, slot, start, end = best
+    return slot, start, end
+
+
+@pytest.mark.parametrize("codes", SCHEDULES, ids=lambda c: ",".join(c))
+@pytest.mark.parametrize("tz", [JST, UTC], ids=["JST", "UTC"])
+def test_matches_brute_force(codes, tz):
+    schedule = PickupSchedule.from_codes(codes)
+
+    for now in _instants(schedule):
+        now = now.astimezone(tz)
+        assert schedule.next_pickup(now, tz) == _brute_next_pickup(schedule, now, tz), now
+        assert schedule.event_for_export(now, tz) == _brute_event_for_export(schedule, now, tz), now
+
+        upcoming = schedule.upcoming_pickups(now, tz)
+        assert upcoming[0] == schedule.next_pickup(now, tz)
+        assert sorted(s.code for s, _, _ in upcoming) == sorted(schedule.codes)
+        assert [start for _, start, _ in upcoming] == sorted(start for _, start, _ in upcoming)
+
+
+@pytest.mark.parametrize("code", ["SAT_10_11", "MON_0_1", "SUN_23_24"])
+def test_single_slot_matches_pickup_slot(code):
+    schedule = PickupSchedule.from_codes([code])
+    slot = PickupSlot.from_code(code)
+
+    for now in _instants(schedule):
+        assert schedule.next_pickup(now, JST) == (slot, *slot.next_pickup(now, JST))
+        assert schedule.event_for_export(now, JST) == (slot, *slot.event_for_export(now, JST))
+
+
+def test_week_wraparound():
+    schedule = PickupSchedule.from_codes(["MON_9_10", "SAT_10_11"])
+    # 土曜 8 時（締切後）→ 翌週の月曜
+    now = WEEK_START + timedelta(days=5, hours=8)
+
+    slot, start, deadline = schedule.next_pickup(now, JST)
+
+    assert slot.code == "MON_9_10"
+    assert start == WEEK_START + timedelta(weeks=1, hours=9)
+    assert deadline == start - BOOKING_DEADLINE
+
+
+def test_from_codes_is_interned_and_ordered():
+    a = PickupSchedule.from_codes(["SAT_10_11", "WED_19_20", " SAT_10_11 "])
+    b = PickupSchedule.from_codes(["WED_19_20", "SAT_10_11"])
+
+    assert a is b
+    assert a.codes == ("WED_19_20", "SAT_10_11")
+    assert a.find("sat_10_11") is a.find("SAT_10_11") is not None
+    assert a.find("MON_1_2") is None
+
+
+# ============================================================
+# スロットの検証（設定 API）
+# ============================================================
+
+FARM_ID = 1
+
+
+@pytest.fixture
+def farm(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO farms (farm_id, email, registration_status, pickup_time)
+            VALUES (?, 'farmer@example.com', 'PROFILE_COMPLETED', 'SAT_10_11')
+            """,
+            (FARM_ID,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return FARM_ID
+
+
+def _update_pickup(pickup_times):
+    from app_v2.main import app
+
+    return TestClient(app).post(
+        "/api/farmer/pickup-settings",
+        json={
+            "farm_id": FARM_ID,
+            "pickup_lat": 34.07,
+            "pickup_lng": 134.55,
+            "pickup_place_name": "倉庫前",
+            "pickup_time": "SAT_10_11",
+            "pickup_times": pickup_times,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "pickup_times",
+    [
+        ["MON_9_10", "TUE_9_10", "WED_9_10", "THU_9_10"],
+        ["XYZ_9_10"],
+        ["SAT_10"],
+        ["  "],
+    ],
+)
+def test_update_rejects_invalid_pickup_times(farm, pickup_times):
+    resp = _update_pickup(pickup_times)
+    assert resp.status_code == 400, resp.text
+
+
+def test_update_saves_slots_in_week_order(farm):
+    # 大文字に揃えて重複は 1 つに（重複を除けば上限内）
+    codes = ["sat_14_15", "WED_19_20", "SAT_14_15"]
+    assert len(codes) <= MAX_PICKUP_SLOTS_PER_FARM
+
+    resp = _update_pickup(codes)
+
+    assert resp.status_code == 200, resp.text
+    farm_body = resp.json()["farm"]
+    assert farm_body["pickup_times"] == ["WED_19_20", "SAT_14_15"]
+    assert farm_body["pickup_time"] == "WED_19_20"
+
+
+# ============================================================
+# farm に無いスロットの予約（confirm）
+# ============================================================
+
+def test_confirm_rejects_slot_not_in_farm(monkeypatch):
+    from app_v2.customer_booking.services import confirm_service
+
+    monkeypatch.setattr(
+        confirm_service,
+        "fetch_pickup_slot_codes",
+        lambda farm_id: ["WED_19_20", "SAT_10_11"],
+    )
+    service = confirm_service.ConfirmService()
+    now = WEEK_START  # 月曜 0 時（どちらのスロットも締切前）
+
+    with pytest.raises(HTTPException) as exc:
+        service._check_server_deadline(now=now, farm_id=FARM_ID, pickup_slot_code="SUN_10_11")
+    assert exc.value.status_code == 409
+
+    # 大文字小文字は farm 側の表記に揃える
+    assert (
+        service._check_server_deadline(now=now, farm_id=FARM_ID, pickup_slot_code="sat_10_11")
+        == "SAT_10_11"
+    )
+
+
+def test_confirm_rejects_farm_without_slots(monkeypatch):
+    from app_v2.customer_booking.services import confirm_service
+
+    monkeypatch.setattr(confirm_service, "fetch_pickup_slot_codes", lambda farm_id: [])
+
+    with pytest.raises(HTTPException) as exc:
+        confirm_service.ConfirmService()._check_server_deadline(
+            now=WEEK_START, farm_id=FARM_ID, pickup_slot_code="SAT_10_11"
+        )
+    assert exc.value.status_code == 409
@@ -0,0 +1,253 @@
+# tests/test_pr_image_upload.py
+#
+# PR 画像アップロード（FarmerSettingsService.upload_pr_images）
+# - 複数枚は worker pool で並列に上がる（全体の時間 ≒ 最も遅い 1 枚）
+# - 一部が失敗したら、失敗分の月間枠を返却し、孤児ファイルを残さない
+# - cover image の upload は PR 画像として上げ、一覧の先頭に並べる
+
+import io
+import json
+import random
+import sqlite3
+import threading
+import time
+from base64 import b64encode
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import pytest
+from fastapi.testclient import TestClient
+from itsdangerous import TimestampSigner
+from PIL import Image
+
+from app_v2.common import storage
+from app_v2.common.storage import LocalContentStore, StorageBackend
+from app_v2.config.upload_limits import PR_IMAGE_UPLOAD_MAX_WORKERS
+from app_v2.farmer.services.farmer_settings_service import FarmerSettingsService
+
+FARM_ID = 1
+MONTHLY_LIMIT = 50_000_000
+
+
+class DelayedStore(StorageBackend):
+    """
+    LocalContentStore の前に置く、ファイル名ごとに遅延・失敗させる backend。
+    """
+
+    name = "delayed"
+
+    def __init__(
+        self,
+        inner: LocalContentStore,
+        *,
+        delays: Optional[Dict[str, float]] = None,
+        fail: Optional[Set[str]] = None,
+    ) -> None:
+        self.inner = inner
+        self.delays = delays or {}
+        self.fail = fail or set()
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        # 最初の put の開始〜最後の put の終了（アップロード部分だけの時間）
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+
+    def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            if self.first_start is None:
+                self.first_start = time.perf_counter()
+        try:
+            time.sleep(self.delays.get(filename, 0.0))
+            if filename in self.fail:
+                raise RuntimeError(f"upload failed: {filename}")
+            return self.inner.put(content, filename=filename, folder=folder)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.last_end = time.perf_counter()
+
+    def delete(self, public_id: str) -> bool:
+        return self.inner.delete(public_id)
+
+
+def _png(seed: int) -> bytes:
+    # サムネイルの辺（PR_IMAGE_THUMB_EDGE）より大きく、表示用と内容が分かれる画像
+    size = (640, 480)
+    noise = random.Random(seed).randbytes(size[0] * size[1] * 3)
+    buf = io.BytesIO()
+    Image.frombytes("RGB", size, noise).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _stored_files(root: Path) -> Set[str]:
+    return {p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file()}
+
+
+def _monthly_upload_bytes(db_path: Path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT monthly_upload_bytes FROM farms WHERE farm_id = ?", (FARM_ID,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return int(row[0])
+
+
+@pytest.fixture
+def farm(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO farms (
+                farm_id, email, registration_status,
+                pr_images_json, monthly_upload_bytes, monthly_upload_limit
+            ) VALUES (?, 'farmer@example.com', 'PROFILE_COMPLETED', '[]', 0, ?)
+            """,
+            (FARM_ID, MONTHLY_LIMIT),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return FARM_ID
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    root = tmp_path / "objects"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def use_storage():
+    def _use(backend: StorageBackend) -> StorageBackend:
+        storage.set_storage(backend)
+        return backend
+
+    yield _use
+    storage.set_storage(None)
+
+
+def test_uploads_run_in_parallel(farm, media_root, use_storage):
+    # 1 枚 = 表示 + サムネイルの 2 回。worker 数ちょうどの回数になる枚数
+    n_files = max(1, PR_IMAGE_UPLOAD_MAX_WORKERS // 2)
+    slowest = 0.6
+    delays = {f"photo{i}.webp": 0.4 for i in range(n_files)}
+    delays.update({f"photo{i}_thumb.webp": 0.4 for i in range(n_files)})
+    delays["photo0.webp"] = slowest
+    backend = use_storage(
+        DelayedStore(LocalContentStore(media_root, "http://media.test"), delays=delays)
+    )
+
+    service = FarmerSettingsService()
+    files = [(_png(i), f"photo{i}.png") for i in range(n_files)]
+
+    settings = service.upload_pr_images(farm_id=farm, files=files)
+    elapsed = backend.last_end - backend.first_start
+
+    assert len(settings.pr_images) == n_files
+    # worker 数ぶんが同時に走った
+    assert backend.max_active == min(2 * n_files, PR_IMAGE_UPLOAD_MAX_WORKERS)
+    # 直列なら sum(delays)。並列なら最も遅い 1 枚分（負荷の高い CI でも余裕のある比較）
+    serial = sum(delays.values())
+    assert slowest <= elapsed < serial * 0.8
+
+
+def test_partial_failure_refunds_quota(farm, db_path, media_root, use_storage):
+    use_storage(
+        DelayedStore(
+            LocalContentStore(media_root, "http://media.test"),
+            fail={"photo1_thumb.webp"},
+        )
+    )
+    service = FarmerSettingsService()
+    files = [(_png(0), "photo0.png"), (_png(1), "photo1.png")]
+
+    with pytest.raises(RuntimeError, match="photo1_thumb.webp"):
+        service.upload_pr_images(farm_id=farm, files=files)
+
+    # 成功した 1 枚目（表示 + サムネイル）だけが残り、枠もその分だけ消費する
+    pr_list = service.repo.load_pr_images_list(farm)
+    assert len(pr_list) == 1
+    thumb_id = pr_list[0]["thumbnail_url"].removeprefix("http://media.test/")
+    kept = {pr_list[0]["id"], thumb_id}
+    assert _stored_files(media_root) == kept
+
+    kept_bytes = sum((media_root / public_id).stat().st_size for public_id in kept)
+    assert _monthly_upload_bytes(db_path) == kept_bytes
+
+
+def test_all_failed_refunds_whole_reservation(farm, db_path, media_root, use_storage):
+    use_storage(
+        DelayedStore(
+            LocalContentStore(media_root, "http://media.test"),
+            fail={"photo0.webp", "photo1.webp"},
+        )
+    )
+    service = FarmerSettingsService()
+    files = [(_png(0), "photo0.png"), (_png(1), "photo1.png")]
+
+    with pytest.raises(RuntimeError):
+        service.upload_pr_images(farm_id=farm, files=files)
+
+    assert service.repo.load_pr_images_list(farm) == []
+    # 成功したサムネイルも消して、確保した枠は全部返す
+    assert _stored_files(media_root) == set()
+    assert _monthly_upload_bytes(db_path) == 0
+
+
+def _session_cookie(secret: str, data: dict) -> str:
+    # starlette SessionMiddleware と同じ形式（base64(JSON) を TimestampSigner で署名）
+    payload = b64encode(json.dumps(data).encode("utf-8"))
+    return TimestampSigner(secret).sign(payload).decode("utf-8")
+
+
+def test_cover_image_upload_goes_first(farm, media_root, use_storage):
+    from app_v2.main import app, settings
+
+    use_storage(LocalContentStore(media_root, "http://media.test"))
+    service = FarmerSettingsService()
+    before = service.upload_pr_images(
+        farm_id=farm, files=[(_png(0), "photo0.png"), (_png(1), "photo1.png")]
+    )
+    before_ids = [img.id for img in before.pr_images]
+
+    client = TestClient(app)
+    client.cookies.set("session", _session_cookie(settings.session_secret, {"farm_id": farm}))
+    resp = client.post(
+        "/api/farmer/settings-v2/cover-image/me",
+        files={"file": ("cover.png", _png(2), "image/png")},
+    )
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    ids = [img["id"] for img in body["pr_images"]]
+    assert ids[0] not in before_ids
+    assert ids[1:] == before_ids
+    assert body["cover_image_url"] == body["pr_images"][0]["url"]
+    assert [img["order"] for img in body["pr_images"]] == [1, 2, 3]
+
+
+def test_upload_routes_run_in_threadpool():
+    # 画像の加工・upload pool の待ちは同期処理。async def だとイベントループを止める
+    import inspect
+
+    from fastapi.routing import APIRoute
+
+    from app_v2.main import app
+
+    upload_routes = [
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path.startswith("/api/farmer/settings-v2/")
+        and "POST" in route.methods
+    ]
+    assert len(upload_routes) >= 4
+    for route in upload_routes:
+        assert not inspect.iscoroutinefunction(route.endpoint), route.path
@@ -0,0 +1,154 @@
+# tests/test_single_flight.py
+#
+# 同時に来た同じ計算をまとめる（app_v2.common.single_flight）
+# - 同じ key の同時呼び出しは 1 回の計算を共有する。例外も全員に届く
+# - 終わったら key を外す（結果は保持しない）
+# - 公開 API では、書き込み後の ETag のリクエストが書き込み前に始まった計算に相乗りしない
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app_v2.common.single_flight import SingleFlight
+
+N_CALLERS = 8
+
+
+def _run_concurrently(flight, key, fn):
+    """
+    N_CALLERS 個のスレッドから flight.do(key, fn)。([結果 or 例外], 計算の回数)
+    """
+    calls = []
+    results = [None] * N_CALLERS
+
+    def counted():
+        calls.append(1)
+        # 残り全員が相乗りするまで計算を終えない
+        deadline = time.monotonic() + 5
+        while flight.stats()["shared"] < N_CALLERS - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return fn()
+
+    def worker(i):
+        try:
+            results[i] = flight.do(key, counted)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(N_CALLERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results, len(calls)
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight("test.share")
+    result = {"value": 1}
+
+    results, n_calls = _run_concurrently(flight, "k", lambda: result)
+
+    assert n_calls == 1
+    # 全員が同じオブジェクトを受け取る
+    assert all(r is result for r in results)
+    assert flight.stats() == {"leaders": 1, "shared": N_CALLERS - 1, "in_flight": 0}
+
+
+def test_error_propagates_to_waiters():
+    flight = SingleFlight("test.error")
+
+    def fail():
+        raise RuntimeError("boom")
+
+    results, n_calls = _run_concurrently(flight, "k", fail)
+
+    assert n_calls == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "boom" for r in results)
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight("test.release")
+
+    assert flight.do("k", lambda: 1) == 1
+    # 結果は保持しない（次の呼び出しは新しく計算する）
+    assert flight.do("k", lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: int("x"))
+    assert flight.do("k", lambda: 3) == 3
+    assert flight.stats()["in_flight"] == 0
+    assert flight.stats()["leaders"] == 4
+
+
+def test_different_keys_do_not_share():
+    flight = SingleFlight("test.keys")
+    release = threading.Event()
+    results = {}
+
+    def slow():
+        release.wait(5)
+        return "a"
+
+    t = threading.Thread(target=lambda: results.update(a=flight.do("a", slow)))
+    t.start()
+    # "a" の計算中でも "b" は待たずに計算する
+    assert flight.do("b", lambda: "b") == "b"
+    release.set()
+    t.join(5)
+    assert results == {"a": "a"}
+
+
+def _bump_farms_version(db_path) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("UPDATE table_versions SET version = version + 1 WHERE table_name = 'farms'")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_request_after_write_does_not_join_older_flight(db_path, monkeypatch):
+    from app_v2.customer_booking.repository.public_farm_detail_repo import (
+        PublicFarmDetailRepository,
+    )
+    from app_v2.main import app
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(self, farm_id):
+        calls.append(farm_id)
+        if len(calls) == 1:
+            # 1 件目（書き込み前の version）の計算を止めておく
+            started.set()
+            release.wait(5)
+        return None
+
+    monkeypatch.setattr(PublicFarmDetailRepository, "fetch_publishable_farm_detail", fetch)
+    client = TestClient(app)
+    responses = {}
+
+    def get(name):
+        responses[name] = client.get("/api/public/farms/1")
+
+    before = threading.Thread(target=get, args=("before",))
+    before.start()
+    assert started.wait(5)
+
+    _bump_farms_version(db_path)
+    after = threading.Thread(target=get, args=("after",))
+    after.start()
+    # 相乗りしていれば 1 件目が終わるまで返らない
+    after.join(5)
+    finished_alone = not after.is_alive()
+    release.set()
+    before.join(5)
+    after.join(5)
+
+    assert finished_alone
+    assert calls == [1, 1]
+    assert responses["before"].headers["ETag"] != responses["after"].headers["ETag"]
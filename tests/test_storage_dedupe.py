@@ -0,0 +1,88 @@
+# tests/test_storage_dedupe.py
+#
+# 画像ストレージの同一内容の検出（DedupingStorage + storage_dedupe テーブル）
+
+import sqlite3
+from typing import Any, Dict, List
+
+import pytest
+
+from app_v2.common.storage import (
+    DedupeIndex,
+    DedupingStorage,
+    LocalContentStore,
+    StorageBackend,
+)
+
+FOLDER = "farms/1/pr_images"
+
+
+class CountingStore(LocalContentStore):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.puts: List[str] = []
+
+    def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+        self.puts.append(filename)
+        return super().put(content, filename=filename, folder=folder)
+
+
+@pytest.fixture
+def inner(tmp_path):
+    return CountingStore(tmp_path / "objects", "http://media.test")
+
+
+def test_backend_must_implement_put_and_delete():
+    class Incomplete(StorageBackend):
+        def put(self, content: bytes, *, filename: str, folder: str) -> Dict[str, Any]:
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_same_content_is_uploaded_once(db_path, inner):
+    storage = DedupingStorage(inner, DedupeIndex())
+
+    first = storage.put(b"image-a", filename="a.webp", folder=FOLDER)
+    again = storage.put(b"image-a", filename="renamed.webp", folder=FOLDER)
+
+    assert again == first
+    assert inner.puts == ["a.webp"]
+    # 別 folder は別扱い
+    storage.put(b"image-a", filename="a.webp", folder="farms/2/pr_images")
+    assert inner.puts == ["a.webp", "a.webp"]
+
+
+def test_index_is_shared_through_db(db_path, inner):
+    # 別インスタンス（= 別プロセス・デプロイ後）でも同じ索引を見る
+    result = DedupingStorage(inner, DedupeIndex()).put(b"image-a", filename="a.webp", folder=FOLDER)
+
+    other = DedupingStorage(inner, DedupeIndex())
+    assert other.find(b"image-a", folder=FOLDER) == result
+    assert other.find(b"image-b", folder=FOLDER) is None
+
+
+def test_delete_forgets_index(db_path, inner):
+    storage = DedupingStorage(inner, DedupeIndex())
+    result = storage.put(b"image-a", filename="a.webp", folder=FOLDER)
+
+    assert storage.delete(result["public_id"])
+    assert storage.find(b"image-a", folder=FOLDER) is None
+
+    storage.put(b"image-a", filename="a.webp", folder=FOLDER)
+    assert inner.puts == ["a.webp", "a.webp"]
+
+
+def test_without_table_behaves_as_no_index(tmp_path, monkeypatch, inner):
+    # マイグレーション前の DB
+    path = tmp_path / "old.db"
+    sqlite3.connect(path).close()
+    monkeypatch.setenv("DB_PATH", str(path))
+    storage = DedupingStorage(inner, DedupeIndex())
+
+    storage.put(b"image-a", filename="a.webp", folder=FOLDER)
+    storage.put(b"image-a", filename="a.webp", folder=FOLDER)
+
+    assert storage.find(b"image-a", folder=FOLDER) is None
+    assert inner.puts == ["a.webp", "a.webp"]
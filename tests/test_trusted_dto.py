@@ -0,0 +1,95 @@
+# tests/test_trusted_dto.py
+#
+# build_trusted で組み立てる DTO（app_v2.common.trusted_dto）
+# - STRICT_DTO_VALIDATION=1 では全項目を Pydantic で検証する（型崩れは 500 になる）
+# - 検証を飛ばしても、一覧のレスポンスは検証した場合とバイト単位で同じ
+
+import json
+import sqlite3
+from base64 import b64encode
+
+import pytest
+from fastapi.testclient import TestClient
+from itsdangerous import TimestampSigner
+
+# 徳島県全体 / 徳島市役所付近
+MAP_BOUNDS = {"min_lat": 33.5, "max_lat": 34.3, "min_lng": 133.6, "max_lng": 134.8}
+USER_LOCATION = {"lat": 34.0703, "lng": 134.5548}
+
+
+@pytest.fixture
+def busy_farm_id(seed_1k_db, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(seed_1k_db))
+    conn = sqlite3.connect(seed_1k_db)
+    try:
+        row = conn.execute(
+            """
+            SELECT farm_id FROM reservations
+             WHERE status = 'confirmed'
+             GROUP BY farm_id
+             ORDER BY COUNT(*) DESC
+             LIMIT 1
+            """
+        ).fetchone()
+    finally:
+        conn.close()
+    return int(row[0])
+
+
+def _session_cookie(secret: str, data: dict) -> str:
+    # starlette SessionMiddleware と同じ形式（base64(JSON) を TimestampSigner で署名）
+    payload = b64encode(json.dumps(data).encode("utf-8"))
+    return TimestampSigner(secret).sign(payload).decode("utf-8")
+
+
+def _list_bodies(farm_id: int) -> dict:
+    from app_v2.main import app, settings
+
+    client = TestClient(app)
+    client.cookies.set("session", _session_cookie(settings.session_secret, {"farm_id": farm_id}))
+    requests = {
+        # PublicFarmCardDTO
+        "public_farms": ("/api/public/farms", {"page": 1, **USER_LOCATION}),
+        "public_farms_map": ("/api/public/farms/map", MAP_BOUNDS),
+        # PublicFarmMapClusterDTO
+        "public_farms_map_clusters": ("/api/public/farms/map/clusters", {**MAP_BOUNDS, "zoom": 9}),
+        # ExportReservationRowDTO / ExportReservationItemDTO
+        "reservations_expanded": ("/reservations/expanded", None),
+        # AdminReservationListItemDTO
+        "admin_reservations": ("/api/admin/reservations", {"farm_id": farm_id, "limit": 200}),
+    }
+
+    bodies = {}
+    for name, (path, params) in requests.items():
+        resp = client.get(path, params=params)
+        assert resp.status_code == 200, (name, resp.text[:200])
+        bodies[name] = resp.content
+    return bodies
+
+
+def test_list_endpoints_build_valid_dtos_in_strict_mode(busy_farm_id, settings_env):
+    settings_env(STRICT_DTO_VALIDATION="1")
+    bodies = _list_bodies(busy_farm_id)
+
+    assert json.loads(bodies["public_farms_map"])
+    assert json.loads(bodies["public_farms_map_clusters"])["clusters"]
+    assert json.loads(bodies["admin_reservations"])["items"]
+
+
+def test_trusted_bodies_match_strict_mode(busy_farm_id, settings_env):
+    settings_env(STRICT_DTO_VALIDATION="1")
+    strict = _list_bodies(busy_farm_id)
+    settings_env(STRICT_DTO_VALIDATION="0")
+    trusted = _list_bodies(busy_farm_id)
+
+    for name in strict:
+        assert trusted[name] == strict[name], name
+
+
+def test_strict_mode_is_read_at_call_time(settings_env):
+    from app_v2.common.trusted_dto import strict_dto_validation
+
+    settings_env(STRICT_DTO_VALIDATION="1")
+    assert strict_dto_validation()
+    settings_env(STRICT_DTO_VALIDATION="0")
+    assert not strict_dto_validation()
@@ -0,0 +1,201 @@
+# tests/test_upload_guard.py
+#
+# アップロード受信時の上限（app_v2.common.upload_guard）
+# - multipart のパートごとの上限は、本文を受信しながら判定する（超えたら残りを受信しない）
+# - 全体の上限はパスごと（1 ファイルだけ受ける route は 1 枚分）
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+
+from app_v2.common.upload_guard import (
+    MultipartPartMeter,
+    UploadBodyLimitMiddleware,
+    multipart_boundary,
+)
+
+BOUNDARY = b"test-boundary-7MA4YWxkTrZu0gW"
+MAX_PART = 1000
+MAX_BODY = 10_000
+SINGLE_FILE_MAX_BODY = 1_500
+
+
+def _multipart(files: List[Tuple[str, bytes]]) -> bytes:
+    body = b""
+    for filename, content in files:
+        body += (
+            b"--" + BOUNDARY + b"\r\n"
+            + f'Content-Disposition: form-data; name="files"; filename="{filename}"\r\n'.encode()
+            + b"Content-Type: image/png\r\n\r\n"
+            + content
+            + b"\r\n"
+        )
+    return body + b"--" + BOUNDARY + b"--\r\n"
+
+
+def _chunks(body: bytes, size: int) -> List[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)] or [b""]
+
+
+def _feed_all(body: bytes, chunk_size: int) -> bool:
+    meter = MultipartPartMeter(BOUNDARY, max_part_bytes=MAX_PART)
+    return all([meter.feed(chunk) for chunk in _chunks(body, chunk_size)])
+
+
+# ============================================================
+# MultipartPartMeter
+# ============================================================
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100_000])
+def test_meter_accepts_parts_up_to_limit(chunk_size):
+    # 区切りに似た中身・上限ちょうどのパートも通す
+    tricky = (b"\r\n--" + BOUNDARY[:-1] + b"x").ljust(MAX_PART, b"a")
+    body = _multipart([("a.png", b"a" * MAX_PART), ("b.png", tricky), ("c.png", b"")])
+    assert _feed_all(body, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100_000])
+def test_meter_rejects_part_over_limit(chunk_size):
+    body = _multipart([("a.png", b"a" * 10), ("b.png", b"b" * (MAX_PART + 1))])
+    assert not _feed_all(body, chunk_size)
+
+
+def test_meter_counts_each_part_separately():
+    body = _multipart([(f"{i}.png", b"x" * MAX_PART) for i in range(5)])
+    assert len(body) > MAX_PART * 5
+    assert _feed_all(body, 333)
+
+
+def test_multipart_boundary():
+    assert multipart_boundary(b'multipart/form-data; boundary="abc"') == b"abc"
+    assert multipart_boundary(b"Multipart/Form-Data;charset=utf-8; boundary=abc") == b"abc"
+    assert multipart_boundary(b"application/json") is None
+    assert multipart_boundary(b"multipart/form-data") is None
+
+
+# ============================================================
+# UploadBodyLimitMiddleware
+# ============================================================
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/upload/many")
+    async def many(files: List[UploadFile] = File(...)):
+        return {"sizes": [f.size for f in files]}
+
+    @app.post("/upload/one")
+    async def one(files: List[UploadFile] = File(...)):
+        return {"sizes": [f.size for f in files]}
+
+    app.add_middleware(
+        UploadBodyLimitMiddleware,
+        path_prefixes=["/upload/"],
+        max_body_bytes=MAX_BODY,
+        path_max_body_bytes={"/upload/one": SINGLE_FILE_MAX_BODY},
+        max_part_bytes=MAX_PART,
+    )
+    return app
+
+
+def _post(
+    path: str,
+    body: bytes,
+    *,
+    chunk_size: int = 100,
+    content_length: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    本文を chunk_size ずつ送り、ステータスと受信された chunk 数を返す。
+    """
+    chunks = _chunks(body, chunk_size)
+    pulled = 0
+    result: Dict[str, int] = {}
+
+    headers = [(b"content-type", b"multipart/form-data; boundary=" + BOUNDARY)]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        nonlocal pulled
+        if pulled >= len(chunks):
+            return {"type": "http.disconnect"}
+        chunk = chunks[pulled]
+        pulled += 1
+        return {"type": "http.request", "body": chunk, "more_body": pulled < len(chunks)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+
+    asyncio.run(_app()(scope, receive, send))
+    result["pulled"] = pulled
+    result["chunks"] = len(chunks)
+    return result
+
+
+def test_middleware_accepts_files_within_limits():
+    body = _multipart([("a.png", b"a" * MAX_PART), ("b.png", b"b" * MAX_PART)])
+    result = _post("/upload/many", body)
+    assert result["status"] == 200
+    assert result["pulled"] == result["chunks"]
+
+
+def test_middleware_stops_reading_at_oversized_part():
+    body = _multipart([("a.png", b"a" * (MAX_PART * 3))])
+    assert len(body) < MAX_BODY
+
+    result = _post("/upload/many", body)
+
+    assert result["status"] == 413
+    # 上限 + 1 チャンク程度で打ち切る（残りは受信しない）
+    assert result["pulled"] <= MAX_PART // 100 + 3 < result["chunks"]
+
+
+def test_middleware_applies_per_path_body_limit():
+    body = _multipart([("a.png", b"a" * 900), ("b.png", b"b" * 900)])
+    assert SINGLE_FILE_MAX_BODY < len(body) < MAX_BODY
+
+    assert _post("/upload/many", body)["status"] == 200
+    assert _post("/upload/one", body)["status"] == 413
+    # Content-Length で分かる場合は本文を読む前に断る
+    declared = _post("/upload/one", body, content_length=len(body))
+    assert declared["status"] == 413
+    assert declared["pulled"] == 0
+
+
+def test_early_413_has_cors_headers(db_path):
+    # upload guard は CORS の内側。ブラウザに 413 として見えるようにする
+    from fastapi.testclient import TestClient
+
+    from app_v2.main import app
+
+    resp = TestClient(app).post(
+        "/api/farmer/settings-v2/pr-images/me",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Content-Type": "multipart/form-data; boundary=" + BOUNDARY.decode(),
+            "Content-Length": "999999999",
+        },
+        content=b"--" + BOUNDARY + b"--\r\n",
+    )
+
+    assert resp.status_code == 413
+    assert resp.headers["access-control-allow-origin"] == "http://localhost:5173"